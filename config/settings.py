@@ -7,11 +7,22 @@ Model IDs follow the Nova 2 Developer Guide naming convention:
 """
 
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag; "1", "true" and "yes" (any case) mean on."""
+
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().casefold() in {"1", "true", "yes"}
+
+
 # ── AWS ────────────────────────────────────────────────
 AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
 
@@ -70,8 +81,208 @@ def validate_cors_origins(origins: list[str]) -> None:
         )
 
 
+# Bearer token for GET /api/metrics (per-caller usage, quota and cache stats).
+# Empty disables the endpoint.
+METRICS_API_TOKEN: str = os.getenv("METRICS_API_TOKEN", "").strip()
+
+
+# ── Triage (router + Crisis Radar) ─────────────────────
+# Both classifications run concurrently; whatever has not finished by the
+# deadline falls back (COMPASS for routing, the explicit failure path for crisis).
+TRIAGE_DEADLINE_SECONDS: float = float(os.getenv("TRIAGE_DEADLINE_SECONDS", "15"))
+TRIAGE_MAX_WORKERS: int = int(os.getenv("TRIAGE_MAX_WORKERS", "16"))
+# "parallel": router and Crisis Radar as two concurrent Nova requests;
+# "combined": one structured request answers both (half the request rate).
+TRIAGE_MODE: str = os.getenv("TRIAGE_MODE", "parallel").strip().casefold()
+
 # ── Session ────────────────────────────────────────────
 SESSION_TIMEOUT_MINUTES: int = int(os.getenv("SESSION_TIMEOUT_MINUTES", "30"))
 
+# ── History window ─────────────────────────────────────
+# Estimated input tokens of conversation history sent per turn. Older turns
+# beyond the budget are collapsed into one block built from the session summary,
+# in steps of at least half the budget so the cached history prefix stays
+# stable. 0 disables the window. HISTORY_TOKEN_BUDGETS overrides the budget
+# per agent name, e.g. "compass=3000,student_aid=8000".
+HISTORY_TOKEN_BUDGET: int = int(os.getenv("HISTORY_TOKEN_BUDGET", "6000"))
+_raw_history_budgets: str = os.getenv("HISTORY_TOKEN_BUDGETS", "")
+HISTORY_TOKEN_BUDGETS: dict[str, int] = {
+    name.strip(): int(budget)
+    for name, _, budget in (item.partition("=") for item in _raw_history_budgets.split(","))
+    if name.strip()
+}
+
+# ── Session summaries ──────────────────────────────────
+# Sidebar summaries run on a small background pool after the reply is sent.
+# The queue holds at most one job per session; beyond this many sessions new
+# jobs are dropped (the next turn for that session queues a fresh one).
+SUMMARY_WORKER_THREADS: int = int(os.getenv("SUMMARY_WORKER_THREADS", "2"))
+SUMMARY_QUEUE_MAX_SESSIONS: int = int(os.getenv("SUMMARY_QUEUE_MAX_SESSIONS", "256"))
+# Exports queue a summary on the worker and wait this long for it; after
+# that the bundle carries the last completed summary.
+SUMMARY_EXPORT_WAIT_SECONDS: float = float(os.getenv("SUMMARY_EXPORT_WAIT_SECONDS", "20"))
+# Cadence: "adaptive" summarizes when local profile signals change, every N
+# exchanges, or once the unsummarized transcript grows past the token threshold.
+SUMMARY_CADENCE_MODE: str = os.getenv("SUMMARY_CADENCE_MODE", "adaptive")
+SUMMARY_EVERY_N_TURNS: int = int(os.getenv("SUMMARY_EVERY_N_TURNS", "4"))
+SUMMARY_TOKEN_GROWTH: int = int(os.getenv("SUMMARY_TOKEN_GROWTH", "1200"))
+# Incremental mode sends only messages added since the last summary plus that
+# summary, keeping per-update input roughly constant.
+SUMMARY_INCREMENTAL: bool = _env_bool("SUMMARY_INCREMENTAL", True)
+
+# ── Observability ──────────────────────────────────────
+# Per-turn stage timings are always logged ("chat_turn_timings"); this flag
+# additionally returns them on ChatTurnResult / OnboardingTurnResult.
+TURN_TIMINGS_ENABLED: bool = _env_bool("TURN_TIMINGS_ENABLED", False)
+
 # ── Bedrock timeout (Nova guide: up to 60 min for extended thinking) ──
 BEDROCK_READ_TIMEOUT: int = 3600
+
+# ── Bedrock connection pool ────────────────────────────
+# All NovaClient instances share one bedrock-runtime client per region. Size
+# its urllib3 pool for the threads that can call Bedrock at once: the triage
+# pool, the summary workers, the generation threads (asyncio's default
+# executor and Streamlit/API request threads, ~32) and the duplicate requests
+# of hedged calls. Hedged primaries run on behalf of those threads; their
+# pool is capped at this connection count instead of adding to it.
+BEDROCK_HEDGE_POOL_SIZE: int = 16
+BEDROCK_MAX_POOL_CONNECTIONS: int = int(
+    os.getenv(
+        "BEDROCK_MAX_POOL_CONNECTIONS",
+        str(TRIAGE_MAX_WORKERS + SUMMARY_WORKER_THREADS + 32 + BEDROCK_HEDGE_POOL_SIZE),
+    )
+)
+
+# ── Bedrock retries ────────────────────────────────────
+# Retryable Bedrock errors (throttling, ServiceUnavailable, ModelNotReady,
+# connection resets) are retried with full-jitter exponential backoff. The
+# process-wide retry budget lets retries grow to BEDROCK_RETRY_BUDGET_RATIO of
+# first attempts (plus a burst of BEDROCK_RETRY_BUDGET_BURST), then fails fast.
+BEDROCK_MAX_RETRIES: int = int(os.getenv("BEDROCK_MAX_RETRIES", "3"))
+BEDROCK_RETRY_BASE_DELAY: float = float(os.getenv("BEDROCK_RETRY_BASE_DELAY", "1.0"))
+BEDROCK_RETRY_MAX_DELAY: float = float(os.getenv("BEDROCK_RETRY_MAX_DELAY", "20.0"))
+BEDROCK_RETRY_BUDGET_RATIO: float = float(os.getenv("BEDROCK_RETRY_BUDGET_RATIO", "0.2"))
+BEDROCK_RETRY_BUDGET_BURST: float = float(os.getenv("BEDROCK_RETRY_BUDGET_BURST", "10"))
+
+# ── Bedrock request hedging ────────────────────────────
+# Router, Crisis Radar and triage calls that run longer than the given
+# percentile of their recent latencies get one duplicate request; the first
+# response wins. Hedges are capped at BEDROCK_HEDGE_BUDGET_RATIO of calls.
+BEDROCK_HEDGING_ENABLED: bool = _env_bool("BEDROCK_HEDGING_ENABLED", False)
+BEDROCK_HEDGE_PERCENTILE: float = float(os.getenv("BEDROCK_HEDGE_PERCENTILE", "95"))
+BEDROCK_HEDGE_MIN_SAMPLES: int = int(os.getenv("BEDROCK_HEDGE_MIN_SAMPLES", "20"))
+BEDROCK_HEDGE_BUDGET_RATIO: float = float(os.getenv("BEDROCK_HEDGE_BUDGET_RATIO", "0.05"))
+BEDROCK_HEDGE_BUDGET_BURST: float = float(os.getenv("BEDROCK_HEDGE_BUDGET_BURST", "5"))
+
+# ── Bedrock quota scheduler ────────────────────────────
+# Token buckets sized to the account's Bedrock quotas pace requests before
+# they are sent (0 disables a bucket; both 0 disable the scheduler). Crisis
+# Radar and router go first, then specialists, then the summarizer. The
+# "file" backend shares the buckets between worker processes via flock.
+BEDROCK_QUOTA_RPM: int = int(os.getenv("BEDROCK_QUOTA_RPM", "0"))
+BEDROCK_QUOTA_TPM: int = int(os.getenv("BEDROCK_QUOTA_TPM", "0"))
+BEDROCK_QUOTA_BACKEND: str = os.getenv("BEDROCK_QUOTA_BACKEND", "memory")
+BEDROCK_QUOTA_STATE_FILE: str = os.getenv(
+    "BEDROCK_QUOTA_STATE_FILE", os.path.join(tempfile.gettempdir(), "koda-bedrock-quota.json")
+)
+BEDROCK_QUOTA_MAX_WAIT_SECONDS: float = float(os.getenv("BEDROCK_QUOTA_MAX_WAIT_SECONDS", "30"))
+
+# ── Bedrock endpoint failover ──────────────────────────
+# Ordered "model_id@region" entries (region defaults to AWS_REGION), e.g. the
+# us. and global. inference profiles or a second region. Empty keeps every
+# call on NOVA_MODEL_ID in AWS_REGION. Traffic favours earlier and healthier
+# endpoints; a failing one is ejected and gets one probe request every
+# BEDROCK_ENDPOINT_PROBE_INTERVAL seconds until a probe succeeds.
+BEDROCK_ENDPOINTS: str = os.getenv("BEDROCK_ENDPOINTS", "")
+BEDROCK_ENDPOINT_FAILURE_THRESHOLD: int = int(os.getenv("BEDROCK_ENDPOINT_FAILURE_THRESHOLD", "3"))
+BEDROCK_ENDPOINT_MAX_ERROR_RATE: float = float(os.getenv("BEDROCK_ENDPOINT_MAX_ERROR_RATE", "0.5"))
+BEDROCK_ENDPOINT_PROBE_INTERVAL: float = float(os.getenv("BEDROCK_ENDPOINT_PROBE_INTERVAL", "30"))
+
+# ── Bedrock prompt caching ─────────────────────────────
+# Converse cache points after the static per-agent system prompt and after
+# the stable history prefix, so follow-up turns re-read those tokens from cache.
+PROMPT_CACHE_ENABLED: bool = _env_bool("PROMPT_CACHE_ENABLED", True)
+
+# ── Token usage and cost ───────────────────────────────
+# Per-million-token prices used to estimate cost from Converse usage blocks
+# (USD, Nova 2 Lite on-demand list prices; override for other models/regions).
+BEDROCK_PRICE_INPUT_PER_MTOK: float = float(os.getenv("BEDROCK_PRICE_INPUT_PER_MTOK", "0.30"))
+BEDROCK_PRICE_OUTPUT_PER_MTOK: float = float(os.getenv("BEDROCK_PRICE_OUTPUT_PER_MTOK", "2.50"))
+BEDROCK_PRICE_CACHE_READ_PER_MTOK: float = float(
+    os.getenv("BEDROCK_PRICE_CACHE_READ_PER_MTOK", "0.075")
+)
+BEDROCK_PRICE_CACHE_WRITE_PER_MTOK: float = float(
+    os.getenv("BEDROCK_PRICE_CACHE_WRITE_PER_MTOK", "0.30")
+)
+# Bedrock tokens one session may use before optional work (background
+# summaries) is skipped; 0 disables the budget. Replies are never refused.
+SESSION_TOKEN_BUDGET: int = int(os.getenv("SESSION_TOKEN_BUDGET", "0"))
+# Return per-turn and per-session usage on ChatTurnResult / OnboardingTurnResult.
+TURN_USAGE_ENABLED: bool = _env_bool("TURN_USAGE_ENABLED", False)
+
+# ── Startup ────────────────────────────────────────────
+# Agents and Bedrock clients are built lazily. When enabled, the API lifespan
+# (and the Streamlit app, in a background thread) builds them up front so the
+# first request does not pay for initialization.
+WARM_UP_ON_STARTUP: bool = _env_bool("WARM_UP_ON_STARTUP", True)
+
+# ── Routing ────────────────────────────────────────────
+# Messages with unambiguous topic keywords (BAföG, ECTS, NC, ...) are routed
+# by a local lexicon; the Nova router only runs below this confidence.
+ROUTER_LOCAL_ENABLED: bool = _env_bool("ROUTER_LOCAL_ENABLED", True)
+ROUTER_LOCAL_CONFIDENCE: float = float(os.getenv("ROUTER_LOCAL_CONFIDENCE", "0.7"))
+# Short or anaphoric follow-ups ("und wie beantrage ich das?") keep the
+# session's current specialist for this long after its last answer, unless
+# topic keywords point at a different specialist.
+ROUTER_STICKY_ENABLED: bool = _env_bool("ROUTER_STICKY_ENABLED", True)
+ROUTER_STICKY_MAX_WORDS: int = int(os.getenv("ROUTER_STICKY_MAX_WORDS", "8"))
+ROUTER_STICKY_WINDOW_SECONDS: int = int(os.getenv("ROUTER_STICKY_WINDOW_SECONDS", "600"))
+# Model routing decisions are cached per normalized message (quick actions
+# repeat across sessions). Pre-seeding the cache with the i18n quick-action
+# messages during warm-up costs one paid routing call per message on every
+# process start and delays readiness, so it is opt-in.
+ROUTER_CACHE_ENABLED: bool = _env_bool("ROUTER_CACHE_ENABLED", True)
+ROUTER_CACHE_MAX_ENTRIES: int = int(os.getenv("ROUTER_CACHE_MAX_ENTRIES", "1024"))
+ROUTER_CACHE_TTL_SECONDS: int = int(os.getenv("ROUTER_CACHE_TTL_SECONDS", "3600"))
+ROUTER_CACHE_PRESEED: bool = _env_bool("ROUTER_CACHE_PRESEED", False)
+
+# ── Crisis Radar screening ─────────────────────────────
+# "tiered": strong local distress patterns flag a crisis without a model call;
+#   only bare greetings/thanks and benign study-choice questions without
+#   distress vocabulary are cleared locally, everything else goes to Nova;
+# "strong_only": only the local crisis flag, everything else goes to Nova;
+# "model_only": every message goes to Nova, with no local decision at all.
+CRISIS_SCREEN_MODE: str = os.getenv("CRISIS_SCREEN_MODE", "tiered").strip().casefold()
+# Longer messages are never cleared locally; they carry more context than a
+# word list can judge.
+CRISIS_NEUTRAL_MAX_CHARS: int = int(os.getenv("CRISIS_NEUTRAL_MAX_CHARS", "280"))
+# Model crisis assessments are cached briefly for exact repeats only.
+CRISIS_CACHE_ENABLED: bool = _env_bool("CRISIS_CACHE_ENABLED", True)
+CRISIS_CACHE_MAX_ENTRIES: int = int(os.getenv("CRISIS_CACHE_MAX_ENTRIES", "512"))
+CRISIS_CACHE_TTL_SECONDS: int = int(os.getenv("CRISIS_CACHE_TTL_SECONDS", "300"))
+
+# ── Canned answers ─────────────────────────────────────
+# Replies to the fixed i18n quick-action messages are reused for empty
+# sessions, keyed by agent, language and trusted-source registry version.
+CANNED_ANSWERS_ENABLED: bool = _env_bool("CANNED_ANSWERS_ENABLED", True)
+CANNED_ANSWERS_TTL_SECONDS: int = int(os.getenv("CANNED_ANSWERS_TTL_SECONDS", "86400"))
+CANNED_ANSWERS_MAX_ENTRIES: int = int(os.getenv("CANNED_ANSWERS_MAX_ENTRIES", "64"))
+
+# ── Semantic response cache ────────────────────────────
+# Generic first turns (quick actions, or short messages without personal
+# details) of sessions without memory are embedded and compared against
+# earlier answers of the same agent, language and source registry version;
+# close matches are reused.
+SEMANTIC_CACHE_ENABLED: bool = _env_bool("SEMANTIC_CACHE_ENABLED", False)
+# "nova": NOVA_EMBEDDINGS_MODEL_ID on Bedrock; "hashing": local, offline stand-in.
+SEMANTIC_CACHE_EMBEDDER: str = os.getenv("SEMANTIC_CACHE_EMBEDDER", "nova").strip().casefold()
+SEMANTIC_CACHE_DIMENSIONS: int = int(os.getenv("SEMANTIC_CACHE_DIMENSIONS", "1024"))
+SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "256"))
+SEMANTIC_CACHE_TTL_SECONDS: int = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400"))
+
+# ── Speculative specialist execution ───────────────────
+# On follow-up turns, start the previous specialist's reply while triage is
+# still running; commit it if routing agrees, cancel it otherwise.
+SPECULATIVE_SPECIALIST: bool = _env_bool("SPECULATIVE_SPECIALIST", False)
+SPECULATION_MAX_WORKERS: int = int(os.getenv("SPECULATION_MAX_WORKERS", "8"))
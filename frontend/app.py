@@ -5,6 +5,7 @@ KODA — Streamlit Chat Interface.
 import html as html_lib
 import re
 import sys
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -13,7 +14,7 @@ import streamlit.components.v1 as components
 from PIL import Image
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-
+from config.settings import WARM_UP_ON_STARTUP
 from src.core.conversation import SessionMemorySnapshot
 from src.core.documents import (
     ALLOWED_DOCUMENT_EXTENSIONS,
@@ -1851,7 +1852,11 @@ def _reset_chat() -> None:
 def load_chat_service():
     """Initialize the shared chat service once and cache it."""
 
-    return build_default_chat_service()
+    service = build_default_chat_service()
+    if WARM_UP_ON_STARTUP:
+        # Streamlit has no startup hook; warm up while the first page renders.
+        threading.Thread(target=service.warm_up, name="koda-warm-up", daemon=True).start()
+    return service
 
 
 def _normalize_provenance(value: dict | ResponseProvenance | None) -> ResponseProvenance | None:
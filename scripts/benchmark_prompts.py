@@ -0,0 +1,106 @@
+"""Compare memoized system prompt assembly against direct concatenation.
+
+Builds the system prompt of every domain agent for a warm session with
+identity context, session memory and trusted sources, once by calling the
+section builders directly and once through ``BaseAgent._build_prompt`` with
+precompiled templates and memoized sections. Both must produce the same
+prompt. Runs offline; no AWS credentials are needed.
+
+Usage: python scripts/benchmark_prompts.py [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from src.agents.academic_basics.hidden_curriculum import HiddenCurriculumAgent
+from src.agents.base import build_ui_language_addendum
+from src.agents.compass import CompassAgent
+from src.agents.financing.student_aid import StudentAidAgent
+from src.agents.role_models.anti_impostor import AntiImpostorAgent
+from src.agents.study_choice.degree_explorer import DegreeExplorerAgent
+from src.core.client import PROMPT_CACHE_POINT
+from src.core.conversation import Conversation, build_session_memory_addendum
+from src.core.documents import build_document_prompt_addendum
+from src.core.prompt_assembly import clear_prompt_memos, prompt_memo_stats
+from src.core.provenance import build_sourcing_addendum
+from src.core.safety import build_identity_addendum
+from src.knowledge import SourceSelectionContext, select_trusted_sources
+
+AGENTS = (
+    CompassAgent,
+    StudentAidAgent,
+    DegreeExplorerAgent,
+    HiddenCurriculumAgent,
+    AntiImpostorAgent,
+)
+
+
+def _metadata() -> dict:
+    conversation = Conversation()
+    for text in (
+        "Ich bin die erste in meiner Familie, die studiert.",
+        "Wie beantrage ich BAföG?",
+        "Und was ist mit Stipendien?",
+    ):
+        conversation.add_user_message(text, ui_language="de")
+        conversation.add_assistant_message(
+            "Gute Frage, schauen wir uns das an.", agent_key="FINANCING"
+        )
+    selection = select_trusted_sources(
+        SourceSelectionContext(user_language="de", user_message="Wie beantrage ich BAföG?")
+    )
+    return {
+        **conversation.metadata,
+        "ui_language": "de",
+        "identity_context": {"first_gen": True, "language": "de"},
+        "trusted_sources": selection.sources,
+    }
+
+
+def _direct(agent, metadata: dict) -> str:
+    prompt = agent._base_prompt + build_ui_language_addendum(metadata) + PROMPT_CACHE_POINT
+    prompt += build_identity_addendum(metadata["identity_context"])
+    prompt += build_session_memory_addendum(metadata["session_memory"])
+    if metadata.get("document_context"):
+        prompt += build_document_prompt_addendum(metadata["document_context"])
+    trusted_sources = tuple(metadata["trusted_sources"])
+    if trusted_sources or agent.tool_mode == "web_grounding":
+        prompt += build_sourcing_addendum(trusted_sources, tool_mode=agent.tool_mode)
+    return prompt
+
+
+def _time(agent, metadata: dict, repeat: int) -> tuple[float, float]:
+    direct = timeit.timeit(lambda: _direct(agent, metadata), number=repeat)
+    memoized = timeit.timeit(lambda: agent._build_prompt(metadata), number=repeat)
+    return direct / repeat * 1e6, memoized / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2_000, help="prompt builds per agent")
+    args = parser.parse_args()
+
+    metadata = _metadata()
+    clear_prompt_memos()
+
+    print(f"Prompt assembly — {args.repeat} builds per agent")
+    print(f"   {'agent':<18} {'direct µs':>10} {'memoized µs':>12} {'speedup':>8}")
+    for agent_cls in AGENTS:
+        agent = agent_cls()
+        key = agent.name
+        assert agent._build_prompt(metadata) == _direct(agent, metadata), key
+        direct_us, memoized_us = _time(agent, metadata, args.repeat)
+        print(
+            f"   {key:<18} {direct_us:>10.1f} {memoized_us:>12.1f} {direct_us / memoized_us:>7.1f}x"
+        )
+
+    print()
+    for name, stats in prompt_memo_stats().items():
+        print(f"   memo {name:<15}: {stats.hits} hits, {stats.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare parallel (router + Crisis Radar) and combined triage against live Bedrock.
+
+Runs every message from the routing scenarios (tests/scenarios/*.json) and
+the crisis screen eval set through both triage modes and reports latency,
+routing accuracy, crisis accuracy and Bedrock requests per turn. Local fast
+paths are disabled so both modes are measured on the model alone.
+
+Usage: python scripts/benchmark_triage.py [--repeat N]
+Requires AWS credentials with Bedrock access to Nova 2 Lite.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from src.agents.crisis import CrisisRadar, load_crisis_screen_eval
+from src.agents.router import RouterAgent
+from src.agents.triage import TriageAgent
+from src.orchestration.triage import CombinedTriage, ParallelTriage
+
+SCENARIOS_DIR = Path("tests/scenarios")
+
+
+def _load_cases() -> list[dict]:
+    cases = []
+    for path in sorted(SCENARIOS_DIR.glob("*.json")):
+        scenario = json.loads(path.read_text(encoding="utf-8"))
+        cases.append({"text": scenario["input"], "agent": scenario["expected_agent"]})
+    for case in load_crisis_screen_eval():
+        cases.append({"text": case["text"], "crisis": case["label"] == "crisis"})
+    return cases
+
+
+def _run(name: str, triage, cases: list[dict], repeat: int, requests_per_turn: int) -> None:
+    latencies: list[float] = []
+    route_hits = route_total = crisis_hits = crisis_total = failures = 0
+    for _ in range(repeat):
+        for case in cases:
+            started = time.monotonic()
+            result = triage.run(case["text"])
+            latencies.append((time.monotonic() - started) * 1000)
+            failures += int(result.route_fallback or result.crisis_failed)
+            if "agent" in case:
+                route_total += 1
+                route_hits += int(result.agent_key == case["agent"])
+            if "crisis" in case:
+                crisis_total += 1
+                crisis_hits += int(bool(result.crisis.get("is_crisis")) == case["crisis"])
+    triage.shutdown()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"\n{name}")
+    print(f"   turns            : {len(latencies)}")
+    print(f"   Bedrock requests : {requests_per_turn} per turn")
+    print(f"   latency p50 / p95: {statistics.median(latencies):.0f} / {p95:.0f} ms")
+    print(f"   routing accuracy : {route_hits}/{route_total}")
+    print(f"   crisis accuracy  : {crisis_hits}/{crisis_total}")
+    print(f"   fallbacks        : {failures}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the case set")
+    args = parser.parse_args()
+
+    cases = _load_cases()
+    print("=" * 50)
+    print(f"KODA — Triage benchmark ({len(cases)} messages x {args.repeat})")
+    print("=" * 50)
+
+    parallel = ParallelTriage(RouterAgent(use_local=False), CrisisRadar(mode="model_only"))
+    _run("parallel (RouterAgent + CrisisRadar)", parallel, cases, args.repeat, 2)
+    _run("combined (TriageAgent)", CombinedTriage(TriageAgent()), cases, args.repeat, 1)
+
+
+if __name__ == "__main__":
+    main()
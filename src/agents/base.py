@@ -5,22 +5,34 @@ Provides: system prompt enrichment, tool selection, anti-shame filtering,
 and graceful error handling (never shows stack traces to users).
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import structlog
-
-from src.core.client import NovaClient, NovaClientError
-from src.core.conversation import build_session_memory_addendum
+from config.settings import HISTORY_TOKEN_BUDGET, HISTORY_TOKEN_BUDGETS
+
+from src.core.client import (
+    PROMPT_CACHE_POINT,
+    NovaClient,
+    NovaClientError,
+    StreamInterrupted,
+    strip_hidden_markers,
+)
 from src.core.documents import build_document_prompt_addendum
+from src.core.prompt_assembly import (
+    PromptTemplate,
+    identity_addendum,
+    session_memory_addendum,
+    sourcing_addendum,
+)
 from src.core.provenance import (
     AgentReply,
     ResponseProvenance,
     SourceAttribution,
     build_default_provenance,
-    build_sourcing_addendum,
     merge_provenance,
 )
-from src.core.safety import apply_anti_shame_filter, build_identity_addendum
+from src.core.safety import apply_anti_shame_filter
+from src.core.timings import timed_stage
 
 logger = structlog.get_logger()
 
@@ -81,12 +93,16 @@ class BaseAgent:
         system_prompt: str,
         reasoning_effort: str | None = None,
         tool_mode: str | None = None,
+        history_token_budget: int = HISTORY_TOKEN_BUDGET,
     ):
         self.name = name
         self._base_prompt = system_prompt + LANGUAGE_INSTRUCTION
         self.reasoning_effort = reasoning_effort
         self.tool_mode = tool_mode
-        self.client = NovaClient()
+        # Estimated history tokens sent per turn (0: full stored history).
+        self.history_token_budget = HISTORY_TOKEN_BUDGETS.get(name, history_token_budget)
+        self.client = NovaClient(caller=name)
+        self._template = PromptTemplate.compile(self._base_prompt, self._language_addendum)
 
     def respond(self, messages: list[dict], metadata: dict | None = None) -> str:
         """
@@ -107,7 +123,8 @@ class BaseAgent:
         remains as a backwards-compatible string-only wrapper.
         """
         try:
-            prompt = self._build_prompt(metadata)
+            with timed_stage(metadata, "prompt_build"):
+                prompt = self._build_prompt(metadata)
 
             if self.tool_mode == "code_interpreter":
                 resp = self.client.with_code_interpreter(messages, prompt, self.reasoning_effort)
@@ -118,20 +135,44 @@ class BaseAgent:
                     messages, prompt, reasoning_effort=self.reasoning_effort
                 )
 
-            text = self.client.extract_text(resp)
-
-            if not text.strip():
-                logger.warning("empty_response", agent=self.name)
-                return self._fallback_reply(messages)
+            return self._reply_from_response(resp, messages, metadata)
 
-            web_sources: tuple[SourceAttribution, ...] = ()
-            if self.tool_mode == "web_grounding":
-                web_sources = self.client.extract_web_citations(resp)
+        except NovaClientError as e:
+            logger.error("agent_error", agent=self.name, error=str(e))
+            return self._fallback_reply(messages)
 
-            return AgentReply(
-                text=apply_anti_shame_filter(text),
-                provenance=self._resolve_provenance(metadata, web_sources),
+        except Exception as e:
+            logger.error(
+                "agent_unexpected_error", agent=self.name, error=str(e), type=type(e).__name__
             )
+            return self._fallback_reply(messages)
+
+    async def arespond(self, messages: list[dict], metadata: dict | None = None) -> str:
+        """Async variant of :meth:`respond`."""
+        return (await self.arespond_with_details(messages, metadata)).text
+
+    async def arespond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        """Async variant of :meth:`respond_with_details` with the same fallbacks."""
+        try:
+            with timed_stage(metadata, "prompt_build"):
+                prompt = self._build_prompt(metadata)
+
+            if self.tool_mode == "code_interpreter":
+                resp = await self.client.awith_code_interpreter(
+                    messages, prompt, self.reasoning_effort
+                )
+            elif self.tool_mode == "web_grounding":
+                resp = await self.client.awith_web_grounding(
+                    messages, prompt, self.reasoning_effort
+                )
+            else:
+                resp = await self.client.aconverse(
+                    messages, prompt, reasoning_effort=self.reasoning_effort
+                )
+
+            return self._reply_from_response(resp, messages, metadata)
 
         except NovaClientError as e:
             logger.error("agent_error", agent=self.name, error=str(e))
@@ -145,13 +186,15 @@ class BaseAgent:
 
     def respond_stream(
         self, messages: list[dict], metadata: dict | None = None
-    ) -> Generator[str, None, None]:
+    ) -> Generator[str | StreamInterrupted, None, None]:
         """
         Stream a response token-by-token via Nova 2 Lite.
 
         Yields text delta strings suitable for ``st.write_stream()``.
-        Falls back to a single-chunk yield of the non-streaming response on
-        any error so the caller always receives a complete answer.
+        Errors before the first chunk are retried by the client and end in
+        a single fallback chunk. If the stream breaks after text was shown,
+        the filtered partial answer is closed as usual and the client's
+        ``StreamInterrupted`` event is yielded last for the orchestrator.
 
         Note: tool_mode agents (code_interpreter, web_grounding) do not
         support streaming — they fall back to ``respond()`` automatically.
@@ -162,42 +205,65 @@ class BaseAgent:
             return
 
         try:
-            prompt = self._build_prompt(metadata)
+            with timed_stage(metadata, "prompt_build"):
+                prompt = self._build_prompt(metadata)
             # Never pass reasoning_effort to converse_stream: the model
             # emits a long thinking block before any text deltas, during
             # which the UI receives zero chunks and appears frozen.
             # Reasoning is retained for non-streaming respond_with_details().
-            stream_resp = self.client.converse_stream(
-                messages,
-                system_prompt=prompt,
+            collected: list[str] = []
+            interruption: StreamInterrupted | None = None
+            for chunk in self.client.stream_text(messages, system_prompt=prompt):
+                if isinstance(chunk, StreamInterrupted):
+                    interruption = chunk
+                    break
+                collected.append(chunk)
+                yield chunk
+
+            closing = self._finish_stream(collected, messages)
+            if closing is not None:
+                yield closing
+            if interruption is not None:
+                yield interruption
+
+        except NovaClientError as e:
+            logger.error("agent_stream_error", agent=self.name, error=str(e))
+            yield self._fallback_message(messages)
+
+        except Exception as e:
+            logger.error(
+                "agent_stream_unexpected_error",
+                agent=self.name,
+                error=str(e),
+                type=type(e).__name__,
             )
+            yield self._fallback_message(messages)
+
+    async def arespond_stream(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AsyncGenerator[str | StreamInterrupted, None]:
+        """Async variant of :meth:`respond_stream` with the same chunk protocol."""
+        if self.tool_mode in ("code_interpreter", "web_grounding"):
+            yield (await self.arespond_with_details(messages, metadata)).text
+            return
+
+        try:
+            with timed_stage(metadata, "prompt_build"):
+                prompt = self._build_prompt(metadata)
             collected: list[str] = []
-            for chunk in self.client.iter_stream_text(stream_resp):
+            interruption: StreamInterrupted | None = None
+            async for chunk in self.client.astream_text(messages, system_prompt=prompt):
+                if isinstance(chunk, StreamInterrupted):
+                    interruption = chunk
+                    break
                 collected.append(chunk)
                 yield chunk
 
-            full_text = "".join(collected)
-            # Safety-net: strip any [HIDDEN] markers that survived
-            # chunk-level filtering (e.g. split across two chunks).
-            from src.core.client import strip_hidden_markers
-
-            cleaned_text = strip_hidden_markers(full_text)
-            if cleaned_text != full_text:
-                full_text = cleaned_text
-
-            if not full_text.strip():
-                logger.warning("empty_stream_response", agent=self.name)
-                yield self._fallback_message(messages)
-                return
-
-            # Apply anti-shame filter to the final assembled text.
-            # If the filter changes the text, re-yield the corrected version
-            # as a single replacement chunk.
-            filtered = apply_anti_shame_filter(full_text)
-            if filtered != full_text or full_text != "".join(collected):
-                # Signal to the caller that the streamed text should be
-                # replaced (Streamlit will overwrite the container).
-                yield "\x00REPLACE\x00" + filtered
+            closing = self._finish_stream(collected, messages)
+            if closing is not None:
+                yield closing
+            if interruption is not None:
+                yield interruption
 
         except NovaClientError as e:
             logger.error("agent_stream_error", agent=self.name, error=str(e))
@@ -212,22 +278,90 @@ class BaseAgent:
             )
             yield self._fallback_message(messages)
 
+    def _reply_from_response(
+        self,
+        resp: dict,
+        messages: list[dict],
+        metadata: dict | None,
+    ) -> AgentReply:
+        """Turn a raw Converse response into a filtered, provenance-aware reply."""
+        text = self.client.extract_text(resp)
+
+        if not text.strip():
+            logger.warning("empty_response", agent=self.name)
+            return self._fallback_reply(messages)
+
+        web_sources: tuple[SourceAttribution, ...] = ()
+        if self.tool_mode == "web_grounding":
+            web_sources = self.client.extract_web_citations(resp)
+
+        return AgentReply(
+            text=apply_anti_shame_filter(text),
+            provenance=self._resolve_provenance(metadata, web_sources),
+        )
+
+    def _finish_stream(self, collected: list[str], messages: list[dict]) -> str | None:
+        """Return the closing chunk (fallback or replacement) for a finished stream."""
+        full_text = "".join(collected)
+        # Safety-net: strip any [HIDDEN] markers that survived
+        # chunk-level filtering (e.g. split across two chunks).
+        cleaned_text = strip_hidden_markers(full_text)
+        if cleaned_text != full_text:
+            full_text = cleaned_text
+
+        if not full_text.strip():
+            logger.warning("empty_stream_response", agent=self.name)
+            return self._fallback_message(messages)
+
+        # Apply anti-shame filter to the final assembled text.
+        # If the filter changes the text, re-yield the corrected version
+        # as a single replacement chunk.
+        filtered = apply_anti_shame_filter(full_text)
+        if filtered != full_text or full_text != "".join(collected):
+            # Signal to the caller that the streamed text should be
+            # replaced (Streamlit will overwrite the container).
+            return "\x00REPLACE\x00" + filtered
+        return None
+
     def _build_prompt(self, metadata: dict | None) -> str:
-        """Build the system prompt with optional metadata enrichment."""
-        prompt = self._base_prompt
-        prompt += build_ui_language_addendum(metadata)
-        if metadata and metadata.get("identity_context"):
-            prompt += build_identity_addendum(metadata["identity_context"])
-        if metadata and metadata.get("session_memory"):
-            prompt += build_session_memory_addendum(metadata["session_memory"])
-        if metadata and metadata.get("document_context"):
-            prompt += build_document_prompt_addendum(metadata["document_context"])
-        trusted_sources = ()
-        if metadata and metadata.get("trusted_sources"):
-            trusted_sources = tuple(metadata["trusted_sources"])
+        """Build the system prompt with optional metadata enrichment.
+
+        Sections that only vary by agent and UI language come first and end
+        in a cache point, so Bedrock can reuse them across turns and sessions.
+        """
+        return self._static_prompt(metadata) + PROMPT_CACHE_POINT + self._turn_prompt(metadata)
+
+    def _static_prompt(self, metadata: dict | None) -> str:
+        """Return the prompt prefix shared by every turn in the same UI language."""
+        return self._template.render((metadata or {}).get("ui_language"))
+
+    def _language_addendum(self, ui_language: str) -> str:
+        """Return the static section for one UI language; compiled once per agent."""
+        return build_ui_language_addendum({"ui_language": ui_language})
+
+    def _turn_prompt(self, metadata: dict | None) -> str:
+        """Return the per-session and per-turn context, most volatile last."""
+        if not metadata:
+            return self._sourcing_section(())
+        parts: list[str] = []
+        if metadata.get("identity_context"):
+            parts.append(identity_addendum(metadata["identity_context"]))
+        if metadata.get("session_memory"):
+            parts.append(
+                session_memory_addendum(
+                    metadata["session_memory"],
+                    version=metadata.get("session_memory_version"),
+                )
+            )
+        if metadata.get("document_context"):
+            parts.append(build_document_prompt_addendum(metadata["document_context"]))
+        parts.append(self._sourcing_section(tuple(metadata.get("trusted_sources") or ())))
+        return "".join(parts)
+
+    def _sourcing_section(self, trusted_sources: tuple) -> str:
         if trusted_sources or self.tool_mode == "web_grounding":
-            prompt += build_sourcing_addendum(trusted_sources, tool_mode=self.tool_mode)
-        return prompt
+            return sourcing_addendum(trusted_sources, tool_mode=self.tool_mode)
+        return ""
 
     def _fallback_reply(self, messages: list[dict]) -> AgentReply:
         """Return a friendly fallback with neutral provenance metadata."""
@@ -3,20 +3,43 @@ Crisis Radar — parallel safety monitor on every message.
 
 Detects financial emergencies, mental health crises, dropout risk,
 and acute danger using contextual reasoning (not just keywords).
+
+Scanning is tiered. A local lexical screen runs first: strong distress
+language is flagged at once, and — under the ``tiered`` policy — only a bare
+greeting or thanks, or a benign study-choice question without distress
+vocabulary, is cleared without a model call. Everything else goes to Nova.
+``CRISIS_SCREEN_EVAL_PATH`` holds the labeled set that measures the screen's
+recall. Model assessments are cached
+for a short TTL, for exact repeats of a message only.
 """
 
 from __future__ import annotations
 
+import json
 import re
-from typing import Protocol
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, Protocol
 
-from config.settings import REASONING_LOW
+import structlog
+from config.settings import (
+    CRISIS_CACHE_ENABLED,
+    CRISIS_CACHE_MAX_ENTRIES,
+    CRISIS_CACHE_TTL_SECONDS,
+    CRISIS_NEUTRAL_MAX_CHARS,
+    CRISIS_SCREEN_MODE,
+    REASONING_LOW,
+)
+from pydantic import BaseModel, ConfigDict
 
 from src.core.client import NovaClient
+from src.core.ttl_cache import CacheStats, TTLCache
 
-CRISIS_PROMPT = """You are a crisis detector for a student support system.
+logger = structlog.get_logger()
 
-Analyze the user's message for signs of:
+# Shared with the combined triage prompt (src/agents/triage.py).
+CRISIS_SIGNAL_GUIDE = """Analyze the user's message for signs of:
 1. FINANCIAL: Cannot pay rent or food, at risk of dropping out due to money.
 2. MENTAL: Hopelessness, self-harm indicators, extreme isolation, despair.
 3. DROPOUT: Wants to quit studies, sees no purpose in continuing.
@@ -27,7 +50,11 @@ IMPORTANT: Understand CONTEXT.
 - "I want to understand whether studying is right for me" → NOT a crisis (normal orientation).
 - "I am unsure whether university is worth it for me" → NOT a crisis (study-choice exploration).
 - "I can't do this anymore, I just want to disappear" → POTENTIAL crisis.
+"""
+
+CRISIS_PROMPT = f"""You are a crisis detector for a student support system.
 
+{CRISIS_SIGNAL_GUIDE}
 Respond ONLY in this format:
 CRISIS: YES or NO
 TYPE: FINANCIAL | MENTAL | DROPOUT | ACUTE | NONE
@@ -54,18 +81,166 @@ _BENIGN_STUDY_CHOICE_PATTERNS: tuple[re.Pattern[str], ...] = (
     re.compile(r"\bif i should study\b"),
 )
 
-_STRONG_CRISIS_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"\b(?:suizid|suicide|kill myself|bring myself|self-harm|selbstmord)\b"),
-    re.compile(r"\b(?:ich kann nicht mehr|i can't do this anymore|i cant do this anymore)\b"),
+# Strong patterns flag a crisis locally, each with the type it implies.
+_STRONG_CRISIS_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"\b(?:suizid|suicide|kill myself|bring myself|self-harm|selbstmord)\b"), "MENTAL"),
+    (
+        re.compile(
+            r"\b(?:end my life|take my (?:own )?life|no reason to live|mich umbringen|"
+            r"mir das leben nehmen|kein grund (?:mehr )?zu leben)\b"
+        ),
+        "MENTAL",
+    ),
+    (
+        re.compile(r"\b(?:ich kann nicht mehr|i can't do this anymore|i cant do this anymore)\b"),
+        "MENTAL",
+    ),
+    (
+        re.compile(
+            r"\b(?:(?:want|wanna) to disappear|(?:will|möchte|moechte) (?:einfach )?(?:nur )?"
+            r"verschwinden|nicht mehr leben|don't want to live|do not want to live)\b"
+        ),
+        "MENTAL",
+    ),
+    (
+        re.compile(r"\b(?:alles ist sinnlos|nothing matters|no point anymore|keinen sinn mehr)\b"),
+        "MENTAL",
+    ),
+    (
+        re.compile(
+            r"\b(?:kann.*(?:miete|essen) nicht bezahlen|can't pay (?:rent|food)|cannot pay (?:rent|food))\b"
+        ),
+        "FINANCIAL",
+    ),
+)
+
+# Distress vocabulary that is not decisive on its own. Any hit sends the
+# message to Nova; only messages with none of these can be cleared locally.
+_WATCH_PATTERNS: tuple[re.Pattern[str], ...] = (
+    # Mental strain and isolation
     re.compile(
-        r"\b(?:verschwinden|disappear|nicht mehr leben|don't want to live|do not want to live)\b"
+        r"\b(?:angst|ängste|aengste|panik\w*|panic\w*|anxi\w*|depress\w*|hoffnungslos\w*|"
+        r"hopeless\w*|verzweif\w*|desperate|despair|einsam\w*|lonely|alone|allein\w*|"
+        r"isoliert|isolated|leer|empty|erschöpft|erschoepft|exhausted|burnout|burn-out|"
+        r"überfordert|ueberfordert|overwhelm\w*|stress\w*|weine\w*|cry|crying|"
+        r"schlafe? (?:kaum|nicht)|can't sleep|cannot sleep|aufgeben|give up|giving up|"
+        r"schaffe? das nicht|can't cope|cannot cope|kaputt|sinnlos|pointless|worthless|"
+        r"wertlos|hasse mich|hate myself|ritzen|verletze? mich|hurt myself|sterben|"
+        r"want to die|wanna die|tot sein|be dead|lebensmüde|lebensmuede)\b"
     ),
-    re.compile(r"\b(?:alles ist sinnlos|nothing matters|no point anymore|keinen sinn mehr)\b"),
-    re.compile(r"\b(?:obdachlos|homeless|gewalt|violence)\b"),
+    # Paraphrased exit thoughts
     re.compile(
-        r"\b(?:kann.*(?:miete|essen) nicht bezahlen|can't pay (?:rent|food)|cannot pay (?:rent|food))\b"
+        r"\b(?:end (?:it|it all|things|everything)|ending (?:it|it all|things|everything)|"
+        r"reason to live|point (?:of|in) living|alive|(?:not|won't|will not) be (?:around|here)|"
+        r"bringe? mich um|will nicht mehr|mag nicht mehr|kann so nicht weiter|"
+        r"nicht mehr (?:leben|lebe|am leben|da sein)|am leben|sinn des lebens|"
+        r"abschiedsbrief|goodbye letter|lebewohl)\b"
     ),
+    # Death, finality and giving up on everything
+    re.compile(
+        r"\b(?:(?:if|when|after|before|once) i (?:die|am dead)|i (?:will |might )?die|"
+        r"tot bin|wenn ich tot|nach meinem tod|forever|für immer|fuer immer|"
+        r"(?:not|never|don't want to|do not want to) wake up|nicht mehr aufwachen|"
+        r"done with (?:everything|it all|life)|fertig mit allem|mit allem fertig|"
+        r"(?:halte|ertrage) (?:das|es) (?:leben |alles )?nicht mehr|leben nicht mehr aus|"
+        r"any point|no point|anymore|any more|nicht mehr|disappear\w*|verschwinden)\b"
+    ),
+    # Means
+    re.compile(
+        r"\b(?:tabletten|pillen|pills|tablets|überdosis|ueberdosis|overdose|rasierklinge\w*|"
+        r"razor\w*|strick|noose|rope|brücke|bruecke|bridge|jump off|runterspringen|"
+        r"springe? (?:von|vor)|waffe|gun)\b"
+    ),
+    re.compile(
+        r"\b(?:geht es mir|mir geht(?:'s| es)) (?:so |echt |total |richtig )?"
+        r"(?:schlecht|mies|dreckig)\b|\bi feel (?:so |really )?(?:bad|terrible|awful|lost)\b"
+    ),
+    re.compile(
+        r"\b(?:wenn ich (?:weg|nicht mehr da) wäre|wenn ich (?:weg|nicht mehr da) waere|"
+        r"if i (?:were|was) gone|if i wasn't here|nobody would (?:notice|care|miss)|"
+        r"niemand würde|niemand wuerde|keiner würde|keiner wuerde)\b"
+    ),
+    # Money emergencies
+    re.compile(
+        r"\b(?:schulden|debt\w*|pleite|broke|kein geld|no money|out of money|miete|rent|"
+        r"hunger|hungry|nichts (?:mehr )?zu essen|nothing to eat|räumung|raeumung|evict\w*|"
+        r"kündigung|kuendigung|gesperrt|mahnung\w*|inkasso)\b"
+    ),
+    # Dropout and exit thoughts
+    re.compile(
+        r"\b(?:abbrechen|abzubrechen|abbruch|studienabbruch|aufhören|aufzuhören|aufhoeren|"
+        r"aufzuhoeren|hinschmeißen|hinzuschmeißen|hinschmeissen|hinzuschmeissen|exmatrikul\w*|"
+        r"drop(?:ping|ped)? out|dropout|quit(?:s|ting)?)\b"
+    ),
+    # Acute danger
+    re.compile(
+        r"\b(?:bedroh\w*|threat\w*|schlägt mich|schlaegt mich|hits? me|abuse\w*|"
+        r"missbrauch\w*|unsafe|nicht sicher|rausgeworfen|rausgeschmissen|kicked out|"
+        r"polizei|police|notfall|emergency|wohnungslos|nowhere to (?:go|sleep)|"
+        r"geschlagen|schlägt|schlaegt|schlagen|verprügelt|verpruegelt|hit me|beat me|"
+        r"beats me|hurt me|hurts me|tut mir weh|verletzt mich|vergewaltig\w*|rape\w*|"
+        r"assault\w*|stalk\w*|belästig\w*|belaestig\w*|harass\w*|eingesperrt|locked in|"
+        r"obdachlos\w*|homeless\w*|gewalt\w*|violen\w*)\b"
+    ),
+)
+
+# The only messages the tiered screen may clear besides benign study-choice
+# questions: a bare greeting or thanks made of these words alone ("Hallo!",
+# "ok, danke"). Any other word, however harmless it looks, goes to Nova.
+_GREETING_WORD = (
+    r"(?:hi|hallo|hey|hello|moin|servus|guten (?:morgen|tag|abend)|good (?:morning|evening)|"
+    r"danke(?:schön|schoen| schön| schoen| dir)?|vielen dank|thanks|thank you|ok|okay|"
+    r"alles klar|super|cool|got it|bye|goodbye|tschüss|tschuess|koda)"
 )
+_GREETING_RE = re.compile(rf"^{_GREETING_WORD}(?:[\s,]+{_GREETING_WORD})*[\s.!]*$")
+
+_CRISIS_TYPE_RE = re.compile(r"TYPE:\s*([A-Z]+)")
+
+CrisisScreenMode = Literal["tiered", "strong_only", "model_only"]
+ScreenVerdict = Literal["crisis", "neutral", "ambiguous"]
+
+CRISIS_SCREEN_MODES: tuple[str, ...] = ("tiered", "strong_only", "model_only")
+CRISIS_SCREEN_EVAL_PATH = Path(__file__).resolve().parent / "crisis_screen_eval.jsonl"
+
+
+@dataclass(frozen=True)
+class CrisisScreen:
+    """Outcome of the local screen; ``ambiguous`` means "ask the model"."""
+
+    verdict: ScreenVerdict
+    reason: str
+    crisis_type: str | None = None
+    matched: tuple[str, ...] = ()
+
+
+class CrisisScreenStats(BaseModel):
+    """Process-lifetime counters for how scans were decided."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    total: int
+    local_crisis: int
+    local_neutral: int
+    model: int
+    model_rate: float
+    cache: CacheStats | None = None
+
+
+class CrisisScreenEval(BaseModel):
+    """Screen quality on a labeled set.
+
+    ``recall`` is the share of crisis cases that were *not* cleared locally,
+    i.e. that were flagged or escalated to the model. It must stay at 1.0.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    crisis_cases: int
+    neutral_cases: int
+    recall: float
+    missed: tuple[str, ...]
+    false_alarms: tuple[str, ...]
+    neutral_skip_rate: float
 
 
 class CrisisClient(Protocol):
@@ -80,48 +255,247 @@ class CrisisClient(Protocol):
         top_p: float = 1.0,
     ) -> dict: ...
 
+    async def aconverse(
+        self,
+        messages: list[dict],
+        system_prompt: str | None = None,
+        tool_config: dict | None = None,
+        reasoning_effort: str | None = None,
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        top_p: float = 1.0,
+    ) -> dict: ...
+
     def extract_text(self, response: dict) -> str: ...
 
 
 class CrisisRadar:
     """Scans every user message for crisis indicators."""
 
-    def __init__(self, client: CrisisClient | None = None):
-        self.client = client or NovaClient()
+    def __init__(
+        self,
+        client: CrisisClient | None = None,
+        *,
+        mode: str = CRISIS_SCREEN_MODE,
+        neutral_max_chars: int = CRISIS_NEUTRAL_MAX_CHARS,
+        use_cache: bool = CRISIS_CACHE_ENABLED,
+        cache: TTLCache[dict] | None = None,
+    ):
+        if mode not in CRISIS_SCREEN_MODES:
+            raise ValueError(f"Unknown crisis screen mode: {mode}")
+        self.client = client or NovaClient(caller="crisis", hedged=True)
+        self.mode = mode
+        self.neutral_max_chars = neutral_max_chars
+        self.cache: TTLCache[dict] | None = None
+        if use_cache:
+            self.cache = cache or TTLCache(
+                max_entries=CRISIS_CACHE_MAX_ENTRIES,
+                ttl_seconds=CRISIS_CACHE_TTL_SECONDS,
+            )
+        self._stats_lock = threading.Lock()
+        self._decisions = {"crisis": 0, "neutral": 0, "ambiguous": 0}
 
     def scan(self, message: str) -> dict:
         """Return crisis assessment with resources if needed."""
-        normalized = message.casefold()
-        if _looks_like_benign_study_choice(normalized) and not _contains_strong_crisis_signal(
-            normalized
-        ):
-            return _no_crisis("BENIGN_STUDY_CHOICE")
+        known = self.known_assessment(message)
+        if known is not None:
+            return known
 
-        messages = [{"role": "user", "content": [{"text": message}]}]
         response = self.client.converse(
-            messages=messages,
+            messages=[{"role": "user", "content": [{"text": message}]}],
             system_prompt=CRISIS_PROMPT,
             reasoning_effort=REASONING_LOW,
             max_tokens=100,
             temperature=0.0,
         )
-        text = self.client.extract_text(response).upper()
-        is_crisis = "CRISIS: YES" in text
-        crisis_type = _extract_crisis_type(text)
-
-        if (
-            is_crisis
-            and crisis_type == "DROPOUT"
-            and _looks_like_benign_study_choice(normalized)
-            and not _contains_strong_crisis_signal(normalized)
-        ):
-            return _no_crisis("DROPOUT_OVERRIDE")
+        return self._remember_assessment(message, self.client.extract_text(response))
 
-        return {
-            "is_crisis": is_crisis,
-            "assessment": text,
-            "resources": CRISIS_RESOURCES if is_crisis else None,
-        }
+    async def ascan(self, message: str) -> dict:
+        """Async variant of :meth:`scan`."""
+        known = self.known_assessment(message)
+        if known is not None:
+            return known
+
+        response = await self.client.aconverse(
+            messages=[{"role": "user", "content": [{"text": message}]}],
+            system_prompt=CRISIS_PROMPT,
+            reasoning_effort=REASONING_LOW,
+            max_tokens=100,
+            temperature=0.0,
+        )
+        return self._remember_assessment(message, self.client.extract_text(response))
+
+    def screening_stats(self) -> CrisisScreenStats:
+        """Return how many scans were decided locally vs. by the model."""
+
+        with self._stats_lock:
+            total = sum(self._decisions.values())
+            model = self._decisions["ambiguous"]
+            return CrisisScreenStats(
+                total=total,
+                local_crisis=self._decisions["crisis"],
+                local_neutral=self._decisions["neutral"],
+                model=model,
+                model_rate=round(model / total, 4) if total else 0.0,
+                cache=self.cache.stats() if self.cache is not None else None,
+            )
+
+    def known_assessment(self, message: str) -> dict | None:
+        """Return the local screen's verdict or a cached model assessment.
+
+        ``None`` means the model has to be asked about *message*.
+        """
+
+        screen = self.screen(message)
+        if screen.verdict != "ambiguous":
+            return crisis_screen_result(screen)
+        return self._cached_assessment(message)
+
+    def _cached_assessment(self, message: str) -> dict | None:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(message)
+        return dict(cached) if cached is not None else None
+
+    def _remember_assessment(self, message: str, model_text: str) -> dict:
+        result = assess_crisis_reply(message, model_text)
+        if self.cache is not None:
+            self.cache.put(message, dict(result))
+        return result
+
+    def screen(self, message: str) -> CrisisScreen:
+        """Run the local screen for *message* and count its verdict."""
+
+        screen = screen_crisis_message(
+            message, mode=self.mode, neutral_max_chars=self.neutral_max_chars
+        )
+        with self._stats_lock:
+            self._decisions[screen.verdict] += 1
+        logger.debug(
+            "crisis_screen",
+            verdict=screen.verdict,
+            reason=screen.reason,
+            crisis_type=screen.crisis_type,
+            matched=screen.matched,
+        )
+        return screen
+
+
+def screen_crisis_message(
+    message: str,
+    *,
+    mode: str = CRISIS_SCREEN_MODE,
+    neutral_max_chars: int = CRISIS_NEUTRAL_MAX_CHARS,
+) -> CrisisScreen:
+    """Decide locally whether *message* is a crisis, clearly neutral, or needs Nova.
+
+    The policy, in order:
+
+    1. ``model_only`` sends every message to the model.
+    2. A strong distress pattern is a crisis.
+    3. ``strong_only`` sends everything else to the model.
+    4. Any watch-list term goes to the model.
+    5. A benign study-choice question is neutral.
+    6. A message longer than *neutral_max_chars* goes to the model.
+    7. A message made only of greeting and thanks words is neutral.
+    8. Everything else goes to the model: a missing distress term is not
+       evidence that a message is harmless.
+    """
+
+    if mode == "model_only":
+        return CrisisScreen(verdict="ambiguous", reason="POLICY_MODEL_ONLY")
+    normalized = message.casefold()
+    strong = _strong_crisis_match(normalized)
+    watched = tuple(
+        found.group(0)
+        for pattern in _WATCH_PATTERNS
+        if (found := pattern.search(normalized)) is not None
+    )
+
+    if strong is not None:
+        matched, crisis_type = strong
+        return CrisisScreen(
+            verdict="crisis",
+            reason="LOCAL_STRONG_SIGNAL",
+            crisis_type=crisis_type,
+            matched=(matched,),
+        )
+    if mode == "strong_only":
+        return CrisisScreen(verdict="ambiguous", reason="POLICY_STRONG_ONLY")
+    if watched:
+        return CrisisScreen(verdict="ambiguous", reason="WATCH_TERM", matched=watched)
+    if _looks_like_benign_study_choice(normalized):
+        return CrisisScreen(verdict="neutral", reason="BENIGN_STUDY_CHOICE")
+    if len(message) > neutral_max_chars:
+        return CrisisScreen(verdict="ambiguous", reason="TOO_LONG_TO_CLEAR")
+    if _GREETING_RE.match(normalized.strip()):
+        return CrisisScreen(verdict="neutral", reason="GREETING")
+    return CrisisScreen(verdict="ambiguous", reason="NO_NEUTRAL_RULE")
+
+
+def load_crisis_screen_eval(path: Path = CRISIS_SCREEN_EVAL_PATH) -> list[dict]:
+    """Load the labeled screen evaluation set (JSON lines: id, text, label)."""
+
+    with path.open(encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def evaluate_crisis_screen(
+    cases: list[dict],
+    *,
+    mode: str = CRISIS_SCREEN_MODE,
+    neutral_max_chars: int = CRISIS_NEUTRAL_MAX_CHARS,
+) -> CrisisScreenEval:
+    """Measure the local screen against labeled cases (``label``: crisis | neutral)."""
+
+    missed: list[str] = []
+    false_alarms: list[str] = []
+    crisis_cases = 0
+    neutral_cases = 0
+    neutral_skipped = 0
+    for case in cases:
+        screen = screen_crisis_message(case["text"], mode=mode, neutral_max_chars=neutral_max_chars)
+        if case["label"] == "crisis":
+            crisis_cases += 1
+            if screen.verdict == "neutral":
+                missed.append(case["id"])
+        else:
+            neutral_cases += 1
+            if screen.verdict == "crisis":
+                false_alarms.append(case["id"])
+            elif screen.verdict == "neutral":
+                neutral_skipped += 1
+
+    return CrisisScreenEval(
+        crisis_cases=crisis_cases,
+        neutral_cases=neutral_cases,
+        recall=round(1 - len(missed) / crisis_cases, 4) if crisis_cases else 1.0,
+        missed=tuple(missed),
+        false_alarms=tuple(false_alarms),
+        neutral_skip_rate=round(neutral_skipped / neutral_cases, 4) if neutral_cases else 0.0,
+    )
+
+
+def assess_crisis_reply(message: str, model_text: str) -> dict:
+    """Turn a model reply containing ``CRISIS:``/``TYPE:`` lines into an assessment."""
+    normalized = message.casefold()
+    text = model_text.upper()
+    is_crisis = "CRISIS: YES" in text
+    crisis_type = _extract_crisis_type(text)
+
+    if (
+        is_crisis
+        and crisis_type == "DROPOUT"
+        and _looks_like_benign_study_choice(normalized)
+        and not _contains_strong_crisis_signal(normalized)
+    ):
+        return _no_crisis("DROPOUT_OVERRIDE")
+
+    return {
+        "is_crisis": is_crisis,
+        "assessment": text,
+        "resources": CRISIS_RESOURCES if is_crisis else None,
+    }
 
 
 def _looks_like_benign_study_choice(text: str) -> bool:
@@ -129,16 +503,59 @@ def _looks_like_benign_study_choice(text: str) -> bool:
 
 
 def _contains_strong_crisis_signal(text: str) -> bool:
-    return any(pattern.search(text) for pattern in _STRONG_CRISIS_PATTERNS)
+    return _strong_crisis_match(text) is not None
+
+
+def _strong_crisis_match(text: str) -> tuple[str, str] | None:
+    for pattern, crisis_type in _STRONG_CRISIS_PATTERNS:
+        found = pattern.search(text)
+        if found is not None:
+            return found.group(0), crisis_type
+    return None
 
 
 def _extract_crisis_type(assessment: str) -> str | None:
-    match = re.search(r"TYPE:\s*([A-Z]+)", assessment)
+    match = _CRISIS_TYPE_RE.search(assessment)
     if not match:
         return None
     return match.group(1)
 
 
+def crisis_scan_unavailable(message: str, reason: str) -> dict:
+    """
+    Return the explicit failure assessment used when the model scan did not finish.
+
+    Strong local distress signals still surface the crisis resources; everything
+    else is reported as not assessed instead of silently claiming "no crisis".
+    """
+    if _contains_strong_crisis_signal(message.casefold()):
+        return {
+            "is_crisis": True,
+            "assessment": f"CRISIS: YES\nTYPE: UNKNOWN\nREASON: {reason}",
+            "resources": CRISIS_RESOURCES,
+            "scan_failed": True,
+        }
+    return {
+        "is_crisis": False,
+        "assessment": f"CRISIS: UNKNOWN\nTYPE: NONE\nREASON: {reason}",
+        "resources": None,
+        "scan_failed": True,
+    }
+
+
+def crisis_screen_result(screen: CrisisScreen) -> dict:
+    """Return the assessment for a locally decided (non-ambiguous) screen."""
+    if screen.verdict == "crisis":
+        return {
+            "is_crisis": True,
+            "assessment": (
+                f"CRISIS: YES\nTYPE: {screen.crisis_type or 'UNKNOWN'}\nREASON: {screen.reason}"
+            ),
+            "resources": CRISIS_RESOURCES,
+        }
+    return _no_crisis(screen.reason)
+
+
 def _no_crisis(reason: str) -> dict:
     return {
         "is_crisis": False,
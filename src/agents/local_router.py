@@ -0,0 +1,143 @@
+"""
+Local fast-path routing — keyword classification without a Bedrock call.
+
+Many messages name their topic outright (BAföG, Stipendium, ECTS, NC,
+Impostor). A weighted lexicon per agent scores those messages locally; the
+router only asks Nova when the local confidence is below its threshold.
+
+The lexicon is deliberately small and auditable. COMPASS has no entries:
+general or ambiguous messages always fall through to the model, which is
+also where the "choose COMPASS when unsure" rule lives.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+# Strong terms name a topic on their own; weak terms only tip a decision.
+STRONG = 3.0
+WEAK = 1.0
+
+# Added to the denominator so a single weak hit never clears the threshold.
+_SMOOTHING = 1.0
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+# Patterns match the normalized text (casefolded, umlauts folded to ae/oe/ue/ss).
+_LEXICON: dict[str, tuple[tuple[str, float], ...]] = {
+    "FINANCING": (
+        (r"baf(?:oe|o)g", STRONG),
+        (r"stipendi\w*", STRONG),
+        (r"scholarships?", STRONG),
+        (r"studienkredit\w*", STRONG),
+        (r"student loans?", STRONG),
+        (r"semesterbeitr\w*", STRONG),
+        (r"wohngeld", STRONG),
+        (r"nebenjob\w*|werkstudent\w*|minijob\w*|student jobs?", STRONG),
+        (r"miete|rent", WEAK),
+        (r"geld|money", WEAK),
+        (r"kosten|costs?", WEAK),
+        (r"finanzier\w*|financ\w*", WEAK),
+        (r"kredit\w*|loans?", WEAK),
+        (r"afford\w*", WEAK),
+    ),
+    "STUDY_CHOICE": (
+        (r"numerus clausus|nc", STRONG),
+        (r"studiengae?ng\w*", STRONG),
+        (r"degree programs?|degree programmes?", STRONG),
+        (r"studienfach\w*|studienwahl", STRONG),
+        (r"hochschulstart|uni-assist", STRONG),
+        (r"fachhochschul\w*|universities of applied sciences?", STRONG),
+        (r"welche uni\w*|which universit\w*", STRONG),
+        (r"zulassung\w*|admissions?", STRONG),
+        (r"bewerbung\w*|bewerben", WEAK),
+        (r"apply|application", WEAK),
+        (r"major", WEAK),
+    ),
+    "ACADEMIC_BASICS": (
+        (r"ects", STRONG),
+        (r"credit points?|leistungspunkt\w*", STRONG),
+        (r"immatrikul\w*|exmatrikul\w*|rueckmeldung", STRONG),
+        (r"modulhandbuch\w*|pruefungsordnung\w*|studienordnung\w*", STRONG),
+        (r"semesterwochenstunden|sws", STRONG),
+        (r"apprenticeships?|vocational", STRONG),
+        (r"ausbildung", WEAK),
+        (r"hidden curriculum", STRONG),
+        (r"sprechstunde\w*|office hours", STRONG),
+        (r"vorlesung\w*|lectures?", WEAK),
+        (r"seminar\w*|tutorium\w*", WEAK),
+        (r"hausarbeit\w*|klausur\w*|exams?", WEAK),
+    ),
+    "ROLE_MODELS": (
+        (r"impostor\w*|imposter\w*|hochstapler\w*", STRONG),
+        (r"role models?|vorbild\w*", STRONG),
+        (r"selbstzweifel\w*|self-doubt", STRONG),
+        (r"dazugehoer\w*|belong", 2.0),
+        (r"klueger|smarter than", 2.0),
+        (r"nicht gut genug|not good enough|not smart enough", 2.0),
+        (r"motivation|motiviert", WEAK),
+    ),
+}
+
+_COMPILED_LEXICON: dict[str, tuple[tuple[re.Pattern[str], float], ...]] = {
+    agent: tuple((re.compile(rf"\b(?:{pattern})\b"), weight) for pattern, weight in terms)
+    for agent, terms in _LEXICON.items()
+}
+
+
+@dataclass(frozen=True)
+class LocalRoute:
+    """Best local guess for one message, with its supporting matches."""
+
+    agent: str | None
+    confidence: float
+    matched: tuple[str, ...] = ()
+
+
+def normalize_for_routing(text: str) -> str:
+    """Casefold and fold German umlauts so ``BAföG`` and ``Bafoeg`` match alike."""
+
+    return text.casefold().translate(_UMLAUTS)
+
+
+class LocalRouteClassifier:
+    """Score a message against the per-agent lexicon."""
+
+    def __init__(
+        self,
+        lexicon: dict[str, tuple[tuple[re.Pattern[str], float], ...]] | None = None,
+    ) -> None:
+        self._lexicon = lexicon or _COMPILED_LEXICON
+
+    def classify(self, message: str) -> LocalRoute:
+        """Return the best agent and a confidence in ``[0, 1)``.
+
+        Confidence is the winner's margin over the runner-up, scaled by the
+        winner's total score: one strong term yields 0.75, two competing
+        strong terms yield 0.
+        """
+
+        normalized = normalize_for_routing(message)
+        scores: dict[str, float] = {}
+        matched: dict[str, list[str]] = {}
+        for agent, terms in self._lexicon.items():
+            for pattern, weight in terms:
+                found = pattern.search(normalized)
+                if found is None:
+                    continue
+                scores[agent] = scores.get(agent, 0.0) + weight
+                matched.setdefault(agent, []).append(found.group(0))
+
+        if not scores:
+            return LocalRoute(agent=None, confidence=0.0)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_agent, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        confidence = (best - runner_up) / (best + _SMOOTHING)
+        return LocalRoute(
+            agent=best_agent,
+            confidence=round(confidence, 3),
+            matched=tuple(matched[best_agent]),
+        )
@@ -83,20 +83,20 @@ class OnboardingAgent(BaseAgent):
     def __init__(self) -> None:
         super().__init__(name="onboarding", system_prompt=SYSTEM_PROMPT)
 
-    def _build_prompt(self, metadata: dict[str, Any] | None) -> str:
-        prompt = super()._build_prompt(metadata)
+    def _language_addendum(self, ui_language: str) -> str:
+        return super()._language_addendum(ui_language) + (
+            "\n--- Onboarding language preference ---\n"
+            f"- App UI language for this turn: {ui_language}\n"
+            "- Match this language from the very first line.\n"
+            "- For [START_ONBOARDING], do not use a bilingual greeting when this language is known.\n"
+            "---\n"
+        )
+
+    def _turn_prompt(self, metadata: dict[str, Any] | None) -> str:
+        prompt = super()._turn_prompt(metadata)
         if not metadata:
             return prompt
 
-        ui_language = str(metadata.get("ui_language", "")).strip().lower()
-        if ui_language in {"de", "en"}:
-            prompt += (
-                "\n--- Onboarding language preference ---\n"
-                f"- App UI language for this turn: {ui_language}\n"
-                "- Match this language from the very first line.\n"
-                "- For [START_ONBOARDING], do not use a bilingual greeting when this language is known.\n"
-            )
-
         user_turn_count = int(metadata.get("onboarding_user_turn_count", 0) or 0)
         if user_turn_count:
             prompt += (
@@ -111,15 +111,19 @@ class OnboardingAgent(BaseAgent):
                 "- Output the warm summary plus the required PROFILE and PROMPTS blocks now.\n"
             )
 
-        prompt += "---\n"
+        if user_turn_count or metadata.get("force_onboarding_completion"):
+            prompt += "---\n"
         return prompt
 
     def start_greeting(self) -> Generator[str, None, None]:
         """Trigger the initial onboarding greeting without user input."""
 
-        yield from self.respond_stream(
+        for chunk in self.respond_stream(
             [{"role": "user", "content": [{"text": START_TRIGGER}]}],
-        )
+        ):
+            # A StreamInterrupted event just ends the greeting early.
+            if isinstance(chunk, str):
+                yield chunk
 
     @staticmethod
     def extract_profile(text: str) -> str | None:
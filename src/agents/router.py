@@ -2,21 +2,45 @@
 Router Agent — fast message classification using Extended Thinking LOW.
 
 Determines which specialist agent should handle the incoming message.
+Messages with unambiguous topic keywords are routed locally
+(``LocalRouteClassifier``); only the rest cost a Bedrock round-trip. Model
+decisions are cached per normalized message, so repeated messages such as
+quick actions are classified once per TTL.
 """
 
-from src.core.client import NovaClient
+import threading
+from collections.abc import Iterable
 
-ROUTER_PROMPT = """You are the router for KODA, an AI companion for first-generation academics.
+import structlog
+from config.settings import (
+    ROUTER_CACHE_ENABLED,
+    ROUTER_CACHE_MAX_ENTRIES,
+    ROUTER_CACHE_TTL_SECONDS,
+    ROUTER_LOCAL_CONFIDENCE,
+    ROUTER_LOCAL_ENABLED,
+)
+from pydantic import BaseModel, ConfigDict
 
-Analyze the user's message and determine which agent should handle it.
+from src.agents.local_router import LocalRoute, LocalRouteClassifier, normalize_for_routing
+from src.core.client import NovaClient
+from src.core.ttl_cache import CacheStats, TTLCache
 
-Available agents:
+logger = structlog.get_logger()
+
+# Shared with the combined triage prompt (src/agents/triage.py).
+ROUTER_AGENT_GUIDE = """Available agents:
 - COMPASS: First contact, emotional support, general orientation. Use when someone is new, unsure, overwhelmed, or does not fit other categories.
 - FINANCING: Student aid (BAföG), scholarships, cost of living, student jobs, loans. Any financial question about studying.
 - STUDY_CHOICE: Degree programs, universities, numerus clausus, applications, types of higher education institutions.
 - ACADEMIC_BASICS: Fundamental questions about how university works, academic terminology, study vs. apprenticeship decisions.
 - ROLE_MODELS: Motivation, role models, career visions, impostor feelings, self-doubt, encouragement.
+"""
+
+ROUTER_PROMPT = f"""You are the router for KODA, an AI companion for first-generation academics.
 
+Analyze the user's message and determine which agent should handle it.
+
+{ROUTER_AGENT_GUIDE}
 IMPORTANT: Always respond in English regardless of the language of the user's message.
 Respond ONLY with the agent name:
 AGENT: [NAME]
@@ -38,29 +62,183 @@ _GERMAN_FALLBACK: dict[str, str] = {
 }
 
 
+class RoutingStats(BaseModel):
+    """Process-lifetime counters for local vs. model routing decisions."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    total: int
+    local: int
+    model: int
+    local_hit_rate: float
+    local_by_agent: dict[str, int]
+    cache: CacheStats | None = None
+
+
+def routing_cache_key(user_message: str) -> str:
+    """Normalize *message* so case, umlaut spelling and spacing share a cache entry."""
+
+    return " ".join(normalize_for_routing(user_message).split())
+
+
 class RouterAgent:
     """Routes each message to the appropriate specialist agent."""
 
     VALID_AGENTS = ("FINANCING", "STUDY_CHOICE", "ACADEMIC_BASICS", "ROLE_MODELS", "COMPASS")
 
-    def __init__(self):
-        self.client = NovaClient()
+    def __init__(
+        self,
+        *,
+        use_local: bool = ROUTER_LOCAL_ENABLED,
+        classifier: LocalRouteClassifier | None = None,
+        confidence_threshold: float = ROUTER_LOCAL_CONFIDENCE,
+        use_cache: bool = ROUTER_CACHE_ENABLED,
+        cache: TTLCache[str] | None = None,
+    ):
+        self.client = NovaClient(caller="router", hedged=True)
+        self.classifier = (classifier or LocalRouteClassifier()) if use_local else None
+        self.confidence_threshold = confidence_threshold
+        self.cache: TTLCache[str] | None = None
+        if use_cache:
+            self.cache = cache or TTLCache(
+                max_entries=ROUTER_CACHE_MAX_ENTRIES,
+                ttl_seconds=ROUTER_CACHE_TTL_SECONDS,
+            )
+        self._stats_lock = threading.Lock()
+        self._model_routes = 0
+        self._local_routes: dict[str, int] = {}
 
     def route(self, user_message: str) -> str:
         """Return the agent name that should handle this message."""
-        messages = [{"role": "user", "content": [{"text": user_message}]}]
+        local_agent = self.route_locally(user_message)
+        if local_agent is not None:
+            return local_agent
+        cached = self._cached_route(user_message)
+        if cached is not None:
+            return cached
+        self.record_model_route()
+        return self._route_with_model(user_message)
+
+    async def aroute(self, user_message: str) -> str:
+        """Async variant of :meth:`route`."""
+        local_agent = self.route_locally(user_message)
+        if local_agent is not None:
+            return local_agent
+        cached = self._cached_route(user_message)
+        if cached is not None:
+            return cached
+
+        self.record_model_route()
+        response = await self.client.aconverse(
+            messages=self._build_messages(user_message),
+            system_prompt=ROUTER_PROMPT,
+            max_tokens=50,
+            temperature=0.0,
+        )
+        return self._remember_route(user_message, self.client.extract_text(response))
+
+    def prime_cache(self, messages: Iterable[str]) -> int:
+        """Route *messages* the local lexicon cannot decide and cache the results.
+
+        Returns the number of model calls made. Messages already cached are
+        skipped, so calling this again within the TTL is free.
+        """
+
+        if self.cache is None:
+            return 0
+        primed = 0
+        for message in messages:
+            if self._local_decision(message) is not None:
+                continue
+            if routing_cache_key(message) in self.cache:
+                continue
+            self._route_with_model(message)
+            primed += 1
+        logger.info("router_cache_primed", model_calls=primed)
+        return primed
+
+    def routing_stats(self) -> RoutingStats:
+        """Return how many turns were routed locally vs. by the model."""
+
+        with self._stats_lock:
+            local = sum(self._local_routes.values())
+            total = local + self._model_routes
+            return RoutingStats(
+                total=total,
+                local=local,
+                model=self._model_routes,
+                local_hit_rate=round(local / total, 4) if total else 0.0,
+                local_by_agent=dict(self._local_routes),
+                cache=self.cache.stats() if self.cache is not None else None,
+            )
+
+    def record_model_route(self) -> None:
+        """Count one turn whose route is decided by a model request.
+
+        :meth:`route` and :meth:`aroute` call this themselves; a caller that
+        only uses :meth:`route_locally` and asks another model calls it when
+        that request is sent.
+        """
+
+        with self._stats_lock:
+            self._model_routes += 1
+
+    def route_locally(self, user_message: str) -> str | None:
+        """Return a local decision above the threshold, or ``None`` to ask the model.
+
+        A miss is not counted here; cache hits and the caller's model request
+        decide whether the turn counts as a model route.
+        """
+
+        decision = self._local_decision(user_message)
+        if decision is None or decision.agent is None:
+            return None
+
+        with self._stats_lock:
+            self._local_routes[decision.agent] = self._local_routes.get(decision.agent, 0) + 1
+        logger.debug(
+            "route_local",
+            agent=decision.agent,
+            confidence=decision.confidence,
+            matched=decision.matched,
+        )
+        return decision.agent
+
+    def _local_decision(self, user_message: str) -> LocalRoute | None:
+        decision = self.classifier.classify(user_message) if self.classifier else None
+        if decision is None or decision.confidence < self.confidence_threshold:
+            return None
+        return decision
 
+    def _cached_route(self, user_message: str) -> str | None:
+        if self.cache is None:
+            return None
+        return self.cache.get(routing_cache_key(user_message))
+
+    def _route_with_model(self, user_message: str) -> str:
         response = self.client.converse(
-            messages=messages,
+            messages=self._build_messages(user_message),
             system_prompt=ROUTER_PROMPT,
             max_tokens=50,
             temperature=0.0,
         )
+        return self._remember_route(user_message, self.client.extract_text(response))
+
+    def _remember_route(self, user_message: str, model_text: str) -> str:
+        agent = self._parse_agent(model_text)
+        if self.cache is not None:
+            self.cache.put(routing_cache_key(user_message), agent)
+        return agent
+
+    @staticmethod
+    def _build_messages(user_message: str) -> list[dict]:
+        return [{"role": "user", "content": [{"text": user_message}]}]
 
-        text = self.client.extract_text(response)
+    @classmethod
+    def _parse_agent(cls, text: str) -> str:
         upper = text.upper()
 
-        for name in self.VALID_AGENTS:
+        for name in cls.VALID_AGENTS:
             if name in upper:
                 return name
 
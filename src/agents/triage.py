@@ -0,0 +1,103 @@
+"""
+Combined triage agent — routing and crisis assessment in one Nova call.
+
+The separate path asks the router and the Crisis Radar independently, which
+costs two Bedrock requests per turn. This agent asks both questions in one
+structured request built from the same guidance (``ROUTER_AGENT_GUIDE`` and
+``CRISIS_SIGNAL_GUIDE``) and parses the reply with the same rules as the
+two specialists, so either path can back the triage stage.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from config.settings import REASONING_LOW
+
+from src.agents.crisis import CRISIS_SIGNAL_GUIDE, CrisisClient, assess_crisis_reply
+from src.agents.router import ROUTER_AGENT_GUIDE, RouterAgent
+from src.core.client import NovaClient
+
+TRIAGE_PROMPT = f"""You are the triage step for KODA, an AI companion for first-generation academics.
+For the user's message, answer two independent questions.
+
+QUESTION 1 — Which agent should handle the message?
+{ROUTER_AGENT_GUIDE}
+If the message is ambiguous, choose COMPASS.
+
+QUESTION 2 — Is the user in crisis?
+{CRISIS_SIGNAL_GUIDE}
+A block starting with "ROUTING CONTEXT" is not part of the user's message. Use it
+for QUESTION 1 only; answer QUESTION 2 from the user's message alone.
+
+IMPORTANT: Always respond in English regardless of the language of the user's message.
+Respond ONLY in this format:
+AGENT: [NAME]
+CRISIS: YES or NO
+TYPE: FINANCIAL | MENTAL | DROPOUT | ACUTE | NONE
+"""
+
+_AGENT_LINE_RE = re.compile(r"AGENT:\s*([A-Z_]+)")
+
+
+@dataclass(frozen=True)
+class TriageDecision:
+    """Parsed reply of one combined triage call."""
+
+    agent_key: str
+    crisis: dict[str, Any]
+
+
+class TriageAgent:
+    """Classify agent and crisis state for a message with a single request."""
+
+    def __init__(self, client: CrisisClient | None = None):
+        self.client = client or NovaClient(caller="triage", hedged=True)
+
+    def classify(self, message: str, *, route_message: str | None = None) -> TriageDecision:
+        """Return routing and crisis assessment for *message*.
+
+        *route_message* (the message plus attached document names) informs
+        routing only; the crisis assessment sees the user's message alone.
+        """
+        response = self.client.converse(
+            messages=_build_messages(message, route_message),
+            system_prompt=TRIAGE_PROMPT,
+            reasoning_effort=REASONING_LOW,
+            max_tokens=150,
+            temperature=0.0,
+        )
+        return parse_triage_reply(message, self.client.extract_text(response))
+
+    async def aclassify(self, message: str, *, route_message: str | None = None) -> TriageDecision:
+        """Async variant of :meth:`classify`."""
+        response = await self.client.aconverse(
+            messages=_build_messages(message, route_message),
+            system_prompt=TRIAGE_PROMPT,
+            reasoning_effort=REASONING_LOW,
+            max_tokens=150,
+            temperature=0.0,
+        )
+        return parse_triage_reply(message, self.client.extract_text(response))
+
+
+def _build_messages(message: str, route_message: str | None) -> list[dict]:
+    content: list[dict] = [{"text": message}]
+    if route_message and route_message != message:
+        content.append({"text": f"ROUTING CONTEXT:\n{route_message}"})
+    return [{"role": "user", "content": content}]
+
+
+def parse_triage_reply(message: str, text: str) -> TriageDecision:
+    """Parse ``AGENT``/``CRISIS``/``TYPE`` lines like the separate agents do."""
+
+    agent_line = _AGENT_LINE_RE.search(text.upper())
+    # Only the AGENT line is matched against agent names, so a crisis TYPE such
+    # as FINANCIAL cannot leak into routing.
+    route_text = agent_line.group(0) if agent_line else text.upper().split("CRISIS:")[0]
+    return TriageDecision(
+        agent_key=RouterAgent._parse_agent(route_text),
+        crisis=assess_crisis_reply(message, text),
+    )
@@ -5,17 +5,25 @@ Flow: User message → Router (triage) + Crisis Radar (parallel) → Domain Agen
 Sessions are ephemeral. No persistent user data.
 """
 
+import asyncio
 import base64
+import hmac
 from contextlib import asynccontextmanager
 
-from config.settings import CORS_ALLOWED_ORIGINS, validate_cors_origins
-from fastapi import FastAPI, HTTPException
+from config.settings import (
+    CORS_ALLOWED_ORIGINS,
+    METRICS_API_TOKEN,
+    WARM_UP_ON_STARTUP,
+    validate_cors_origins,
+)
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from src.core.documents import DocumentUploadInput, DocumentValidationError
 from src.core.provenance import ResponseProvenance
 from src.core.session_bundle import SessionBundle
+from src.core.timings import TurnTimings
 from src.orchestration import OnboardingTurnResult, build_default_chat_service
 
 # ── App setup ──────────────────────────────────────
@@ -27,13 +35,17 @@ async def lifespan(app: FastAPI):
     Startup / shutdown lifecycle handler.
 
     Validates critical configuration at process start so misconfiguration
-    fails loudly before accepting any traffic.
+    fails loudly before accepting any traffic, then warms the chat service.
     """
     # Raises ValueError immediately if CORS origins are empty or contain '*'.
     # This prevents a silent wildcard policy from reaching production.
     validate_cors_origins(CORS_ALLOWED_ORIGINS)
+    if WARM_UP_ON_STARTUP:
+        # Build agents and clients now so the first request skips that work.
+        await asyncio.to_thread(chat_service.warm_up)
     yield
-    # (shutdown logic here if needed)
+    # Let queued sidebar summaries finish before the process exits.
+    chat_service.shutdown()
 
 
 app = FastAPI(
@@ -85,6 +97,7 @@ class ChatResponse(BaseModel):
     crisis_detected: bool
     crisis_resources: dict | None = None
     provenance: ResponseProvenance
+    timings: TurnTimings | None = None
 
 
 class SessionImportResponse(BaseModel):
@@ -113,7 +126,7 @@ class OnboardingSkipResponse(BaseModel):
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """Main chat endpoint."""
-    result = chat_service.respond(
+    result = await chat_service.arespond(
         request.message,
         session_id=request.session_id,
         ui_language=request.language,
@@ -125,6 +138,7 @@ async def chat(request: ChatRequest):
         crisis_detected=result.crisis,
         crisis_resources=result.crisis_resources,
         provenance=result.provenance,
+        timings=result.timings,
     )
 
 
@@ -141,7 +155,7 @@ async def chat_with_documents(request: DocumentChatRequest):
             )
             for document in request.documents
         ]
-        result = chat_service.respond_with_documents(
+        result = await chat_service.arespond_with_documents(
             request.message,
             document_inputs,
             session_id=request.session_id,
@@ -159,22 +173,14 @@ async def chat_with_documents(request: DocumentChatRequest):
         crisis_detected=result.crisis,
         crisis_resources=result.crisis_resources,
         provenance=result.provenance,
-    )
-
-    return ChatResponse(
-        session_id=result.session_id,
-        response=result.response,
-        agent_used=result.agent,
-        crisis_detected=result.crisis,
-        crisis_resources=result.crisis_resources,
-        provenance=result.provenance,
+        timings=result.timings,
     )
 
 
 @app.post("/api/onboarding/start", response_model=OnboardingTurnResult)
 async def start_onboarding(request: OnboardingRequest):
     """Start the guided onboarding flow for a session."""
-    return chat_service.start_onboarding(
+    return await chat_service.astart_onboarding(
         session_id=request.session_id,
         ui_language=request.language,
     )
@@ -183,7 +189,7 @@ async def start_onboarding(request: OnboardingRequest):
 @app.post("/api/onboarding/continue", response_model=OnboardingTurnResult)
 async def continue_onboarding(request: OnboardingContinueRequest):
     """Continue the guided onboarding flow with one user answer."""
-    return chat_service.continue_onboarding(
+    return await chat_service.acontinue_onboarding(
         request.message,
         session_id=request.session_id,
         ui_language=request.language,
@@ -213,7 +219,7 @@ async def end_session(session_id: str):
 @app.get("/api/session/{session_id}/export", response_model=SessionBundle)
 async def export_session(session_id: str):
     """Export a user-owned session bundle for later continuation."""
-    bundle = chat_service.export_session_bundle(session_id)
+    bundle = await chat_service.aexport_session_bundle(session_id)
     if bundle is None:
         raise HTTPException(status_code=404, detail="Session not found.")
     return bundle
@@ -237,3 +243,19 @@ async def import_session(bundle: SessionBundle):
 @app.get("/api/health")
 async def health():
     return {"status": "ok", "agents": list(chat_service.agent_keys)}
+
+
+@app.get("/api/metrics")
+async def metrics(authorization: str | None = Header(default=None)):
+    """Process-local operational metrics (no user data), behind ``METRICS_API_TOKEN``."""
+    if not METRICS_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {METRICS_API_TOKEN}"
+    if authorization is None or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # The quota snapshot may wait on a file lock shared with other workers.
+    return await asyncio.to_thread(chat_service.metrics)
@@ -2,15 +2,38 @@
 Amazon Bedrock client wrapper for Nova 2 Lite.
 
 Every agent calls this module — never boto3 directly.
-Includes retry logic with exponential backoff for transient errors.
+Transient errors are retried with full-jitter backoff under a process-wide
+retry budget (see ``src.core.retry``); ``map_bedrock_error`` translates
+everything else into the ``NovaClientError`` hierarchy. When RPM/TPM quotas
+are configured, every request first waits for capacity in the shared
+``src.core.quota`` scheduler. Clients built with ``hedged=True`` (short,
+idempotent classification calls) may send one duplicate of a slow request
+when ``BEDROCK_HEDGING_ENABLED`` is set (see ``src.core.hedging``).
+With ``BEDROCK_ENDPOINTS`` set, requests go through an ``EndpointRouter``
+that spreads them over several models and regions and fails over between
+them (see ``src.core.endpoints``).
+The ``a*`` methods are awaitable twins of the blocking API: boto3 calls run
+in worker threads and backoff uses ``asyncio.sleep``, so the event loop
+never blocks on Bedrock.
+
+System prompts may contain ``PROMPT_CACHE_POINT`` markers; ``_build`` turns
+them into Converse ``cachePoint`` blocks and adds one after the stable
+history prefix. Token usage, including cache reads and writes, is recorded
+per call and labeled with the client's ``caller`` (see ``src.core.usage``).
 
 Reference: Nova 2 Developer Guide — "Core inference" and "Troubleshooting" chapters.
 """
 
+import asyncio
+import contextvars
+import json
 import re
+import threading
 import time
-from collections.abc import Generator
-from typing import Any
+from collections.abc import AsyncGenerator, Generator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Literal
 from urllib.parse import urlparse
 
 import boto3
@@ -19,22 +42,63 @@ import structlog
 from botocore.config import Config
 from config.settings import (
     AWS_REGION,
+    BEDROCK_ENDPOINTS,
+    BEDROCK_HEDGE_POOL_SIZE,
+    BEDROCK_HEDGING_ENABLED,
+    BEDROCK_MAX_POOL_CONNECTIONS,
     BEDROCK_READ_TIMEOUT,
     DEFAULT_MAX_TOKENS,
     DEFAULT_TEMPERATURE,
     DEFAULT_TOP_P,
     NOVA_MODEL_ID,
+    PROMPT_CACHE_ENABLED,
 )
+from pydantic import BaseModel, ConfigDict
 
+from src.core.endpoints import EndpointRouter, build_endpoint_router
+from src.core.hedging import hedge_policy
 from src.core.provenance import SourceAttribution, build_web_source
+from src.core.quota import QuotaGrant, estimate_request_tokens, quota_scheduler
+from src.core.retry import MAX_RETRIES, backoff_delay, retry_tracker
+from src.core.tokens import estimate_tokens
+from src.core.usage import UNLABELED_CALLER, process_usage, record_usage, usage_token_total
 
 logger = structlog.get_logger()
 
-# Retry configuration
-MAX_RETRIES = 3
-RETRY_BASE_DELAY = 1.0  # seconds
+# Transient failures worth retrying; everything else fails immediately.
+_RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "ServiceUnavailableException",
+        "ModelNotReadyException",
+        "InternalServerException",
+        "ModelStreamErrorException",
+    }
+)
+_CONNECTION_ERRORS = (
+    botocore.exceptions.ConnectionClosedError,
+    botocore.exceptions.EndpointConnectionError,
+    ConnectionResetError,
+)
 
 _HIDDEN_RE = re.compile(r"\[HIDDEN\]")
+HedgeRole = Literal["primary", "hedge"]
+_STREAM_END = object()
+
+# Hedged classification calls run their primary request and their duplicates
+# in separate pools, so a primary never queues behind hedges. The hedge delay
+# starts when the primary starts running; time spent queued never fires a hedge.
+# Both pools share the runtime client's connections, so neither outgrows them.
+_HEDGE_POOL_SIZES: dict[HedgeRole, int] = {
+    "primary": BEDROCK_MAX_POOL_CONNECTIONS,
+    "hedge": min(BEDROCK_HEDGE_POOL_SIZE, BEDROCK_MAX_POOL_CONNECTIONS),
+}
+_hedge_executors: dict[HedgeRole, ThreadPoolExecutor] = {}
+_hedge_executor_lock = threading.Lock()
+
+# Separates the cacheable prefix of a system prompt from per-turn context.
+PROMPT_CACHE_POINT = "\x00CACHE_POINT\x00"
+_CACHE_POINT_BLOCK = {"cachePoint": {"type": "default"}}
 
 
 def strip_hidden_markers(text: str) -> str:
@@ -60,16 +124,236 @@ class NovaTimeoutError(NovaClientError):
     """Raised when Bedrock does not respond within the timeout."""
 
 
+class NovaUnavailableError(NovaClientError):
+    """Raised when Bedrock stays unavailable or unreachable after all retries."""
+
+
+@dataclass(frozen=True)
+class StreamInterrupted:
+    """Yielded by :meth:`NovaClient.stream_text` when a stream fails after visible text.
+
+    Failures before the first text delta are retried instead; once text has
+    been shown, the caller decides how to finish the answer.
+    """
+
+    error: NovaClientError
+    chunks_delivered: int
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether *error* is transient: throttling, unavailability or a dropped connection."""
+
+    if isinstance(error, botocore.exceptions.ClientError):
+        return _error_code(error) in _RETRYABLE_ERROR_CODES
+    return isinstance(error, _CONNECTION_ERRORS)
+
+
+def map_bedrock_error(error: Exception) -> NovaClientError:
+    """Log *error* and return the matching ``NovaClientError`` to raise from it."""
+
+    if isinstance(error, NovaClientError):
+        return error
+
+    if isinstance(error, botocore.exceptions.ClientError):
+        error_code = _error_code(error)
+
+        if error_code == "ThrottlingException":
+            logger.error("bedrock_throttled_giving_up", error=str(error))
+            return NovaThrottlingError("Bedrock rate limit exceeded after all retries.")
+
+        if error_code in _RETRYABLE_ERROR_CODES:
+            logger.error("bedrock_unavailable", code=error_code, error=str(error))
+            return NovaUnavailableError(f"Bedrock is temporarily unavailable ({error_code}).")
+
+        if error_code == "AccessDeniedException":
+            logger.error("bedrock_access_denied", error=str(error))
+            return NovaAccessDeniedError(
+                "Permission denied. Check IAM policy for bedrock:Converse and bedrock:InvokeTool."
+            )
+
+        if error_code == "ValidationException":
+            logger.error("bedrock_validation_error", error=str(error))
+            return NovaClientError(f"Invalid request: {error}")
+
+        # Unknown client error — don't retry
+        logger.error("bedrock_client_error", code=error_code, error=str(error))
+        return NovaClientError(f"Bedrock error ({error_code}): {error}")
+
+    if isinstance(error, botocore.exceptions.ReadTimeoutError):
+        logger.error("bedrock_timeout", timeout=BEDROCK_READ_TIMEOUT)
+        return NovaTimeoutError("Bedrock did not respond in time. Please try again.")
+
+    if isinstance(error, _CONNECTION_ERRORS):
+        logger.error("bedrock_connection_error", error=str(error), type=type(error).__name__)
+        return NovaUnavailableError("Could not reach Bedrock. Please try again.")
+
+    logger.error("bedrock_unexpected_error", error=str(error), type=type(error).__name__)
+    return NovaClientError(f"Unexpected error: {error}")
+
+
+# ── Shared runtime clients ─────────────────────────
+# boto3 low-level clients are thread-safe, so every NovaClient in the process
+# shares one bedrock-runtime client per region: one credential resolution,
+# one endpoint setup and one connection pool sized for our concurrency.
+
+_runtime_clients: dict[str, Any] = {}
+_runtime_clients_lock = threading.Lock()
+
+
+def get_bedrock_runtime_client(region: str = AWS_REGION) -> Any:
+    """Return the process-wide bedrock-runtime client for *region*."""
+
+    with _runtime_clients_lock:
+        client = _runtime_clients.get(region)
+        if client is None:
+            client = boto3.client(
+                "bedrock-runtime",
+                region_name=region,
+                config=Config(
+                    read_timeout=BEDROCK_READ_TIMEOUT,
+                    max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+                    # NovaClient retries under its own budget; botocore must not multiply them.
+                    retries={"mode": "standard", "max_attempts": 1},
+                ),
+            )
+            _runtime_clients[region] = client
+            logger.info(
+                "bedrock_client_created",
+                region=region,
+                max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+            )
+        return client
+
+
+# ── Endpoint failover ──────────────────────────
+
+_endpoint_router: EndpointRouter | None = None
+_endpoint_router_configured = False
+_endpoint_router_lock = threading.Lock()
+
+
+def endpoint_router() -> EndpointRouter | None:
+    """Return the process-wide endpoint router, or ``None`` without ``BEDROCK_ENDPOINTS``."""
+
+    global _endpoint_router, _endpoint_router_configured
+    with _endpoint_router_lock:
+        if not _endpoint_router_configured:
+            _endpoint_router = build_endpoint_router(
+                BEDROCK_ENDPOINTS,
+                default_region=AWS_REGION,
+                client_factory=get_bedrock_runtime_client,
+                is_failure=is_retryable_error,
+            )
+            _endpoint_router_configured = True
+        return _endpoint_router
+
+
+def configure_endpoint_router(router: EndpointRouter | None) -> None:
+    """Replace the process-wide endpoint router (tests, fake endpoints)."""
+
+    global _endpoint_router, _endpoint_router_configured
+    with _endpoint_router_lock:
+        _endpoint_router = router
+        _endpoint_router_configured = True
+
+
+def reset_endpoint_router() -> None:
+    """Rebuild the endpoint router from settings on next use (tests)."""
+
+    global _endpoint_router, _endpoint_router_configured
+    with _endpoint_router_lock:
+        _endpoint_router = None
+        _endpoint_router_configured = False
+
+
+def _get_hedge_executor(role: HedgeRole) -> ThreadPoolExecutor:
+    with _hedge_executor_lock:
+        executor = _hedge_executors.get(role)
+        if executor is None:
+            executor = _hedge_executors[role] = ThreadPoolExecutor(
+                max_workers=_HEDGE_POOL_SIZES[role], thread_name_prefix=f"bedrock-{role}"
+            )
+        return executor
+
+
+def reset_bedrock_runtime_clients() -> None:
+    """Drop cached runtime clients (tests, credential rotation)."""
+
+    with _runtime_clients_lock:
+        _runtime_clients.clear()
+
+
+# ── Token usage ────────────────────────────────
+
+
+class PromptCacheStats(BaseModel):
+    """Process-lifetime Bedrock token usage, split by prompt-cache outcome."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    requests: int
+    input_tokens: int
+    output_tokens: int
+    cache_read_input_tokens: int
+    cache_write_input_tokens: int
+    cache_read_ratio: float
+
+
+def prompt_cache_stats() -> PromptCacheStats:
+    """Return process token usage split by prompt-cache outcome."""
+
+    totals = process_usage().total
+    prompt_tokens = (
+        totals.input_tokens + totals.cache_read_input_tokens + totals.cache_write_input_tokens
+    )
+    return PromptCacheStats(
+        requests=totals.requests,
+        input_tokens=totals.input_tokens,
+        output_tokens=totals.output_tokens,
+        cache_read_input_tokens=totals.cache_read_input_tokens,
+        cache_write_input_tokens=totals.cache_write_input_tokens,
+        cache_read_ratio=(
+            round(totals.cache_read_input_tokens / prompt_tokens, 4) if prompt_tokens else 0.0
+        ),
+    )
+
+
 class NovaClient:
     """Unified wrapper around the Bedrock Converse API for Nova 2 Lite."""
 
-    def __init__(self, model_id: str = NOVA_MODEL_ID, region: str = AWS_REGION):
-        self._client = boto3.client(
-            "bedrock-runtime",
-            region_name=region,
-            config=Config(read_timeout=BEDROCK_READ_TIMEOUT),
-        )
+    def __init__(
+        self,
+        model_id: str = NOVA_MODEL_ID,
+        region: str = AWS_REGION,
+        *,
+        caller: str = UNLABELED_CALLER,
+        hedged: bool = False,
+    ):
         self.model_id = model_id
+        self.region = region
+        # Labels this client's token usage (router, crisis, agent name, ...).
+        self.caller = caller
+        # Only set for idempotent classification calls; see src.core.hedging.
+        self.hedged = hedged
+        self._runtime_client: Any | None = None
+
+    @property
+    def _client(self) -> Any:
+        # Resolved on first use so constructing agents never touches boto3.
+        # The endpoint router, when configured, overrides model_id and region.
+        if self._runtime_client is None:
+            router = endpoint_router()
+            self._runtime_client = (
+                router if router is not None else get_bedrock_runtime_client(self.region)
+            )
+        return self._runtime_client
+
+    def warm_up(self) -> None:
+        """Bind the shared runtime client now instead of on the first call."""
+
+        client = self._client
+        if isinstance(client, EndpointRouter):
+            client.warm_up()
 
     # ── Public API ─────────────────────────────────
 
@@ -104,7 +388,55 @@ class NovaClient:
         max_tokens=DEFAULT_MAX_TOKENS,
         temperature=DEFAULT_TEMPERATURE,
     ):
-        """Streaming variant — returns an event iterator."""
+        """Streaming variant — returns an event iterator.
+
+        Only opening the stream is retried; prefer :meth:`stream_text`, which
+        also retries failures that happen before the first text delta.
+        """
+        kwargs = self._build(
+            messages,
+            system_prompt,
+            tool_config,
+            reasoning_effort,
+            max_tokens,
+            temperature,
+        )
+        return self._call_with_retry(kwargs, stream=True)
+
+    def invoke_model(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Send an InvokeModel request (embeddings) and return the decoded JSON body.
+
+        Goes through the same quota scheduler, retry budget, usage metering
+        and endpoint failover as :meth:`converse`. Bedrock reports only the
+        input token count, in a response header.
+        """
+        kwargs = {
+            "modelId": self.model_id,
+            "body": json.dumps(body),
+            "contentType": "application/json",
+            "accept": "application/json",
+        }
+        result = self._call_with_retry(kwargs, invoke=True)
+        output: dict[str, Any] = result["output"]
+        return output
+
+    def stream_text(
+        self,
+        messages: list[dict],
+        system_prompt: str | None = None,
+        tool_config: dict | None = None,
+        reasoning_effort: str | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> Generator[str | StreamInterrupted, None, None]:
+        """
+        Stream visible text deltas, retrying transparently until the first one.
+
+        Errors before any text was yielded are retried like :meth:`converse`
+        and raise the mapped ``NovaClientError`` once retries run out. A
+        failure after text was yielded ends the stream with one
+        :class:`StreamInterrupted` event instead of raising.
+        """
         kwargs = self._build(
             messages,
             system_prompt,
@@ -113,24 +445,50 @@ class NovaClient:
             max_tokens,
             temperature,
         )
-        return self._client.converse_stream(**kwargs)
+        retry_tracker.record_call(self.caller)
+
+        for attempt in range(MAX_RETRIES + 1):
+            grant = self._acquire_quota(kwargs)
+            delivered = 0
+            try:
+                response = self._client.converse_stream(**kwargs)
+                for chunk in self.iter_stream_text(response, caller=self.caller, grant=grant):
+                    delivered += 1
+                    yield chunk
+            except Exception as e:
+                if delivered:
+                    yield self._stream_interrupted(e, delivered)
+                    return
+                _refund_quota(grant, kwargs)
+                delay = self._retry_delay_or_raise(e, attempt)
+            else:
+                if attempt:
+                    retry_tracker.record_recovered(self.caller)
+                return
+            time.sleep(delay)
+
+        raise NovaClientError("All retries exhausted.")
 
     @staticmethod
-    def iter_stream_text(stream_response) -> Generator[str, None, None]:
+    def iter_stream_text(
+        stream_response, *, caller: str = UNLABELED_CALLER, grant: QuotaGrant | None = None
+    ) -> Generator[str, None, None]:
         """
         Yield text delta chunks from a converse_stream() response.
 
         Skips reasoning/thinking blocks — only yields the visible assistant text.
         Strips leaked ``[HIDDEN]`` markers from each chunk.
-        Suitable for passing directly to ``st.write_stream()``.
+        Suitable for passing directly to ``st.write_stream()``. The quota
+        *grant* of the request is settled from the final ``metadata`` event.
         """
         stream = stream_response.get("stream", stream_response)
         for event in stream:
-            delta = event.get("contentBlockDelta", {}).get("delta", {})
-            if "text" in delta:
-                cleaned = strip_hidden_markers(delta["text"])
-                if cleaned:
-                    yield cleaned
+            usage = _record_stream_usage(event, caller)
+            if usage is not None:
+                _settle_quota(grant, usage)
+            cleaned = _event_text(event)
+            if cleaned:
+                yield cleaned
 
     def with_code_interpreter(self, messages, system_prompt=None, reasoning_effort=None):
         """Converse using the built-in Code Interpreter system tool."""
@@ -142,6 +500,127 @@ class NovaClient:
         cfg = {"tools": [{"systemTool": {"name": "nova_grounding"}}]}
         return self.converse(messages, system_prompt, cfg, reasoning_effort, temperature=0.3)
 
+    # ── Async API ──────────────────────────────────
+
+    async def aconverse(
+        self,
+        messages: list[dict],
+        system_prompt: str | None = None,
+        tool_config: dict | None = None,
+        reasoning_effort: str | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        temperature: float = DEFAULT_TEMPERATURE,
+        top_p: float = DEFAULT_TOP_P,
+    ) -> dict:
+        """Awaitable variant of :meth:`converse` with non-blocking backoff."""
+        kwargs = self._build(
+            messages,
+            system_prompt,
+            tool_config,
+            reasoning_effort,
+            max_tokens,
+            temperature,
+            top_p,
+        )
+        return await self._acall_with_retry(kwargs)
+
+    async def aconverse_stream(
+        self,
+        messages,
+        system_prompt=None,
+        tool_config=None,
+        reasoning_effort=None,
+        max_tokens=DEFAULT_MAX_TOKENS,
+        temperature=DEFAULT_TEMPERATURE,
+    ):
+        """Awaitable variant of :meth:`converse_stream`; consume with ``aiter_stream_text``."""
+        kwargs = self._build(
+            messages,
+            system_prompt,
+            tool_config,
+            reasoning_effort,
+            max_tokens,
+            temperature,
+        )
+        return await self._acall_with_retry(kwargs, stream=True)
+
+    async def astream_text(
+        self,
+        messages: list[dict],
+        system_prompt: str | None = None,
+        tool_config: dict | None = None,
+        reasoning_effort: str | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> AsyncGenerator[str | StreamInterrupted, None]:
+        """Async twin of :meth:`stream_text` with non-blocking reads and backoff."""
+        kwargs = self._build(
+            messages,
+            system_prompt,
+            tool_config,
+            reasoning_effort,
+            max_tokens,
+            temperature,
+        )
+        retry_tracker.record_call(self.caller)
+
+        for attempt in range(MAX_RETRIES + 1):
+            grant = await self._aacquire_quota(kwargs)
+            delivered = 0
+            try:
+                response = await asyncio.to_thread(lambda: self._client.converse_stream(**kwargs))
+                async for chunk in self.aiter_stream_text(
+                    response, caller=self.caller, grant=grant
+                ):
+                    delivered += 1
+                    yield chunk
+            except Exception as e:
+                if delivered:
+                    yield self._stream_interrupted(e, delivered)
+                    return
+                await _arefund_quota(grant, kwargs)
+                delay = self._retry_delay_or_raise(e, attempt)
+            else:
+                if attempt:
+                    retry_tracker.record_recovered(self.caller)
+                return
+            await asyncio.sleep(delay)
+
+        raise NovaClientError("All retries exhausted.")
+
+    @staticmethod
+    async def aiter_stream_text(
+        stream_response, *, caller: str = UNLABELED_CALLER, grant: QuotaGrant | None = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Async twin of :meth:`iter_stream_text`.
+
+        Each blocking read from the Bedrock event stream happens in a worker
+        thread so other requests keep running while this one waits for tokens.
+        """
+        stream = stream_response.get("stream", stream_response)
+        iterator = iter(stream)
+        while True:
+            event = await asyncio.to_thread(next, iterator, _STREAM_END)
+            if not isinstance(event, dict):
+                return
+            usage = _record_stream_usage(event, caller)
+            if usage is not None:
+                await _asettle_quota(grant, usage)
+            cleaned = _event_text(event)
+            if cleaned:
+                yield cleaned
+
+    async def awith_code_interpreter(self, messages, system_prompt=None, reasoning_effort=None):
+        """Async variant of :meth:`with_code_interpreter`."""
+        cfg = {"tools": [{"systemTool": {"name": "nova_code_interpreter"}}]}
+        return await self.aconverse(messages, system_prompt, cfg, reasoning_effort, temperature=0.0)
+
+    async def awith_web_grounding(self, messages, system_prompt=None, reasoning_effort=None):
+        """Async variant of :meth:`with_web_grounding`."""
+        cfg = {"tools": [{"systemTool": {"name": "nova_grounding"}}]}
+        return await self.aconverse(messages, system_prompt, cfg, reasoning_effort, temperature=0.3)
+
     # ── Response helpers ───────────────────────────
 
     @staticmethod
@@ -195,58 +674,270 @@ class NovaClient:
 
     # ── Internal ───────────────────────────────────
 
-    def _call_with_retry(self, kwargs: dict) -> dict[str, Any]:
-        """Execute a Bedrock call with exponential backoff retry."""
-        last_exception = None
+    def _call_with_retry(
+        self, kwargs: dict, *, stream: bool = False, invoke: bool = False
+    ) -> dict[str, Any]:
+        """Execute a Bedrock call, retrying transient errors with jittered backoff."""
+        retry_tracker.record_call(self.caller)
+        if invoke:
+            call = self._invoke_model
+        elif stream:
+            call = self._client.converse_stream
+        elif self._hedging_active():
+            call = self._hedged_converse
+        else:
+            call = self._client.converse
 
         for attempt in range(MAX_RETRIES + 1):
+            grant = self._acquire_quota(kwargs)
             try:
-                result: dict[str, Any] = self._client.converse(**kwargs)
+                result: dict[str, Any] = call(**kwargs)
+            except Exception as e:
+                _refund_quota(grant, kwargs)
+                delay = self._retry_delay_or_raise(e, attempt)
+            else:
+                self._record_success(result, attempt)
+                _settle_quota(grant, result.get("usage") or {})
                 return result
+            time.sleep(delay)
 
-            except botocore.exceptions.ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "")
-
-                if error_code == "ThrottlingException":
-                    last_exception = e
-                    if attempt < MAX_RETRIES:
-                        delay = RETRY_BASE_DELAY * (2**attempt)
-                        logger.warning(
-                            "bedrock_throttled",
-                            attempt=attempt + 1,
-                            max_retries=MAX_RETRIES,
-                            delay=delay,
-                        )
-                        time.sleep(delay)
-                        continue
-                    raise NovaThrottlingError(
-                        "Bedrock rate limit exceeded after all retries."
-                    ) from e
-
-                if error_code == "AccessDeniedException":
-                    logger.error("bedrock_access_denied", error=str(e))
-                    raise NovaAccessDeniedError(
-                        "Permission denied. Check IAM policy for bedrock:Converse and bedrock:InvokeTool."
-                    ) from e
-
-                if error_code == "ValidationException":
-                    logger.error("bedrock_validation_error", error=str(e))
-                    raise NovaClientError(f"Invalid request: {e}") from e
-
-                # Unknown client error — don't retry
-                logger.error("bedrock_client_error", code=error_code, error=str(e))
-                raise NovaClientError(f"Bedrock error ({error_code}): {e}") from e
-
-            except botocore.exceptions.ReadTimeoutError as e:
-                logger.error("bedrock_timeout", timeout=BEDROCK_READ_TIMEOUT)
-                raise NovaTimeoutError("Bedrock did not respond in time. Please try again.") from e
+        # Should not reach here, but safety net
+        raise NovaClientError("All retries exhausted.")
+
+    async def _acall_with_retry(self, kwargs: dict, *, stream: bool = False) -> dict[str, Any]:
+        """Async twin of :meth:`_call_with_retry` that never blocks the event loop."""
+        retry_tracker.record_call(self.caller)
+        call = self._client.converse_stream if stream else self._client.converse
+        hedging = not stream and self._hedging_active()
 
+        for attempt in range(MAX_RETRIES + 1):
+            grant = await self._aacquire_quota(kwargs)
+            try:
+                if hedging:
+                    result: dict[str, Any] = await self._ahedged_converse(kwargs)
+                else:
+                    result = await asyncio.to_thread(lambda: call(**kwargs))
             except Exception as e:
-                logger.error("bedrock_unexpected_error", error=str(e), type=type(e).__name__)
-                raise NovaClientError(f"Unexpected error: {e}") from e
+                await _arefund_quota(grant, kwargs)
+                delay = self._retry_delay_or_raise(e, attempt)
+            else:
+                self._record_success(result, attempt)
+                await _asettle_quota(grant, result.get("usage") or {})
+                return result
+            await asyncio.sleep(delay)
 
-        # Should not reach here, but safety net
-        raise NovaClientError("All retries exhausted.") from last_exception
+        raise NovaClientError("All retries exhausted.")
+
+    def _invoke_model(self, **kwargs: Any) -> dict[str, Any]:
+        # Shaped like a Converse result, so the retry loop meters and settles it.
+        response = self._client.invoke_model(**kwargs)
+        headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+        input_tokens = int(headers.get("x-amzn-bedrock-input-token-count", 0))
+        return {
+            "output": json.loads(response["body"].read()),
+            "usage": {"inputTokens": input_tokens, "outputTokens": 0},
+        }
+
+    def _acquire_quota(self, kwargs: dict) -> QuotaGrant | None:
+        """Wait for RPM/TPM capacity when a quota scheduler is configured."""
+        scheduler = quota_scheduler()
+        if scheduler is None:
+            return None
+        return scheduler.acquire(self.caller, _estimate_tokens(kwargs))
+
+    async def _aacquire_quota(self, kwargs: dict) -> QuotaGrant | None:
+        scheduler = quota_scheduler()
+        if scheduler is None:
+            return None
+        return await scheduler.aacquire(self.caller, _estimate_tokens(kwargs))
+
+    def _record_success(self, result: dict[str, Any], attempt: int) -> None:
+        record_usage(result.get("usage") or {}, caller=self.caller, metrics=result.get("metrics"))
+        if attempt:
+            retry_tracker.record_recovered(self.caller)
+
+    # ── Hedging ────────────────────────────────────
+
+    def _hedging_active(self) -> bool:
+        return self.hedged and BEDROCK_HEDGING_ENABLED
+
+    def _timed_converse(self, kwargs: dict) -> dict[str, Any]:
+        started = time.perf_counter()
+        result: dict[str, Any] = self._client.converse(**kwargs)
+        hedge_policy.record_latency(self.caller, time.perf_counter() - started)
+        return result
+
+    def _may_hedge(self, kwargs: dict) -> tuple[bool, QuotaGrant | None]:
+        """Spend hedge budget and, with a quota scheduler, capacity that is free right now.
+
+        Returns whether to hedge and the quota grant the hedge must settle.
+        """
+        if not hedge_policy.allow_hedge(self.caller):
+            return False, None
+        grant = None
+        scheduler = quota_scheduler()
+        if scheduler is not None:
+            grant = scheduler.try_acquire(self.caller, estimate_request_tokens(kwargs))
+            if grant is None:
+                hedge_policy.record_quota_denied(self.caller)
+                return False, None
+        hedge_policy.record_hedged(self.caller)
+        logger.info("bedrock_hedge_sent", caller=self.caller)
+        return True, grant
+
+    async def _amay_hedge(self, kwargs: dict) -> tuple[bool, QuotaGrant | None]:
+        """Async twin of :meth:`_may_hedge`; the quota check never blocks the event loop."""
+        if not hedge_policy.allow_hedge(self.caller):
+            return False, None
+        grant = None
+        scheduler = quota_scheduler()
+        if scheduler is not None:
+            grant = await scheduler.atry_acquire(self.caller, estimate_request_tokens(kwargs))
+            if grant is None:
+                hedge_policy.record_quota_denied(self.caller)
+                return False, None
+        hedge_policy.record_hedged(self.caller)
+        logger.info("bedrock_hedge_sent", caller=self.caller)
+        return True, grant
+
+    def _run_hedge(self, kwargs: dict, grant: QuotaGrant | None) -> dict[str, Any]:
+        # The hedge holds its own grant; settle it from the hedge's own outcome,
+        # whether it wins or loses.
+        try:
+            result = self._timed_converse(kwargs)
+        except Exception:
+            _refund_quota(grant, kwargs)
+            raise
+        _settle_quota(grant, result.get("usage") or {})
+        return result
+
+    def _hedged_converse(self, **kwargs: Any) -> dict[str, Any]:
+        """Run one Converse call and duplicate it once it outlasts the hedge delay."""
+        hedge_policy.record_call(self.caller)
+        delay = hedge_policy.hedge_delay(self.caller)
+        if delay is None:
+            return self._timed_converse(kwargs)
+
+        context = contextvars.copy_context()
+        started = threading.Event()
+
+        def run_primary() -> dict[str, Any]:
+            started.set()
+            return self._timed_converse(kwargs)
+
+        primary = _get_hedge_executor("primary").submit(context.copy().run, run_primary)
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        hedging, grant = self._may_hedge(kwargs)
+        if not hedging:
+            return primary.result()
+
+        hedge = _get_hedge_executor("hedge").submit(
+            context.copy().run, self._run_hedge, kwargs, grant
+        )
+        pending: set[Future[dict[str, Any]]] = {primary, hedge}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    for loser in pending:
+                        loser.add_done_callback(
+                            lambda f: context.copy().run(self._record_hedge_loser, f.exception(), f)
+                        )
+                    if future is hedge:
+                        hedge_policy.record_hedge_win(self.caller)
+                    return future.result()
+        assert error is not None
+        raise error
+
+    async def _ahedged_converse(self, kwargs: dict) -> dict[str, Any]:
+        """Async twin of :meth:`_hedged_converse`; waiting never blocks the event loop."""
+        hedge_policy.record_call(self.caller)
+        delay = hedge_policy.hedge_delay(self.caller)
+        if delay is None:
+            return await asyncio.to_thread(self._timed_converse, kwargs)
+
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def run_primary() -> dict[str, Any]:
+            loop.call_soon_threadsafe(started.set)
+            return self._timed_converse(kwargs)
+
+        primary = loop.run_in_executor(
+            _get_hedge_executor("primary"), contextvars.copy_context().run, run_primary
+        )
+        await started.wait()
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return await primary
+        hedging, grant = await self._amay_hedge(kwargs)
+        if not hedging:
+            return await primary
+
+        hedge = loop.run_in_executor(
+            _get_hedge_executor("hedge"),
+            contextvars.copy_context().run,
+            self._run_hedge,
+            kwargs,
+            grant,
+        )
+        pending: set[asyncio.Future[dict[str, Any]]] = {primary, hedge}
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    for loser in pending:
+                        loser.add_done_callback(
+                            lambda t: self._record_hedge_loser(
+                                None if t.cancelled() else t.exception(), t
+                            )
+                        )
+                    if task is hedge:
+                        hedge_policy.record_hedge_win(self.caller)
+                    return task.result()
+        assert error is not None
+        raise error
+
+    def _record_hedge_loser(self, error: BaseException | None, future: Any) -> None:
+        # The losing request still ran to completion and was billed.
+        if error is not None or future.cancelled():
+            return
+        result = future.result()
+        record_usage(result.get("usage"), caller=self.caller, metrics=result.get("metrics"))
+
+    def _stream_interrupted(self, error: Exception, delivered: int) -> StreamInterrupted:
+        logger.warning(
+            "bedrock_stream_interrupted",
+            caller=self.caller,
+            chunks_delivered=delivered,
+            error=_error_label(error),
+        )
+        return StreamInterrupted(error=map_bedrock_error(error), chunks_delivered=delivered)
+
+    def _retry_delay_or_raise(self, error: Exception, attempt: int) -> float:
+        """Return the backoff delay for a retryable error, or raise the mapped error."""
+        if is_retryable_error(error):
+            if attempt >= MAX_RETRIES:
+                retry_tracker.record_exhausted(self.caller)
+            elif retry_tracker.allow_retry(self.caller):
+                delay = backoff_delay(attempt)
+                logger.warning(
+                    "bedrock_retry",
+                    caller=self.caller,
+                    error=_error_label(error),
+                    attempt=attempt + 1,
+                    max_retries=MAX_RETRIES,
+                    delay=round(delay, 3),
+                )
+                return delay
+        raise map_bedrock_error(error) from error
 
     def _build(
         self,
@@ -260,11 +951,11 @@ class NovaClient:
     ) -> dict[str, Any]:
         kw: dict = {
             "modelId": self.model_id,
-            "messages": messages,
+            "messages": _with_history_cache_point(messages) if PROMPT_CACHE_ENABLED else messages,
             "inferenceConfig": {"maxTokens": max_tokens, "temperature": temperature, "topP": top_p},
         }
         if system_prompt:
-            kw["system"] = [{"text": system_prompt}]
+            kw["system"] = _system_blocks(system_prompt)
         if tool_config:
             kw["toolConfig"] = tool_config
         if reasoning_effort:
@@ -320,3 +1011,104 @@ class NovaClient:
                 break
 
         return build_web_source(title or parsed.netloc.removeprefix("www."), url)
+
+
+def _system_blocks(system_prompt: str) -> list[dict[str, Any]]:
+    """Split *system_prompt* at cache-point markers into Converse system blocks."""
+
+    segments = system_prompt.split(PROMPT_CACHE_POINT)
+    if not PROMPT_CACHE_ENABLED:
+        return [{"text": "".join(segments)}]
+    blocks: list[dict[str, Any]] = []
+    for index, segment in enumerate(segments):
+        if segment:
+            blocks.append({"text": segment})
+        if index < len(segments) - 1 and blocks and "text" in blocks[-1]:
+            blocks.append(_CACHE_POINT_BLOCK)
+    return blocks
+
+
+def _with_history_cache_point(messages: list) -> list:
+    """Return *messages* with a cache point closing the turns before the newest one.
+
+    Earlier turns are identical on the next request of the same session, so
+    Bedrock can serve them from cache. The caller's list is not modified.
+    """
+
+    if len(messages) < 2:
+        return messages
+    stable = messages[-2]
+    content = stable.get("content")
+    if not isinstance(content, list) or not content or "cachePoint" in content[-1]:
+        return messages
+    return [*messages[:-2], {**stable, "content": [*content, _CACHE_POINT_BLOCK]}, messages[-1]]
+
+
+def _error_code(error: botocore.exceptions.ClientError) -> str:
+    code = str(error.response.get("Error", {}).get("Code", ""))
+    # Errors raised inside an event stream use lowerCamelCase ("throttlingException").
+    return code[:1].upper() + code[1:]
+
+
+def _error_label(error: Exception) -> str:
+    if isinstance(error, botocore.exceptions.ClientError):
+        return _error_code(error) or type(error).__name__
+    return type(error).__name__
+
+
+def _estimate_tokens(kwargs: dict) -> int:
+    # InvokeModel carries a JSON body instead of Converse messages.
+    if "body" in kwargs:
+        return estimate_tokens(kwargs["body"])
+    return estimate_request_tokens(kwargs)
+
+
+def _record_stream_usage(event: dict, caller: str) -> dict | None:
+    """Record the usage of a stream's final ``metadata`` event and return it."""
+    metadata = event.get("metadata")
+    if not metadata:
+        return None
+    usage = metadata.get("usage") or {}
+    record_usage(usage, caller=caller, metrics=metadata.get("metrics"))
+    return usage
+
+
+def _settle_quota(grant: QuotaGrant | None, usage: dict) -> None:
+    """Settle *grant* against the real *usage* when a quota scheduler is configured."""
+    scheduler = quota_scheduler()
+    if grant is not None and scheduler is not None:
+        scheduler.settle(grant, usage_token_total(usage))
+
+
+async def _asettle_quota(grant: QuotaGrant | None, usage: dict) -> None:
+    scheduler = quota_scheduler()
+    if grant is not None and scheduler is not None:
+        await scheduler.asettle(grant, usage_token_total(usage))
+
+
+def _output_reservation(kwargs: dict) -> int:
+    # InvokeModel requests reserve no output tokens.
+    if "body" in kwargs:
+        return 0
+    return int(kwargs.get("inferenceConfig", {}).get("maxTokens", DEFAULT_MAX_TOKENS))
+
+
+def _refund_quota(grant: QuotaGrant | None, kwargs: dict) -> None:
+    """Settle a failed attempt's *grant* as if it produced no output tokens."""
+    scheduler = quota_scheduler()
+    if grant is not None and scheduler is not None:
+        scheduler.refund(grant, _output_reservation(kwargs))
+
+
+async def _arefund_quota(grant: QuotaGrant | None, kwargs: dict) -> None:
+    scheduler = quota_scheduler()
+    if grant is not None and scheduler is not None:
+        await scheduler.arefund(grant, _output_reservation(kwargs))
+
+
+def _event_text(event: dict) -> str:
+    """Return the visible text carried by one stream event, if any."""
+    delta = event.get("contentBlockDelta", {}).get("delta", {})
+    if "text" not in delta:
+        return ""
+    return strip_hidden_markers(delta["text"])
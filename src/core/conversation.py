@@ -8,19 +8,25 @@ agents can follow the conversation without relying on long-term storage.
 
 from __future__ import annotations
 
+import itertools
 import re
 import threading
 import time
 import uuid
 from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from typing import Any, Literal, cast
 
 from config.settings import SESSION_TIMEOUT_MINUTES
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from src.core.documents import DocumentMemory, UploadedDocument
+from src.core.history_window import CompactionAnchor
 from src.core.provenance import ResponseProvenance, SourceAttribution
 from src.core.session_summary import SessionSummary
+from src.core.summary_cadence import SummaryProgress
+from src.core.tokens import estimate_message_tokens
+from src.core.usage import UsageMeter
 
 MAX_SESSION_MESSAGES = 24
 MAX_ACTIVE_GOALS = 4
@@ -114,6 +120,15 @@ _WORK_HOURS_PATTERNS: tuple[re.Pattern[str], ...] = (
 )
 
 
+@dataclass(frozen=True)
+class SummaryInput:
+    """A consistent view of what a summarizer should read for one session."""
+
+    messages: list[dict[str, Any]]
+    covered_through: int
+    previous_summary: SessionSummary
+
+
 def _normalize_text(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
@@ -253,6 +268,9 @@ class PersonalizedPrompt(BaseModel):
 SessionMemorySnapshot.model_rebuild()
 
 
+_MEMORY_VERSIONS = itertools.count(1)
+
+
 class Conversation:
     """Single in-memory user session."""
 
@@ -271,6 +289,8 @@ class Conversation:
         self._last_activity = now_ts
         self.messages: list[dict[str, Any]] = []
         self.current_agent: str | None = None
+        # Wall-clock time ``current_agent`` last answered; drives sticky routing.
+        self.current_agent_at: float | None = None
         self.topics: list[str] = []
         self.identity_context: dict[str, bool | str] = {}
         self.preferences: dict[str, str] = {}
@@ -285,6 +305,20 @@ class Conversation:
         self.document_memories: list[DocumentMemory] = []
         self._active_documents: list[UploadedDocument] = []
         self.crisis_detected = False
+        # Monotonic count of messages ever added, and the count already covered by
+        # the sidebar summary. Trimming ``messages`` never moves either mark back.
+        self._message_serial = 0
+        self._summary_serial = 0
+        self._summary_signals: frozenset[str] = frozenset()
+        # Last history-window cut per agent, so the compacted prefix stays stable.
+        self._compaction_anchors: dict[str, CompactionAnchor] = {}
+        # Changes whenever a memory field changes value and is unique across
+        # sessions, even when a session id is reused, so derived prompt sections
+        # can be reused until then. Activity alone only moves ``_last_activity``.
+        self._memory_version = next(_MEMORY_VERSIONS)
+        self._versioned_memory = self._memory_fields()
+        # Bedrock token usage of this session's turns and summaries.
+        self.usage = UsageMeter()
 
     @property
     def metadata(self) -> dict[str, Any]:
@@ -315,6 +349,7 @@ class Conversation:
                 "remembered": [document.display_label for document in snapshot.document_memories]
             },
             "session_memory": snapshot.model_dump(mode="python"),
+            "session_memory_version": self.memory_version,
         }
 
     def set_preference(self, key: str, value: str) -> None:
@@ -352,6 +387,10 @@ class Conversation:
             self._active_documents = []
             self.crisis_detected = False
             self.preferences["response_language"] = ui_language
+            self._message_serial = len(history)
+            self._summary_serial = 0
+            self._summary_signals = frozenset()
+            self._compaction_anchors = {}
 
             for raw_message in history:
                 role = str(raw_message.get("role", "user"))
@@ -374,6 +413,7 @@ class Conversation:
                 if provenance is not None:
                     self._remember_sources(_coerce_provenance(provenance))
 
+            self.current_agent_at = self._now() if self.current_agent else None
             self._trim_messages()
             self._touch()
 
@@ -446,6 +486,7 @@ class Conversation:
 
         with self._lock:
             self.messages.append({"role": "user", "content": [{"text": normalized}]})
+            self._message_serial += 1
             self.preferences["response_language"] = ui_language
             self._remember_goal(normalized)
             self._remember_topics(normalized)
@@ -476,13 +517,35 @@ class Conversation:
 
         with self._lock:
             self.messages.append(message_payload)
+            self._message_serial += 1
             self.current_agent = agent_key
+            self.current_agent_at = self._now()
             self.crisis_detected = crisis
             self._remember_agent_topic(agent_key)
             self._remember_sources(normalized_provenance)
             self._trim_messages()
             self._touch()
 
+    def is_empty(self) -> bool:
+        """Return whether nothing in this session could personalize a reply yet.
+
+        The response language is not counted; callers key on the UI language.
+        """
+
+        with self._lock:
+            return not (
+                self.messages
+                or self.identity_context
+                or set(self.preferences) - {"response_language"}
+                or self.active_goals
+                or self.profile_facts
+                or self.onboarding_messages
+                or self.profile_summary
+                or self.document_memories
+                or self._active_documents
+                or self.crisis_detected
+            )
+
     def get_messages(self, last_n: int | None = None) -> list[dict[str, Any]]:
         with self._lock:
             messages = self.messages[-last_n:] if last_n else self.messages
@@ -499,6 +562,54 @@ class Conversation:
                 copied.append(entry)
             return copied
 
+    def compaction_anchor(self, key: str) -> tuple[int, CompactionAnchor | None]:
+        """Return the absolute index of the first retained message and *key*'s last cut."""
+
+        with self._lock:
+            return self._message_serial - len(self.messages), self._compaction_anchors.get(key)
+
+    def set_compaction_anchor(self, key: str, anchor: CompactionAnchor | None) -> None:
+        with self._lock:
+            if anchor is None:
+                self._compaction_anchors.pop(key, None)
+            else:
+                self._compaction_anchors[key] = anchor
+
+    def summary_input(self, *, since_last_summary: bool = False) -> SummaryInput:
+        """Return the transcript to summarize together with its high-water mark.
+
+        With ``since_last_summary`` only messages added after the last successful
+        summary are returned (as far as they are still retained in memory).
+        """
+
+        with self._lock:
+            new_messages = self._message_serial - self._summary_serial
+            if since_last_summary:
+                messages = self.get_messages(last_n=new_messages) if new_messages > 0 else []
+            else:
+                messages = self.get_messages()
+            return SummaryInput(
+                messages=messages,
+                covered_through=self._message_serial,
+                previous_summary=SessionSummary(
+                    profile_facts=tuple(self.profile_facts),
+                    conversation_overview=tuple(self.conversation_overview),
+                ),
+            )
+
+    def summary_progress(self) -> SummaryProgress:
+        """Describe what changed since the last successful sidebar summary."""
+
+        with self._lock:
+            new_messages = self._message_serial - self._summary_serial
+            unsummarized = self.messages[-new_messages:] if new_messages > 0 else []
+            return SummaryProgress(
+                new_messages=new_messages,
+                new_tokens=estimate_message_tokens(unsummarized),
+                signals_changed=self._profile_signals() != self._summary_signals,
+                has_summary=bool(self.profile_facts or self.conversation_overview),
+            )
+
     def snapshot(self) -> SessionMemorySnapshot:
         with self._lock:
             return SessionMemorySnapshot(
@@ -571,10 +682,8 @@ class Conversation:
         _remember_recent(self.active_goals, cleaned, limit=MAX_ACTIVE_GOALS)
 
     def _remember_topics(self, text: str) -> None:
-        lowered = text.casefold()
-        for topic, keywords in _TOPIC_KEYWORDS:
-            if any(keyword in lowered for keyword in keywords):
-                _remember_recent(self.topics, topic, limit=MAX_TOPICS)
+        for topic in detect_topics(text):
+            _remember_recent(self.topics, topic, limit=MAX_TOPICS)
 
     def _remember_agent_topic(self, agent_key: str) -> None:
         label = _AGENT_TOPIC_LABELS.get(agent_key)
@@ -604,14 +713,33 @@ class Conversation:
         for source in provenance.sources:
             _remember_source(self.cited_sources, source)
 
-    def update_summary(self, summary: SessionSummary) -> None:
-        """Replace dynamic sidebar summary fields with the latest LLM summary."""
+    def update_summary(
+        self,
+        summary: SessionSummary,
+        *,
+        covered_through: int | None = None,
+    ) -> None:
+        """Replace dynamic sidebar summary fields with the latest LLM summary.
+
+        ``covered_through`` is the message serial the summary was built from
+        (see :meth:`summary_input`); messages added while it ran stay pending,
+        and a summary older than the one already stored is ignored.
+        """
 
         with self._lock:
+            if covered_through is not None and covered_through < self._summary_serial:
+                # A newer summary already landed; keep it.
+                return
             self.profile_facts = [item.strip() for item in summary.profile_facts if item.strip()]
             self.conversation_overview = [
                 item.strip() for item in summary.conversation_overview if item.strip()
             ]
+            self._summary_serial = (
+                self._message_serial
+                if covered_through is None
+                else min(covered_through, self._message_serial)
+            )
+            self._summary_signals = self._profile_signals()
             self._touch()
 
     def restore_portable_state(
@@ -628,6 +756,7 @@ class Conversation:
         with self._lock:
             current_agent = str(session_memory.get("current_agent", "")).strip() or None
             self.current_agent = current_agent
+            self.current_agent_at = self._now() if current_agent else None
             self.crisis_detected = bool(session_memory.get("crisis_detected", False))
             self.topics = [
                 str(item).strip() for item in session_memory.get("topics", ()) if str(item).strip()
@@ -682,15 +811,54 @@ class Conversation:
                 _coerce_document_memories(session_memory.get("document_memories", ()))
             )
             self._active_documents = []
+            if self.profile_facts or self.conversation_overview:
+                self._summary_serial = self._message_serial
+                self._summary_signals = self._profile_signals()
             self._trim_messages()
             self._touch()
 
+    def _profile_signals(self) -> frozenset[str]:
+        signals = {f"topic:{topic}" for topic in self.topics}
+        signals.update(f"identity:{key}={value}" for key, value in self.identity_context.items())
+        return frozenset(signals)
+
     def _trim_messages(self) -> None:
         if len(self.messages) > MAX_SESSION_MESSAGES:
             self.messages = self.messages[-MAX_SESSION_MESSAGES:]
 
+    @property
+    def memory_version(self) -> int:
+        """Return a counter that changes whenever session memory has changed."""
+
+        with self._lock:
+            return self._memory_version
+
+    def _memory_fields(self) -> tuple[Any, ...]:
+        return (
+            self.current_agent,
+            self.crisis_detected,
+            tuple(self.topics),
+            tuple(self.identity_context.items()),
+            tuple(self.preferences.items()),
+            tuple(self.active_goals),
+            tuple(self.cited_sources),
+            tuple(self.profile_facts),
+            tuple(self.conversation_overview),
+            self.onboarding_state,
+            tuple(self.onboarding_messages),
+            self.profile_summary,
+            tuple(self.personalized_prompts),
+            tuple(self.document_memories),
+        )
+
     def _touch(self) -> None:
+        """Record activity; move the memory version only if a memory field changed."""
+
         self._last_activity = self._now()
+        fields = self._memory_fields()
+        if fields != self._versioned_memory:
+            self._versioned_memory = fields
+            self._memory_version = next(_MEMORY_VERSIONS)
 
 
 class ConversationStore:
@@ -747,6 +915,17 @@ class ConversationStore:
             self._sessions.pop(session_id, None)
 
 
+def detect_topics(text: str) -> tuple[str, ...]:
+    """Return the session topics whose keywords appear in *text*, in table order."""
+
+    lowered = text.casefold()
+    return tuple(
+        topic
+        for topic, keywords in _TOPIC_KEYWORDS
+        if any(keyword in lowered for keyword in keywords)
+    )
+
+
 def build_session_memory_addendum(
     session_memory: dict[str, Any] | SessionMemorySnapshot | None,
 ) -> str:
@@ -0,0 +1,112 @@
+"""
+Text embeddings for semantic lookups.
+
+``NovaEmbedder`` calls Nova multimodal embeddings on Bedrock
+(``NOVA_EMBEDDINGS_MODEL_ID``). ``HashingEmbedder`` is a deterministic local
+stand-in: it hashes words and character trigrams into a fixed-size vector,
+needs no network and gives paraphrases with shared vocabulary a high cosine
+similarity. Both return L2-normalized ``float32`` vectors, so a dot product
+is the cosine similarity.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Protocol
+
+import numpy as np
+from config.settings import (
+    AWS_REGION,
+    NOVA_EMBEDDINGS_MODEL_ID,
+    SEMANTIC_CACHE_DIMENSIONS,
+    SEMANTIC_CACHE_EMBEDDER,
+)
+
+from src.core.client import NovaClient
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_WORD_RE = re.compile(r"\w+")
+
+
+class TextEmbedder(Protocol):
+    """Map text to an L2-normalized vector of ``dimensions`` floats."""
+
+    dimensions: int
+
+    def embed(self, text: str) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """Feature-hashing embedder over words and character trigrams."""
+
+    def __init__(self, dimensions: int = 512) -> None:
+        if dimensions < 1:
+            raise ValueError("dimensions must be at least 1")
+        self.dimensions = dimensions
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, weight in _features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:7], "little") % self.dimensions
+            sign = 1.0 if digest[7] & 1 else -1.0
+            vector[bucket] += sign * weight
+        return _normalize(vector)
+
+
+class NovaEmbedder:
+    """Text embeddings from Nova multimodal embeddings on Bedrock.
+
+    Requests go through ``NovaClient`` (caller ``embeddings``), so they share
+    the quota scheduler, retry budget, usage metering and endpoint failover
+    of every other Bedrock call.
+    """
+
+    def __init__(
+        self,
+        model_id: str = NOVA_EMBEDDINGS_MODEL_ID,
+        region: str = AWS_REGION,
+        dimensions: int = SEMANTIC_CACHE_DIMENSIONS,
+    ) -> None:
+        self.model_id = model_id
+        self.region = region
+        self.dimensions = dimensions
+        self.client = NovaClient(model_id=model_id, region=region, caller="embeddings")
+
+    def embed(self, text: str) -> np.ndarray:
+        body = {
+            "taskType": "SINGLE_EMBEDDING",
+            "singleEmbeddingParams": {
+                "embeddingPurpose": "GENERIC_INDEX",
+                "embeddingDimension": self.dimensions,
+                "text": {"truncationMode": "END", "value": text},
+            },
+        }
+        payload = self.client.invoke_model(body)
+        return _normalize(np.asarray(payload["embeddings"][0]["embedding"], dtype=np.float32))
+
+
+def build_embedder(kind: str = SEMANTIC_CACHE_EMBEDDER) -> TextEmbedder:
+    """Create the configured embedder (``nova`` or ``hashing``)."""
+
+    normalized = kind.strip().casefold()
+    if normalized == "nova":
+        return NovaEmbedder()
+    if normalized == "hashing":
+        return HashingEmbedder()
+    raise ValueError(f"Unknown SEMANTIC_CACHE_EMBEDDER {kind!r}. Expected 'nova' or 'hashing'.")
+
+
+def _features(text: str) -> list[tuple[str, float]]:
+    words = _WORD_RE.findall(text.casefold().translate(_UMLAUTS))
+    features: list[tuple[str, float]] = [(f"w:{word}", 1.0) for word in words]
+    for word in words:
+        padded = f"^{word}$"
+        features.extend((f"c:{padded[i : i + 3]}", 0.5) for i in range(len(padded) - 2))
+    return features
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
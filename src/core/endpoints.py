@@ -0,0 +1,371 @@
+"""
+Failover routing across several Bedrock endpoints (regions and inference profiles).
+
+``BEDROCK_ENDPOINTS`` lists endpoints in order of preference as
+``model_id@region`` entries, for example the ``us.`` and ``global.`` Nova
+inference profiles or the same profile in a second region. When it is set,
+every ``NovaClient`` sends its requests through one process-wide
+:class:`EndpointRouter` instead of the single ``NOVA_MODEL_ID`` /
+``AWS_REGION`` pair.
+
+Each endpoint keeps a window of its recent outcomes. Its health score is
+the success rate times its latency relative to the fastest endpoint, and
+requests pick endpoints at random, weighted by score and by position in
+the list, so traffic drifts towards the healthy, fast and preferred ones.
+If a request fails with a transient error, the router tries the next
+endpoint straight away. The retry loop in ``NovaClient`` only backs off
+once every endpoint has failed.
+
+An endpoint is ejected after ``BEDROCK_ENDPOINT_FAILURE_THRESHOLD``
+consecutive failures, or once its recent error rate reaches
+``BEDROCK_ENDPOINT_MAX_ERROR_RATE``. Every ``BEDROCK_ENDPOINT_PROBE_INTERVAL``
+seconds an ejected endpoint receives exactly one live request as a probe
+(with failover behind it, so a failed probe only costs latency). It
+rejoins the rotation once a probe succeeds.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import structlog
+from config.settings import (
+    BEDROCK_ENDPOINT_FAILURE_THRESHOLD,
+    BEDROCK_ENDPOINT_MAX_ERROR_RATE,
+    BEDROCK_ENDPOINT_PROBE_INTERVAL,
+)
+from pydantic import BaseModel, ConfigDict
+
+logger = structlog.get_logger()
+
+EndpointState = Literal["healthy", "ejected", "probing"]
+
+# Recent outcomes kept per endpoint for the error rate and latency.
+OUTCOME_WINDOW = 50
+
+# The error rate only ejects an endpoint once this many outcomes were seen.
+_MIN_SAMPLES = 5
+
+# Each later position in BEDROCK_ENDPOINTS halves an endpoint's share.
+_PREFERENCE_DECAY = 0.5
+
+# Floor for a healthy endpoint's score, so one with recent errors keeps
+# getting a trickle of traffic and either recovers or gets ejected.
+_MIN_SCORE = 0.05
+
+
+@dataclass(frozen=True)
+class BedrockEndpoint:
+    """One model (or inference profile) in one region."""
+
+    model_id: str
+    region: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.model_id}@{self.region}"
+
+
+class EndpointHealth(BaseModel):
+    """Health of one endpoint over its recent outcome window."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    endpoint: str
+    state: EndpointState
+    score: float
+    requests: int
+    failures: int
+    error_rate: float
+    mean_latency_ms: float | None
+    ejections: int
+    restorations: int
+
+
+class EndpointStats(BaseModel):
+    """Process-lifetime health of every configured endpoint, in list order."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    endpoints: list[EndpointHealth]
+
+
+def parse_endpoints(spec: str, default_region: str) -> tuple[BedrockEndpoint, ...]:
+    """Parse a comma-separated ``model_id[@region]`` list."""
+
+    endpoints = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        model_id, _, region = entry.partition("@")
+        if not model_id.strip():
+            raise ValueError(f"Invalid BEDROCK_ENDPOINTS entry {entry!r}: missing model id.")
+        endpoints.append(
+            BedrockEndpoint(model_id=model_id.strip(), region=region.strip() or default_region)
+        )
+    return tuple(dict.fromkeys(endpoints))
+
+
+class _Health:
+    """Mutable per-endpoint bookkeeping; guarded by the router's lock."""
+
+    def __init__(self) -> None:
+        # (succeeded, latency in seconds) per request, newest last.
+        self.outcomes: deque[tuple[bool, float]] = deque(maxlen=OUTCOME_WINDOW)
+        self.consecutive_failures = 0
+        self.ejected_at: float | None = None
+        self.probe_in_flight = False
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.restorations = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for ok, _ in self.outcomes if not ok) / len(self.outcomes)
+
+    @property
+    def mean_latency(self) -> float | None:
+        latencies = [latency for ok, latency in self.outcomes if ok]
+        return sum(latencies) / len(latencies) if latencies else None
+
+
+class EndpointRouter:
+    """Spreads Converse calls over healthy endpoints and fails over between them.
+
+    Exposes ``converse``, ``converse_stream`` and ``invoke_model`` like a
+    boto3 bedrock-runtime client, so ``NovaClient`` can use it in place of
+    one. ``invoke_model`` (embeddings) keeps the request's ``modelId`` and
+    only fails over between the endpoints' regions. *client_factory*
+    returns the runtime client for a region. *is_failure* decides which
+    errors count against an endpoint and trigger failover; any other error
+    is the request's fault and is raised unchanged.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[BedrockEndpoint],
+        *,
+        client_factory: Callable[[str], Any],
+        is_failure: Callable[[Exception], bool],
+        failure_threshold: int = BEDROCK_ENDPOINT_FAILURE_THRESHOLD,
+        max_error_rate: float = BEDROCK_ENDPOINT_MAX_ERROR_RATE,
+        probe_interval: float = BEDROCK_ENDPOINT_PROBE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("EndpointRouter needs at least one endpoint.")
+        self.endpoints = tuple(endpoints)
+        self.failure_threshold = max(1, failure_threshold)
+        self.max_error_rate = max_error_rate
+        self.probe_interval = probe_interval
+        self._client_factory = client_factory
+        self._is_failure = is_failure
+        self._clock = clock
+        self._rng = rng or random.SystemRandom()
+        self._lock = threading.Lock()
+        self._health = {endpoint: _Health() for endpoint in self.endpoints}
+
+    # ── Runtime client interface ───────────────────
+
+    def converse(self, **kwargs: Any) -> dict[str, Any]:
+        return self._call("converse", kwargs)
+
+    def converse_stream(self, **kwargs: Any) -> dict[str, Any]:
+        # Only opening the stream is routed; a stream that breaks later is
+        # handled by NovaClient.stream_text.
+        return self._call("converse_stream", kwargs)
+
+    def invoke_model(self, **kwargs: Any) -> dict[str, Any]:
+        return self._call("invoke_model", kwargs, keep_model=True)
+
+    def warm_up(self) -> None:
+        """Create the runtime client of every configured region now."""
+
+        for region in dict.fromkeys(endpoint.region for endpoint in self.endpoints):
+            self._client_factory(region)
+
+    # ── Health ─────────────────────────────────────
+
+    def stats(self) -> EndpointStats:
+        now = self._clock()
+        with self._lock:
+            scores = self._scores()
+            return EndpointStats(
+                endpoints=[
+                    EndpointHealth(
+                        endpoint=endpoint.label,
+                        state=self._state(health, now),
+                        score=round(scores[endpoint], 4),
+                        requests=health.requests,
+                        failures=health.failures,
+                        error_rate=round(health.error_rate, 4),
+                        mean_latency_ms=(
+                            round(health.mean_latency * 1000, 1)
+                            if health.mean_latency is not None
+                            else None
+                        ),
+                        ejections=health.ejections,
+                        restorations=health.restorations,
+                    )
+                    for endpoint, health in self._health.items()
+                ]
+            )
+
+    # ── Internal ───────────────────────────────────
+
+    def _call(
+        self, method: str, kwargs: dict[str, Any], *, keep_model: bool = False
+    ) -> dict[str, Any]:
+        last_error: Exception | None = None
+        for endpoint, probe in self._candidates():
+            client = self._client_factory(endpoint.region)
+            started = self._clock()
+            request = kwargs if keep_model else {**kwargs, "modelId": endpoint.model_id}
+            try:
+                result: dict[str, Any] = getattr(client, method)(**request)
+            except Exception as error:
+                if not self._is_failure(error):
+                    self._release_probe(endpoint, probe)
+                    raise
+                self._record_failure(endpoint, probe)
+                logger.warning(
+                    "bedrock_endpoint_failed",
+                    endpoint=endpoint.label,
+                    probe=probe,
+                    error=type(error).__name__,
+                )
+                last_error = error
+                continue
+            self._record_success(endpoint, probe, self._clock() - started)
+            return result
+        assert last_error is not None
+        raise last_error
+
+    def _candidates(self) -> list[tuple[BedrockEndpoint, bool]]:
+        """Return endpoints to try in order; the flag marks a probe request."""
+
+        now = self._clock()
+        with self._lock:
+            healthy = [e for e, h in self._health.items() if h.ejected_at is None]
+            ejected = [e for e, h in self._health.items() if h.ejected_at is not None]
+            order: list[tuple[BedrockEndpoint, bool]] = []
+            for endpoint in ejected:
+                if self._state(self._health[endpoint], now) == "probing":
+                    self._health[endpoint].probe_in_flight = True
+                    order.append((endpoint, True))
+                    break
+            order.extend((endpoint, False) for endpoint in self._weighted_order(healthy))
+            if not healthy:
+                # Everything is down: try the ejected endpoints anyway.
+                order.extend(
+                    (endpoint, False) for endpoint in ejected if (endpoint, True) not in order
+                )
+            return order
+
+    def _weighted_order(self, endpoints: list[BedrockEndpoint]) -> list[BedrockEndpoint]:
+        scores = self._scores()
+        weights = {
+            endpoint: max(_MIN_SCORE, scores[endpoint])
+            * _PREFERENCE_DECAY ** self.endpoints.index(endpoint)
+            for endpoint in endpoints
+        }
+        order = []
+        while weights:
+            # Weighted sampling without replacement: draw, drop, draw again.
+            (pick,) = self._rng.choices(list(weights), weights=list(weights.values()))
+            order.append(pick)
+            del weights[pick]
+        return order
+
+    def _scores(self) -> dict[BedrockEndpoint, float]:
+        """Success rate times latency relative to the fastest endpoint, in [0, 1]."""
+
+        latencies = {e: h.mean_latency for e, h in self._health.items()}
+        known = [latency for latency in latencies.values() if latency]
+        fastest = min(known) if known else None
+        scores = {}
+        for endpoint, health in self._health.items():
+            latency = latencies[endpoint]
+            speed = fastest / latency if fastest and latency else 1.0
+            scores[endpoint] = (1.0 - health.error_rate) * speed
+        return scores
+
+    def _state(self, health: _Health, now: float) -> EndpointState:
+        if health.ejected_at is None:
+            return "healthy"
+        if not health.probe_in_flight and now - health.ejected_at >= self.probe_interval:
+            return "probing"
+        return "ejected"
+
+    def _record_success(self, endpoint: BedrockEndpoint, probe: bool, latency: float) -> None:
+        with self._lock:
+            health = self._health[endpoint]
+            health.requests += 1
+            health.consecutive_failures = 0
+            if health.ejected_at is not None:
+                # Start over so the errors that ejected it cannot eject it again.
+                health.outcomes.clear()
+                health.ejected_at = None
+                health.probe_in_flight = False
+                health.restorations += 1
+                logger.info("bedrock_endpoint_restored", endpoint=endpoint.label, probe=probe)
+            health.outcomes.append((True, latency))
+
+    def _record_failure(self, endpoint: BedrockEndpoint, probe: bool) -> None:
+        with self._lock:
+            health = self._health[endpoint]
+            health.requests += 1
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.outcomes.append((False, 0.0))
+            if probe:
+                # Wait a full probe interval before the next probe.
+                health.ejected_at = self._clock()
+                health.probe_in_flight = False
+            elif health.ejected_at is None and (
+                health.consecutive_failures >= self.failure_threshold
+                or (
+                    len(health.outcomes) >= _MIN_SAMPLES
+                    and health.error_rate >= self.max_error_rate
+                )
+            ):
+                health.ejected_at = self._clock()
+                health.ejections += 1
+                logger.warning(
+                    "bedrock_endpoint_ejected",
+                    endpoint=endpoint.label,
+                    error_rate=round(health.error_rate, 3),
+                    consecutive_failures=health.consecutive_failures,
+                )
+
+    def _release_probe(self, endpoint: BedrockEndpoint, probe: bool) -> None:
+        if probe:
+            with self._lock:
+                self._health[endpoint].probe_in_flight = False
+
+
+def build_endpoint_router(
+    spec: str,
+    *,
+    default_region: str,
+    client_factory: Callable[[str], Any],
+    is_failure: Callable[[Exception], bool],
+) -> EndpointRouter | None:
+    """Create a router for *spec*, or ``None`` when no endpoints are listed."""
+
+    endpoints = parse_endpoints(spec, default_region)
+    if not endpoints:
+        return None
+    logger.info("bedrock_endpoints_configured", endpoints=[e.label for e in endpoints])
+    return EndpointRouter(endpoints, client_factory=client_factory, is_failure=is_failure)
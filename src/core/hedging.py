@@ -0,0 +1,162 @@
+"""
+Hedged requests for short, idempotent Bedrock classification calls.
+
+Router, Crisis Radar and triage calls produce a few dozen tokens, but a
+single slow Bedrock request still holds up the whole turn. With hedging,
+a call that has not finished after the ``percentile`` of its caller's
+recent latencies gets one duplicate request, and whichever response
+arrives first wins. The loser cannot be cancelled (boto3 calls block), so
+its result is dropped, though its token usage is still recorded.
+
+Hedging is opt-in twice: ``BEDROCK_HEDGING_ENABLED`` turns it on, and only
+clients built with ``NovaClient(hedged=True)`` take part. Those are the
+classification clients, whose requests are idempotent. Hedges are capped
+by their own token-bucket budget (a ``RetryBudget`` separate from the
+retry budget), so at most ``BEDROCK_HEDGE_BUDGET_RATIO`` of calls are
+duplicated. No call is
+hedged before ``BEDROCK_HEDGE_MIN_SAMPLES`` latencies have been observed.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+
+from config.settings import (
+    BEDROCK_HEDGE_BUDGET_BURST,
+    BEDROCK_HEDGE_BUDGET_RATIO,
+    BEDROCK_HEDGE_MIN_SAMPLES,
+    BEDROCK_HEDGE_PERCENTILE,
+)
+from pydantic import BaseModel, ConfigDict
+
+from src.core.retry import RetryBudget
+
+# Recent latencies kept per caller for the percentile.
+LATENCY_WINDOW = 200
+
+_COUNTERS = ("calls", "hedged", "hedge_wins", "budget_denied", "quota_denied")
+
+
+class HedgeSiteStats(BaseModel):
+    """Hedging counters and the current hedge delay of one call site."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    budget_denied: int = 0
+    quota_denied: int = 0
+    hedge_delay_ms: float | None = None
+
+
+class HedgeStats(BaseModel):
+    """Process-lifetime hedging counters per call site."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    percentile: float
+    budget_ratio: float
+    budget_tokens: float
+    by_caller: dict[str, HedgeSiteStats]
+
+
+class HedgePolicy:
+    """Tracks recent latencies per caller and decides when to send a hedge."""
+
+    def __init__(
+        self,
+        *,
+        percentile: float = BEDROCK_HEDGE_PERCENTILE,
+        min_samples: int = BEDROCK_HEDGE_MIN_SAMPLES,
+        budget: RetryBudget | None = None,
+    ) -> None:
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget = budget or RetryBudget(
+            ratio=BEDROCK_HEDGE_BUDGET_RATIO, burst=BEDROCK_HEDGE_BUDGET_BURST
+        )
+        self._lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = {}
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def hedge_delay(self, caller: str) -> float | None:
+        """Seconds to wait before hedging a call of *caller*; ``None`` while warming up."""
+
+        with self._lock:
+            samples = sorted(self._latencies.get(caller, ()))
+        if len(samples) < max(1, self.min_samples):
+            return None
+        index = min(len(samples) - 1, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return samples[max(0, index)]
+
+    def record_call(self, caller: str) -> None:
+        self.budget.deposit()
+        self._count(caller, "calls")
+
+    def record_latency(self, caller: str, seconds: float) -> None:
+        with self._lock:
+            window = self._latencies.setdefault(caller, deque(maxlen=LATENCY_WINDOW))
+            window.append(seconds)
+
+    def allow_hedge(self, caller: str) -> bool:
+        """Spend one hedge from the budget; ``False`` once it is exhausted."""
+
+        if self.budget.try_spend():
+            return True
+        self._count(caller, "budget_denied")
+        return False
+
+    def record_hedged(self, caller: str) -> None:
+        self._count(caller, "hedged")
+
+    def record_quota_denied(self, caller: str) -> None:
+        self._count(caller, "quota_denied")
+
+    def record_hedge_win(self, caller: str) -> None:
+        self._count(caller, "hedge_wins")
+
+    def stats(self) -> HedgeStats:
+        with self._lock:
+            counts = {caller: dict(values) for caller, values in self._counts.items()}
+        by_caller = {}
+        for caller, values in sorted(counts.items()):
+            delay = self.hedge_delay(caller)
+            by_caller[caller] = HedgeSiteStats(
+                **values,
+                hedge_delay_ms=round(delay * 1000, 1) if delay is not None else None,
+            )
+        return HedgeStats(
+            percentile=self.percentile,
+            budget_ratio=self.budget.ratio,
+            budget_tokens=round(self.budget.tokens, 3),
+            by_caller=by_caller,
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._counts.clear()
+        self.budget.reset()
+
+    def _count(self, caller: str, key: str) -> None:
+        with self._lock:
+            values = self._counts.setdefault(caller, dict.fromkeys(_COUNTERS, 0))
+            values[key] += 1
+
+
+hedge_policy = HedgePolicy()
+
+
+def hedge_stats() -> HedgeStats:
+    """Return process-lifetime hedging counters per call site."""
+
+    return hedge_policy.stats()
+
+
+def reset_hedge_stats() -> None:
+    """Forget latencies and counters and refill the hedge budget (tests)."""
+
+    hedge_policy.reset()
@@ -0,0 +1,190 @@
+"""
+Token-budgeted conversation history windows.
+
+``MAX_SESSION_MESSAGES`` bounds the stored history by count, but a few long
+answers can still dominate the input of a turn. ``fit_history`` keeps the
+most recent turns verbatim within a token budget and collapses everything
+older into one context block built from the session summary (conversation
+overview and profile facts). Token counts are local estimates from
+:mod:`src.core.tokens`.
+
+The window always starts with a user turn, so the Converse history keeps its
+alternating roles; the context block is prepended to that turn.
+
+The history up to the newest turn is a cached prompt prefix, so the window
+must not slide by one exchange per turn. Each window returns a
+:class:`CompactionAnchor`: the absolute index of its cut (counted over every
+message the session ever stored, so trimming by ``MAX_SESSION_MESSAGES``
+does not move it) and the lines of its block. Passed back on the next turn,
+the anchor's cut is chosen again while the kept turns fit, with the same
+block, so each turn only appends to the previous one. Only when they no
+longer fit does the cut move, to the first user turn at least
+``COMPACTION_STEP_RATIO`` of the budget further on, and the block picks up
+the current summary.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.tokens import estimate_message_tokens
+
+# Used when the session has no summary yet: the latest dropped user requests.
+MAX_FALLBACK_REQUESTS = 5
+MAX_FALLBACK_REQUEST_CHARS = 160
+# Minimum distance between successive cuts as a share of the budget, so
+# turns are dropped in steps of at least this size.
+COMPACTION_STEP_RATIO = 0.5
+
+
+@dataclass(frozen=True)
+class CompactionAnchor:
+    """Where a window was cut, as an absolute message index, and its block lines."""
+
+    cut_index: int
+    lines: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class HistoryWindow:
+    """Messages sent for one turn and how much history was compacted."""
+
+    messages: list[dict[str, Any]]
+    compacted_messages: int = 0
+    estimated_tokens: int = 0
+    original_tokens: int = 0
+    anchor: CompactionAnchor | None = None
+
+
+def fit_history(
+    messages: list[dict[str, Any]],
+    *,
+    budget_tokens: int | None,
+    first_index: int = 0,
+    conversation_overview: Sequence[str] = (),
+    profile_facts: Sequence[str] = (),
+    anchor: CompactionAnchor | None = None,
+) -> HistoryWindow:
+    """Return *messages* trimmed to *budget_tokens*, older turns compacted.
+
+    *first_index* is the absolute index of ``messages[0]`` among every
+    message of the session; *anchor* is the previous turn's
+    :attr:`HistoryWindow.anchor`. The last message (the current user turn)
+    is always kept. A budget of ``None`` or ``0`` disables the window.
+    """
+
+    costs = [estimate_message_tokens([message]) for message in messages]
+    total = sum(costs)
+    if not budget_tokens or total <= budget_tokens or len(messages) < 2:
+        return HistoryWindow(messages=messages, estimated_tokens=total, original_tokens=total)
+
+    summary_lines = tuple(_summary_lines(conversation_overview, profile_facts))
+    start = anchor.cut_index - first_index if anchor is not None else 0
+    if not 0 < start < len(messages) - 1 or messages[start].get("role") != "user":
+        anchor, start = None, 0
+    step = max(1, int(budget_tokens * COMPACTION_STEP_RATIO))
+    for cut in _step_cuts(messages, costs, step, start):
+        if anchor is not None and cut == start:
+            lines = anchor.lines
+        else:
+            lines = summary_lines or tuple(_fallback_lines(messages[:cut]))
+        kept = _compact(messages, cut, lines)
+        estimated = estimate_message_tokens(kept)
+        if estimated <= budget_tokens:
+            break
+    return HistoryWindow(
+        messages=kept,
+        compacted_messages=cut,
+        estimated_tokens=estimated,
+        original_tokens=total,
+        anchor=CompactionAnchor(cut_index=first_index + cut, lines=lines),
+    )
+
+
+def build_compacted_history_block(lines: Sequence[str]) -> str:
+    """Render the context block that stands in for the dropped earlier messages."""
+
+    body = "\n".join(lines) if lines else "- No summary is available yet."
+    return (
+        "[EARLIER CONVERSATION — COMPACTED]\n"
+        "Earlier messages of this session were left out to fit the context window and "
+        "are summarized here. Use this for continuity, but do not quote it back as the "
+        "user's own words.\n"
+        f"{body}\n"
+        "[END OF EARLIER CONVERSATION]"
+    )
+
+
+def _step_cuts(
+    messages: list[dict[str, Any]], costs: list[int], step: int, start: int
+) -> Iterator[int]:
+    """Yield candidate cuts: *start* (if past 0), then the first user turn past
+    each further multiple of *step* tokens measured from *start*.
+
+    A cut depends only on the messages between *start* and itself, so
+    appending turns never moves an existing candidate. The current user turn
+    is the last resort.
+    """
+
+    last = len(messages) - 1
+    if start:
+        yield start
+    threshold = step
+    dropped = 0
+    for index in range(start + 1, last):
+        dropped += costs[index - 1]
+        if dropped >= threshold and messages[index].get("role") == "user":
+            yield index
+            threshold = (dropped // step + 1) * step
+    yield last
+
+
+def _compact(
+    messages: list[dict[str, Any]], cut: int, lines: Sequence[str]
+) -> list[dict[str, Any]]:
+    block = build_compacted_history_block(lines)
+    first = messages[cut]
+    return [{**first, "content": [{"text": block}, *_content_blocks(first)]}, *messages[cut + 1 :]]
+
+
+def _summary_lines(overview: Sequence[str], profile_facts: Sequence[str]) -> list[str]:
+    lines: list[str] = []
+    if overview:
+        lines.append("Conversation so far:")
+        lines.extend(f"- {item}" for item in overview)
+    if profile_facts:
+        lines.append("What the user shared about themselves:")
+        lines.extend(f"- {item}" for item in profile_facts)
+    return lines
+
+
+def _fallback_lines(dropped: list[dict[str, Any]]) -> list[str]:
+    requests = [
+        text for message in dropped if message.get("role") == "user" for text in _texts(message)
+    ][-MAX_FALLBACK_REQUESTS:]
+    if not requests:
+        return []
+    lines = ["Earlier user requests:"]
+    for text in requests:
+        clipped = " ".join(text.split())
+        if len(clipped) > MAX_FALLBACK_REQUEST_CHARS:
+            clipped = clipped[: MAX_FALLBACK_REQUEST_CHARS - 1].rstrip() + "…"
+        lines.append(f"- {clipped}")
+    return lines
+
+
+def _content_blocks(message: dict[str, Any]) -> list[Any]:
+    content = message.get("content", ())
+    if isinstance(content, str):
+        return [{"text": content}]
+    return list(content)
+
+
+def _texts(message: dict[str, Any]) -> list[str]:
+    return [
+        str(block["text"])
+        for block in _content_blocks(message)
+        if isinstance(block, dict) and str(block.get("text", "")).strip()
+    ]
@@ -0,0 +1,135 @@
+"""
+System prompt assembly with precompiled and memoized sections.
+
+The static prefix of an agent's prompt (domain prompt, language rules and
+the UI-language addendum) is rendered once per UI language when the agent
+is built. Addenda that depend only on their inputs are memoized in small
+bounded caches: the sourcing block per (source ids, tool mode), the identity
+block per identity context, and the session-memory block per session
+memory version, so an unchanged session is never re-validated.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from config.settings import SESSION_TIMEOUT_MINUTES
+
+from src.core.conversation import SessionMemorySnapshot, build_session_memory_addendum
+from src.core.provenance import build_sourcing_addendum
+from src.core.safety import build_identity_addendum
+from src.core.ttl_cache import CacheStats, TTLCache
+from src.knowledge.source_registry import TrustedSource
+
+UI_LANGUAGES = ("de", "en")
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """Static prompt prefix of one agent, rendered once per UI language."""
+
+    base: str
+    by_language: Mapping[str, str]
+
+    @classmethod
+    def compile(
+        cls,
+        base: str,
+        language_addendum: Callable[[str], str],
+        languages: Iterable[str] = UI_LANGUAGES,
+    ) -> PromptTemplate:
+        return cls(
+            base=base,
+            by_language={language: base + language_addendum(language) for language in languages},
+        )
+
+    def render(self, ui_language: object) -> str:
+        """Return the prefix for *ui_language*, or the bare base for unknown languages."""
+
+        return self.by_language.get(str(ui_language or "").strip().lower(), self.base)
+
+
+# Identity and session-memory sections contain user context, so they expire
+# with the session timeout rather than outliving the session they came from.
+_SECTION_TTL_SECONDS = SESSION_TIMEOUT_MINUTES * 60
+
+_sourcing_memo: TTLCache[str] = TTLCache(max_entries=256, ttl_seconds=_SECTION_TTL_SECONDS)
+_identity_memo: TTLCache[str] = TTLCache(max_entries=256, ttl_seconds=_SECTION_TTL_SECONDS)
+_session_memory_memo: TTLCache[str] = TTLCache(max_entries=1024, ttl_seconds=_SECTION_TTL_SECONDS)
+
+
+def _memoized(memo: TTLCache[str], key: str, render: Callable[[], str]) -> str:
+    text = memo.get(key)
+    if text is None:
+        # Rendering is pure, so two threads racing on one key store the same text.
+        text = render()
+        memo.put(key, text)
+    return text
+
+
+def sourcing_addendum(
+    trusted_sources: tuple[TrustedSource, ...],
+    *,
+    tool_mode: str | None,
+) -> str:
+    """Memoized :func:`build_sourcing_addendum`, keyed by source ids and tool mode."""
+
+    # Source ids are unique within the registry, which is immutable per process.
+    key = f"{tool_mode}|{','.join(source.id for source in trusted_sources)}"
+    return _memoized(
+        _sourcing_memo, key, lambda: build_sourcing_addendum(trusted_sources, tool_mode=tool_mode)
+    )
+
+
+def identity_addendum(identity_context: Mapping[str, Any]) -> str:
+    """Memoized :func:`build_identity_addendum`; item order is part of the key."""
+
+    return _memoized(
+        _identity_memo,
+        repr(tuple(identity_context.items())),
+        lambda: build_identity_addendum(dict(identity_context)),
+    )
+
+
+def session_memory_addendum(
+    session_memory: dict[str, Any] | SessionMemorySnapshot,
+    *,
+    version: int | None,
+) -> str:
+    """Render the session-memory block once per session memory *version*.
+
+    Without a version (memory supplied by a caller rather than a live
+    session) the block is rendered every time.
+    """
+
+    session_id = (
+        session_memory.session_id
+        if isinstance(session_memory, SessionMemorySnapshot)
+        else session_memory.get("session_id")
+    )
+    if version is None or not session_id:
+        return build_session_memory_addendum(session_memory)
+    return _memoized(
+        _session_memory_memo,
+        f"{session_id}:{version}",
+        lambda: build_session_memory_addendum(session_memory),
+    )
+
+
+def prompt_memo_stats() -> dict[str, CacheStats]:
+    """Return hit/miss counters of the memoized sections."""
+
+    return {
+        "sourcing": _sourcing_memo.stats(),
+        "identity": _identity_memo.stats(),
+        "session_memory": _session_memory_memo.stats(),
+    }
+
+
+def clear_prompt_memos() -> None:
+    """Drop every memoized section (tests, registry reloads)."""
+
+    for memo in (_sourcing_memo, _identity_memo, _session_memory_memo):
+        memo.clear()
@@ -0,0 +1,460 @@
+"""
+Quota-aware pacing of Bedrock requests.
+
+The Bedrock account has fixed requests-per-minute (RPM) and
+tokens-per-minute (TPM) quotas. ``QuotaScheduler`` keeps one token bucket
+for each and makes callers wait for capacity before a request is sent, so
+KODA paces itself instead of reacting to ``ThrottlingException``.
+
+Each request is charged one request and its estimated input plus
+``maxTokens`` output tokens, like Bedrock does when a request is admitted.
+``settle`` refunds the difference once the real usage is known, and
+``refund`` returns the output reservation of an attempt that failed.
+An estimate larger than a priority's share of the TPM bucket is clamped to
+that share, so it is admitted once the bucket is full and the rest is
+charged on settlement.
+
+Priorities are derived from the ``NovaClient.caller`` label: Crisis Radar,
+router and triage are ``critical``, specialist agents are ``interactive``
+and the summarizer is ``background``. Lower priorities must leave headroom
+in both buckets, so under pressure critical calls go first and summaries
+wait longest. A request that cannot be admitted within ``max_wait_seconds``
+is sent anyway and its charge is recorded as debt; the scheduler paces
+calls and never refuses them.
+
+Bucket state lives in a backend: ``MemoryQuotaBackend`` for one process,
+or ``FileQuotaBackend``, which keeps it in a small JSON file guarded by
+``fcntl.flock`` so several worker processes share one budget. The awaitable
+methods run file transactions in a worker thread, so a lock held by another
+process never blocks the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal, Protocol, TypeVar
+
+import structlog
+from config.settings import (
+    BEDROCK_QUOTA_BACKEND,
+    BEDROCK_QUOTA_MAX_WAIT_SECONDS,
+    BEDROCK_QUOTA_RPM,
+    BEDROCK_QUOTA_STATE_FILE,
+    BEDROCK_QUOTA_TPM,
+    DEFAULT_MAX_TOKENS,
+)
+from pydantic import BaseModel, ConfigDict
+
+from src.core.tokens import estimate_message_tokens, estimate_tokens
+
+logger = structlog.get_logger()
+
+QuotaPriority = Literal["critical", "interactive", "background"]
+
+PRIORITIES: tuple[QuotaPriority, ...] = ("critical", "interactive", "background")
+CRITICAL_CALLERS = frozenset({"crisis", "router", "triage"})
+BACKGROUND_CALLERS = frozenset({"summarizer"})
+
+# Share of each bucket a priority must leave untouched for higher ones.
+_HEADROOM: dict[QuotaPriority, float] = {"critical": 0.0, "interactive": 0.1, "background": 0.3}
+# Upper bound for one sleep, so waiters notice refunds and other processes.
+_MAX_POLL_SECONDS = 0.25
+
+_T = TypeVar("_T")
+BucketState = dict[str, float]
+
+
+def caller_priority(caller: str) -> QuotaPriority:
+    """Return the scheduling priority of a ``NovaClient.caller`` label."""
+
+    if caller in CRITICAL_CALLERS:
+        return "critical"
+    if caller in BACKGROUND_CALLERS:
+        return "background"
+    return "interactive"
+
+
+def estimate_request_tokens(kwargs: dict[str, Any]) -> int:
+    """Return the estimated input plus maximum output tokens of Converse *kwargs*."""
+
+    system_text = "".join(
+        str(block.get("text", "")) for block in kwargs.get("system", ()) if isinstance(block, dict)
+    )
+    max_tokens = kwargs.get("inferenceConfig", {}).get("maxTokens", DEFAULT_MAX_TOKENS)
+    return (
+        estimate_message_tokens(kwargs.get("messages", []))
+        + estimate_tokens(system_text)
+        + int(max_tokens)
+    )
+
+
+class QuotaBackend(Protocol):
+    """Atomic read-modify-write access to the shared bucket state."""
+
+    def transact(self, update: Callable[[BucketState], _T]) -> _T: ...
+
+
+class MemoryQuotaBackend:
+    """Bucket state shared by the threads of one process."""
+
+    def __init__(self) -> None:
+        self._state: BucketState = {}
+        self._lock = threading.Lock()
+
+    def transact(self, update: Callable[[BucketState], _T]) -> _T:
+        with self._lock:
+            return update(self._state)
+
+
+class FileQuotaBackend:
+    """Bucket state in a JSON file, locked with ``flock`` across processes (POSIX)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def transact(self, update: Callable[[BucketState], _T]) -> _T:
+        import fcntl  # POSIX only; imported here so other platforms can use the memory backend.
+
+        with self._lock, self.path.open("a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                state = _load_state(handle.read())
+                result = update(state)
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+@dataclass(frozen=True)
+class QuotaGrant:
+    """The charge admitted for one request."""
+
+    priority: QuotaPriority
+    tokens: int
+    waited_seconds: float = 0.0
+    forced: bool = False
+
+
+class QuotaPriorityStats(BaseModel):
+    """Process-lifetime admission counters of one priority."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    granted: int = 0
+    waited: int = 0
+    forced: int = 0
+    wait_seconds: float = 0.0
+
+
+class QuotaStats(BaseModel):
+    """Configured limits, current bucket levels and per-priority counters."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    requests_per_minute: int
+    tokens_per_minute: int
+    available_requests: float
+    available_tokens: float
+    by_priority: dict[str, QuotaPriorityStats]
+
+
+class QuotaScheduler:
+    """RPM/TPM token buckets that admit Bedrock requests by priority."""
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        backend: QuotaBackend | None = None,
+        max_wait_seconds: float = BEDROCK_QUOTA_MAX_WAIT_SECONDS,
+        now: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.backend: QuotaBackend = backend or MemoryQuotaBackend()
+        self.max_wait_seconds = max_wait_seconds
+        # Wall-clock time, so state written by other processes stays comparable.
+        self._now = now
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats: dict[QuotaPriority, dict[str, float]] = {
+            priority: {"granted": 0, "waited": 0, "forced": 0, "wait_seconds": 0.0}
+            for priority in PRIORITIES
+        }
+
+    def acquire(self, caller: str, tokens: int) -> QuotaGrant:
+        """Block until the request of *caller* fits both buckets, then charge it."""
+
+        priority = caller_priority(caller)
+        charge = self._clamp(tokens, priority)
+        started = self._now()
+        while True:
+            wait = self.backend.transact(lambda state: self._try_reserve(state, priority, charge))
+            if wait <= 0.0:
+                return self._granted(priority, charge, self._now() - started)
+            remaining = self.max_wait_seconds - (self._now() - started)
+            if remaining <= 0.0:
+                return self._force(priority, charge, self._now() - started)
+            self._sleep(min(wait, remaining, _MAX_POLL_SECONDS))
+
+    def try_acquire(self, caller: str, tokens: int) -> QuotaGrant | None:
+        """Charge the request only if it fits right now; never waits."""
+
+        priority = caller_priority(caller)
+        charge = self._clamp(tokens, priority)
+        wait = self.backend.transact(lambda state: self._try_reserve(state, priority, charge))
+        if wait > 0.0:
+            return None
+        return self._granted(priority, charge, 0.0)
+
+    async def atry_acquire(self, caller: str, tokens: int) -> QuotaGrant | None:
+        """Awaitable twin of :meth:`try_acquire`."""
+
+        priority = caller_priority(caller)
+        charge = self._clamp(tokens, priority)
+        wait = await self._atransact(lambda state: self._try_reserve(state, priority, charge))
+        if wait > 0.0:
+            return None
+        return self._granted(priority, charge, 0.0)
+
+    async def aacquire(self, caller: str, tokens: int) -> QuotaGrant:
+        """Awaitable twin of :meth:`acquire` that waits with ``asyncio.sleep``."""
+
+        priority = caller_priority(caller)
+        charge = self._clamp(tokens, priority)
+        started = self._now()
+        while True:
+            wait = await self._atransact(lambda state: self._try_reserve(state, priority, charge))
+            if wait <= 0.0:
+                return self._granted(priority, charge, self._now() - started)
+            remaining = self.max_wait_seconds - (self._now() - started)
+            if remaining <= 0.0:
+                await self._atransact(lambda state: self._charge(state, charge, refill=True))
+                return self._forced(priority, charge, self._now() - started)
+            await asyncio.sleep(min(wait, remaining, _MAX_POLL_SECONDS))
+
+    def settle(self, grant: QuotaGrant, actual_tokens: int) -> None:
+        """Refund (or charge) the difference between the estimate and real usage."""
+
+        if not self.tokens_per_minute or actual_tokens <= 0:
+            return
+        delta = float(grant.tokens - actual_tokens)
+        self.backend.transact(lambda state: self._adjust_tokens(state, delta))
+
+    async def asettle(self, grant: QuotaGrant, actual_tokens: int) -> None:
+        """Awaitable twin of :meth:`settle`."""
+
+        if not self.tokens_per_minute or actual_tokens <= 0:
+            return
+        delta = float(grant.tokens - actual_tokens)
+        await self._atransact(lambda state: self._adjust_tokens(state, delta))
+
+    def refund(self, grant: QuotaGrant, tokens: int) -> None:
+        """Return up to *tokens* of *grant* after its request failed without usage."""
+
+        delta = float(min(tokens, grant.tokens))
+        if not self.tokens_per_minute or delta <= 0:
+            return
+        self.backend.transact(lambda state: self._adjust_tokens(state, delta))
+
+    async def arefund(self, grant: QuotaGrant, tokens: int) -> None:
+        """Awaitable twin of :meth:`refund`."""
+
+        delta = float(min(tokens, grant.tokens))
+        if not self.tokens_per_minute or delta <= 0:
+            return
+        await self._atransact(lambda state: self._adjust_tokens(state, delta))
+
+    def stats(self) -> QuotaStats:
+        levels = self.backend.transact(self._refill)
+        with self._lock:
+            by_priority: dict[str, QuotaPriorityStats] = {
+                priority: QuotaPriorityStats(
+                    granted=int(counts["granted"]),
+                    waited=int(counts["waited"]),
+                    forced=int(counts["forced"]),
+                    wait_seconds=round(counts["wait_seconds"], 3),
+                )
+                for priority, counts in self._stats.items()
+            }
+        return QuotaStats(
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            available_requests=round(levels["requests"], 3),
+            available_tokens=round(levels["tokens"], 1),
+            by_priority=by_priority,
+        )
+
+    # ── Internal ───────────────────────────────────
+
+    async def _atransact(self, update: Callable[[BucketState], _T]) -> _T:
+        # The memory backend only takes a short in-process lock; any other
+        # backend may wait on a file lock or disk, so it runs in a worker thread.
+        if isinstance(self.backend, MemoryQuotaBackend):
+            return self.backend.transact(update)
+        return await asyncio.to_thread(self.backend.transact, update)
+
+    def _clamp(self, tokens: int, priority: QuotaPriority) -> int:
+        # A request larger than the share of the bucket its priority may use
+        # could never be admitted; settle() charges the rest afterwards.
+        if self.tokens_per_minute:
+            share = int(self.tokens_per_minute * (1 - _HEADROOM[priority]))
+            return min(tokens, max(share, 1))
+        return tokens
+
+    def _refill(self, state: BucketState) -> BucketState:
+        now = self._now()
+        elapsed = max(0.0, now - state.get("updated", now))
+        state["requests"] = min(
+            float(self.requests_per_minute),
+            state.get("requests", float(self.requests_per_minute))
+            + elapsed * self.requests_per_minute / 60,
+        )
+        state["tokens"] = min(
+            float(self.tokens_per_minute),
+            state.get("tokens", float(self.tokens_per_minute))
+            + elapsed * self.tokens_per_minute / 60,
+        )
+        state["updated"] = now
+        return dict(state)
+
+    def _try_reserve(self, state: BucketState, priority: QuotaPriority, tokens: int) -> float:
+        """Charge the request and return 0, or return the seconds to wait for capacity."""
+
+        self._refill(state)
+        headroom = _HEADROOM[priority]
+        wait = 0.0
+        if self.requests_per_minute:
+            needed = min(1 + headroom * self.requests_per_minute, self.requests_per_minute)
+            missing = needed - state["requests"]
+            wait = max(wait, missing * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            missing = tokens + headroom * self.tokens_per_minute - state["tokens"]
+            wait = max(wait, missing * 60 / self.tokens_per_minute)
+        if wait > 0.0:
+            return wait
+        self._charge(state, tokens)
+        return 0.0
+
+    def _charge(self, state: BucketState, tokens: int, *, refill: bool = False) -> None:
+        if refill:
+            self._refill(state)
+        if self.requests_per_minute:
+            state["requests"] -= 1
+        if self.tokens_per_minute:
+            state["tokens"] -= tokens
+
+    def _adjust_tokens(self, state: BucketState, delta: float) -> None:
+        self._refill(state)
+        state["tokens"] = min(float(self.tokens_per_minute), state["tokens"] + delta)
+
+    def _granted(self, priority: QuotaPriority, tokens: int, waited: float) -> QuotaGrant:
+        self._count(priority, waited, forced=False)
+        if waited > 0.0:
+            logger.info("bedrock_quota_waited", priority=priority, waited=round(waited, 3))
+        return QuotaGrant(priority=priority, tokens=tokens, waited_seconds=waited)
+
+    def _force(self, priority: QuotaPriority, tokens: int, waited: float) -> QuotaGrant:
+        # Sent anyway; the charge goes into debt so every process backs off.
+        self.backend.transact(lambda state: self._charge(state, tokens, refill=True))
+        return self._forced(priority, tokens, waited)
+
+    def _forced(self, priority: QuotaPriority, tokens: int, waited: float) -> QuotaGrant:
+        self._count(priority, waited, forced=True)
+        logger.warning("bedrock_quota_wait_exceeded", priority=priority, waited=round(waited, 3))
+        return QuotaGrant(priority=priority, tokens=tokens, waited_seconds=waited, forced=True)
+
+    def _count(self, priority: QuotaPriority, waited: float, *, forced: bool) -> None:
+        with self._lock:
+            counts = self._stats[priority]
+            counts["granted"] += 1
+            counts["wait_seconds"] += waited
+            if waited > 0.0:
+                counts["waited"] += 1
+            if forced:
+                counts["forced"] += 1
+
+
+def _load_state(text: str) -> BucketState:
+    try:
+        loaded = json.loads(text) if text.strip() else {}
+    except ValueError:
+        return {}
+    if not isinstance(loaded, dict):
+        return {}
+    return {key: float(value) for key, value in loaded.items() if isinstance(value, int | float)}
+
+
+# ── Process-wide scheduler ─────────────────────────
+
+_scheduler: QuotaScheduler | None = None
+_scheduler_configured = False
+_scheduler_lock = threading.Lock()
+
+
+def build_quota_scheduler(
+    *,
+    requests_per_minute: int = BEDROCK_QUOTA_RPM,
+    tokens_per_minute: int = BEDROCK_QUOTA_TPM,
+    backend: str = BEDROCK_QUOTA_BACKEND,
+    state_file: str = BEDROCK_QUOTA_STATE_FILE,
+) -> QuotaScheduler | None:
+    """Create the configured scheduler, or ``None`` when both quotas are 0."""
+
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+    normalized = backend.strip().casefold()
+    if normalized == "memory":
+        store: QuotaBackend = MemoryQuotaBackend()
+    elif normalized == "file":
+        store = FileQuotaBackend(state_file)
+    else:
+        raise ValueError(f"Unknown BEDROCK_QUOTA_BACKEND {backend!r}. Expected 'memory' or 'file'.")
+    return QuotaScheduler(
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        backend=store,
+    )
+
+
+def quota_scheduler() -> QuotaScheduler | None:
+    """Return the process-wide scheduler, built from settings on first use."""
+
+    global _scheduler, _scheduler_configured
+    with _scheduler_lock:
+        if not _scheduler_configured:
+            _scheduler = build_quota_scheduler()
+            _scheduler_configured = True
+        return _scheduler
+
+
+def configure_quota_scheduler(scheduler: QuotaScheduler | None) -> None:
+    """Replace the process-wide scheduler (tests, custom backends)."""
+
+    global _scheduler, _scheduler_configured
+    with _scheduler_lock:
+        _scheduler = scheduler
+        _scheduler_configured = True
+
+
+def reset_quota_scheduler() -> None:
+    """Rebuild the scheduler from settings on next use (tests)."""
+
+    global _scheduler, _scheduler_configured
+    with _scheduler_lock:
+        _scheduler = None
+        _scheduler_configured = False
@@ -0,0 +1,178 @@
+"""
+Retry policy for Bedrock calls: full-jitter backoff and a retry budget.
+
+Backoff uses "full jitter": the delay before retry *n* is drawn uniformly
+from ``[0, min(max_delay, base_delay * 2**n)]``. Throttled workers thus
+spread out instead of waking up together and hitting Bedrock again at
+the same moment.
+
+The retry budget is process-wide. Every first attempt deposits ``ratio``
+tokens and every retry spends one, with the balance capped at ``burst``.
+Over time, retries stay below ``ratio`` of the traffic plus a small burst.
+Once the budget is spent, the retryable error is raised straight away
+instead of piling more load onto a struggling endpoint.
+
+Calls, retries, recoveries, give-ups and budget denials are counted per
+call site (the ``NovaClient.caller`` label).
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+
+import structlog
+from config.settings import (
+    BEDROCK_MAX_RETRIES,
+    BEDROCK_RETRY_BASE_DELAY,
+    BEDROCK_RETRY_BUDGET_BURST,
+    BEDROCK_RETRY_BUDGET_RATIO,
+    BEDROCK_RETRY_MAX_DELAY,
+)
+from pydantic import BaseModel, ConfigDict
+
+logger = structlog.get_logger()
+
+MAX_RETRIES = BEDROCK_MAX_RETRIES
+RETRY_BASE_DELAY = BEDROCK_RETRY_BASE_DELAY  # seconds
+RETRY_MAX_DELAY = BEDROCK_RETRY_MAX_DELAY  # seconds
+
+_jitter = random.SystemRandom()
+
+_COUNTERS = ("calls", "retries", "recovered", "exhausted", "budget_denied")
+
+
+class RetrySiteStats(BaseModel):
+    """Retry counters of one call site."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    calls: int = 0
+    retries: int = 0
+    recovered: int = 0
+    exhausted: int = 0
+    budget_denied: int = 0
+
+
+class RetryStats(BaseModel):
+    """Process-lifetime retry counters and the remaining retry budget."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    budget_ratio: float
+    budget_burst: float
+    budget_tokens: float
+    total: RetrySiteStats
+    by_caller: dict[str, RetrySiteStats]
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter delay in seconds before retry number *attempt* (0-based)."""
+
+    ceiling = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2**attempt))
+    return _jitter.uniform(0.0, ceiling)
+
+
+class RetryBudget:
+    """Thread-safe token bucket that caps retries at a share of first attempts."""
+
+    def __init__(self, *, ratio: float, burst: float) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Credit one first attempt."""
+
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry; ``False`` once the budget is exhausted."""
+
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return self._tokens
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tokens = self.burst
+
+
+class RetryTracker:
+    """Applies a :class:`RetryBudget` and counts outcomes per call site."""
+
+    def __init__(self, budget: RetryBudget) -> None:
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._by_caller: dict[str, dict[str, int]] = {}
+
+    def record_call(self, caller: str) -> None:
+        self.budget.deposit()
+        self._count(caller, "calls")
+
+    def allow_retry(self, caller: str) -> bool:
+        if self.budget.try_spend():
+            self._count(caller, "retries")
+            return True
+        self._count(caller, "budget_denied")
+        logger.warning("bedrock_retry_budget_exhausted", caller=caller)
+        return False
+
+    def record_recovered(self, caller: str) -> None:
+        self._count(caller, "recovered")
+
+    def record_exhausted(self, caller: str) -> None:
+        self._count(caller, "exhausted")
+
+    def stats(self) -> RetryStats:
+        with self._lock:
+            by_caller = {caller: dict(counts) for caller, counts in self._by_caller.items()}
+        total = dict.fromkeys(_COUNTERS, 0)
+        for counts in by_caller.values():
+            for key, value in counts.items():
+                total[key] += value
+        return RetryStats(
+            budget_ratio=self.budget.ratio,
+            budget_burst=self.budget.burst,
+            budget_tokens=round(self.budget.tokens, 3),
+            total=RetrySiteStats(**total),
+            by_caller={
+                caller: RetrySiteStats(**counts) for caller, counts in sorted(by_caller.items())
+            },
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_caller.clear()
+        self.budget.reset()
+
+    def _count(self, caller: str, key: str) -> None:
+        with self._lock:
+            counts = self._by_caller.setdefault(caller, dict.fromkeys(_COUNTERS, 0))
+            counts[key] += 1
+
+
+retry_tracker = RetryTracker(
+    RetryBudget(ratio=BEDROCK_RETRY_BUDGET_RATIO, burst=BEDROCK_RETRY_BUDGET_BURST)
+)
+
+
+def retry_stats() -> RetryStats:
+    """Return process-lifetime retry counters per call site."""
+
+    return retry_tracker.stats()
+
+
+def reset_retry_stats() -> None:
+    """Zero the counters and refill the retry budget (tests)."""
+
+    retry_tracker.reset()
@@ -38,6 +38,10 @@ _SHAME_REPLACEMENTS = {
     "selbstverstaendlich": "zur Einordnung",
 }
 
+_SHAME_REPLACEMENT_RES = {
+    pattern: re.compile(re.escape(pattern), re.IGNORECASE) for pattern in _SHAME_REPLACEMENTS
+}
+
 
 def apply_anti_shame_filter(text: str) -> str:
     """Rewrite obvious shame-reinforcing language into neutral wording."""
@@ -49,7 +53,7 @@ def apply_anti_shame_filter(text: str) -> str:
         logger.warning("shame_pattern_detected", pattern=pattern)
         replacement = _SHAME_REPLACEMENTS.get(pattern)
         if replacement:
-            filtered = re.sub(re.escape(pattern), replacement, filtered, flags=re.IGNORECASE)
+            filtered = _SHAME_REPLACEMENT_RES[pattern].sub(replacement, filtered)
             lower = filtered.lower()
     return filtered
 
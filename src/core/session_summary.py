@@ -5,7 +5,7 @@ from __future__ import annotations
 import ast
 import json
 import re
-from typing import Protocol, cast
+from typing import Protocol, cast, runtime_checkable
 
 import structlog
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
@@ -71,6 +71,34 @@ class SessionSummarizer(Protocol):
         """Return profile facts and a conversation overview for the session."""
 
 
+@runtime_checkable
+class IncrementalSessionSummarizer(SessionSummarizer, Protocol):
+    """Summarizer that can fold only the newest messages into an existing summary."""
+
+    def summarize_delta(
+        self,
+        new_messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary,
+    ) -> SessionSummary | None:
+        """Return the updated summary, or ``None`` when the update failed."""
+
+
+@runtime_checkable
+class FallibleSessionSummarizer(SessionSummarizer, Protocol):
+    """Summarizer that reports a failed full summary instead of falling back."""
+
+    def try_summarize(
+        self,
+        messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary | None = None,
+    ) -> SessionSummary | None:
+        """Return the summary of *messages*, or ``None`` when the request failed."""
+
+
 class SummaryClient(Protocol):
     """Minimal client surface needed by the internal session summarizer."""
 
@@ -92,7 +120,7 @@ class NovaSessionSummarizer:
     """Use Nova to maintain dynamic sidebar memory in the background."""
 
     def __init__(self, client: SummaryClient | None = None) -> None:
-        self.client = client or NovaClient()
+        self.client = client or NovaClient(caller="summarizer")
 
     def summarize(
         self,
@@ -101,11 +129,68 @@ class NovaSessionSummarizer:
         ui_language: str,
         previous_summary: SessionSummary | None = None,
     ) -> SessionSummary:
+        summary = self.try_summarize(
+            messages, ui_language=ui_language, previous_summary=previous_summary
+        )
+        if summary is None:
+            return previous_summary or SessionSummary()
+        return summary
+
+    def try_summarize(
+        self,
+        messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary | None = None,
+    ) -> SessionSummary | None:
+        """Like :meth:`summarize`, but return ``None`` when the request failed.
+
+        Callers that track a high-water mark use this, so messages are not
+        marked as summarized by a fallback.
+        """
+
         if not messages:
             return previous_summary or SessionSummary()
 
-        trimmed_messages = messages[-_MAX_SUMMARY_MESSAGES:]
-        summary_messages = _build_summary_messages(trimmed_messages, ui_language=ui_language)
+        return self._request_summary(
+            _build_summary_messages(messages[-_MAX_SUMMARY_MESSAGES:], ui_language=ui_language),
+            ui_language=ui_language,
+            previous_summary=previous_summary,
+        )
+
+    def summarize_delta(
+        self,
+        new_messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary,
+    ) -> SessionSummary | None:
+        """Fold only the messages added since *previous_summary* into it.
+
+        Input size stays roughly constant per turn instead of growing with the
+        transcript. Returns ``None`` on failure so the caller keeps its
+        high-water mark and retries these messages next time.
+        """
+
+        if not new_messages:
+            return previous_summary
+
+        return self._request_summary(
+            _build_delta_summary_messages(
+                new_messages[-_MAX_SUMMARY_MESSAGES:],
+                ui_language=ui_language,
+            ),
+            ui_language=ui_language,
+            previous_summary=previous_summary,
+        )
+
+    def _request_summary(
+        self,
+        summary_messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary | None,
+    ) -> SessionSummary | None:
         system_prompt = _build_system_prompt(
             ui_language=ui_language,
             previous_summary=previous_summary,
@@ -122,7 +207,7 @@ class NovaSessionSummarizer:
             text = self.client.extract_text(response).strip()
             if not text:
                 logger.info("session_summary_empty_response")
-                return previous_summary or SessionSummary()
+                return None
             payload = _extract_json_payload(text)
             summary = SessionSummary.model_validate(payload)
             if summary.has_content:
@@ -130,7 +215,7 @@ class NovaSessionSummarizer:
             return previous_summary or summary
         except (NovaClientError, ValidationError, ValueError, json.JSONDecodeError) as exc:
             logger.warning("session_summary_failed", error=str(exc), type=type(exc).__name__)
-            return previous_summary or SessionSummary()
+            return None
 
 
 def _build_system_prompt(
@@ -178,6 +263,21 @@ def _build_summary_messages(messages: list[dict], *, ui_language: str) -> list[d
     return [{"role": "user", "content": [{"text": request}]}]
 
 
+def _build_delta_summary_messages(messages: list[dict], *, ui_language: str) -> list[dict]:
+    transcript = _render_transcript(messages)
+    prompt_language = "German" if ui_language == "de" else "English"
+    request = (
+        "Update the existing session memory with the new chat messages below.\n"
+        "The transcript contains ONLY the messages added since the existing summary was "
+        "written; everything earlier is already captured in that summary.\n"
+        f"Write every JSON string in {prompt_language}.\n"
+        "Return the complete updated memory as strict JSON only.\n\n"
+        "New messages:\n"
+        f"{transcript}"
+    )
+    return [{"role": "user", "content": [{"text": request}]}]
+
+
 def _render_transcript(messages: list[dict]) -> str:
     lines: list[str] = []
     for message in messages:
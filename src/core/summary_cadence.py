@@ -0,0 +1,117 @@
+"""
+Cadence policies that decide when a session summary is worth a Nova call.
+
+Summarizing after every turn re-sends most of the transcript even when the
+new turn adds nothing to the sidebar. A policy looks at what changed since
+the last successful summary and answers one question: summarize now or not.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from config.settings import (
+    SUMMARY_CADENCE_MODE,
+    SUMMARY_EVERY_N_TURNS,
+    SUMMARY_TOKEN_GROWTH,
+)
+
+
+@dataclass(frozen=True)
+class SummaryProgress:
+    """What a session gained since its last successful summary."""
+
+    new_messages: int
+    new_tokens: int
+    signals_changed: bool
+    has_summary: bool
+
+
+class SummaryCadence(Protocol):
+    """Decide whether a session should be summarized after the latest turn."""
+
+    def should_summarize(self, progress: SummaryProgress) -> bool: ...
+
+
+@dataclass(frozen=True)
+class EveryTurn:
+    """Summarize whenever there is anything new (the pre-cadence behavior)."""
+
+    def should_summarize(self, progress: SummaryProgress) -> bool:
+        return progress.new_messages > 0
+
+
+@dataclass(frozen=True)
+class EveryNTurns:
+    """Summarize once *turns* user/assistant exchanges have accumulated."""
+
+    turns: int
+
+    def should_summarize(self, progress: SummaryProgress) -> bool:
+        return progress.new_messages >= 2 * max(self.turns, 1)
+
+
+@dataclass(frozen=True)
+class TokenGrowth:
+    """Summarize once the unsummarized transcript has grown by *min_tokens*."""
+
+    min_tokens: int
+
+    def should_summarize(self, progress: SummaryProgress) -> bool:
+        return progress.new_messages > 0 and progress.new_tokens >= self.min_tokens
+
+
+@dataclass(frozen=True)
+class ProfileSignalChange:
+    """Summarize when local topic or identity signals changed.
+
+    The signals come from the keyword tables the session already uses for
+    prompt memory, so detecting a change costs no model call. The first
+    exchange of a session is always summarized so the sidebar is never blank.
+    """
+
+    def should_summarize(self, progress: SummaryProgress) -> bool:
+        if progress.new_messages == 0:
+            return False
+        return progress.signals_changed or not progress.has_summary
+
+
+@dataclass(frozen=True)
+class AnyOf:
+    """Summarize when any of the wrapped policies fires."""
+
+    policies: tuple[SummaryCadence, ...]
+
+    def should_summarize(self, progress: SummaryProgress) -> bool:
+        return any(policy.should_summarize(progress) for policy in self.policies)
+
+
+def build_summary_cadence(mode: str = SUMMARY_CADENCE_MODE) -> SummaryCadence:
+    """Build the configured cadence policy.
+
+    ``every_turn`` keeps the original behavior; ``adaptive`` (the default)
+    combines signal changes, a turn count and a token-growth threshold.
+    """
+
+    normalized = mode.strip().casefold()
+    if normalized == "every_turn":
+        return EveryTurn()
+    if normalized == "every_n_turns":
+        return EveryNTurns(SUMMARY_EVERY_N_TURNS)
+    if normalized == "token_growth":
+        return TokenGrowth(SUMMARY_TOKEN_GROWTH)
+    if normalized == "signals":
+        return ProfileSignalChange()
+    if normalized == "adaptive":
+        return AnyOf(
+            (
+                ProfileSignalChange(),
+                EveryNTurns(SUMMARY_EVERY_N_TURNS),
+                TokenGrowth(SUMMARY_TOKEN_GROWTH),
+            )
+        )
+    raise ValueError(
+        f"Unknown SUMMARY_CADENCE_MODE {mode!r}. "
+        "Use one of: adaptive, every_turn, every_n_turns, token_growth, signals."
+    )
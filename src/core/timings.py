@@ -0,0 +1,103 @@
+"""
+Per-turn latency breakdown.
+
+A ``TurnTimer`` travels with one chat or onboarding turn and collects
+monotonic stage durations. The orchestration layer owns it; agents only see
+it through request metadata (``TURN_TIMER_KEY``) so they can time the parts
+that happen inside them, such as prompt assembly.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+TURN_TIMER_KEY = "turn_timer"
+
+
+class TurnTimings(BaseModel):
+    """Stage durations for one turn, in milliseconds.
+
+    Stages that did not run for a turn stay ``None``. ``first_chunk_ms`` is
+    measured from the start of the turn to the first visible streamed chunk.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    context_ms: float | None = None
+    route_ms: float | None = None
+    crisis_ms: float | None = None
+    triage_ms: float | None = None
+    provenance_ms: float | None = None
+    prompt_build_ms: float | None = None
+    first_chunk_ms: float | None = None
+    generation_ms: float | None = None
+    store_ms: float | None = None
+    total_ms: float
+
+
+_STAGES = frozenset(name.removesuffix("_ms") for name in TurnTimings.model_fields) - {"total"}
+
+
+class TurnTimer:
+    """Collect stage timings for a single turn."""
+
+    def __init__(self, *, now: Callable[[], float] | None = None) -> None:
+        self._now = now or time.monotonic
+        self._started = self._now()
+        self._stages: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block; repeated stages accumulate."""
+
+        started = self._now()
+        try:
+            yield
+        finally:
+            self.record(name, (self._now() - started) * 1000)
+
+    def record(self, name: str, elapsed_ms: float | None) -> None:
+        """Add an externally measured duration to *name*."""
+
+        if name not in _STAGES:
+            raise ValueError(f"Unknown turn stage: {name}")
+        if elapsed_ms is None:
+            return
+        self._stages[name] = self._stages.get(name, 0.0) + elapsed_ms
+
+    def elapsed_ms(self) -> float:
+        """Return milliseconds since the turn started."""
+
+        return (self._now() - self._started) * 1000
+
+    def mark_first_chunk(self) -> None:
+        """Record time-to-first-chunk once; later calls are ignored."""
+
+        if "first_chunk" not in self._stages:
+            self._stages["first_chunk"] = self.elapsed_ms()
+
+    def finish(self) -> TurnTimings:
+        """Freeze the collected stages into a ``TurnTimings`` snapshot."""
+
+        values: dict[str, Any] = {
+            f"{name}_ms": round(elapsed, 2) for name, elapsed in self._stages.items()
+        }
+        values["total_ms"] = round(self.elapsed_ms(), 2)
+        return TurnTimings(**values)
+
+
+@contextmanager
+def timed_stage(metadata: dict[str, Any] | None, name: str) -> Iterator[None]:
+    """Time a block against the turn timer carried in *metadata*, if any."""
+
+    timer = metadata.get(TURN_TIMER_KEY) if metadata else None
+    if not isinstance(timer, TurnTimer):
+        yield
+        return
+    with timer.stage(name):
+        yield
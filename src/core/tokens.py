@@ -0,0 +1,36 @@
+"""
+Cheap local token estimates.
+
+Used for budgeting decisions (summary cadence, history windows) where an
+exact count is not worth a tokenizer or a Bedrock round-trip. Nova models
+average roughly four characters per token for German and English text.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Return an approximate token count for *text*."""
+
+    if not text:
+        return 0
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages: list[dict[str, Any]]) -> int:
+    """Return an approximate token count for the text blocks of Converse messages."""
+
+    total = 0
+    for message in messages:
+        content = message.get("content", ())
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+            continue
+        for block in content:
+            if isinstance(block, dict):
+                total += estimate_tokens(str(block.get("text", "")))
+    return total
@@ -0,0 +1,115 @@
+"""
+Bounded in-memory cache with per-entry expiry.
+
+Used in front of deterministic classification calls (router, Crisis Radar)
+whose inputs repeat across sessions, such as quick-action messages. Entries
+are evicted least-recently-used once ``max_entries`` is reached and ignored
+after ``ttl_seconds``. Keys are SHA-256 digests of the caller's key text, so
+cached entries never hold user messages in clear text.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+_V = TypeVar("_V")
+
+
+class CacheStats(BaseModel):
+    """Process-lifetime counters for one cache."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+
+
+class TTLCache(Generic[_V]):
+    """Thread-safe LRU cache whose entries expire after ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        now: Callable[[], float] | None = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._now = now or time.monotonic
+        self._entries: OrderedDict[str, tuple[float, _V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> _V | None:
+        """Return the live value for *key*, or ``None`` on a miss."""
+
+        digest = _digest(key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= self._now():
+                if entry is not None:
+                    del self._entries[digest]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: _V) -> None:
+        """Store *value* under *key*, evicting the least recently used entry if full."""
+
+        digest = _digest(key)
+        with self._lock:
+            self._entries[digest] = (self._now() + self.ttl_seconds, value)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def __contains__(self, key: object) -> bool:
+        # Membership does not count as a hit or miss.
+        if not isinstance(key, str):
+            return False
+        with self._lock:
+            entry = self._entries.get(_digest(key))
+            return entry is not None and entry[0] > self._now()
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return CacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds,
+                hits=self._hits,
+                misses=self._misses,
+                hit_rate=round(self._hits / lookups, 4) if lookups else 0.0,
+                evictions=self._evictions,
+            )
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
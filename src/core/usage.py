@@ -0,0 +1,207 @@
+"""
+Bedrock token usage and cost accounting.
+
+Every Converse response, and the ``metadata`` event that ends every stream,
+carries a ``usage`` block (input, output, cache-read and cache-write tokens)
+and a ``metrics`` block (``latencyMs``). ``record_usage`` adds them to the
+process totals, labeled with the calling component (``router``, ``crisis``,
+``triage``, ``summarizer`` or an agent name), and to the meter bound to the
+current context.
+
+``ChatService`` binds one meter per turn and merges it into the session's
+meter when the turn completes; background summaries are recorded directly
+on the session. Meters are bound with :mod:`contextvars`, so work handed to
+a thread pool is submitted through ``contextvars.copy_context().run`` to keep
+its attribution. Costs are estimates from the configured per-million-token
+prices, not billing data.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+import structlog
+from config.settings import (
+    BEDROCK_PRICE_CACHE_READ_PER_MTOK,
+    BEDROCK_PRICE_CACHE_WRITE_PER_MTOK,
+    BEDROCK_PRICE_INPUT_PER_MTOK,
+    BEDROCK_PRICE_OUTPUT_PER_MTOK,
+)
+from pydantic import BaseModel, ConfigDict
+
+logger = structlog.get_logger()
+
+UNLABELED_CALLER = "unlabeled"
+
+_COUNTERS = (
+    "requests",
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_write_input_tokens",
+    "latency_ms",
+)
+
+
+class UsageTotals(BaseModel):
+    """Summed Bedrock usage of one caller, turn, session or process."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_write_input_tokens: int = 0
+    total_tokens: int = 0
+    latency_ms: int = 0
+    estimated_cost_usd: float = 0.0
+
+
+class UsageReport(BaseModel):
+    """Usage totals overall and per calling component."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    total: UsageTotals
+    by_caller: dict[str, UsageTotals]
+
+
+class UsageMeter:
+    """Thread-safe per-caller usage counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_caller: dict[str, dict[str, int]] = {}
+
+    def add(self, caller: str, counts: dict[str, int]) -> None:
+        with self._lock:
+            totals = self._by_caller.setdefault(caller, dict.fromkeys(_COUNTERS, 0))
+            for key, value in counts.items():
+                totals[key] += value
+
+    def merge(self, other: UsageMeter) -> None:
+        """Add every counter of *other* to this meter."""
+
+        with other._lock:
+            snapshot = {caller: dict(totals) for caller, totals in other._by_caller.items()}
+        for caller, totals in snapshot.items():
+            self.add(caller, totals)
+
+    def total_tokens(self) -> int:
+        with self._lock:
+            return sum(_token_sum(totals) for totals in self._by_caller.values())
+
+    def totals(self) -> UsageTotals:
+        return self.report().total
+
+    def report(self) -> UsageReport:
+        with self._lock:
+            by_caller = {caller: dict(totals) for caller, totals in self._by_caller.items()}
+        overall = dict.fromkeys(_COUNTERS, 0)
+        for totals in by_caller.values():
+            for key, value in totals.items():
+                overall[key] += value
+        return UsageReport(
+            total=_to_totals(overall),
+            by_caller={caller: _to_totals(totals) for caller, totals in sorted(by_caller.items())},
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_caller.clear()
+
+
+_process_meter = UsageMeter()
+_active_meter: ContextVar[UsageMeter | None] = ContextVar("bedrock_usage_meter", default=None)
+
+
+@contextmanager
+def metered(meter: UsageMeter) -> Iterator[UsageMeter]:
+    """Attribute Bedrock usage recorded in this context to *meter*."""
+
+    previous = _active_meter.get()
+    _active_meter.set(meter)
+    try:
+        yield meter
+    finally:
+        # set() rather than reset(): a generator may be closed from another context.
+        _active_meter.set(previous)
+
+
+def current_meter() -> UsageMeter | None:
+    """Return the meter bound to the current context, if any."""
+
+    return _active_meter.get()
+
+
+def record_usage(
+    usage: dict[str, Any] | None,
+    *,
+    caller: str = UNLABELED_CALLER,
+    metrics: dict[str, Any] | None = None,
+) -> None:
+    """Add one response's ``usage`` and ``metrics`` blocks to the active meters."""
+
+    if not usage:
+        return
+    counts = {
+        "requests": 1,
+        "input_tokens": int(usage.get("inputTokens", 0)),
+        "output_tokens": int(usage.get("outputTokens", 0)),
+        "cache_read_input_tokens": int(usage.get("cacheReadInputTokens", 0)),
+        "cache_write_input_tokens": int(usage.get("cacheWriteInputTokens", 0)),
+        "latency_ms": int((metrics or {}).get("latencyMs", 0)),
+    }
+    _process_meter.add(caller, counts)
+    meter = _active_meter.get()
+    if meter is not None:
+        meter.add(caller, counts)
+    logger.debug("bedrock_usage", caller=caller, **counts)
+
+
+def usage_token_total(usage: dict[str, Any]) -> int:
+    """Return the tokens a Converse ``usage`` block counts against the TPM quota."""
+
+    if "totalTokens" in usage:
+        return int(usage["totalTokens"])
+    return int(usage.get("inputTokens", 0)) + int(usage.get("outputTokens", 0))
+
+
+def process_usage() -> UsageReport:
+    """Return usage since start-up (or the last :func:`reset_process_usage`)."""
+
+    return _process_meter.report()
+
+
+def reset_process_usage() -> None:
+    """Zero the process counters (tests)."""
+
+    _process_meter.reset()
+
+
+def _token_sum(totals: dict[str, int]) -> int:
+    return (
+        totals["input_tokens"]
+        + totals["output_tokens"]
+        + totals["cache_read_input_tokens"]
+        + totals["cache_write_input_tokens"]
+    )
+
+
+def _to_totals(totals: dict[str, int]) -> UsageTotals:
+    cost = (
+        totals["input_tokens"] * BEDROCK_PRICE_INPUT_PER_MTOK
+        + totals["output_tokens"] * BEDROCK_PRICE_OUTPUT_PER_MTOK
+        + totals["cache_read_input_tokens"] * BEDROCK_PRICE_CACHE_READ_PER_MTOK
+        + totals["cache_write_input_tokens"] * BEDROCK_PRICE_CACHE_WRITE_PER_MTOK
+    ) / 1_000_000
+    return UsageTotals(
+        **totals,
+        total_tokens=_token_sum(totals),
+        estimated_cost_usd=round(cost, 6),
+    )
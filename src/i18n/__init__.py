@@ -1,10 +1,17 @@
 """Internationalization — UI strings in German and English."""
 
-from src.i18n.strings import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES, get_agent_label, t
+from src.i18n.strings import (
+    DEFAULT_LANGUAGE,
+    SUPPORTED_LANGUAGES,
+    get_agent_label,
+    quick_action_messages,
+    t,
+)
 
 __all__ = [
     "DEFAULT_LANGUAGE",
     "SUPPORTED_LANGUAGES",
     "get_agent_label",
+    "quick_action_messages",
     "t",
 ]
@@ -66,6 +66,7 @@ STRINGS = {
         "session_import_missing": "Choose a session file or paste session JSON first.",
         "session_import_success": "Session loaded into a new private chat.",
         "session_import_error": "This session file could not be loaded.",
+        "stream_interrupted": "\n\n_(This answer was cut off. Ask again if you need the rest.)_",
         "session_import_paste_label": "Or paste session JSON",
         "session_import_paste_placeholder": "Paste the contents of your saved KODA session JSON here if file upload is blocked.",
         "sidebar_crisis_note": "KODA noticed that this conversation may need urgent support. Use the crisis resources shown in the chat.",
@@ -162,6 +163,7 @@ STRINGS = {
         "session_import_missing": "Wähle zuerst eine Sitzungsdatei aus oder füge Sitzungs-JSON ein.",
         "session_import_success": "Sitzung in einen neuen privaten Chat geladen.",
         "session_import_error": "Diese Sitzungsdatei konnte nicht geladen werden.",
+        "stream_interrupted": "\n\n_(Diese Antwort wurde unterbrochen. Frag gern noch einmal, wenn du den Rest brauchst.)_",
         "session_import_paste_label": "Oder Sitzungs-JSON einfügen",
         "session_import_paste_placeholder": "Füge hier den Inhalt deiner gespeicherten KODA-Sitzungsdatei ein, falls der Datei-Upload blockiert wird.",
         "sidebar_crisis_note": "KODA hat erkannt, dass dieses Gespräch möglicherweise sofortige Unterstützung braucht. Nutze die Hilfsangebote im Chat.",
@@ -235,3 +237,13 @@ def t(key: str, lang: str = "en") -> str:
 def get_agent_label(agent: str, lang: str = "en") -> str:
     """Get agent label in the specified language."""
     return AGENT_LABELS.get(lang, AGENT_LABELS["en"]).get(agent, agent)
+
+
+def quick_action_messages() -> tuple[str, ...]:
+    """Return every fixed quick-action message (``quick_*_msg``) in all languages."""
+    return tuple(
+        text
+        for lang in SUPPORTED_LANGUAGES
+        for key, text in STRINGS[lang].items()
+        if key.startswith("quick_") and key.endswith("_msg")
+    )
@@ -7,8 +7,10 @@ from src.knowledge.source_registry import (
     TrustedSourceSelection,
     get_trusted_sources,
     load_trusted_source_manifests,
+    prime_trusted_source_registry,
     select_trusted_sources,
     should_use_trusted_sources,
+    trusted_source_registry_version,
 )
 
 __all__ = [
@@ -18,6 +20,8 @@ __all__ = [
     "TrustedSourceSelection",
     "get_trusted_sources",
     "load_trusted_source_manifests",
+    "prime_trusted_source_registry",
     "select_trusted_sources",
     "should_use_trusted_sources",
+    "trusted_source_registry_version",
 ]
@@ -12,7 +12,7 @@ import json
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import Literal, get_args
 from urllib.parse import urlparse
 
 from pydantic import BaseModel, ConfigDict, field_validator, model_validator
@@ -222,7 +222,9 @@ def load_trusted_source_manifests() -> tuple[TrustedSourceManifest, ...]:
     return tuple(manifests)
 
 
-@lru_cache(maxsize=1)
+# One entry per category plus the unfiltered view; a size of one would evict
+# on every change of specialist.
+@lru_cache(maxsize=8)
 def get_trusted_sources(category: SourceCategory | None = None) -> tuple[TrustedSource, ...]:
     """Return all curated sources, optionally filtered by category."""
 
@@ -235,6 +237,26 @@ def get_trusted_sources(category: SourceCategory | None = None) -> tuple[Trusted
     return sources
 
 
+def trusted_source_registry_version() -> str:
+    """Return a version tag covering every manifest, e.g. ``germany_de@3``.
+
+    Cached answers that cite the registry are keyed by this tag, so a manifest
+    bump invalidates them without any explicit purge.
+    """
+
+    return ",".join(
+        f"{manifest.registry_id}@{manifest.version}" for manifest in load_trusted_source_manifests()
+    )
+
+
+def prime_trusted_source_registry() -> int:
+    """Load the manifests and fill the per-category lookups; returns the source count."""
+
+    for category in get_args(SourceCategory):
+        get_trusted_sources(category)
+    return len(get_trusted_sources())
+
+
 def should_use_trusted_sources(context: SourceSelectionContext) -> tuple[bool, SelectionReason]:
     """
     Decide whether curated sources should be preferred for this request.
@@ -1,10 +1,33 @@
 """Shared orchestration services for chat flows."""
 
+from src.orchestration.agent_registry import LazyAgentRegistry
+from src.orchestration.canned_answers import CannedAnswerCache
 from src.orchestration.chat_service import (
     ChatService,
     ChatTurnResult,
     OnboardingTurnResult,
+    TurnUsage,
     build_default_chat_service,
 )
+from src.orchestration.semantic_cache import SemanticCacheStats, SemanticResponseCache
+from src.orchestration.speculation import SpeculationStats, SpeculativeRunner
+from src.orchestration.summaries import SummaryWorker, SummaryWorkerStats
+from src.orchestration.triage import ParallelTriage, TriageResult
 
-__all__ = ["ChatService", "ChatTurnResult", "OnboardingTurnResult", "build_default_chat_service"]
+__all__ = [
+    "CannedAnswerCache",
+    "ChatService",
+    "ChatTurnResult",
+    "LazyAgentRegistry",
+    "OnboardingTurnResult",
+    "ParallelTriage",
+    "SemanticCacheStats",
+    "SemanticResponseCache",
+    "SpeculationStats",
+    "SpeculativeRunner",
+    "SummaryWorker",
+    "SummaryWorkerStats",
+    "TriageResult",
+    "TurnUsage",
+    "build_default_chat_service",
+]
@@ -0,0 +1,71 @@
+"""
+Lazily constructed agent registry.
+
+Building every specialist up front makes importing the API or loading the
+Streamlit app pay for agents that a process may never use. The registry
+below keeps one factory per key and builds each agent the first time it is
+looked up; ``warm_up()`` builds the rest ahead of traffic when the caller
+has a startup hook to spend the time in.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+
+import structlog
+
+from src.agents.base import BaseAgent
+
+logger = structlog.get_logger()
+
+AgentFactory = Callable[[], BaseAgent]
+
+
+class LazyAgentRegistry(Mapping[str, BaseAgent]):
+    """Read-only agent mapping that constructs each agent on first access."""
+
+    def __init__(self, factories: Mapping[str, AgentFactory]) -> None:
+        self._factories = dict(factories)
+        self._agents: dict[str, BaseAgent] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> BaseAgent:
+        agent = self._agents.get(key)
+        if agent is not None:
+            return agent
+
+        factory = self._factories[key]
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is None:
+                started = time.monotonic()
+                agent = factory()
+                self._agents[key] = agent
+                logger.info(
+                    "agent_constructed",
+                    agent_key=key,
+                    elapsed_ms=round((time.monotonic() - started) * 1000, 2),
+                )
+            return agent
+
+    def __contains__(self, key: object) -> bool:
+        # Membership must not trigger construction.
+        return key in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def is_built(self, key: str) -> bool:
+        """Return whether *key* has already been constructed."""
+
+        return key in self._agents
+
+    def warm_up(self) -> tuple[BaseAgent, ...]:
+        """Construct every registered agent now and return them in key order."""
+
+        return tuple(self[key] for key in self._factories)
@@ -0,0 +1,75 @@
+"""
+Canned answers for the fixed quick-action messages.
+
+Every new session offers the same quick actions, and a click sends the same
+text for every user. For a session with no memory yet, the specialist's
+reply to that text depends only on the agent, the UI language and the
+trusted-source registry it cites, so the reply (with its provenance) is
+cached under exactly that key. Any session memory bypasses the cache, so
+personalized turns are always generated.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+import structlog
+from config.settings import CANNED_ANSWERS_MAX_ENTRIES, CANNED_ANSWERS_TTL_SECONDS
+
+from src.agents.base import FALLBACK_MESSAGES
+from src.core.provenance import AgentReply
+from src.core.ttl_cache import CacheStats, TTLCache
+from src.i18n import quick_action_messages
+from src.knowledge.source_registry import trusted_source_registry_version
+
+logger = structlog.get_logger()
+
+
+class CannedAnswerCache:
+    """Replies to quick-action messages, keyed by agent, language and registry version."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = CANNED_ANSWERS_MAX_ENTRIES,
+        ttl_seconds: float = CANNED_ANSWERS_TTL_SECONDS,
+        messages: Iterable[str] | None = None,
+        registry_version: Callable[[], str] = trusted_source_registry_version,
+        cache: TTLCache[AgentReply] | None = None,
+    ) -> None:
+        self._messages = frozenset(
+            message.strip()
+            for message in (quick_action_messages() if messages is None else messages)
+        )
+        self._registry_version = registry_version
+        self._cache: TTLCache[AgentReply] = cache or TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+
+    def eligible(self, message: str) -> bool:
+        """Return whether *message* is one of the fixed quick-action texts."""
+
+        return message.strip() in self._messages
+
+    def key(self, message: str, *, agent_key: str, ui_language: str) -> str:
+        return "|".join((agent_key, ui_language, self._registry_version(), message.strip()))
+
+    def get(self, key: str) -> AgentReply | None:
+        return self._cache.get(key)
+
+    def put(self, key: str, reply: AgentReply) -> None:
+        """Store *reply* unless it is empty or a temporary-failure fallback."""
+
+        text = reply.text.strip()
+        if not text or text in FALLBACK_MESSAGES.values():
+            return
+        self._cache.put(key, reply)
+
+    def invalidate(self) -> None:
+        """Drop every canned answer, e.g. after a prompt or content change."""
+
+        self._cache.clear()
+        logger.info("canned_answers_invalidated")
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
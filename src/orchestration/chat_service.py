@@ -4,10 +4,36 @@ Shared chat orchestration used by both the API and the Streamlit frontend.
 
 from __future__ import annotations
 
-from collections.abc import Generator
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import Counter
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterator,
+    Mapping,
+)
 from dataclasses import dataclass
-from typing import Any
-
+from typing import Any, TypeVar, cast
+
+import structlog
+from config.settings import (
+    CANNED_ANSWERS_ENABLED,
+    ROUTER_CACHE_PRESEED,
+    ROUTER_STICKY_ENABLED,
+    SEMANTIC_CACHE_ENABLED,
+    SESSION_TOKEN_BUDGET,
+    SPECULATIVE_SPECIALIST,
+    SUMMARY_EXPORT_WAIT_SECONDS,
+    TRIAGE_MODE,
+    TURN_TIMINGS_ENABLED,
+    TURN_USAGE_ENABLED,
+)
 from pydantic import BaseModel, ConfigDict
 
 from src.agents.academic_basics.hidden_curriculum import HiddenCurriculumAgent
@@ -19,6 +45,12 @@ from src.agents.onboarding import START_TRIGGER, OnboardingAgent
 from src.agents.role_models.anti_impostor import AntiImpostorAgent
 from src.agents.router import RouterAgent
 from src.agents.study_choice.degree_explorer import DegreeExplorerAgent
+from src.core.client import (
+    NovaClient,
+    StreamInterrupted,
+    endpoint_router,
+    prompt_cache_stats,
+)
 from src.core.conversation import (
     Conversation,
     ConversationStore,
@@ -26,21 +58,110 @@ from src.core.conversation import (
     SessionMemorySnapshot,
 )
 from src.core.documents import DocumentUploadInput, UploadedDocument, validate_document_uploads
+from src.core.embeddings import build_embedder
+from src.core.hedging import hedge_stats
+from src.core.history_window import fit_history
 from src.core.provenance import (
+    AgentReply,
     ResponseProvenance,
     build_default_provenance,
     build_document_source,
     build_provenance_context,
     with_document_sources,
 )
+from src.core.quota import quota_scheduler
+from src.core.retry import retry_stats
 from src.core.session_bundle import (
     SessionBundle,
     build_session_bundle,
     parse_session_bundle,
     portable_messages_to_history,
 )
-from src.core.session_summary import NovaSessionSummarizer, SessionSummarizer, SessionSummary
-from src.i18n import t
+from src.core.session_summary import NovaSessionSummarizer, SessionSummarizer
+from src.core.summary_cadence import EveryTurn, SummaryCadence, build_summary_cadence
+from src.core.timings import TURN_TIMER_KEY, TurnTimer, TurnTimings
+from src.core.usage import (
+    UsageMeter,
+    UsageReport,
+    UsageTotals,
+    current_meter,
+    metered,
+    process_usage,
+)
+from src.i18n import quick_action_messages, t
+from src.knowledge.source_registry import prime_trusted_source_registry
+from src.orchestration.agent_registry import LazyAgentRegistry
+from src.orchestration.canned_answers import CannedAnswerCache
+from src.orchestration.semantic_cache import SemanticLookup, SemanticResponseCache
+from src.orchestration.speculation import (
+    AsyncSpeculativeRun,
+    SpeculativeRun,
+    SpeculativeRunner,
+    single_item,
+)
+from src.orchestration.stickiness import StickyRoutingPolicy
+from src.orchestration.summaries import SummaryWorker, SummaryWorkerStats, refresh_session_summary
+from src.orchestration.triage import (
+    FALLBACK_AGENT,
+    ParallelTriage,
+    TriageResult,
+    TriageStage,
+    build_triage,
+)
+
+logger = structlog.get_logger()
+
+# Agents in these tool modes cannot stream and always answer in one piece.
+_NON_STREAMING_TOOL_MODES = frozenset({"code_interpreter", "web_grounding"})
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _metered_turn(method: _F) -> _F:
+    """Bind a fresh usage meter for one turn, including streamed turns."""
+
+    if inspect.isasyncgenfunction(method):
+
+        @functools.wraps(method)
+        async def agen_wrapper(*args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+            with metered(UsageMeter()):
+                async for item in method(*args, **kwargs):
+                    yield item
+
+        return cast(_F, agen_wrapper)
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with metered(UsageMeter()):
+                return await method(*args, **kwargs)
+
+        return cast(_F, async_wrapper)
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def gen_wrapper(*args: Any, **kwargs: Any) -> Generator[Any, None, None]:
+            with metered(UsageMeter()):
+                yield from method(*args, **kwargs)
+
+        return cast(_F, gen_wrapper)
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with metered(UsageMeter()):
+            return method(*args, **kwargs)
+
+    return cast(_F, wrapper)
+
+
+class TurnUsage(BaseModel):
+    """Bedrock usage of one turn by caller, and the session's running total."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    turn: UsageReport
+    session: UsageTotals
+    over_budget: bool = False
 
 
 class ChatTurnResult(BaseModel):
@@ -54,6 +175,8 @@ class ChatTurnResult(BaseModel):
     crisis: bool
     crisis_resources: dict[str, str] | None = None
     provenance: ResponseProvenance
+    timings: TurnTimings | None = None
+    usage: TurnUsage | None = None
 
 
 class OnboardingTurnResult(BaseModel):
@@ -68,6 +191,8 @@ class OnboardingTurnResult(BaseModel):
     profile_summary: str | None = None
     personalized_prompts: tuple[PersonalizedPrompt, ...] = ()
     provenance: ResponseProvenance
+    timings: TurnTimings | None = None
+    usage: TurnUsage | None = None
 
 
 @dataclass(frozen=True)
@@ -81,6 +206,29 @@ class PreparedChatTurn:
     agent: BaseAgent
     metadata: dict[str, Any]
     crisis_prefix: str
+    triage: TriageResult
+    timer: TurnTimer
+    speculative: SpeculativeRun | AsyncSpeculativeRun | None = None
+
+
+@dataclass(frozen=True)
+class _Speculation:
+    """A specialist call started for the session's previous agent."""
+
+    agent_key: str
+    agent: BaseAgent
+    metadata: dict[str, Any]
+    bedrock_messages: list[dict[str, Any]]
+    run: SpeculativeRun | AsyncSpeculativeRun
+
+
+@dataclass(frozen=True)
+class _CachedReply:
+    """Reply-cache lookups for one turn and, on a hit, the reply to reuse."""
+
+    canned_key: str | None = None
+    semantic: SemanticLookup | None = None
+    reply: AgentReply | None = None
 
 
 @dataclass(frozen=True)
@@ -90,6 +238,61 @@ class PreparedOnboardingTurn:
     session: Conversation
     bedrock_messages: list[dict[str, Any]]
     metadata: dict[str, Any]
+    timer: TurnTimer
+
+
+class _StreamCollector:
+    """Accumulate streamed chunks and honour the agent's replace sentinel.
+
+    A ``StreamInterrupted`` event from the agent keeps the partial answer and
+    appends a short localized note that it was cut off.
+    """
+
+    _REPLACE = "\x00REPLACE\x00"
+
+    def __init__(
+        self,
+        prefix: str = "",
+        *,
+        timer: TurnTimer | None = None,
+        ui_language: str = "en",
+    ) -> None:
+        self._prefix = prefix
+        self._timer = timer
+        self._ui_language = ui_language
+        self._chunks: list[str] = [prefix]
+        self._replace_text: str | None = None
+        self.interruption: StreamInterrupted | None = None
+
+    def accept(self, chunk: str | StreamInterrupted) -> Iterator[str]:
+        """Record one chunk and yield it back when it should be shown."""
+
+        if isinstance(chunk, StreamInterrupted):
+            self.interruption = chunk
+            logger.warning(
+                "chat_stream_interrupted",
+                chunks_delivered=chunk.chunks_delivered,
+                error=str(chunk.error),
+            )
+            notice = t("stream_interrupted", self._ui_language)
+            if self._replace_text is not None:
+                self._replace_text += notice
+            self._chunks.append(notice)
+            yield notice
+            return
+        if chunk.startswith(self._REPLACE):
+            self._replace_text = self._prefix + chunk.removeprefix(self._REPLACE)
+            return
+        self._chunks.append(chunk)
+        if self._timer is not None:
+            self._timer.mark_first_chunk()
+        yield chunk
+
+    @property
+    def text(self) -> str:
+        if self._replace_text is not None:
+            return self._replace_text
+        return "".join(self._chunks)
 
 
 @dataclass(frozen=True)
@@ -110,17 +313,39 @@ class ChatService:
         *,
         router: RouterAgent,
         crisis_radar: CrisisRadar,
-        agents: dict[str, BaseAgent],
+        agents: Mapping[str, BaseAgent],
         onboarding_agent: OnboardingAgent | None = None,
         sessions: ConversationStore | None = None,
         summarizer: SessionSummarizer | None = None,
+        triage: TriageStage | None = None,
+        summary_worker: SummaryWorker | None = None,
+        summary_cadence: SummaryCadence | None = None,
+        include_timings: bool = TURN_TIMINGS_ENABLED,
+        include_usage: bool = TURN_USAGE_ENABLED,
+        session_token_budget: int = SESSION_TOKEN_BUDGET,
+        speculator: SpeculativeRunner | None = None,
+        sticky_routing: StickyRoutingPolicy | None = None,
+        canned_answers: CannedAnswerCache | None = None,
+        semantic_cache: SemanticResponseCache | None = None,
     ) -> None:
         self.router = router
         self.crisis_radar = crisis_radar
+        self.triage = triage or ParallelTriage(router, crisis_radar)
         self.agents = agents
         self.onboarding_agent = onboarding_agent or OnboardingAgent()
         self.sessions = sessions or ConversationStore()
         self.summarizer = summarizer
+        self.summary_worker = summary_worker
+        self.summary_cadence = summary_cadence or EveryTurn()
+        self.include_timings = include_timings
+        self.include_usage = include_usage
+        self.session_token_budget = session_token_budget
+        self.speculator = speculator
+        self.sticky_routing = sticky_routing
+        self.canned_answers = canned_answers
+        self.semantic_cache = semantic_cache
+        self._summary_decisions: Counter[str] = Counter()
+        self._summary_decisions_lock = threading.Lock()
 
     @property
     def agent_keys(self) -> tuple[str, ...]:
@@ -128,6 +353,7 @@ class ChatService:
 
         return tuple(self.agents.keys())
 
+    @_metered_turn
     def respond(
         self,
         user_message: str,
@@ -145,26 +371,64 @@ class ChatService:
             session_id=session_id,
             ui_language=ui_language,
             conversation_metadata=conversation_metadata,
+            speculate="reply",
         )
-        reply = turn.agent.respond_with_details(turn.bedrock_messages, turn.metadata)
-        self._store_completed_turn(
-            turn.session,
+        cached = self._cached_reply(turn, user_message, ui_language, conversation_metadata)
+        with turn.timer.stage("generation"):
+            if cached.reply is not None:
+                reply = cached.reply
+            elif isinstance(turn.speculative, SpeculativeRun):
+                (reply,) = tuple(turn.speculative.items())
+            else:
+                reply = turn.agent.respond_with_details(turn.bedrock_messages, turn.metadata)
+                self._remember_reply(cached, reply)
+        return self._complete_turn(
+            turn,
             user_message=user_message,
             response=turn.crisis_prefix + reply.text,
-            agent_key=turn.agent_key,
             ui_language=ui_language,
-            crisis=turn.crisis["is_crisis"],
             provenance=reply.provenance,
         )
-        return ChatTurnResult(
-            session_id=turn.session.session_id,
+
+    @_metered_turn
+    async def arespond(
+        self,
+        user_message: str,
+        history: list[dict[str, Any]] | None = None,
+        *,
+        session_id: str | None = None,
+        ui_language: str = "en",
+        conversation_metadata: dict[str, Any] | None = None,
+    ) -> ChatTurnResult:
+        """Async variant of :meth:`respond` that never blocks the event loop."""
+
+        turn = await self._aprepare_turn(
+            user_message,
+            history=history or [],
+            session_id=session_id,
+            ui_language=ui_language,
+            conversation_metadata=conversation_metadata,
+            speculate="reply",
+        )
+        cached = await self._acached_reply(turn, user_message, ui_language, conversation_metadata)
+        with turn.timer.stage("generation"):
+            if cached.reply is not None:
+                reply = cached.reply
+            elif isinstance(turn.speculative, AsyncSpeculativeRun):
+                (reply,) = [item async for item in turn.speculative.items()]
+            else:
+                reply = await turn.agent.arespond_with_details(turn.bedrock_messages, turn.metadata)
+                self._remember_reply(cached, reply)
+        return await asyncio.to_thread(
+            self._complete_turn,
+            turn,
+            user_message=user_message,
             response=turn.crisis_prefix + reply.text,
-            agent=turn.agent_key,
-            crisis=turn.crisis["is_crisis"],
-            crisis_resources=turn.crisis.get("resources"),
+            ui_language=ui_language,
             provenance=reply.provenance,
         )
 
+    @_metered_turn
     def respond_with_documents(
         self,
         user_message: str,
@@ -187,35 +451,51 @@ class ChatService:
             conversation_metadata=conversation_metadata,
             documents=validated_documents,
         )
-        reply = turn.agent.respond_with_details(turn.bedrock_messages, turn.metadata)
-        document_sources = tuple(
-            build_document_source(document.name) for document in validated_documents
+        with turn.timer.stage("generation"):
+            reply = turn.agent.respond_with_details(turn.bedrock_messages, turn.metadata)
+        return self._complete_document_turn(
+            turn,
+            reply,
+            user_message=effective_message,
+            ui_language=ui_language,
+            documents=validated_documents,
         )
-        provenance = (
-            reply.provenance
-            if reply.provenance.document_used
-            else with_document_sources(reply.provenance, document_sources)
+
+    @_metered_turn
+    async def arespond_with_documents(
+        self,
+        user_message: str,
+        documents: list[DocumentUploadInput] | tuple[DocumentUploadInput, ...],
+        history: list[dict[str, Any]] | None = None,
+        *,
+        session_id: str | None = None,
+        ui_language: str = "en",
+        conversation_metadata: dict[str, Any] | None = None,
+    ) -> ChatTurnResult:
+        """Async variant of :meth:`respond_with_documents`."""
+
+        validated_documents = validate_document_uploads(list(documents))
+        effective_message = user_message.strip() or self._default_document_message(ui_language)
+        turn = await self._aprepare_turn(
+            effective_message,
+            history=history or [],
+            session_id=session_id,
+            ui_language=ui_language,
+            conversation_metadata=conversation_metadata,
+            documents=validated_documents,
         )
-        full_response = turn.crisis_prefix + reply.text
-        self._store_completed_turn(
-            turn.session,
+        with turn.timer.stage("generation"):
+            reply = await turn.agent.arespond_with_details(turn.bedrock_messages, turn.metadata)
+        return await asyncio.to_thread(
+            self._complete_document_turn,
+            turn,
+            reply,
             user_message=effective_message,
-            response=full_response,
-            agent_key=turn.agent_key,
             ui_language=ui_language,
-            crisis=turn.crisis["is_crisis"],
-            provenance=provenance,
             documents=validated_documents,
         )
-        return ChatTurnResult(
-            session_id=turn.session.session_id,
-            response=full_response,
-            agent=turn.agent_key,
-            crisis=turn.crisis["is_crisis"],
-            crisis_resources=turn.crisis.get("resources"),
-            provenance=provenance,
-        )
 
+    @_metered_turn
     def respond_stream(
         self,
         user_message: str,
@@ -233,49 +513,108 @@ class ChatService:
             session_id=session_id,
             ui_language=ui_language,
             conversation_metadata=conversation_metadata,
+            speculate="stream",
         )
 
         if turn.crisis_prefix:
+            turn.timer.mark_first_chunk()
             yield turn.crisis_prefix
 
-        collected: list[str] = [turn.crisis_prefix]
-        replace_text: str | None = None
+        collector = _StreamCollector(turn.crisis_prefix, timer=turn.timer, ui_language=ui_language)
         provenance = turn.metadata["provenance"]
-
-        if turn.agent.tool_mode in {"code_interpreter", "web_grounding"}:
-            reply = turn.agent.respond_with_details(turn.bedrock_messages, turn.metadata)
-            collected.append(reply.text)
-            provenance = reply.provenance
-            yield reply.text
-        else:
-            for chunk in turn.agent.respond_stream(turn.bedrock_messages, turn.metadata):
-                if chunk.startswith("\x00REPLACE\x00"):
-                    replace_text = turn.crisis_prefix + chunk.removeprefix("\x00REPLACE\x00")
-                    continue
-
-                collected.append(chunk)
-                yield chunk
-
-        full_response = replace_text if replace_text is not None else "".join(collected)
-        self._store_completed_turn(
-            turn.session,
+        cached = self._cached_reply(turn, user_message, ui_language, conversation_metadata)
+
+        with turn.timer.stage("generation"):
+            if cached.reply is not None:
+                provenance = cached.reply.provenance
+                yield from collector.accept(cached.reply.text)
+            elif isinstance(turn.speculative, SpeculativeRun):
+                for item in turn.speculative.items():
+                    if isinstance(item, AgentReply):
+                        provenance = item.provenance
+                        item = item.text
+                    yield from collector.accept(item)
+            elif turn.agent.tool_mode in _NON_STREAMING_TOOL_MODES:
+                reply = turn.agent.respond_with_details(turn.bedrock_messages, turn.metadata)
+                provenance = reply.provenance
+                yield from collector.accept(reply.text)
+            else:
+                for chunk in turn.agent.respond_stream(turn.bedrock_messages, turn.metadata):
+                    yield from collector.accept(chunk)
+        if cached.reply is None and collector.interruption is None:
+            self._remember_reply(cached, AgentReply(text=collector.text, provenance=provenance))
+
+        yield self._complete_turn(
+            turn,
             user_message=user_message,
-            response=full_response,
-            agent_key=turn.agent_key,
+            response=collector.text,
             ui_language=ui_language,
-            crisis=turn.crisis["is_crisis"],
             provenance=provenance,
         )
 
-        yield ChatTurnResult(
-            session_id=turn.session.session_id,
-            response=full_response,
-            agent=turn.agent_key,
-            crisis=turn.crisis["is_crisis"],
-            crisis_resources=turn.crisis.get("resources"),
+    @_metered_turn
+    async def arespond_stream(
+        self,
+        user_message: str,
+        history: list[dict[str, Any]] | None = None,
+        *,
+        session_id: str | None = None,
+        ui_language: str = "en",
+        conversation_metadata: dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str | ChatTurnResult, None]:
+        """Async variant of :meth:`respond_stream` with the same chunk protocol."""
+
+        turn = await self._aprepare_turn(
+            user_message,
+            history=history or [],
+            session_id=session_id,
+            ui_language=ui_language,
+            conversation_metadata=conversation_metadata,
+            speculate="stream",
+        )
+
+        if turn.crisis_prefix:
+            turn.timer.mark_first_chunk()
+            yield turn.crisis_prefix
+
+        collector = _StreamCollector(turn.crisis_prefix, timer=turn.timer, ui_language=ui_language)
+        provenance = turn.metadata["provenance"]
+        cached = await self._acached_reply(turn, user_message, ui_language, conversation_metadata)
+
+        with turn.timer.stage("generation"):
+            if cached.reply is not None:
+                provenance = cached.reply.provenance
+                for visible in collector.accept(cached.reply.text):
+                    yield visible
+            elif isinstance(turn.speculative, AsyncSpeculativeRun):
+                async for item in turn.speculative.items():
+                    if isinstance(item, AgentReply):
+                        provenance = item.provenance
+                        item = item.text
+                    for visible in collector.accept(item):
+                        yield visible
+            elif turn.agent.tool_mode in _NON_STREAMING_TOOL_MODES:
+                reply = await turn.agent.arespond_with_details(turn.bedrock_messages, turn.metadata)
+                provenance = reply.provenance
+                for visible in collector.accept(reply.text):
+                    yield visible
+            else:
+                async for chunk in turn.agent.arespond_stream(turn.bedrock_messages, turn.metadata):
+                    for visible in collector.accept(chunk):
+                        yield visible
+        if cached.reply is None and collector.interruption is None:
+            self._remember_reply(cached, AgentReply(text=collector.text, provenance=provenance))
+
+        yield await asyncio.to_thread(
+            self._complete_turn,
+            turn,
+            user_message=user_message,
+            response=collector.text,
+            ui_language=ui_language,
             provenance=provenance,
         )
 
+    @_metered_turn
     def start_onboarding(
         self,
         *,
@@ -285,17 +624,43 @@ class ChatService:
         """Start onboarding and return the first assistant greeting/question."""
 
         prepared = self._prepare_onboarding_start(session_id=session_id, ui_language=ui_language)
-        reply = self.onboarding_agent.respond_with_details(
-            prepared.bedrock_messages,
-            prepared.metadata,
+        with prepared.timer.stage("generation"):
+            reply = self.onboarding_agent.respond_with_details(
+                prepared.bedrock_messages,
+                prepared.metadata,
+            )
+        return self._finalize_onboarding_reply(
+            prepared.session,
+            response_text=reply.text,
+            ui_language=ui_language,
+            provenance=reply.provenance,
+            timer=prepared.timer,
         )
+
+    @_metered_turn
+    async def astart_onboarding(
+        self,
+        *,
+        session_id: str | None = None,
+        ui_language: str = "en",
+    ) -> OnboardingTurnResult:
+        """Async variant of :meth:`start_onboarding`."""
+
+        prepared = self._prepare_onboarding_start(session_id=session_id, ui_language=ui_language)
+        with prepared.timer.stage("generation"):
+            reply = await self.onboarding_agent.arespond_with_details(
+                prepared.bedrock_messages,
+                prepared.metadata,
+            )
         return self._finalize_onboarding_reply(
             prepared.session,
             response_text=reply.text,
             ui_language=ui_language,
             provenance=reply.provenance,
+            timer=prepared.timer,
         )
 
+    @_metered_turn
     def start_onboarding_stream(
         self,
         *,
@@ -310,8 +675,10 @@ class ChatService:
             bedrock_messages=prepared.bedrock_messages,
             metadata=prepared.metadata,
             ui_language=ui_language,
+            timer=prepared.timer,
         )
 
+    @_metered_turn
     def continue_onboarding(
         self,
         user_message: str,
@@ -326,18 +693,50 @@ class ChatService:
             session_id=session_id,
             ui_language=ui_language,
         )
-        reply = self.onboarding_agent.respond_with_details(
-            prepared.bedrock_messages,
-            prepared.metadata,
+        with prepared.timer.stage("generation"):
+            reply = self.onboarding_agent.respond_with_details(
+                prepared.bedrock_messages,
+                prepared.metadata,
+            )
+        return self._finalize_onboarding_reply(
+            prepared.session,
+            response_text=reply.text,
+            ui_language=ui_language,
+            provenance=reply.provenance,
+            timer=prepared.timer,
+            user_message=user_message,
+        )
+
+    @_metered_turn
+    async def acontinue_onboarding(
+        self,
+        user_message: str,
+        *,
+        session_id: str | None = None,
+        ui_language: str = "en",
+    ) -> OnboardingTurnResult:
+        """Async variant of :meth:`continue_onboarding`."""
+
+        prepared = self._prepare_onboarding_turn(
+            user_message,
+            session_id=session_id,
+            ui_language=ui_language,
         )
+        with prepared.timer.stage("generation"):
+            reply = await self.onboarding_agent.arespond_with_details(
+                prepared.bedrock_messages,
+                prepared.metadata,
+            )
         return self._finalize_onboarding_reply(
             prepared.session,
             response_text=reply.text,
             ui_language=ui_language,
             provenance=reply.provenance,
+            timer=prepared.timer,
             user_message=user_message,
         )
 
+    @_metered_turn
     def continue_onboarding_stream(
         self,
         user_message: str,
@@ -357,6 +756,7 @@ class ChatService:
             bedrock_messages=prepared.bedrock_messages,
             metadata=prepared.metadata,
             ui_language=ui_language,
+            timer=prepared.timer,
             user_message=user_message,
         )
 
@@ -382,7 +782,130 @@ class ChatService:
         ui_language: str,
         conversation_metadata: dict[str, Any] | None,
         documents: tuple[UploadedDocument, ...] = (),
+        speculate: str | None = None,
     ) -> PreparedChatTurn:
+        timer = TurnTimer()
+        with timer.stage("context"):
+            session, metadata, bedrock_messages = self._load_turn_context(
+                user_message,
+                history=history,
+                session_id=session_id,
+                ui_language=ui_language,
+                conversation_metadata=conversation_metadata,
+                documents=documents,
+            )
+        route_message = self._build_route_message(user_message, documents)
+        speculation = (
+            self._speculate(
+                session,
+                metadata=metadata,
+                bedrock_messages=bedrock_messages,
+                route_message=route_message,
+                ui_language=ui_language,
+                kind=speculate,
+            )
+            if speculate is not None and not documents
+            else None
+        )
+        try:
+            triage = self.triage.run(
+                user_message,
+                route_message=route_message,
+                sticky_agent=self._sticky_agent(session, user_message, documents),
+            )
+        except BaseException:
+            self._resolve_speculation(speculation, routed_to=None)
+            raise
+        return self._apply_triage(
+            session,
+            timer=timer,
+            metadata=metadata,
+            bedrock_messages=bedrock_messages,
+            triage=triage,
+            route_message=route_message,
+            ui_language=ui_language,
+            documents=documents,
+            speculation=speculation,
+        )
+
+    async def _aprepare_turn(
+        self,
+        user_message: str,
+        *,
+        history: list[dict[str, Any]],
+        session_id: str | None,
+        ui_language: str,
+        conversation_metadata: dict[str, Any] | None,
+        documents: tuple[UploadedDocument, ...] = (),
+        speculate: str | None = None,
+    ) -> PreparedChatTurn:
+        timer = TurnTimer()
+        with timer.stage("context"):
+            session, metadata, bedrock_messages = self._load_turn_context(
+                user_message,
+                history=history,
+                session_id=session_id,
+                ui_language=ui_language,
+                conversation_metadata=conversation_metadata,
+                documents=documents,
+            )
+        route_message = self._build_route_message(user_message, documents)
+        speculation = (
+            self._aspeculate(
+                session,
+                metadata=metadata,
+                bedrock_messages=bedrock_messages,
+                route_message=route_message,
+                ui_language=ui_language,
+                kind=speculate,
+            )
+            if speculate is not None and not documents
+            else None
+        )
+        try:
+            triage = await self.triage.arun(
+                user_message,
+                route_message=route_message,
+                sticky_agent=self._sticky_agent(session, user_message, documents),
+            )
+        except BaseException:
+            self._resolve_speculation(speculation, routed_to=None)
+            raise
+        return self._apply_triage(
+            session,
+            timer=timer,
+            metadata=metadata,
+            bedrock_messages=bedrock_messages,
+            triage=triage,
+            route_message=route_message,
+            ui_language=ui_language,
+            documents=documents,
+            speculation=speculation,
+        )
+
+    def _sticky_agent(
+        self,
+        session: Conversation,
+        user_message: str,
+        documents: tuple[UploadedDocument, ...],
+    ) -> str | None:
+        """Return the session's current agent when this turn should keep it."""
+
+        if self.sticky_routing is None or documents:
+            return None
+        agent = self.sticky_routing.decide(session, user_message).agent
+        return agent if agent in self.agents else None
+
+    def _load_turn_context(
+        self,
+        user_message: str,
+        *,
+        history: list[dict[str, Any]],
+        session_id: str | None,
+        ui_language: str,
+        conversation_metadata: dict[str, Any] | None,
+        documents: tuple[UploadedDocument, ...],
+    ) -> tuple[Conversation, dict[str, Any], list[dict[str, Any]]]:
         session = self.sessions.get_or_create(session_id, ui_language=ui_language)
         if history:
             session.sync_history(history, ui_language=ui_language)
@@ -394,14 +917,79 @@ class ChatService:
             user_message,
             documents=documents,
         )
-        crisis = self.crisis_radar.scan(user_message)
-        agent_key = self.router.route(self._build_route_message(user_message, documents))
-        agent = self.agents.get(agent_key, self.agents["COMPASS"])
+        return session, metadata, bedrock_messages
+
+    def _apply_triage(
+        self,
+        session: Conversation,
+        *,
+        metadata: dict[str, Any],
+        bedrock_messages: list[dict[str, Any]],
+        triage: TriageResult,
+        timer: TurnTimer,
+        route_message: str,
+        ui_language: str,
+        documents: tuple[UploadedDocument, ...],
+        speculation: _Speculation | None = None,
+    ) -> PreparedChatTurn:
+        timer.record("route", triage.route_ms)
+        timer.record("crisis", triage.crisis_ms)
+        timer.record("triage", triage.total_ms)
+        crisis = triage.crisis
+        agent_key = triage.agent_key
+
+        speculative = self._resolve_speculation(speculation, routed_to=agent_key)
+        if speculation is not None and speculative is not None:
+            agent = speculation.agent
+            bedrock_messages = speculation.bedrock_messages
+            # Copy so the timer is not visible to the call already in flight.
+            metadata = {**speculation.metadata, TURN_TIMER_KEY: timer}
+        else:
+            agent = self.agents[agent_key if agent_key in self.agents else FALLBACK_AGENT]
+            bedrock_messages = self._window_history(agent, session, metadata, bedrock_messages)
+            with timer.stage("provenance"):
+                metadata = self._turn_metadata(
+                    session,
+                    metadata,
+                    agent_key=agent_key,
+                    agent=agent,
+                    route_message=route_message,
+                    ui_language=ui_language,
+                    documents=documents,
+                )
+            metadata[TURN_TIMER_KEY] = timer
+
+        return PreparedChatTurn(
+            session=session,
+            bedrock_messages=bedrock_messages,
+            crisis=crisis,
+            agent_key=agent_key,
+            agent=agent,
+            metadata=metadata,
+            crisis_prefix=self._format_crisis_prefix(crisis, ui_language),
+            triage=triage,
+            timer=timer,
+            speculative=speculative,
+        )
 
+    def _turn_metadata(
+        self,
+        session: Conversation,
+        metadata: dict[str, Any],
+        *,
+        agent_key: str,
+        agent: BaseAgent,
+        route_message: str,
+        ui_language: str,
+        documents: tuple[UploadedDocument, ...],
+    ) -> dict[str, Any]:
+        """Return request metadata for *agent*: provenance and document context."""
+
+        metadata = dict(metadata)
         metadata.update(
             build_provenance_context(
                 agent_key=agent_key,
-                user_message=self._build_route_message(user_message, documents),
+                user_message=route_message,
                 ui_language=ui_language,
                 tool_mode=agent.tool_mode,
             )
@@ -428,15 +1016,281 @@ class ChatService:
                 ),
                 document_sources,
             )
+        return metadata
 
-        return PreparedChatTurn(
-            session=session,
+    def _speculation_target(
+        self,
+        session: Conversation,
+        *,
+        metadata: dict[str, Any],
+        route_message: str,
+        ui_language: str,
+    ) -> tuple[str, BaseAgent, dict[str, Any]] | None:
+        if self.speculator is None:
+            return None
+        agent_key = session.current_agent
+        if agent_key is None or agent_key not in self.agents:
+            return None
+        agent = self.agents[agent_key]
+        speculative_metadata = self._turn_metadata(
+            session,
+            metadata,
+            agent_key=agent_key,
+            agent=agent,
+            route_message=route_message,
+            ui_language=ui_language,
+            documents=(),
+        )
+        return agent_key, agent, speculative_metadata
+
+    def _speculate(
+        self,
+        session: Conversation,
+        *,
+        metadata: dict[str, Any],
+        bedrock_messages: list[dict[str, Any]],
+        route_message: str,
+        ui_language: str,
+        kind: str,
+    ) -> _Speculation | None:
+        """Start the previous specialist's reply on a worker thread, if enabled."""
+
+        target = self._speculation_target(
+            session, metadata=metadata, route_message=route_message, ui_language=ui_language
+        )
+        if target is None or self.speculator is None:
+            return None
+        agent_key, agent, speculative_metadata = target
+        bedrock_messages = self._window_history(agent, session, metadata, bedrock_messages)
+
+        def produce() -> Iterator[str | StreamInterrupted | AgentReply]:
+            if kind == "stream" and agent.tool_mode not in _NON_STREAMING_TOOL_MODES:
+                return agent.respond_stream(bedrock_messages, speculative_metadata)
+            return iter((agent.respond_with_details(bedrock_messages, speculative_metadata),))
+
+        return _Speculation(
+            agent_key=agent_key,
+            agent=agent,
+            metadata=speculative_metadata,
             bedrock_messages=bedrock_messages,
-            crisis=crisis,
+            run=self.speculator.start(agent_key, produce),
+        )
+
+    def _aspeculate(
+        self,
+        session: Conversation,
+        *,
+        metadata: dict[str, Any],
+        bedrock_messages: list[dict[str, Any]],
+        route_message: str,
+        ui_language: str,
+        kind: str,
+    ) -> _Speculation | None:
+        """Async variant of :meth:`_speculate`; the run is an event-loop task."""
+
+        target = self._speculation_target(
+            session, metadata=metadata, route_message=route_message, ui_language=ui_language
+        )
+        if target is None or self.speculator is None:
+            return None
+        agent_key, agent, speculative_metadata = target
+        bedrock_messages = self._window_history(agent, session, metadata, bedrock_messages)
+
+        def produce() -> AsyncIterator[str | StreamInterrupted | AgentReply]:
+            if kind == "stream" and agent.tool_mode not in _NON_STREAMING_TOOL_MODES:
+                return agent.arespond_stream(bedrock_messages, speculative_metadata)
+            return single_item(
+                lambda: agent.arespond_with_details(bedrock_messages, speculative_metadata)
+            )
+
+        return _Speculation(
             agent_key=agent_key,
             agent=agent,
-            metadata=metadata,
-            crisis_prefix=self._format_crisis_prefix(crisis, ui_language),
+            metadata=speculative_metadata,
+            bedrock_messages=bedrock_messages,
+            run=self.speculator.astart(agent_key, produce),
+        )
+
+    def _resolve_speculation(
+        self,
+        speculation: _Speculation | None,
+        *,
+        routed_to: str | None,
+    ) -> SpeculativeRun | AsyncSpeculativeRun | None:
+        """Commit the run when routing agreed with it; cancel it otherwise."""
+
+        if speculation is None or self.speculator is None:
+            return None
+        if routed_to == speculation.agent_key:
+            self.speculator.commit(speculation.run)
+            return speculation.run
+        self.speculator.cancel(speculation.run, routed_to=routed_to or "none")
+        return None
+
+    def _cached_reply(
+        self,
+        turn: PreparedChatTurn,
+        user_message: str,
+        ui_language: str,
+        conversation_metadata: dict[str, Any] | None,
+    ) -> _CachedReply:
+        """Look up a reusable reply when this turn's reply cannot be personalized."""
+
+        if (
+            (self.canned_answers is None and self.semantic_cache is None)
+            or conversation_metadata
+            or turn.speculative is not None
+            or turn.crisis["is_crisis"]
+            or not turn.session.is_empty()
+        ):
+            return _CachedReply()
+
+        canned_key = None
+        if self.canned_answers is not None and self.canned_answers.eligible(user_message):
+            canned_key = self.canned_answers.key(
+                user_message, agent_key=turn.agent_key, ui_language=ui_language
+            )
+            reply = self.canned_answers.get(canned_key)
+            if reply is not None:
+                logger.info("canned_answer_served", agent=turn.agent_key)
+                return _CachedReply(canned_key=canned_key, reply=reply)
+
+        semantic = (
+            self.semantic_cache.lookup(
+                user_message, agent_key=turn.agent_key, ui_language=ui_language
+            )
+            if self.semantic_cache is not None
+            else None
+        )
+        return _CachedReply(
+            canned_key=canned_key,
+            semantic=semantic,
+            reply=semantic.reply if semantic is not None else None,
+        )
+
+    async def _acached_reply(
+        self,
+        turn: PreparedChatTurn,
+        user_message: str,
+        ui_language: str,
+        conversation_metadata: dict[str, Any] | None,
+    ) -> _CachedReply:
+        """Async variant of :meth:`_cached_reply`; embedding runs off the event loop."""
+
+        if self.semantic_cache is None:
+            return self._cached_reply(turn, user_message, ui_language, conversation_metadata)
+        return await asyncio.to_thread(
+            self._cached_reply, turn, user_message, ui_language, conversation_metadata
+        )
+
+    def _remember_reply(self, cached: _CachedReply, reply: AgentReply) -> None:
+        if cached.canned_key is not None and self.canned_answers is not None:
+            self.canned_answers.put(cached.canned_key, reply)
+        if cached.semantic is not None and self.semantic_cache is not None:
+            self.semantic_cache.put(cached.semantic, reply)
+
+    def _complete_turn(
+        self,
+        turn: PreparedChatTurn,
+        *,
+        user_message: str,
+        response: str,
+        ui_language: str,
+        provenance: ResponseProvenance,
+        documents: tuple[UploadedDocument, ...] = (),
+    ) -> ChatTurnResult:
+        with turn.timer.stage("store"):
+            self._store_completed_turn(
+                turn.session,
+                user_message=user_message,
+                response=response,
+                agent_key=turn.agent_key,
+                ui_language=ui_language,
+                crisis=turn.crisis["is_crisis"],
+                provenance=provenance,
+                documents=documents,
+            )
+        timings = turn.timer.finish()
+        usage = self._finish_turn_usage(turn.session, agent=turn.agent_key)
+        self._log_turn_timings(
+            "chat_turn_timings",
+            timings,
+            session_id=turn.session.session_id,
+            agent=turn.agent_key,
+        )
+        return ChatTurnResult(
+            session_id=turn.session.session_id,
+            response=response,
+            agent=turn.agent_key,
+            crisis=turn.crisis["is_crisis"],
+            crisis_resources=turn.crisis.get("resources"),
+            provenance=provenance,
+            timings=timings if self.include_timings else None,
+            usage=usage if self.include_usage else None,
+        )
+
+    def _finish_turn_usage(self, session: Conversation, *, agent: str) -> TurnUsage | None:
+        """Add the turn's usage to the session and log it; ``None`` outside a turn."""
+
+        meter = current_meter()
+        if meter is None or meter is session.usage:
+            return None
+        session.usage.merge(meter)
+        turn = meter.report()
+        session_total = session.usage.totals()
+        logger.info(
+            "chat_turn_usage",
+            session_id=session.session_id,
+            agent=agent,
+            **turn.total.model_dump(exclude={"latency_ms"}),
+            session_tokens=session_total.total_tokens,
+        )
+        return TurnUsage(
+            turn=turn,
+            session=session_total,
+            over_budget=self._over_token_budget(session),
+        )
+
+    def _over_token_budget(self, session: Conversation) -> bool:
+        return 0 < self.session_token_budget <= session.usage.total_tokens()
+
+    @staticmethod
+    def _log_turn_timings(
+        event: str,
+        timings: TurnTimings,
+        *,
+        session_id: str,
+        agent: str,
+    ) -> None:
+        logger.info(
+            event,
+            session_id=session_id,
+            agent=agent,
+            **timings.model_dump(exclude_none=True),
+        )
+
+    def _complete_document_turn(
+        self,
+        turn: PreparedChatTurn,
+        reply: AgentReply,
+        *,
+        user_message: str,
+        ui_language: str,
+        documents: tuple[UploadedDocument, ...],
+    ) -> ChatTurnResult:
+        document_sources = tuple(build_document_source(document.name) for document in documents)
+        provenance = (
+            reply.provenance
+            if reply.provenance.document_used
+            else with_document_sources(reply.provenance, document_sources)
+        )
+        return self._complete_turn(
+            turn,
+            user_message=user_message,
+            response=turn.crisis_prefix + reply.text,
+            ui_language=ui_language,
+            provenance=provenance,
+            documents=documents,
         )
 
     def _prepare_onboarding_start(
@@ -445,6 +1299,7 @@ class ChatService:
         session_id: str | None,
         ui_language: str,
     ) -> PreparedOnboardingTurn:
+        timer = TurnTimer()
         session = self.sessions.get_or_create(session_id, ui_language=ui_language)
         session.set_onboarding_state("in_progress")
         session.set_preference("response_language", ui_language)
@@ -453,10 +1308,13 @@ class ChatService:
         metadata["onboarding_user_turn_count"] = 0
         metadata["force_onboarding_completion"] = False
         bedrock_messages = [{"role": "user", "content": [{"text": START_TRIGGER}]}]
+        metadata[TURN_TIMER_KEY] = timer
+        timer.record("context", timer.elapsed_ms())
         return PreparedOnboardingTurn(
             session=session,
             bedrock_messages=bedrock_messages,
             metadata=metadata,
+            timer=timer,
         )
 
     def _prepare_onboarding_turn(
@@ -466,6 +1324,7 @@ class ChatService:
         session_id: str | None,
         ui_language: str,
     ) -> PreparedOnboardingTurn:
+        timer = TurnTimer()
         session = self.sessions.get_or_create(session_id, ui_language=ui_language)
         session.set_onboarding_state("in_progress")
         session.set_preference("response_language", ui_language)
@@ -478,10 +1337,13 @@ class ChatService:
         metadata["onboarding_user_turn_count"] = user_turn_count
         metadata["force_onboarding_completion"] = user_turn_count >= 4
         bedrock_messages = self._build_onboarding_messages(session, user_message=user_message)
+        metadata[TURN_TIMER_KEY] = timer
+        timer.record("context", timer.elapsed_ms())
         return PreparedOnboardingTurn(
             session=session,
             bedrock_messages=bedrock_messages,
             metadata=metadata,
+            timer=timer,
         )
 
     def _stream_onboarding_reply(
@@ -491,25 +1353,21 @@ class ChatService:
         bedrock_messages: list[dict[str, Any]],
         metadata: dict[str, Any],
         ui_language: str,
+        timer: TurnTimer,
         user_message: str | None = None,
     ) -> Generator[str | OnboardingTurnResult, None, None]:
-        collected: list[str] = []
-        replace_text: str | None = None
-
-        for chunk in self.onboarding_agent.respond_stream(bedrock_messages, metadata):
-            if chunk.startswith("\x00REPLACE\x00"):
-                replace_text = chunk.removeprefix("\x00REPLACE\x00")
-                continue
-            collected.append(chunk)
-            yield chunk
+        collector = _StreamCollector(timer=timer, ui_language=ui_language)
+        with timer.stage("generation"):
+            for chunk in self.onboarding_agent.respond_stream(bedrock_messages, metadata):
+                yield from collector.accept(chunk)
 
-        full_response = replace_text if replace_text is not None else "".join(collected)
         yield self._finalize_onboarding_reply(
             session,
-            response_text=full_response,
+            response_text=collector.text,
             ui_language=ui_language,
             provenance=metadata.get("provenance") or build_default_provenance(),
             user_message=user_message,
+            timer=timer,
         )
 
     def _finalize_onboarding_reply(
@@ -520,7 +1378,48 @@ class ChatService:
         ui_language: str,
         provenance: ResponseProvenance,
         user_message: str | None = None,
+        timer: TurnTimer | None = None,
     ) -> OnboardingTurnResult:
+        timer = timer or TurnTimer()
+        with timer.stage("store"):
+            display_text, snapshot = self._store_onboarding_reply(
+                session,
+                response_text=response_text,
+                ui_language=ui_language,
+                user_message=user_message,
+            )
+        timings = timer.finish()
+        usage = self._finish_turn_usage(session, agent="ONBOARDING")
+        self._log_turn_timings(
+            "onboarding_turn_timings",
+            timings,
+            session_id=session.session_id,
+            agent="ONBOARDING",
+        )
+        return OnboardingTurnResult(
+            session_id=session.session_id,
+            response=display_text,
+            onboarding_state=snapshot.onboarding_state,
+            completed=snapshot.onboarding_state == "complete",
+            profile_summary=snapshot.profile_summary,
+            personalized_prompts=snapshot.personalized_prompts,
+            provenance=(
+                provenance
+                if isinstance(provenance, ResponseProvenance)
+                else ResponseProvenance.model_validate(provenance)
+            ),
+            timings=timings if self.include_timings else None,
+            usage=usage if self.include_usage else None,
+        )
+
+    def _store_onboarding_reply(
+        self,
+        session: Conversation,
+        *,
+        response_text: str,
+        ui_language: str,
+        user_message: str | None,
+    ) -> tuple[str, SessionMemorySnapshot]:
         if user_message:
             session.add_onboarding_message("user", user_message)
 
@@ -538,20 +1437,7 @@ class ChatService:
         else:
             session.set_onboarding_state("in_progress")
 
-        snapshot = session.snapshot()
-        return OnboardingTurnResult(
-            session_id=session.session_id,
-            response=display_text,
-            onboarding_state=snapshot.onboarding_state,
-            completed=snapshot.onboarding_state == "complete",
-            profile_summary=snapshot.profile_summary,
-            personalized_prompts=snapshot.personalized_prompts,
-            provenance=(
-                provenance
-                if isinstance(provenance, ResponseProvenance)
-                else ResponseProvenance.model_validate(provenance)
-            ),
-        )
+        return display_text, session.snapshot()
 
     @staticmethod
     def _build_bedrock_messages(
@@ -580,6 +1466,46 @@ class ChatService:
         normalized.append({"role": "user", "content": final_content})
         return normalized
 
+    @staticmethod
+    def _window_history(
+        agent: BaseAgent,
+        session: Conversation,
+        metadata: dict[str, Any],
+        bedrock_messages: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Fit the history to the agent's token budget, compacting older turns.
+
+        The cut is remembered per agent on the session, so later turns reuse
+        it, and its block, while the kept turns fit.
+        """
+
+        budget = getattr(agent, "history_token_budget", 0)
+        if not budget:
+            return bedrock_messages
+        agent_name = getattr(agent, "name", type(agent).__name__)
+        first_index, anchor = session.compaction_anchor(agent_name)
+        memory = metadata.get("session_memory") or {}
+        if isinstance(memory, SessionMemorySnapshot):
+            memory = memory.model_dump(mode="python")
+        window = fit_history(
+            bedrock_messages,
+            budget_tokens=budget,
+            first_index=first_index,
+            conversation_overview=tuple(memory.get("conversation_overview", ())),
+            profile_facts=tuple(memory.get("profile_facts", ())),
+            anchor=anchor,
+        )
+        session.set_compaction_anchor(agent_name, window.anchor)
+        if window.compacted_messages:
+            logger.info(
+                "history_compacted",
+                agent=agent_name,
+                compacted_messages=window.compacted_messages,
+                original_tokens=window.original_tokens,
+                estimated_tokens=window.estimated_tokens,
+            )
+        return window.messages
+
     @staticmethod
     def _build_route_message(
         user_message: str,
@@ -617,6 +1543,9 @@ class ChatService:
         merged = dict(base_metadata)
         if not extra_metadata:
             return merged
+        if "session_memory" in extra_metadata:
+            # Caller-supplied memory does not match the live session's version.
+            merged.pop("session_memory_version", None)
 
         for key, value in extra_metadata.items():
             if (
@@ -654,10 +1583,6 @@ class ChatService:
         provenance: ResponseProvenance,
         documents: tuple[UploadedDocument, ...] = (),
     ) -> None:
-        previous_summary = SessionSummary(
-            profile_facts=tuple(session.profile_facts),
-            conversation_overview=tuple(session.conversation_overview),
-        )
         session.add_user_message(user_message, ui_language=ui_language)
         session.add_assistant_message(
             response,
@@ -665,16 +1590,63 @@ class ChatService:
             crisis=crisis,
             provenance=provenance,
         )
-        if self.summarizer is not None:
-            summary = self.summarizer.summarize(
-                session.get_messages(),
-                ui_language=ui_language,
-                previous_summary=previous_summary,
-            )
-            session.update_summary(summary)
+        self._schedule_summary(session, ui_language=ui_language)
         if documents:
             session.set_active_documents(documents, summary_text=response)
 
+    def _schedule_summary(self, session: Conversation, *, ui_language: str) -> None:
+        if self.summary_worker is None and self.summarizer is None:
+            return
+
+        if self._over_token_budget(session):
+            # Soft degradation: the reply is served, the optional summary is not.
+            with self._summary_decisions_lock:
+                self._summary_decisions["over_budget"] += 1
+            logger.info(
+                "summary_skipped_over_budget",
+                session_id=session.session_id,
+                session_tokens=session.usage.total_tokens(),
+                budget=self.session_token_budget,
+            )
+            return
+
+        due = self.summary_cadence.should_summarize(session.summary_progress())
+        with self._summary_decisions_lock:
+            self._summary_decisions["scheduled" if due else "skipped"] += 1
+        if not due:
+            return
+
+        if self.summary_worker is not None:
+            self.summary_worker.submit(session, ui_language=ui_language)
+        elif self.summarizer is not None:
+            refresh_session_summary(self.summarizer, session, ui_language=ui_language)
+
+    def _force_summary(self, session: Conversation) -> None:
+        if self.summary_worker is None and self.summarizer is None:
+            return
+        if session.summary_progress().new_messages <= 0:
+            return
+
+        ui_language = session.preferences.get("response_language", "en")
+        with self._summary_decisions_lock:
+            self._summary_decisions["forced"] += 1
+        if self.summary_worker is None:
+            assert self.summarizer is not None
+            refresh_session_summary(self.summarizer, session, ui_language=ui_language)
+            return
+
+        # Go through the worker so an export never summarizes the same session
+        # in parallel with a queued or running job for it.
+        submitted = self.summary_worker.submit(session, ui_language=ui_language)
+        if not submitted or not self.summary_worker.flush_session(
+            session.session_id, timeout=SUMMARY_EXPORT_WAIT_SECONDS
+        ):
+            logger.warning(
+                "export_summary_not_ready",
+                session_id=session.session_id,
+                submitted=submitted,
+            )
+
     def end_session(self, session_id: str) -> None:
         """Delete a session explicitly."""
 
@@ -691,11 +1663,18 @@ class ChatService:
         session = self.sessions.get(session_id)
         if session is None:
             return None
+        # Exports must carry an up-to-date summary even if the cadence skipped turns.
+        self._force_summary(session)
         return build_session_bundle(
             snapshot=session.snapshot(),
             messages=session.get_messages(),
         )
 
+    async def aexport_session_bundle(self, session_id: str) -> SessionBundle | None:
+        """Async twin of :meth:`export_session_bundle`; the final summary runs off the loop."""
+
+        return await asyncio.to_thread(self.export_session_bundle, session_id)
+
     def import_session_bundle(
         self,
         payload: bytes | str | dict[str, Any] | SessionBundle,
@@ -733,20 +1712,181 @@ class ChatService:
 
         return self.sessions.count
 
+    def summary_stats(self) -> SummaryWorkerStats | None:
+        """Return background summarizer queue metrics, if a worker is configured."""
 
-def build_default_chat_service() -> ChatService:
-    """Create the production chat service with the standard agent registry."""
-
+        if self.summary_worker is None:
+            return None
+        return self.summary_worker.stats()
+
+    def metrics(self) -> dict[str, Any]:
+        """Return process-local operational metrics for monitoring endpoints."""
+
+        summary_stats = self.summary_stats()
+        with self._summary_decisions_lock:
+            cadence = {
+                "scheduled": self._summary_decisions["scheduled"],
+                "skipped": self._summary_decisions["skipped"],
+                "forced": self._summary_decisions["forced"],
+                "over_budget": self._summary_decisions["over_budget"],
+            }
+        routing = (
+            self.router.routing_stats().model_dump()
+            if isinstance(self.router, RouterAgent)
+            else None
+        )
+        crisis_screen = (
+            self.crisis_radar.screening_stats().model_dump()
+            if isinstance(self.crisis_radar, CrisisRadar)
+            else None
+        )
+        quota = quota_scheduler()
+        endpoints = endpoint_router()
+        return {
+            "sessions": self.session_count,
+            "summaries": summary_stats.model_dump() if summary_stats is not None else None,
+            "summary_cadence": cadence,
+            "routing": routing,
+            "crisis_screen": crisis_screen,
+            "speculation": (
+                self.speculator.stats().model_dump() if self.speculator is not None else None
+            ),
+            "sticky_routing": (
+                self.sticky_routing.stats().model_dump()
+                if self.sticky_routing is not None
+                else None
+            ),
+            "canned_answers": (
+                self.canned_answers.stats().model_dump()
+                if self.canned_answers is not None
+                else None
+            ),
+            "semantic_cache": (
+                self.semantic_cache.stats().model_dump()
+                if self.semantic_cache is not None
+                else None
+            ),
+            "prompt_cache": prompt_cache_stats().model_dump(),
+            "usage": process_usage().model_dump(),
+            "retries": retry_stats().model_dump(),
+            "hedging": hedge_stats().model_dump(),
+            "quota": quota.stats().model_dump() if quota is not None else None,
+            "endpoints": endpoints.stats().model_dump() if endpoints is not None else None,
+        }
+
+    def warm_up(self) -> dict[str, float]:
+        """Build agents and prime shared resources before the first request.
+
+        Steps: construct agents, bind Bedrock clients, load the trusted source
+        registry and, when enabled, pre-seed the router cache with the i18n
+        quick-action messages.
+
+        Returns per-step durations in milliseconds. A failing step is logged
+        and skipped; whatever it would have primed is then built lazily on
+        first use instead. Safe to call more than once.
+        """
+
+        steps: dict[str, Callable[[], object]] = {
+            "agents": self._warm_agents,
+            "clients": self._warm_clients,
+            "trusted_sources": prime_trusted_source_registry,
+        }
+        if (
+            ROUTER_CACHE_PRESEED
+            and isinstance(self.router, RouterAgent)
+            and self.router.cache is not None
+        ):
+            router = self.router
+            steps["route_cache"] = lambda: router.prime_cache(quick_action_messages())
+        durations: dict[str, float] = {}
+        for name, step in steps.items():
+            started = time.monotonic()
+            try:
+                step()
+            except Exception as exc:
+                logger.warning(
+                    "warm_up_step_failed",
+                    step=name,
+                    error=str(exc),
+                    type=type(exc).__name__,
+                )
+                continue
+            durations[name] = round((time.monotonic() - started) * 1000, 2)
+
+        logger.info("chat_service_warmed", **{f"{name}_ms": ms for name, ms in durations.items()})
+        return durations
+
+    def _warm_agents(self) -> None:
+        if isinstance(self.agents, LazyAgentRegistry):
+            self.agents.warm_up()
+
+    def _warm_clients(self) -> None:
+        components: list[object] = [
+            self.router,
+            self.crisis_radar,
+            self.onboarding_agent,
+            self.summarizer,
+            *self.agents.values(),
+        ]
+        for component in components:
+            client = getattr(component, "client", None)
+            if isinstance(client, NovaClient):
+                client.warm_up()
+
+    def shutdown(self) -> None:
+        """Release background workers owned by this service."""
+
+        self.triage.shutdown()
+        if self.speculator is not None:
+            self.speculator.shutdown()
+        if self.summary_worker is not None:
+            self.summary_worker.shutdown(wait=True)
+
+
+def build_default_chat_service(
+    *,
+    triage_mode: str = TRIAGE_MODE,
+    speculative: bool = SPECULATIVE_SPECIALIST,
+) -> ChatService:
+    """Create the production chat service with the standard agent registry.
+
+    Construction stays cheap: specialists are built on first use and no
+    Bedrock client exists until a call needs one. Call ``warm_up()`` from a
+    startup hook to move that work ahead of the first request.
+
+    *triage_mode* selects two concurrent classification requests
+    (``parallel``) or one combined request (``combined``) per turn. With
+    *speculative* set, follow-up turns start the previous specialist while
+    triage runs and discard its output when routing picks another agent.
+    Replies to the fixed quick-action messages are reused for sessions
+    without memory while ``CANNED_ANSWERS_ENABLED`` is set, and close
+    paraphrases of earlier first turns while ``SEMANTIC_CACHE_ENABLED`` is.
+    """
+
+    summarizer = NovaSessionSummarizer()
+    router = RouterAgent()
+    crisis_radar = CrisisRadar()
     return ChatService(
-        router=RouterAgent(),
-        crisis_radar=CrisisRadar(),
-        agents={
-            "COMPASS": CompassAgent(),
-            "FINANCING": StudentAidAgent(),
-            "STUDY_CHOICE": DegreeExplorerAgent(),
-            "ACADEMIC_BASICS": HiddenCurriculumAgent(),
-            "ROLE_MODELS": AntiImpostorAgent(),
-        },
+        router=router,
+        crisis_radar=crisis_radar,
+        triage=build_triage(router, crisis_radar, triage_mode),
+        agents=LazyAgentRegistry(
+            {
+                "COMPASS": CompassAgent,
+                "FINANCING": StudentAidAgent,
+                "STUDY_CHOICE": DegreeExplorerAgent,
+                "ACADEMIC_BASICS": HiddenCurriculumAgent,
+                "ROLE_MODELS": AntiImpostorAgent,
+            }
+        ),
         onboarding_agent=OnboardingAgent(),
-        summarizer=NovaSessionSummarizer(),
+        summarizer=summarizer,
+        summary_worker=SummaryWorker(summarizer),
+        summary_cadence=build_summary_cadence(),
+        speculator=SpeculativeRunner() if speculative else None,
+        sticky_routing=StickyRoutingPolicy() if ROUTER_STICKY_ENABLED else None,
+        canned_answers=CannedAnswerCache() if CANNED_ANSWERS_ENABLED else None,
+        semantic_cache=(
+            SemanticResponseCache(build_embedder()) if SEMANTIC_CACHE_ENABLED else None
+        ),
     )
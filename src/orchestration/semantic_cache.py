@@ -0,0 +1,236 @@
+"""
+Semantic response cache for first turns without personalization.
+
+The first message of a session without memory is answered from the agent's
+general knowledge only, so a paraphrase of an earlier first message can
+reuse its answer. Messages are embedded and compared by cosine similarity
+against earlier answers in the same (agent, language, source registry
+version) bucket; the best match at or above the threshold is served with
+its original provenance. A registry update therefore starts from empty
+buckets.
+
+Only generic messages take part: the quick-action texts, or short messages
+without personal details (first-person circumstances, possessives, numbers,
+addresses). A first message often describes the user's situation, and the
+answer to it must never be served to someone else.
+
+Each bucket holds its vectors as rows of one NumPy matrix, so a lookup is a
+single matrix-vector product. Expired rows are skipped and reused first; a
+full bucket evicts its least recently used row.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+import structlog
+from config.settings import (
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS,
+)
+from pydantic import BaseModel, ConfigDict
+
+from src.agents.base import FALLBACK_MESSAGES
+from src.core.embeddings import TextEmbedder
+from src.core.provenance import AgentReply
+from src.i18n import quick_action_messages
+from src.knowledge.source_registry import trusted_source_registry_version
+
+logger = structlog.get_logger()
+
+# Longer free-text messages usually describe the user's situation.
+_GENERIC_MAX_WORDS = 20
+
+# First-person circumstances and possessives, numbers (ages, amounts, dates)
+# and contact details mark a message as personal.
+_PERSONAL_RE = re.compile(
+    r"\b(?:ich bin|ich hab|ich habe|ich arbeite|ich wohne|ich lebe|ich komme|ich studiere|"
+    r"ich war|mein\w*|mir|mich|wir|uns|unser\w*|i am|i'm|i have|i've|i work|i live|"
+    r"i come|i study|i was|my|mine|me|we|us|our\w*)\b|\d|@|https?:|www\."
+)
+
+BucketKey = tuple[str, str, str]
+
+
+class SemanticCacheStats(BaseModel):
+    """Process-lifetime counters for the semantic response cache."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    size: int
+    buckets: int
+    max_entries: int
+    threshold: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    embed_failures: int
+    ineligible: int
+
+
+@dataclass(frozen=True)
+class SemanticLookup:
+    """One lookup: the query vector and, on a hit, the reused reply."""
+
+    bucket: BucketKey
+    vector: np.ndarray = field(repr=False)
+    reply: AgentReply | None = None
+    similarity: float = 0.0
+
+
+class _Bucket:
+    """Fixed-capacity rows for one (agent, language, registry version) key."""
+
+    def __init__(self, capacity: int, dimensions: int) -> None:
+        self.vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.expires = np.zeros(capacity, dtype=np.float64)
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.replies: list[AgentReply | None] = [None] * capacity
+        self.size = 0
+
+    def live(self, now: float) -> int:
+        return int(np.count_nonzero(self.expires[: self.size] > now))
+
+
+class SemanticResponseCache:
+    """Nearest-neighbour reply reuse, bucketed by agent, language and registry version."""
+
+    def __init__(
+        self,
+        embedder: TextEmbedder,
+        *,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+        now: Callable[[], float] | None = None,
+        messages: Iterable[str] | None = None,
+        registry_version: Callable[[], str] = trusted_source_registry_version,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.embedder = embedder
+        self._messages = frozenset(
+            message.strip()
+            for message in (quick_action_messages() if messages is None else messages)
+        )
+        self._registry_version = registry_version
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._now = now or time.monotonic
+        self._buckets: dict[BucketKey, _Bucket] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._embed_failures = 0
+        self._ineligible = 0
+
+    def eligible(self, message: str) -> bool:
+        """Return whether *message* is generic enough to share an answer across users."""
+
+        text = message.strip()
+        if text in self._messages:
+            return True
+        return len(text.split()) <= _GENERIC_MAX_WORDS and not _PERSONAL_RE.search(text.casefold())
+
+    def lookup(self, message: str, *, agent_key: str, ui_language: str) -> SemanticLookup | None:
+        """Embed *message* and return the closest live answer above the threshold.
+
+        Returns ``None`` when the message is not :meth:`eligible` or the
+        embedder fails; the turn is then generated and not cached.
+        """
+
+        if not self.eligible(message):
+            with self._lock:
+                self._ineligible += 1
+            return None
+        try:
+            vector = np.asarray(self.embedder.embed(message), dtype=np.float32)
+        except Exception as exc:
+            with self._lock:
+                self._embed_failures += 1
+            logger.warning("semantic_cache_embed_failed", error=str(exc), type=type(exc).__name__)
+            return None
+
+        key = (agent_key, ui_language, self._registry_version())
+        with self._lock:
+            bucket = self._buckets.get(key)
+            now = self._now()
+            if bucket is None or bucket.size == 0:
+                self._misses += 1
+                return SemanticLookup(bucket=key, vector=vector)
+            scores = bucket.vectors[: bucket.size] @ vector
+            scores[bucket.expires[: bucket.size] <= now] = -np.inf
+            row = int(np.argmax(scores))
+            similarity = float(scores[row])
+            reply = bucket.replies[row]
+            if similarity < self.threshold or reply is None:
+                self._misses += 1
+                return SemanticLookup(bucket=key, vector=vector, similarity=max(similarity, 0.0))
+            bucket.last_used[row] = now
+            self._hits += 1
+        logger.info("semantic_cache_hit", agent=agent_key, similarity=round(similarity, 4))
+        return SemanticLookup(bucket=key, vector=vector, reply=reply, similarity=similarity)
+
+    def put(self, lookup: SemanticLookup, reply: AgentReply) -> None:
+        """Store *reply* under the vector of a missed *lookup*."""
+
+        text = reply.text.strip()
+        if lookup.reply is not None or not text or text in FALLBACK_MESSAGES.values():
+            return
+        with self._lock:
+            bucket = self._buckets.get(lookup.bucket)
+            if bucket is None:
+                # Answers citing an older source registry are never served again.
+                for stale in [key for key in self._buckets if key[2] != lookup.bucket[2]]:
+                    del self._buckets[stale]
+                bucket = _Bucket(self.max_entries, lookup.vector.shape[0])
+                self._buckets[lookup.bucket] = bucket
+            now = self._now()
+            row = self._free_row(bucket, now)
+            bucket.vectors[row] = lookup.vector
+            bucket.expires[row] = now + self.ttl_seconds
+            bucket.last_used[row] = now
+            bucket.replies[row] = reply
+
+    def invalidate(self) -> None:
+        """Drop every cached answer; counters are kept."""
+
+        with self._lock:
+            self._buckets.clear()
+        logger.info("semantic_cache_invalidated")
+
+    def stats(self) -> SemanticCacheStats:
+        with self._lock:
+            now = self._now()
+            lookups = self._hits + self._misses
+            return SemanticCacheStats(
+                size=sum(bucket.live(now) for bucket in self._buckets.values()),
+                buckets=len(self._buckets),
+                max_entries=self.max_entries,
+                threshold=self.threshold,
+                hits=self._hits,
+                misses=self._misses,
+                hit_rate=round(self._hits / lookups, 4) if lookups else 0.0,
+                evictions=self._evictions,
+                embed_failures=self._embed_failures,
+                ineligible=self._ineligible,
+            )
+
+    def _free_row(self, bucket: _Bucket, now: float) -> int:
+        expired = np.flatnonzero(bucket.expires[: bucket.size] <= now)
+        if expired.size:
+            return int(expired[0])
+        if bucket.size < self.max_entries:
+            bucket.size += 1
+            return bucket.size - 1
+        self._evictions += 1
+        return int(np.argmin(bucket.last_used))
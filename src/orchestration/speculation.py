@@ -0,0 +1,199 @@
+"""
+Speculative specialist execution.
+
+On follow-up turns the previous specialist (``Conversation.current_agent``)
+is usually routed to again, so its reply can start while triage is still in
+flight. The output is buffered; once routing has decided, the buffer is
+either committed and replayed to the caller, or the run is cancelled and
+discarded. The routing decision itself never changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import queue
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import structlog
+from config.settings import SPECULATION_MAX_WORKERS
+from pydantic import BaseModel, ConfigDict
+
+logger = structlog.get_logger()
+
+_DONE = object()
+
+
+class SpeculationStats(BaseModel):
+    """Process-lifetime outcome counters for speculative runs."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    started: int
+    committed: int
+    cancelled: int
+    hit_rate: float
+    waste_rate: float
+
+
+class SpeculativeRun:
+    """Buffered output of a specialist call started before routing finished."""
+
+    def __init__(self, agent_key: str) -> None:
+        self.agent_key = agent_key
+        self._items: queue.Queue[Any] = queue.Queue()
+        self._cancelled = threading.Event()
+        self._error: BaseException | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def items(self) -> Iterator[Any]:
+        """Yield buffered and still-arriving items until the run finishes."""
+
+        while True:
+            item = self._items.get()
+            if item is _DONE:
+                break
+            yield item
+        if self._error is not None:
+            raise self._error
+
+    def _produce(self, produce: Callable[[], Iterable[Any]]) -> None:
+        stream: Iterable[Any] = ()
+        try:
+            stream = produce()
+            for item in stream:
+                if self._cancelled.is_set():
+                    break
+                self._items.put(item)
+        except Exception as exc:
+            self._error = exc
+        finally:
+            # Closing the generator releases the underlying Bedrock stream.
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            self._items.put(_DONE)
+
+
+class AsyncSpeculativeRun:
+    """Event-loop twin of :class:`SpeculativeRun`."""
+
+    def __init__(self, agent_key: str, produce: Callable[[], AsyncIterator[Any]]) -> None:
+        self.agent_key = agent_key
+        self._items: asyncio.Queue[Any] = asyncio.Queue()
+        self._error: BaseException | None = None
+        self._cancel_requested = False
+        self._task = asyncio.ensure_future(self._produce(produce))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_requested
+
+    async def items(self) -> AsyncIterator[Any]:
+        """Yield buffered and still-arriving items until the run finishes."""
+
+        while True:
+            item = await self._items.get()
+            if item is _DONE:
+                break
+            yield item
+        if self._error is not None:
+            raise self._error
+
+    def _cancel(self) -> None:
+        self._cancel_requested = True
+        self._task.cancel()
+        # A task cancelled before its first step never reaches ``finally``.
+        self._items.put_nowait(_DONE)
+
+    async def _produce(self, produce: Callable[[], AsyncIterator[Any]]) -> None:
+        try:
+            async for item in produce():
+                self._items.put_nowait(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._items.put_nowait(_DONE)
+
+
+class SpeculativeRunner:
+    """Start, commit and cancel speculative runs and keep hit/waste counters."""
+
+    def __init__(self, *, max_workers: int = SPECULATION_MAX_WORKERS) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="koda-speculation",
+        )
+        self._lock = threading.Lock()
+        self._started = 0
+        self._committed = 0
+        self._cancelled = 0
+
+    def start(self, agent_key: str, produce: Callable[[], Iterable[Any]]) -> SpeculativeRun:
+        """Run *produce* on a worker thread and buffer what it yields."""
+
+        run = SpeculativeRun(agent_key)
+        # A copied context keeps the turn's usage meter bound on the worker thread.
+        self._executor.submit(contextvars.copy_context().run, run._produce, produce)
+        self._count_start(agent_key)
+        return run
+
+    def astart(
+        self, agent_key: str, produce: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncSpeculativeRun:
+        """Run *produce* as a task on the current event loop."""
+
+        run = AsyncSpeculativeRun(agent_key, produce)
+        self._count_start(agent_key)
+        return run
+
+    def commit(self, run: SpeculativeRun | AsyncSpeculativeRun) -> None:
+        """Record that routing agreed with the speculation."""
+
+        with self._lock:
+            self._committed += 1
+        logger.info("speculation_committed", agent=run.agent_key)
+
+    def cancel(self, run: SpeculativeRun | AsyncSpeculativeRun, *, routed_to: str) -> None:
+        """Stop a run whose agent lost the routing decision and discard its output."""
+
+        if isinstance(run, SpeculativeRun):
+            run._cancelled.set()
+        else:
+            run._cancel()
+        with self._lock:
+            self._cancelled += 1
+        logger.info("speculation_cancelled", agent=run.agent_key, routed_to=routed_to)
+
+    def stats(self) -> SpeculationStats:
+        with self._lock:
+            started = self._started
+            return SpeculationStats(
+                started=started,
+                committed=self._committed,
+                cancelled=self._cancelled,
+                hit_rate=round(self._committed / started, 4) if started else 0.0,
+                waste_rate=round(self._cancelled / started, 4) if started else 0.0,
+            )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count_start(self, agent_key: str) -> None:
+        with self._lock:
+            self._started += 1
+        logger.debug("speculation_started", agent=agent_key)
+
+
+async def single_item(awaitable: Callable[[], Awaitable[Any]]) -> AsyncIterator[Any]:
+    """Adapt a one-shot coroutine to the async item stream used by runs."""
+
+    yield await awaitable()
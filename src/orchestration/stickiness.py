@@ -0,0 +1,164 @@
+"""
+Session-sticky routing for short follow-up messages.
+
+"Und wie beantrage ich das?" or "and how much is that?" carry no topic of
+their own; the router can only guess, and usually lands on the specialist
+that answered the previous turn. The policy below keeps that specialist
+(``Conversation.current_agent``) for short or anaphoric follow-ups within a
+time window, so triage skips the router call. Crisis scanning is not
+affected.
+
+A follow-up is re-routed when the session topic keywords
+(``src.core.conversation.detect_topics``) name a topic owned by a different
+specialist, or when the local routing lexicon confidently points elsewhere.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import structlog
+from config.settings import (
+    ROUTER_LOCAL_CONFIDENCE,
+    ROUTER_STICKY_MAX_WORDS,
+    ROUTER_STICKY_WINDOW_SECONDS,
+)
+from pydantic import BaseModel, ConfigDict
+
+from src.agents.local_router import LocalRouteClassifier
+from src.core.conversation import Conversation, detect_topics
+
+logger = structlog.get_logger()
+
+# Session topics (``_TOPIC_KEYWORDS`` labels) owned by one specialist. Topics
+# that several specialists discuss, such as deadlines, are left out.
+TOPIC_AGENTS: dict[str, str] = {
+    "BAfoeG": "FINANCING",
+    "scholarships": "FINANCING",
+    "semester fees": "FINANCING",
+    "ECTS": "ACADEMIC_BASICS",
+    "module handbook": "ACADEMIC_BASICS",
+    "Ausbildung": "ACADEMIC_BASICS",
+    "applications": "STUDY_CHOICE",
+    "dual study": "STUDY_CHOICE",
+    "self-doubt": "ROLE_MODELS",
+}
+
+# Openers and pro-forms that refer back to the previous answer.
+_ANAPHORA_RE = re.compile(
+    r"^(?:und|and|aber|but|also|auch|dann|then|ok(?:ay)?|what about|how about|"
+    r"was ist mit|wie ist es mit|und wenn|what if)\b"
+    r"|\b(?:dafuer|dafür|davon|damit|dazu|darauf|dabei|dort|that|this|it|those|them|there)\b",
+    re.IGNORECASE,
+)
+
+# Anaphoric messages may be somewhat longer than bare short follow-ups.
+_ANAPHORA_WORD_FACTOR = 2
+
+STICKY_REASONS: tuple[str, ...] = (
+    "follow_up",
+    "no_current_agent",
+    "expired",
+    "topic_switch",
+    "not_follow_up",
+)
+
+
+@dataclass(frozen=True)
+class StickyDecision:
+    """Whether a turn keeps the current specialist, and why."""
+
+    agent: str | None
+    reason: str
+
+
+class StickyRoutingStats(BaseModel):
+    """Process-lifetime counters for sticky routing decisions."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    total: int
+    kept: int
+    rerouted: int
+    sticky_rate: float
+    by_reason: dict[str, int]
+
+
+class StickyRoutingPolicy:
+    """Decide per turn whether to reuse ``Conversation.current_agent``."""
+
+    def __init__(
+        self,
+        *,
+        max_words: int = ROUTER_STICKY_MAX_WORDS,
+        window_seconds: float = ROUTER_STICKY_WINDOW_SECONDS,
+        classifier: LocalRouteClassifier | None = None,
+        switch_confidence: float = ROUTER_LOCAL_CONFIDENCE,
+        now: Callable[[], float] | None = None,
+    ) -> None:
+        self.max_words = max_words
+        self.window_seconds = window_seconds
+        self.classifier = classifier or LocalRouteClassifier()
+        self.switch_confidence = switch_confidence
+        self._now = now or time.time
+        self._reasons: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def decide(self, session: Conversation, message: str) -> StickyDecision:
+        """Return the agent to keep for *message*, or ``None`` to route normally."""
+
+        decision = self._decide(session, message)
+        with self._lock:
+            self._reasons[decision.reason] += 1
+        if decision.agent is not None:
+            logger.debug("routing_sticky", agent=decision.agent, session_id=session.session_id)
+        return decision
+
+    def stats(self) -> StickyRoutingStats:
+        with self._lock:
+            by_reason = {reason: self._reasons[reason] for reason in STICKY_REASONS}
+        total = sum(by_reason.values())
+        kept = by_reason["follow_up"]
+        return StickyRoutingStats(
+            total=total,
+            kept=kept,
+            rerouted=total - kept,
+            sticky_rate=round(kept / total, 4) if total else 0.0,
+            by_reason=by_reason,
+        )
+
+    def _decide(self, session: Conversation, message: str) -> StickyDecision:
+        agent = session.current_agent
+        answered_at = session.current_agent_at
+        if agent is None or answered_at is None:
+            return StickyDecision(None, "no_current_agent")
+        if self._now() - answered_at > self.window_seconds:
+            return StickyDecision(None, "expired")
+        if self._switches_topic(agent, message):
+            return StickyDecision(None, "topic_switch")
+        if not self._is_follow_up(message):
+            return StickyDecision(None, "not_follow_up")
+        return StickyDecision(agent, "follow_up")
+
+    def _switches_topic(self, agent: str, message: str) -> bool:
+        if any(TOPIC_AGENTS.get(topic, agent) != agent for topic in detect_topics(message)):
+            return True
+        local = self.classifier.classify(message)
+        return (
+            local.agent is not None
+            and local.agent != agent
+            and local.confidence >= self.switch_confidence
+        )
+
+    def _is_follow_up(self, message: str) -> bool:
+        words = len(message.split())
+        if words <= self.max_words:
+            return True
+        return words <= self.max_words * _ANAPHORA_WORD_FACTOR and bool(
+            _ANAPHORA_RE.search(message.strip())
+        )
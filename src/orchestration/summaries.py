@@ -0,0 +1,260 @@
+"""
+Background session summarization.
+
+Sidebar memory is refreshed by an extra Nova call after every turn. Running
+it inline adds that call to user-visible latency, so the worker below runs
+summaries after the reply has been returned. Jobs are coalesced per session:
+while a session already has a summary queued, newer turns only replace the
+pending job, and the transcript is read when the job starts, so only the
+latest state is ever summarized.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast
+
+import structlog
+from config.settings import (
+    SUMMARY_INCREMENTAL,
+    SUMMARY_QUEUE_MAX_SESSIONS,
+    SUMMARY_WORKER_THREADS,
+)
+from pydantic import BaseModel, ConfigDict
+
+from src.core.conversation import Conversation
+from src.core.session_summary import (
+    FallibleSessionSummarizer,
+    IncrementalSessionSummarizer,
+    SessionSummarizer,
+    SessionSummary,
+)
+from src.core.usage import metered
+
+logger = structlog.get_logger()
+
+
+class SummaryWorkerStats(BaseModel):
+    """Point-in-time queue metrics for the background summarizer."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    queue_depth: int
+    in_flight: int
+    max_queue_depth: int
+    submitted: int
+    coalesced: int
+    completed: int
+    failed: int
+    dropped: int
+
+
+def refresh_session_summary(
+    summarizer: SessionSummarizer,
+    session: Conversation,
+    *,
+    ui_language: str,
+    incremental: bool = SUMMARY_INCREMENTAL,
+) -> SessionSummary:
+    """Summarize the session and store the result on it.
+
+    Incremental summarizers only receive the messages added since the last
+    successful summary, plus that summary. A failed delta, or a failed full
+    summary of a summarizer that reports failures, leaves the session's
+    high-water mark untouched so the same messages are retried.
+    Token usage of the summary call is recorded on the session's meter.
+    """
+
+    with metered(session.usage):
+        return _refresh_session_summary(
+            summarizer, session, ui_language=ui_language, incremental=incremental
+        )
+
+
+def _refresh_session_summary(
+    summarizer: SessionSummarizer,
+    session: Conversation,
+    *,
+    ui_language: str,
+    incremental: bool,
+) -> SessionSummary:
+    use_delta = incremental and isinstance(summarizer, IncrementalSessionSummarizer)
+    summary_input = session.summary_input(since_last_summary=use_delta)
+    previous_summary = summary_input.previous_summary
+
+    if use_delta and previous_summary.has_content:
+        if not summary_input.messages:
+            return previous_summary
+        delta_summary = cast(IncrementalSessionSummarizer, summarizer).summarize_delta(
+            summary_input.messages,
+            ui_language=ui_language,
+            previous_summary=previous_summary,
+        )
+        if delta_summary is None:
+            logger.info("session_summary_delta_deferred", session_id=session.session_id)
+            return previous_summary
+        summary = delta_summary
+    else:
+        if use_delta:
+            # No summary yet: the first pass needs the full retained transcript.
+            summary_input = session.summary_input()
+        if isinstance(summarizer, FallibleSessionSummarizer):
+            full_summary = summarizer.try_summarize(
+                summary_input.messages,
+                ui_language=ui_language,
+                previous_summary=previous_summary,
+            )
+            if full_summary is None:
+                logger.info("session_summary_full_deferred", session_id=session.session_id)
+                return previous_summary
+            summary = full_summary
+        else:
+            summary = summarizer.summarize(
+                summary_input.messages,
+                ui_language=ui_language,
+                previous_summary=previous_summary,
+            )
+
+    session.update_summary(summary, covered_through=summary_input.covered_through)
+    return summary
+
+
+class SummaryWorker:
+    """Bounded thread pool that refreshes session summaries off the hot path."""
+
+    def __init__(
+        self,
+        summarizer: SessionSummarizer,
+        *,
+        max_workers: int = SUMMARY_WORKER_THREADS,
+        max_queue_depth: int = SUMMARY_QUEUE_MAX_SESSIONS,
+    ) -> None:
+        self.summarizer = summarizer
+        self.max_queue_depth = max_queue_depth
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="koda-summary",
+        )
+        self._lock = threading.Condition()
+        self._pending: dict[str, tuple[Conversation, str]] = {}
+        self._running: set[str] = set()
+        self._closed = False
+        self._submitted = 0
+        self._coalesced = 0
+        self._completed = 0
+        self._failed = 0
+        self._dropped = 0
+
+    def submit(self, session: Conversation, *, ui_language: str) -> bool:
+        """Queue a summary refresh; returns ``False`` when the job was dropped."""
+
+        session_id = session.session_id
+        with self._lock:
+            if self._closed:
+                self._dropped += 1
+                return False
+
+            if session_id in self._pending:
+                self._pending[session_id] = (session, ui_language)
+                self._coalesced += 1
+                return True
+
+            if len(self._pending) + len(self._running) >= self.max_queue_depth:
+                self._dropped += 1
+                logger.warning(
+                    "summary_queue_full",
+                    session_id=session_id,
+                    max_queue_depth=self.max_queue_depth,
+                )
+                return False
+
+            self._pending[session_id] = (session, ui_language)
+            self._submitted += 1
+            # A session that is being summarized right now is rescheduled by its
+            # running job, which keeps at most one summary per session in flight.
+            if session_id not in self._running:
+                self._executor.submit(self._run, session_id)
+            return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued summary has finished; ``False`` on timeout."""
+
+        with self._lock:
+            return self._lock.wait_for(
+                lambda: not self._pending and not self._running,
+                timeout=timeout,
+            )
+
+    def flush_session(self, session_id: str, timeout: float | None = None) -> bool:
+        """Block until *session_id* has no summary queued or running; ``False`` on timeout."""
+
+        with self._lock:
+            return self._lock.wait_for(
+                lambda: session_id not in self._pending and session_id not in self._running,
+                timeout=timeout,
+            )
+
+    def stats(self) -> SummaryWorkerStats:
+        """Return current queue depth and lifetime counters."""
+
+        with self._lock:
+            return SummaryWorkerStats(
+                queue_depth=len(self._pending),
+                in_flight=len(self._running),
+                max_queue_depth=self.max_queue_depth,
+                submitted=self._submitted,
+                coalesced=self._coalesced,
+                completed=self._completed,
+                failed=self._failed,
+                dropped=self._dropped,
+            )
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop accepting jobs; optionally wait for queued summaries to finish."""
+
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        with self._lock:
+            # Jobs cancelled before they started will never run.
+            abandoned = [key for key in self._pending if key not in self._running]
+            for key in abandoned:
+                del self._pending[key]
+            self._dropped += len(abandoned)
+            self._lock.notify_all()
+
+    def _run(self, session_id: str) -> None:
+        with self._lock:
+            job = self._pending.pop(session_id, None)
+            if job is None:
+                return
+            self._running.add(session_id)
+
+        session, ui_language = job
+        try:
+            refresh_session_summary(self.summarizer, session, ui_language=ui_language)
+        except Exception as exc:
+            logger.error(
+                "summary_worker_failed",
+                session_id=session_id,
+                error=str(exc),
+                type=type(exc).__name__,
+            )
+            succeeded = False
+        else:
+            succeeded = True
+
+        with self._lock:
+            self._running.discard(session_id)
+            if succeeded:
+                self._completed += 1
+            else:
+                self._failed += 1
+            if session_id in self._pending:
+                if self._closed:
+                    del self._pending[session_id]
+                    self._dropped += 1
+                else:
+                    self._executor.submit(self._run, session_id)
+            self._lock.notify_all()
@@ -0,0 +1,446 @@
+"""
+Concurrent triage: routing and crisis detection for a single user turn.
+
+Both classifications are independent Bedrock round-trips, so they are
+dispatched side by side and joined under one deadline. Whatever does not
+finish in time falls back safely instead of failing the turn.
+
+``CombinedTriage`` is the alternative selected by ``TRIAGE_MODE=combined``:
+one structured Nova request answers both questions, halving the triage
+request rate against Bedrock quotas.
+
+Both accept a ``sticky_agent`` chosen by the caller (session-sticky routing);
+routing is then skipped, but the crisis assessment always runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Protocol, TypeVar
+
+import structlog
+from config.settings import TRIAGE_DEADLINE_SECONDS, TRIAGE_MAX_WORKERS, TRIAGE_MODE
+
+from src.agents.crisis import CrisisRadar, crisis_scan_unavailable
+from src.agents.router import RouterAgent
+from src.agents.triage import TriageAgent, TriageDecision
+
+logger = structlog.get_logger()
+
+FALLBACK_AGENT = "COMPASS"
+
+_T = TypeVar("_T")
+
+
+class MessageRouter(Protocol):
+    """Minimal router surface needed by the triage stage."""
+
+    def route(self, user_message: str) -> str: ...
+
+    async def aroute(self, user_message: str) -> str: ...
+
+
+class CrisisScanner(Protocol):
+    """Minimal Crisis Radar surface needed by the triage stage."""
+
+    def scan(self, message: str) -> dict: ...
+
+    async def ascan(self, message: str) -> dict: ...
+
+
+class TriageClassifier(Protocol):
+    """Single-request routing + crisis classifier used by ``CombinedTriage``."""
+
+    def classify(self, message: str, *, route_message: str | None = None) -> TriageDecision: ...
+
+    async def aclassify(
+        self, message: str, *, route_message: str | None = None
+    ) -> TriageDecision: ...
+
+
+@dataclass(frozen=True)
+class TriageResult:
+    """Routing decision and crisis assessment for one turn, with stage timings."""
+
+    agent_key: str
+    crisis: dict[str, Any]
+    route_ms: float | None
+    crisis_ms: float | None
+    total_ms: float
+    route_fallback: bool = False
+    crisis_failed: bool = False
+    sticky: bool = False
+
+
+class TriageStage(Protocol):
+    """What ``ChatService`` needs from a triage implementation."""
+
+    def run(
+        self,
+        user_message: str,
+        *,
+        route_message: str | None = None,
+        sticky_agent: str | None = None,
+    ) -> TriageResult: ...
+
+    async def arun(
+        self,
+        user_message: str,
+        *,
+        route_message: str | None = None,
+        sticky_agent: str | None = None,
+    ) -> TriageResult: ...
+
+    def shutdown(self) -> None: ...
+
+
+class ParallelTriage:
+    """Run the router and the Crisis Radar concurrently under a shared deadline."""
+
+    def __init__(
+        self,
+        router: MessageRouter,
+        crisis_radar: CrisisScanner,
+        *,
+        deadline_seconds: float = TRIAGE_DEADLINE_SECONDS,
+        max_workers: int = TRIAGE_MAX_WORKERS,
+    ) -> None:
+        self.router = router
+        self.crisis_radar = crisis_radar
+        self.deadline_seconds = deadline_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="koda-triage",
+        )
+
+    def run(
+        self,
+        user_message: str,
+        *,
+        route_message: str | None = None,
+        sticky_agent: str | None = None,
+    ) -> TriageResult:
+        """Classify one turn; never raises for router or crisis failures."""
+
+        started = time.monotonic()
+        # Copied contexts keep the turn's usage meter bound in the pool threads.
+        crisis_future = self._executor.submit(
+            contextvars.copy_context().run, _timed, self.crisis_radar.scan, user_message
+        )
+        pending: list[Future[Any]] = [crisis_future]
+        route_future = None
+        if sticky_agent is None:
+            route_future = self._executor.submit(
+                contextvars.copy_context().run,
+                _timed,
+                self.router.route,
+                route_message or user_message,
+            )
+            pending.append(route_future)
+        wait(pending, timeout=self.deadline_seconds)
+        return self._complete(started, user_message, route_future, crisis_future, sticky_agent)
+
+    async def arun(
+        self,
+        user_message: str,
+        *,
+        route_message: str | None = None,
+        sticky_agent: str | None = None,
+    ) -> TriageResult:
+        """Async variant of :meth:`run`; both calls are awaited concurrently."""
+
+        started = time.monotonic()
+        crisis_task = asyncio.ensure_future(_atimed(self.crisis_radar.ascan, user_message))
+        pending: list[asyncio.Future[Any]] = [crisis_task]
+        route_task = None
+        if sticky_agent is None:
+            route_task = asyncio.ensure_future(
+                _atimed(self.router.aroute, route_message or user_message)
+            )
+            pending.append(route_task)
+        await asyncio.wait(pending, timeout=self.deadline_seconds)
+        return self._complete(started, user_message, route_task, crisis_task, sticky_agent)
+
+    def shutdown(self) -> None:
+        """Stop accepting work; in-flight classifications finish in the background."""
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _complete(
+        self,
+        started: float,
+        user_message: str,
+        route_future: Future[tuple[str, float]] | asyncio.Future[tuple[str, float]] | None,
+        crisis_future: Future[tuple[dict, float]] | asyncio.Future[tuple[dict, float]],
+        sticky_agent: str | None = None,
+    ) -> TriageResult:
+        if route_future is None:
+            agent_key, route_ms, route_fallback = sticky_agent or FALLBACK_AGENT, None, False
+        else:
+            agent_key, route_ms, route_fallback = self._resolve_route(route_future)
+        crisis, crisis_ms, crisis_failed = self._resolve_crisis(crisis_future, user_message)
+        result = TriageResult(
+            agent_key=agent_key,
+            crisis=crisis,
+            route_ms=route_ms,
+            crisis_ms=crisis_ms,
+            total_ms=_elapsed_ms(started),
+            route_fallback=route_fallback,
+            crisis_failed=crisis_failed,
+            sticky=sticky_agent is not None,
+        )
+        _log_triage(result, mode="parallel")
+        return result
+
+    def _resolve_route(
+        self,
+        future: Future[tuple[str, float]] | asyncio.Future[tuple[str, float]],
+    ) -> tuple[str, float | None, bool]:
+        if not future.done():
+            future.cancel()
+            logger.warning("triage_route_timeout", deadline_seconds=self.deadline_seconds)
+            return FALLBACK_AGENT, None, True
+
+        try:
+            agent_key, elapsed_ms = future.result()
+        except Exception as exc:
+            logger.error("triage_route_failed", error=str(exc), type=type(exc).__name__)
+            return FALLBACK_AGENT, None, True
+        return agent_key or FALLBACK_AGENT, elapsed_ms, not agent_key
+
+    def _resolve_crisis(
+        self,
+        future: Future[tuple[dict, float]] | asyncio.Future[tuple[dict, float]],
+        user_message: str,
+    ) -> tuple[dict[str, Any], float | None, bool]:
+        if not future.done():
+            future.cancel()
+            logger.warning("triage_crisis_timeout", deadline_seconds=self.deadline_seconds)
+            return crisis_scan_unavailable(user_message, "SCAN_TIMEOUT"), None, True
+
+        try:
+            crisis, elapsed_ms = future.result()
+        except Exception as exc:
+            logger.error("triage_crisis_failed", error=str(exc), type=type(exc).__name__)
+            return crisis_scan_unavailable(user_message, "SCAN_FAILED"), None, True
+        return crisis, elapsed_ms, False
+
+
+class CombinedTriage:
+    """Route and crisis-scan a turn with one Bedrock request instead of two.
+
+    When a router and Crisis Radar are given, their local fast paths (and
+    the Crisis Radar's assessment cache) run first; the combined request is
+    only sent if either answer is still open, and local answers take
+    precedence over the model's. As in ``ParallelTriage``, the crisis
+    question only ever sees the user's message; attached document names
+    inform routing alone.
+    """
+
+    def __init__(
+        self,
+        classifier: TriageClassifier,
+        *,
+        router: RouterAgent | None = None,
+        crisis_radar: CrisisRadar | None = None,
+        deadline_seconds: float = TRIAGE_DEADLINE_SECONDS,
+        max_workers: int = TRIAGE_MAX_WORKERS,
+    ) -> None:
+        self.classifier = classifier
+        self.router = router
+        self.crisis_radar = crisis_radar
+        self.deadline_seconds = deadline_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="koda-triage",
+        )
+
+    def run(
+        self,
+        user_message: str,
+        *,
+        route_message: str | None = None,
+        sticky_agent: str | None = None,
+    ) -> TriageResult:
+        """Classify one turn; never raises for classifier failures."""
+
+        started = time.monotonic()
+        message = route_message or user_message
+        local_agent, local_crisis = self._decide_locally(user_message, message, sticky_agent)
+        if local_agent is not None and local_crisis is not None:
+            return self._local_result(started, local_agent, local_crisis, sticky_agent)
+
+        self._record_model_route(local_agent)
+        future = self._executor.submit(
+            contextvars.copy_context().run,
+            _timed,
+            functools.partial(self.classifier.classify, route_message=message),
+            user_message,
+        )
+        wait([future], timeout=self.deadline_seconds)
+        return self._complete(
+            started, user_message, future, local_agent, local_crisis, sticky_agent
+        )
+
+    async def arun(
+        self,
+        user_message: str,
+        *,
+        route_message: str | None = None,
+        sticky_agent: str | None = None,
+    ) -> TriageResult:
+        """Async variant of :meth:`run`."""
+
+        started = time.monotonic()
+        message = route_message or user_message
+        local_agent, local_crisis = self._decide_locally(user_message, message, sticky_agent)
+        if local_agent is not None and local_crisis is not None:
+            return self._local_result(started, local_agent, local_crisis, sticky_agent)
+
+        self._record_model_route(local_agent)
+        task = asyncio.ensure_future(
+            _atimed(
+                functools.partial(self.classifier.aclassify, route_message=message), user_message
+            )
+        )
+        await asyncio.wait((task,), timeout=self.deadline_seconds)
+        return self._complete(started, user_message, task, local_agent, local_crisis, sticky_agent)
+
+    def shutdown(self) -> None:
+        """Stop accepting work; in-flight classifications finish in the background."""
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _decide_locally(
+        self, user_message: str, route_message: str, sticky_agent: str | None
+    ) -> tuple[str | None, dict[str, Any] | None]:
+        agent = sticky_agent
+        if agent is None and self.router is not None:
+            agent = self.router.route_locally(route_message)
+        crisis = None
+        if self.crisis_radar is not None:
+            crisis = self.crisis_radar.known_assessment(user_message)
+        return agent, crisis
+
+    def _record_model_route(self, local_agent: str | None) -> None:
+        # The combined request decides the route only when nothing local did.
+        if local_agent is None and self.router is not None:
+            self.router.record_model_route()
+
+    def _local_result(
+        self, started: float, agent_key: str, crisis: dict, sticky_agent: str | None
+    ) -> TriageResult:
+        elapsed = _elapsed_ms(started)
+        result = TriageResult(
+            agent_key=agent_key,
+            crisis=crisis,
+            route_ms=None if sticky_agent is not None else elapsed,
+            crisis_ms=elapsed,
+            total_ms=elapsed,
+            sticky=sticky_agent is not None,
+        )
+        _log_triage(result, mode="combined")
+        return result
+
+    def _complete(
+        self,
+        started: float,
+        user_message: str,
+        future: Future[tuple[TriageDecision, float]] | asyncio.Future[tuple[TriageDecision, float]],
+        local_agent: str | None,
+        local_crisis: dict[str, Any] | None,
+        sticky_agent: str | None = None,
+    ) -> TriageResult:
+        decision: TriageDecision | None = None
+        call_ms: float | None = None
+        failure = "SCAN_FAILED"
+        if not future.done():
+            future.cancel()
+            failure = "SCAN_TIMEOUT"
+            logger.warning("triage_combined_timeout", deadline_seconds=self.deadline_seconds)
+        else:
+            try:
+                decision, call_ms = future.result()
+            except Exception as exc:
+                logger.error("triage_combined_failed", error=str(exc), type=type(exc).__name__)
+
+        if local_agent is not None:
+            agent_key, route_fallback = local_agent, False
+        elif decision is not None:
+            agent_key, route_fallback = decision.agent_key, False
+        else:
+            agent_key, route_fallback = FALLBACK_AGENT, True
+
+        if local_crisis is not None:
+            crisis, crisis_failed = local_crisis, False
+        elif decision is not None:
+            crisis, crisis_failed = decision.crisis, False
+        else:
+            crisis, crisis_failed = crisis_scan_unavailable(user_message, failure), True
+
+        result = TriageResult(
+            agent_key=agent_key,
+            crisis=crisis,
+            route_ms=None if route_fallback or sticky_agent is not None else call_ms,
+            crisis_ms=None if crisis_failed else call_ms,
+            total_ms=_elapsed_ms(started),
+            route_fallback=route_fallback,
+            crisis_failed=crisis_failed,
+            sticky=sticky_agent is not None,
+        )
+        _log_triage(result, mode="combined")
+        return result
+
+
+TRIAGE_MODES: tuple[str, ...] = ("parallel", "combined")
+
+
+def build_triage(
+    router: RouterAgent,
+    crisis_radar: CrisisRadar,
+    mode: str = TRIAGE_MODE,
+) -> TriageStage:
+    """Create the triage stage selected by *mode* (``parallel`` or ``combined``)."""
+
+    if mode == "parallel":
+        return ParallelTriage(router, crisis_radar)
+    if mode == "combined":
+        return CombinedTriage(TriageAgent(), router=router, crisis_radar=crisis_radar)
+    raise ValueError(f"Unknown triage mode: {mode}")
+
+
+def _log_triage(result: TriageResult, *, mode: str) -> None:
+    logger.info(
+        "triage_completed",
+        mode=mode,
+        agent=result.agent_key,
+        crisis=bool(result.crisis.get("is_crisis")),
+        route_ms=result.route_ms,
+        crisis_ms=result.crisis_ms,
+        total_ms=result.total_ms,
+        route_fallback=result.route_fallback,
+        crisis_failed=result.crisis_failed,
+        sticky=result.sticky,
+    )
+
+
+def _timed(fn: Callable[[str], _T], message: str) -> tuple[_T, float]:
+    started = time.monotonic()
+    result = fn(message)
+    return result, _elapsed_ms(started)
+
+
+async def _atimed(fn: Callable[[str], Awaitable[_T]], message: str) -> tuple[_T, float]:
+    started = time.monotonic()
+    result = await fn(message)
+    return result, _elapsed_ms(started)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.monotonic() - started) * 1000, 2)
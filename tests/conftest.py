@@ -0,0 +1,12 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from src.core.client import reset_bedrock_runtime_clients
+
+
+@pytest.fixture(autouse=True)
+def _isolated_bedrock_clients():
+    """Tests patch ``boto3.client``; never reuse a runtime client across tests."""
+    reset_bedrock_runtime_clients()
+    yield
+    reset_bedrock_runtime_clients()
@@ -76,6 +76,30 @@ class TestHealthEndpoint:
         expected_agents = {"COMPASS", "FINANCING", "STUDY_CHOICE", "ACADEMIC_BASICS", "ROLE_MODELS"}
         assert expected_agents == set(body["agents"])
 
+    def test_metrics_are_disabled_without_a_token(self, client: "TestClient") -> None:
+        """GET /api/metrics must not be served unless METRICS_API_TOKEN is set."""
+        with patch("src.api.app.METRICS_API_TOKEN", ""):
+            assert client.get("/api/metrics").status_code == 404
+
+    def test_metrics_require_the_bearer_token(self, client: "TestClient") -> None:
+        """GET /api/metrics must reject requests without the configured token."""
+        with patch("src.api.app.METRICS_API_TOKEN", "s3cret"):
+            assert client.get("/api/metrics").status_code == 401
+            wrong = client.get("/api/metrics", headers={"Authorization": "Bearer nope"})
+            assert wrong.status_code == 401
+
+    def test_metrics_expose_summary_queue(self, client: "TestClient") -> None:
+        """GET /api/metrics must expose summary queue depth without user data."""
+        with patch("src.api.app.METRICS_API_TOKEN", "s3cret"):
+            response = client.get("/api/metrics", headers={"Authorization": "Bearer s3cret"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["sessions"] >= 0
+        assert body["summaries"]["queue_depth"] >= 0
+        assert "dropped" in body["summaries"]
+        assert 0.0 <= body["routing"]["local_hit_rate"] <= 1.0
+        assert 0.0 <= body["crisis_screen"]["model_rate"] <= 1.0
+
 
 # ---------------------------------------------------------------------------
 # Chat endpoint
@@ -0,0 +1,70 @@
+"""Unit tests for the lazily constructed agent registry."""
+
+import threading
+
+import pytest
+from src.orchestration import LazyAgentRegistry
+
+pytestmark = pytest.mark.unit
+
+
+class CountingFactory:
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> object:
+        with self._lock:
+            self.calls += 1
+        return object()
+
+
+class TestLazyAgentRegistry:
+    def test_agents_are_built_on_first_lookup_only(self):
+        compass = CountingFactory()
+        financing = CountingFactory()
+        registry = LazyAgentRegistry({"COMPASS": compass, "FINANCING": financing})
+
+        assert list(registry) == ["COMPASS", "FINANCING"]
+        assert len(registry) == 2
+        assert "FINANCING" in registry
+        assert "UNKNOWN" not in registry
+        assert financing.calls == 0
+
+        first = registry["COMPASS"]
+
+        assert registry["COMPASS"] is first
+        assert registry.get("COMPASS") is first
+        assert registry.get("UNKNOWN") is None
+        assert compass.calls == 1
+        assert registry.is_built("COMPASS") is True
+        assert registry.is_built("FINANCING") is False
+
+    def test_warm_up_builds_every_agent_once(self):
+        factories = {key: CountingFactory() for key in ("COMPASS", "FINANCING", "ROLE_MODELS")}
+        registry = LazyAgentRegistry(factories)
+
+        agents = registry.warm_up()
+        registry.warm_up()
+
+        assert len(agents) == 3
+        assert [factory.calls for factory in factories.values()] == [1, 1, 1]
+
+    def test_concurrent_first_lookups_share_one_instance(self):
+        factory = CountingFactory()
+        registry = LazyAgentRegistry({"COMPASS": factory})
+        seen: list[object] = []
+        barrier = threading.Barrier(8)
+
+        def lookup() -> None:
+            barrier.wait()
+            seen.append(registry["COMPASS"])
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert factory.calls == 1
+        assert all(agent is seen[0] for agent in seen)
@@ -0,0 +1,210 @@
+"""Unit tests for canned quick-action answers."""
+
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from src.agents.base import FALLBACK_MESSAGES
+from src.core.provenance import AgentReply, ResponseProvenance, SourceAttribution
+from src.i18n import t
+from src.knowledge import trusted_source_registry_version
+from src.orchestration import CannedAnswerCache, ChatService, ChatTurnResult
+
+pytestmark = pytest.mark.unit
+
+QUICK_BAFOEG = t("quick_bafoeg_msg", "en")
+
+CITED = ResponseProvenance(
+    mode="source_registry",
+    source_registry_used=True,
+    web_grounding_used=False,
+    sources=(
+        SourceAttribution(
+            title="BAföG",
+            url="https://www.bafög.de",
+            domain="bafög.de",
+            origin="source_registry",
+        ),
+    ),
+)
+
+
+class FixedRouter:
+    def __init__(self, agent: str = "FINANCING") -> None:
+        self.agent = agent
+
+    def route(self, _message: str) -> str:
+        return self.agent
+
+    async def aroute(self, message: str) -> str:
+        return self.route(message)
+
+
+class StubRadar:
+    def __init__(self, *, crisis: bool = False) -> None:
+        self.crisis = crisis
+
+    def scan(self, _message: str) -> dict:
+        return {"is_crisis": self.crisis, "resources": {"hotline": "0800"} if self.crisis else None}
+
+    async def ascan(self, message: str) -> dict:
+        return self.scan(message)
+
+
+class CountingAgent:
+    tool_mode = None
+
+    def __init__(self, text: str = "BAföG is federal student aid.") -> None:
+        self.text = text
+        self.calls = 0
+
+    def respond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        self.calls += 1
+        return AgentReply(text=self.text, provenance=CITED)
+
+    def respond_stream(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> Generator[str, None, None]:
+        self.calls += 1
+        yield from self.text.partition(" is ")
+
+    async def arespond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        return self.respond_with_details(messages, metadata)
+
+    async def arespond_stream(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AsyncGenerator[str, None]:
+        for chunk in self.respond_stream(messages, metadata):
+            yield chunk
+
+
+def _service(
+    *, crisis: bool = False, version: str = "de@1"
+) -> tuple[ChatService, CountingAgent, CannedAnswerCache]:
+    agent = CountingAgent()
+    canned = CannedAnswerCache(max_entries=8, ttl_seconds=60, registry_version=lambda: version)
+    service = ChatService(
+        router=FixedRouter(),
+        crisis_radar=StubRadar(crisis=crisis),
+        agents={"COMPASS": CountingAgent("compass"), "FINANCING": agent},
+        canned_answers=canned,
+    )
+    return service, agent, canned
+
+
+class TestCannedAnswerCache:
+    def test_only_quick_action_messages_are_eligible(self):
+        canned = CannedAnswerCache()
+
+        assert canned.eligible(f"  {QUICK_BAFOEG} ")
+        assert canned.eligible(t("quick_bafoeg_msg", "de"))
+        assert not canned.eligible("What is BAföG? I live in Munich.")
+
+    def test_key_includes_agent_language_and_registry_version(self):
+        version = ["de@1"]
+        canned = CannedAnswerCache(registry_version=lambda: version[0])
+        key = canned.key(QUICK_BAFOEG, agent_key="FINANCING", ui_language="en")
+
+        assert key != canned.key(QUICK_BAFOEG, agent_key="COMPASS", ui_language="en")
+        assert key != canned.key(QUICK_BAFOEG, agent_key="FINANCING", ui_language="de")
+        version[0] = "de@2"
+        assert key != canned.key(QUICK_BAFOEG, agent_key="FINANCING", ui_language="en")
+
+    def test_fallback_replies_are_not_stored(self):
+        canned = CannedAnswerCache()
+        reply = AgentReply(text=FALLBACK_MESSAGES["en"], provenance=CITED)
+
+        canned.put("k", reply)
+
+        assert canned.get("k") is None
+
+    def test_invalidate_drops_answers(self):
+        canned = CannedAnswerCache()
+        canned.put("k", AgentReply(text="answer", provenance=CITED))
+
+        canned.invalidate()
+
+        assert canned.get("k") is None
+
+
+class TestChatServiceCannedAnswers:
+    def test_second_new_session_is_served_from_cache_with_provenance(self):
+        service, agent, canned = _service()
+
+        first = service.respond(QUICK_BAFOEG)
+        second = service.respond(QUICK_BAFOEG)
+
+        assert agent.calls == 1
+        assert second.response == first.response
+        assert second.provenance == CITED
+        assert second.session_id != first.session_id
+        assert canned.stats().hits == 1
+        assert service.metrics()["canned_answers"]["hits"] == 1
+
+    def test_cached_turn_is_stored_in_the_session(self):
+        service, _agent, _canned = _service()
+        service.respond(QUICK_BAFOEG)
+
+        second = service.respond(QUICK_BAFOEG)
+
+        snapshot = service.get_session_snapshot(second.session_id)
+        assert snapshot is not None
+        assert snapshot.current_agent == "FINANCING"
+
+    def test_session_with_memory_bypasses_cache(self):
+        service, agent, _canned = _service()
+        first = service.respond(QUICK_BAFOEG)
+
+        service.respond(QUICK_BAFOEG, session_id=first.session_id)
+
+        assert agent.calls == 2
+
+    def test_crisis_turn_bypasses_cache(self):
+        service, agent, canned = _service(crisis=True)
+
+        service.respond(QUICK_BAFOEG)
+        service.respond(QUICK_BAFOEG)
+
+        assert agent.calls == 2
+        assert canned.stats().size == 0
+
+    def test_languages_are_cached_separately(self):
+        service, agent, _canned = _service()
+
+        service.respond(QUICK_BAFOEG, ui_language="en")
+        service.respond(QUICK_BAFOEG, ui_language="de")
+
+        assert agent.calls == 2
+
+    def test_stream_replays_cached_answer(self):
+        service, agent, _canned = _service()
+        first = list(service.respond_stream(QUICK_BAFOEG))
+
+        second = list(service.respond_stream(QUICK_BAFOEG))
+
+        assert agent.calls == 1
+        assert "".join(second[:-1]) == agent.text
+        result = second[-1]
+        assert isinstance(result, ChatTurnResult)
+        assert result.response == first[-1].response
+        assert result.provenance == first[-1].provenance
+
+    @pytest.mark.asyncio
+    async def test_async_paths_share_the_cache(self):
+        service, agent, _canned = _service()
+
+        await service.arespond(QUICK_BAFOEG)
+        chunks = [chunk async for chunk in service.arespond_stream(QUICK_BAFOEG)]
+
+        assert agent.calls == 1
+        assert chunks[-1].provenance == CITED
+
+
+def test_registry_version_names_every_manifest():
+    version = trusted_source_registry_version()
+
+    assert version
+    assert all("@" in part for part in version.split(","))
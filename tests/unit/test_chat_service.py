@@ -1,15 +1,25 @@
 """Unit tests for the shared chat orchestration service."""
 
 import json
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
+from src.agents.router import RouterAgent
+from src.core.client import NovaThrottlingError, StreamInterrupted
 from src.core.conversation import ConversationStore
 from src.core.documents import DocumentUploadInput
 from src.core.provenance import AgentReply, build_default_provenance
 from src.core.session_summary import SessionSummary
+from src.core.summary_cadence import EveryNTurns
 from src.i18n import t
-from src.orchestration import ChatService, ChatTurnResult
+from src.orchestration import (
+    ChatService,
+    ChatTurnResult,
+    LazyAgentRegistry,
+    OnboardingTurnResult,
+    SummaryWorker,
+)
+from structlog.testing import capture_logs
 
 pytestmark = pytest.mark.unit
 
@@ -21,6 +31,9 @@ class StubRouter:
     def route(self, _message: str) -> str:
         return self.agent_key
 
+    async def aroute(self, message: str) -> str:
+        return self.route(message)
+
 
 class StubCrisisRadar:
     def __init__(self, payload: dict) -> None:
@@ -29,6 +42,9 @@ class StubCrisisRadar:
     def scan(self, _message: str) -> dict:
         return self.payload
 
+    async def ascan(self, message: str) -> dict:
+        return self.scan(message)
+
 
 class StubAgent:
     def __init__(
@@ -36,7 +52,7 @@ class StubAgent:
         *,
         tool_mode: str | None = None,
         text: str = "Test response",
-        stream_chunks: list[str] | None = None,
+        stream_chunks: list[str | StreamInterrupted] | None = None,
     ) -> None:
         self.tool_mode = tool_mode
         self.text = text
@@ -55,11 +71,24 @@ class StubAgent:
         self,
         messages: list[dict],
         metadata: dict | None = None,
-    ) -> Generator[str, None, None]:
+    ) -> Generator[str | StreamInterrupted, None, None]:
         self.messages_seen = messages
         self.metadata_seen = metadata or {}
         yield from self.stream_chunks
 
+    async def arespond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        return self.respond_with_details(messages, metadata)
+
+    async def arespond_stream(
+        self,
+        messages: list[dict],
+        metadata: dict | None = None,
+    ) -> AsyncGenerator[str | StreamInterrupted, None]:
+        for chunk in self.respond_stream(messages, metadata):
+            yield chunk
+
 
 class StubSummarizer:
     def summarize(
@@ -87,6 +116,21 @@ class StubSummarizer:
         )
 
 
+class CountingSummarizer:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def summarize(
+        self,
+        messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary | None = None,
+    ) -> SessionSummary:
+        self.calls += 1
+        return SessionSummary(conversation_overview=(f"{len(messages)} messages",))
+
+
 class StubOnboardingAgent:
     def __init__(
         self,
@@ -106,6 +150,11 @@ class StubOnboardingAgent:
         self.metadata_seen = metadata or {}
         return AgentReply(text=self.text, provenance=build_default_provenance())
 
+    async def arespond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        return self.respond_with_details(messages, metadata)
+
     def respond_stream(
         self,
         messages: list[dict],
@@ -269,6 +318,23 @@ class TestChatService:
         assert isinstance(streamed[-1], ChatTurnResult)
         assert streamed[-1].response == "Improved answer"
 
+    def test_interrupted_stream_keeps_partial_answer_with_notice(self):
+        interruption = StreamInterrupted(error=NovaThrottlingError("slow down"), chunks_delivered=1)
+        agent = StubAgent(stream_chunks=["Der BAföG-Antrag", interruption])
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": agent},
+        )
+
+        with capture_logs() as logs:
+            streamed = list(service.respond_stream("BAföG?", ui_language="de"))
+
+        assert streamed[:-1] == ["Der BAföG-Antrag", t("stream_interrupted", "de")]
+        assert isinstance(streamed[-1], ChatTurnResult)
+        assert streamed[-1].response == "Der BAföG-Antrag" + t("stream_interrupted", "de")
+        assert any(log["event"] == "chat_stream_interrupted" for log in logs)
+
     def test_respond_reuses_session_memory_without_replaying_history(self):
         agent = StubAgent(text="Antwort")
         service = ChatService(
@@ -513,3 +579,343 @@ class TestChatService:
         assert onboarding_agent.metadata_seen["ui_language"] == "de"
         assert onboarding_agent.metadata_seen["onboarding_user_turn_count"] == 4
         assert onboarding_agent.metadata_seen["force_onboarding_completion"] is True
+
+    def test_respond_falls_back_to_compass_when_router_fails(self):
+        class FailingRouter:
+            def route(self, _message: str) -> str:
+                raise RuntimeError("bedrock unavailable")
+
+        compass = StubAgent(text="Lass uns gemeinsam schauen.")
+        service = ChatService(
+            router=FailingRouter(),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": compass, "FINANCING": StubAgent()},
+        )
+
+        result = service.respond("Wie beantrage ich BAfoeG?", ui_language="de")
+
+        assert result.agent == "COMPASS"
+        assert result.response == "Lass uns gemeinsam schauen."
+
+    def test_lazy_registry_builds_only_the_routed_agent(self):
+        built: list[str] = []
+
+        def factory(key: str, text: str):
+            def build() -> StubAgent:
+                built.append(key)
+                return StubAgent(text=text)
+
+            return build
+
+        service = ChatService(
+            router=StubRouter("FINANCING"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents=LazyAgentRegistry(
+                {
+                    "COMPASS": factory("COMPASS", "Kompass"),
+                    "FINANCING": factory("FINANCING", "Finanzen"),
+                    "ROLE_MODELS": factory("ROLE_MODELS", "Vorbilder"),
+                }
+            ),
+            onboarding_agent=StubOnboardingAgent(),
+        )
+
+        assert service.agent_keys == ("COMPASS", "FINANCING", "ROLE_MODELS")
+        assert built == []
+
+        result = service.respond("Wie beantrage ich BAfoeG?", ui_language="de")
+
+        assert result.response == "Finanzen"
+        assert built == ["FINANCING"]
+
+        with capture_logs() as logs:
+            durations = service.warm_up()
+
+        assert sorted(built) == ["COMPASS", "FINANCING", "ROLE_MODELS"]
+        assert set(durations) == {"agents", "clients", "trusted_sources"}
+        assert any(log["event"] == "chat_service_warmed" for log in logs)
+
+    def test_warm_up_skips_failing_steps(self):
+        def broken() -> StubAgent:
+            raise RuntimeError("no credentials")
+
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents=LazyAgentRegistry({"COMPASS": broken}),
+            onboarding_agent=StubOnboardingAgent(),
+        )
+
+        with capture_logs() as logs:
+            durations = service.warm_up()
+
+        assert "agents" not in durations
+        assert "trusted_sources" in durations
+        failure = next(log for log in logs if log["event"] == "warm_up_step_failed")
+        assert failure["step"] == "agents"
+
+    def test_warm_up_skips_router_preseeding_by_default(self):
+        class FailingRouterClient:
+            def converse(self, **_kwargs) -> dict:
+                raise AssertionError("warm-up must not call the router")
+
+        router = RouterAgent()
+        router.client = FailingRouterClient()  # type: ignore[assignment]
+        service = ChatService(
+            router=router,
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent()},
+            onboarding_agent=StubOnboardingAgent(),
+        )
+
+        durations = service.warm_up()
+
+        assert "route_cache" not in durations
+        assert router.cache is not None
+        assert router.cache.stats().size == 0
+
+    def test_warm_up_preseeds_the_router_cache(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr("src.orchestration.chat_service.ROUTER_CACHE_PRESEED", True)
+
+        class FakeRouterClient:
+            calls = 0
+
+            def converse(self, **_kwargs) -> dict:
+                FakeRouterClient.calls += 1
+                return {"text": "AGENT: COMPASS"}
+
+            def extract_text(self, response: dict) -> str:
+                return response["text"]
+
+        router = RouterAgent()
+        router.client = FakeRouterClient()  # type: ignore[assignment]
+        service = ChatService(
+            router=router,
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent()},
+            onboarding_agent=StubOnboardingAgent(),
+        )
+
+        durations = service.warm_up()
+
+        assert "route_cache" in durations
+        assert FakeRouterClient.calls > 0
+        assert router.cache is not None
+        assert router.cache.stats().size == FakeRouterClient.calls
+
+    def test_summary_worker_runs_summary_after_reply(self):
+        worker = SummaryWorker(StubSummarizer())
+        service = ChatService(
+            router=StubRouter("FINANCING"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(), "FINANCING": StubAgent(text="Antwort")},
+            summary_worker=worker,
+        )
+
+        result = service.respond("Ich arbeite 20h pro Woche.", ui_language="de")
+        assert worker.flush(timeout=2) is True
+
+        snapshot = service.get_session_snapshot(result.session_id)
+        assert snapshot is not None
+        assert snapshot.profile_facts == ("Erstakademikerin", "Arbeitet 20h/Woche")
+        metrics = service.metrics()
+        assert metrics["sessions"] == 1
+        assert metrics["summaries"]["completed"] == 1
+        assert metrics["summaries"]["queue_depth"] == 0
+        service.shutdown()
+
+    def test_summary_cadence_skips_turns_and_export_forces_summary(self):
+        summarizer = CountingSummarizer()
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(text="Okay")},
+            summarizer=summarizer,
+            summary_cadence=EveryNTurns(2),
+        )
+
+        first = service.respond("Hallo", ui_language="de")
+        service.respond("Noch etwas", session_id=first.session_id, ui_language="de")
+        service.respond("Und noch etwas", session_id=first.session_id, ui_language="de")
+
+        assert summarizer.calls == 1
+        assert service.metrics()["summary_cadence"] == {
+            "scheduled": 1,
+            "skipped": 2,
+            "forced": 0,
+            "over_budget": 0,
+        }
+
+        bundle = service.export_session_bundle(first.session_id)
+
+        assert bundle is not None
+        assert summarizer.calls == 2
+        assert service.metrics()["summary_cadence"]["forced"] == 1
+        service.export_session_bundle(first.session_id)
+        assert summarizer.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_async_export_summarizes_through_the_worker(self):
+        summarizer = CountingSummarizer()
+        worker = SummaryWorker(summarizer)
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(text="Okay")},
+            summary_worker=worker,
+            summary_cadence=EveryNTurns(5),
+        )
+        first = service.respond("Hallo", ui_language="de")
+        assert summarizer.calls == 0
+
+        bundle = await service.aexport_session_bundle(first.session_id)
+
+        assert bundle is not None
+        assert bundle.session.conversation_overview == ("2 messages",)
+        assert summarizer.calls == 1
+        assert worker.stats().completed == 1
+        assert service.metrics()["summary_cadence"]["forced"] == 1
+        service.shutdown()
+
+    def test_turn_timings_are_optional_and_always_logged(self):
+        def build(include_timings: bool) -> ChatService:
+            return ChatService(
+                router=StubRouter("COMPASS"),
+                crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+                agents={"COMPASS": StubAgent(text="Okay")},
+                include_timings=include_timings,
+            )
+
+        with capture_logs() as logs:
+            hidden = build(False).respond("Hallo", ui_language="de")
+        shown = build(True).respond("Hallo", ui_language="de")
+
+        assert hidden.timings is None
+        assert shown.timings is not None
+        assert shown.timings.triage_ms is not None
+        assert shown.timings.generation_ms is not None
+        assert shown.timings.store_ms is not None
+        assert shown.timings.first_chunk_ms is None
+        assert shown.timings.total_ms >= shown.timings.generation_ms
+        event = next(log for log in logs if log["event"] == "chat_turn_timings")
+        assert event["agent"] == "COMPASS"
+        assert "total_ms" in event
+
+    def test_stream_timings_include_time_to_first_chunk(self):
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(stream_chunks=["Hallo", " Welt"])},
+            include_timings=True,
+        )
+
+        streamed = list(service.respond_stream("Hi", ui_language="de"))
+
+        result = streamed[-1]
+        assert isinstance(result, ChatTurnResult)
+        assert result.timings is not None
+        assert result.timings.first_chunk_ms is not None
+        assert result.timings.first_chunk_ms <= result.timings.total_ms
+
+    def test_onboarding_result_carries_timings_when_enabled(self):
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent()},
+            onboarding_agent=StubOnboardingAgent(stream_chunks=["Hallo!"]),
+            include_timings=True,
+        )
+
+        streamed = list(service.start_onboarding_stream(ui_language="de"))
+
+        result = streamed[-1]
+        assert isinstance(result, OnboardingTurnResult)
+        assert result.timings is not None
+        assert result.timings.context_ms is not None
+        assert result.timings.first_chunk_ms is not None
+
+
+class TestAsyncChatService:
+    @pytest.mark.asyncio
+    async def test_arespond_matches_sync_turn_shape(self):
+        agent = StubAgent(text="Antwort")
+        service = ChatService(
+            router=StubRouter("FINANCING"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(), "FINANCING": agent},
+        )
+
+        result = await service.arespond("Wie beantrage ich BAfoeG?", ui_language="de")
+
+        assert result.response == "Antwort"
+        assert result.agent == "FINANCING"
+        assert agent.metadata_seen is not None
+        assert agent.metadata_seen["ui_language"] == "de"
+        session = service.sessions.get(result.session_id)
+        assert session is not None
+        assert [message["role"] for message in session.get_messages()] == ["user", "assistant"]
+
+    @pytest.mark.asyncio
+    async def test_arespond_stream_honors_crisis_prefix_and_replacement(self):
+        agent = StubAgent(stream_chunks=["First draft", "\x00REPLACE\x00Improved answer"])
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar(
+                {"is_crisis": True, "resources": {"de": "Telefonseelsorge"}}
+            ),
+            agents={"COMPASS": agent},
+        )
+
+        streamed = [chunk async for chunk in service.arespond_stream("Hilfe", ui_language="de")]
+
+        prefix = streamed[0]
+        assert isinstance(prefix, str)
+        assert streamed[1:-1] == ["First draft"]
+        assert isinstance(streamed[-1], ChatTurnResult)
+        assert streamed[-1].crisis is True
+        assert streamed[-1].response == prefix + "Improved answer"
+
+    @pytest.mark.asyncio
+    async def test_arespond_with_documents_tracks_document_provenance(self):
+        service = ChatService(
+            router=StubRouter("FINANCING"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(), "FINANCING": StubAgent(text="Dein Bescheid")},
+        )
+
+        result = await service.arespond_with_documents(
+            "",
+            [
+                DocumentUploadInput(
+                    name="Bescheid.pdf",
+                    media_type="application/pdf",
+                    content=b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\n",
+                )
+            ],
+            ui_language="de",
+        )
+
+        assert result.provenance.document_used is True
+        assert result.response == "Dein Bescheid"
+
+    @pytest.mark.asyncio
+    async def test_async_onboarding_start_and_continue(self):
+        onboarding = StubOnboardingAgent(
+            text="Fertig! [PROFILE_START]Erstakademikerin[PROFILE_END]",
+        )
+        service = ChatService(
+            router=StubRouter("COMPASS"),
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent()},
+            onboarding_agent=onboarding,
+        )
+
+        started = await service.astart_onboarding(ui_language="de")
+        finished = await service.acontinue_onboarding(
+            "Ich bin die Erste in meiner Familie.",
+            session_id=started.session_id,
+            ui_language="de",
+        )
+
+        assert finished.completed is True
+        assert finished.profile_summary == "Erstakademikerin"
@@ -1,7 +1,18 @@
 """Unit tests for Bedrock response parsing helpers."""
 
+import botocore.exceptions
 import pytest
-from src.core.client import NovaClient, strip_hidden_markers
+from config.settings import BEDROCK_MAX_POOL_CONNECTIONS
+from src.agents.compass import CompassAgent
+from src.core.client import (
+    PROMPT_CACHE_POINT,
+    NovaClient,
+    get_bedrock_runtime_client,
+    prompt_cache_stats,
+    reset_bedrock_runtime_clients,
+    strip_hidden_markers,
+)
+from src.core.usage import reset_process_usage
 
 pytestmark = pytest.mark.unit
 
@@ -142,3 +153,212 @@ class TestWebCitationExtraction:
         citations = NovaClient.extract_web_citations(response)
 
         assert len(citations) == 1
+
+
+class _FlakyBedrock:
+    """Raise ThrottlingException once, then return a canned response."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def converse(self, **_kwargs) -> dict:
+        self.calls += 1
+        if self.calls == 1:
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+                "Converse",
+            )
+        return _make_response("Async hello")
+
+
+class TestAsyncConverse:
+    @pytest.mark.asyncio
+    async def test_aconverse_retries_without_blocking_sleep(self, monkeypatch):
+        bedrock = _FlakyBedrock()
+        monkeypatch.setattr("src.core.client.boto3.client", lambda *_args, **_kwargs: bedrock)
+        delays: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            delays.append(delay)
+
+        def forbidden_sleep(_delay: float) -> None:
+            raise AssertionError("time.sleep must not run on the async path")
+
+        monkeypatch.setattr("src.core.client.asyncio.sleep", fake_sleep)
+        monkeypatch.setattr("src.core.client.time.sleep", forbidden_sleep)
+
+        response = await NovaClient().aconverse([{"role": "user", "content": [{"text": "Hi"}]}])
+
+        assert NovaClient.extract_text(response) == "Async hello"
+        assert bedrock.calls == 2
+        assert len(delays) == 1
+        assert 0.0 <= delays[0] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_aiter_stream_text_strips_hidden_markers(self):
+        fake_stream = [
+            {"contentBlockDelta": {"delta": {"text": "[HIDDEN]"}}},
+            {"contentBlockDelta": {"delta": {"text": "Hello"}}},
+            {"contentBlockDelta": {"delta": {"text": " async"}}},
+        ]
+
+        chunks = [chunk async for chunk in NovaClient.aiter_stream_text({"stream": fake_stream})]
+
+        assert chunks == ["Hello", " async"]
+
+
+class TestSharedRuntimeClient:
+    def test_nova_clients_share_one_pooled_runtime_client_per_region(self, monkeypatch):
+        created: list[dict] = []
+
+        def fake_client(service_name, **kwargs):
+            created.append({"service": service_name, **kwargs})
+            return object()
+
+        monkeypatch.setattr("src.core.client.boto3.client", fake_client)
+
+        first = NovaClient()
+        second = NovaClient(model_id="other-model")
+        other_region = NovaClient(region="eu-west-1")
+
+        assert first._client is second._client
+        assert other_region._client is not first._client
+        assert len(created) == 2
+        assert created[0]["service"] == "bedrock-runtime"
+        assert created[0]["config"].max_pool_connections == BEDROCK_MAX_POOL_CONNECTIONS
+
+    def test_reset_drops_cached_clients(self, monkeypatch):
+        monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: object())
+
+        before = get_bedrock_runtime_client("us-east-1")
+        reset_bedrock_runtime_clients()
+
+        assert get_bedrock_runtime_client("us-east-1") is not before
+
+    def test_runtime_client_is_created_on_first_use(self, monkeypatch):
+        created: list[str] = []
+
+        def fake_client(service_name, **_kwargs):
+            created.append(service_name)
+            return object()
+
+        monkeypatch.setattr("src.core.client.boto3.client", fake_client)
+
+        client = NovaClient()
+        assert created == []
+
+        client.warm_up()
+        client.warm_up()
+
+        assert created == ["bedrock-runtime"]
+
+
+class _RecordingBedrock:
+    """Record Converse kwargs and answer with a usage block."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+
+    def converse(self, **kwargs) -> dict:
+        self.requests.append(kwargs)
+        return {
+            **_make_response("ok"),
+            "usage": {
+                "inputTokens": 20,
+                "outputTokens": 5,
+                "cacheReadInputTokens": 60,
+                "cacheWriteInputTokens": 20,
+            },
+        }
+
+
+def _history(turns: int) -> list[dict]:
+    roles = ("user", "assistant")
+    return [
+        {"role": roles[index % 2], "content": [{"text": f"turn {index}"}]} for index in range(turns)
+    ]
+
+
+class TestPromptCaching:
+    @pytest.fixture(autouse=True)
+    def _reset_usage(self):
+        reset_process_usage()
+        yield
+        reset_process_usage()
+
+    def test_system_prompt_splits_at_cache_point(self):
+        kwargs = NovaClient()._build(
+            _history(1), f"static{PROMPT_CACHE_POINT}dynamic", None, None, 100, 0.5
+        )
+
+        assert kwargs["system"] == [
+            {"text": "static"},
+            {"cachePoint": {"type": "default"}},
+            {"text": "dynamic"},
+        ]
+
+    def test_fully_static_prompt_ends_in_cache_point(self):
+        kwargs = NovaClient()._build(_history(1), f"static{PROMPT_CACHE_POINT}", None, None, 1, 0)
+
+        assert kwargs["system"] == [{"text": "static"}, {"cachePoint": {"type": "default"}}]
+
+    def test_history_prefix_gets_cache_point_without_mutating_input(self):
+        messages = _history(3)
+
+        sent = NovaClient()._build(messages, None, None, None, 100, 0.5)["messages"]
+
+        assert sent[1]["content"][-1] == {"cachePoint": {"type": "default"}}
+        assert sent[2] == messages[2]
+        assert messages[1]["content"] == [{"text": "turn 1"}]
+
+    def test_single_message_has_no_history_cache_point(self):
+        messages = _history(1)
+
+        assert NovaClient()._build(messages, None, None, None, 100, 0.5)["messages"] is messages
+
+    def test_disabled_caching_sends_plain_prompt(self, monkeypatch):
+        monkeypatch.setattr("src.core.client.PROMPT_CACHE_ENABLED", False)
+        messages = _history(3)
+
+        kwargs = NovaClient()._build(
+            messages, f"static{PROMPT_CACHE_POINT}dynamic", None, None, 100, 0.5
+        )
+
+        assert kwargs["system"] == [{"text": "staticdynamic"}]
+        assert kwargs["messages"] is messages
+
+    def test_usage_is_counted_for_converse_and_streams(self, monkeypatch):
+        bedrock = _RecordingBedrock()
+        monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: bedrock)
+        reset_bedrock_runtime_clients()
+
+        NovaClient().converse(_history(1))
+        list(
+            NovaClient.iter_stream_text(
+                {
+                    "stream": [
+                        {"contentBlockDelta": {"delta": {"text": "hi"}}},
+                        {"metadata": {"usage": {"inputTokens": 100, "outputTokens": 1}}},
+                    ]
+                }
+            )
+        )
+
+        stats = prompt_cache_stats()
+        assert stats.requests == 2
+        assert stats.input_tokens == 120
+        assert stats.cache_read_input_tokens == 60
+        assert stats.cache_write_input_tokens == 20
+        assert stats.cache_read_ratio == 0.3
+        reset_bedrock_runtime_clients()
+
+    def test_agent_prompt_puts_static_sections_before_cache_point(self):
+        agent = CompassAgent()
+
+        prompt = agent._build_prompt({"ui_language": "de", "identity_context": {"first_gen": True}})
+        static, dynamic = prompt.split(PROMPT_CACHE_POINT)
+
+        assert static.startswith(agent._base_prompt)
+        assert "UI LANGUAGE PREFERENCE" in static
+        assert dynamic == agent._turn_prompt({"identity_context": {"first_gen": True}})
+        assert dynamic
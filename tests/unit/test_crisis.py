@@ -1,7 +1,12 @@
 """Unit tests for crisis detection safeguards."""
 
 import pytest
-from src.agents.crisis import CrisisRadar
+from src.agents.crisis import (
+    CrisisRadar,
+    evaluate_crisis_screen,
+    load_crisis_screen_eval,
+    screen_crisis_message,
+)
 
 pytestmark = pytest.mark.unit
 
@@ -10,6 +15,7 @@ class StubCrisisClient:
     def __init__(self, response_text: str = "CRISIS: NO\nTYPE: NONE") -> None:
         self.response_text = response_text
         self.called = False
+        self.calls = 0
 
     def converse(
         self,
@@ -23,6 +29,7 @@ class StubCrisisClient:
     ) -> dict:
         del messages, system_prompt, tool_config, reasoning_effort, max_tokens, temperature, top_p
         self.called = True
+        self.calls += 1
         return {"ok": True}
 
     def extract_text(self, response: dict) -> str:
@@ -44,15 +51,17 @@ def test_crisis_radar_skips_benign_study_choice_questions() -> None:
     assert client.called is False
 
 
-def test_crisis_radar_still_allows_real_crisis_language() -> None:
-    client = StubCrisisClient(response_text="CRISIS: YES\nTYPE: MENTAL")
+def test_crisis_radar_flags_strong_crisis_language_without_the_model() -> None:
+    client = StubCrisisClient(response_text="CRISIS: NO\nTYPE: NONE")
     radar = CrisisRadar(client=client)
 
     result = radar.scan("Ich kann nicht mehr und will einfach nur verschwinden.")
 
-    assert client.called is True
+    assert client.called is False
     assert result["is_crisis"] is True
     assert result["resources"] is not None
+    assert "TYPE: MENTAL" in result["assessment"]
+    assert "LOCAL_STRONG_SIGNAL" in result["assessment"]
 
 
 def test_crisis_radar_does_not_override_when_strong_distress_is_present() -> None:
@@ -63,6 +72,158 @@ def test_crisis_radar_does_not_override_when_strong_distress_is_present() -> Non
         "Ich frage mich, ob ich überhaupt studieren soll, aber gerade ist alles sinnlos und ich kann nicht mehr."
     )
 
-    assert client.called is True
+    assert client.called is False
     assert result["is_crisis"] is True
     assert result["resources"] is not None
+
+
+def test_crisis_radar_clears_bare_greetings_locally() -> None:
+    client = StubCrisisClient(response_text="CRISIS: YES\nTYPE: MENTAL")
+    radar = CrisisRadar(client=client)
+
+    result = radar.scan("Ok, danke!")
+
+    assert client.called is False
+    assert result["is_crisis"] is False
+    assert "GREETING" in result["assessment"]
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["Wie viele ECTS brauche ich für den Bachelor?", "Danke, das hilft mir sehr!"],
+)
+def test_study_questions_and_longer_thanks_go_to_the_model(message: str) -> None:
+    screen = screen_crisis_message(message, mode="tiered")
+
+    assert screen.verdict == "ambiguous"
+    assert screen.reason == "NO_NEUTRAL_RULE"
+
+
+def test_topic_words_alone_do_not_raise_the_banner() -> None:
+    screen = screen_crisis_message("Can homeless students get BAföG?", mode="tiered")
+
+    assert screen.verdict == "ambiguous"
+    assert screen.matched == ("homeless",)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "I want to end it all",
+        "I keep thinking about ending it",
+        "ich bringe mich um",
+        "Ich will nicht mehr.",
+        "Ich habe Tabletten gesammelt",
+        "Mein Freund hat mich geschlagen",
+        "Mein Onkel fasst mich immer wieder an",
+        "Someone from my course keeps following me home",
+        "Who gets my scholarship if I die?",
+        "Was passiert mit meinem Studium wenn ich tot bin?",
+        "Wie kündige ich mein Studium, ich halte das Leben nicht mehr aus?",
+        "How do I deregister from university? I am done with everything.",
+        "Is there any point in my studies anymore?",
+        "ok bye forever",
+        "thanks, goodbye forever",
+    ],
+)
+def test_tiered_screen_never_clears_paraphrased_distress(message: str) -> None:
+    screen = screen_crisis_message(message, mode="tiered")
+
+    assert screen.verdict != "neutral", screen
+
+
+def test_messages_without_a_neutral_rule_go_to_the_model() -> None:
+    screen = screen_crisis_message("Ich habe heute mit meiner Mutter gesprochen.", mode="tiered")
+
+    assert screen.verdict == "ambiguous"
+    assert screen.reason == "NO_NEUTRAL_RULE"
+
+
+def test_crisis_radar_sends_watch_terms_to_the_model() -> None:
+    client = StubCrisisClient(response_text="CRISIS: YES\nTYPE: FINANCIAL")
+    radar = CrisisRadar(client=client)
+
+    result = radar.scan("Ich habe so viele Schulden, dass ich keinen Ausweg sehe.")
+
+    assert client.called is True
+    assert result["is_crisis"] is True
+    stats = radar.screening_stats()
+    assert stats.model == 1
+    assert stats.model_rate == 1.0
+
+
+def test_long_messages_are_never_cleared_locally() -> None:
+    screen = screen_crisis_message("Ich habe eine Frage zum Studium. " * 20)
+
+    assert screen.verdict == "ambiguous"
+    assert screen.reason == "TOO_LONG_TO_CLEAR"
+
+
+@pytest.mark.parametrize("mode", ["strong_only", "model_only"])
+@pytest.mark.parametrize(
+    "message", ["Hallo", "Ob ich überhaupt studieren will, weiß ich noch nicht."]
+)
+def test_stricter_modes_never_clear_messages_locally(mode: str, message: str) -> None:
+    client = StubCrisisClient()
+    radar = CrisisRadar(client=client, mode=mode)
+
+    radar.scan(message)
+
+    assert client.called is True
+
+
+def test_model_only_mode_keeps_strong_language_on_the_model() -> None:
+    client = StubCrisisClient(response_text="CRISIS: YES\nTYPE: MENTAL")
+    radar = CrisisRadar(client=client, mode="model_only")
+
+    result = radar.scan("I can't do this anymore.")
+
+    assert client.called is True
+    assert result["is_crisis"] is True
+
+
+def test_unknown_screen_mode_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown crisis screen mode"):
+        CrisisRadar(client=StubCrisisClient(), mode="keywords")
+
+
+def test_screen_recall_on_labeled_eval_set() -> None:
+    cases = load_crisis_screen_eval()
+    report = evaluate_crisis_screen(cases, mode="tiered")
+
+    assert report.crisis_cases >= 30
+    assert report.neutral_cases >= 30
+    # No labeled crisis may be cleared without the model seeing it.
+    assert report.recall == 1.0, report.missed
+    assert report.false_alarms == ()
+    # Only bare greetings and benign study-choice questions are cleared.
+    assert report.neutral_skip_rate >= 0.15
+
+
+def test_crisis_radar_caches_model_assessments_for_exact_repeats() -> None:
+    client = StubCrisisClient(response_text="CRISIS: YES\nTYPE: MENTAL")
+    radar = CrisisRadar(client=client)
+    message = "Ich fühle mich so einsam und weiß nicht weiter."
+
+    first = radar.scan(message)
+    second = radar.scan(message)
+    radar.scan(message + " ")
+
+    assert first == second
+    assert second is not first
+    assert client.calls == 2
+    stats = radar.screening_stats()
+    assert stats.cache is not None
+    assert stats.cache.hits == 1
+
+
+def test_crisis_radar_cache_can_be_disabled() -> None:
+    client = StubCrisisClient(response_text="CRISIS: NO\nTYPE: NONE")
+    radar = CrisisRadar(client=client, use_cache=False)
+    message = "Ich fühle mich so einsam und weiß nicht weiter."
+
+    radar.scan(message)
+    radar.scan(message)
+
+    assert client.calls == 2
+    assert radar.screening_stats().cache is None
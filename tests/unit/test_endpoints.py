@@ -0,0 +1,265 @@
+"""Unit tests for Bedrock endpoint health scoring, failover and probing."""
+
+import random
+from collections.abc import Generator
+
+import botocore.exceptions
+import pytest
+from src.core.client import (
+    NovaClient,
+    NovaClientError,
+    configure_endpoint_router,
+    is_retryable_error,
+    reset_bedrock_runtime_clients,
+    reset_endpoint_router,
+)
+from src.core.endpoints import BedrockEndpoint, EndpointRouter, parse_endpoints
+from src.core.retry import reset_retry_stats
+
+pytestmark = pytest.mark.unit
+
+MESSAGES = [{"role": "user", "content": [{"text": "Hi"}]}]
+
+US = BedrockEndpoint(model_id="us.amazon.nova-2-lite-v1:0", region="us-east-1")
+GLOBAL = BedrockEndpoint(model_id="global.amazon.nova-2-lite-v1:0", region="eu-central-1")
+
+
+def _client_error(code: str) -> botocore.exceptions.ClientError:
+    return botocore.exceptions.ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+class FakeRegion:
+    """A local stand-in for one region's bedrock-runtime client."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.errors: list[Exception] = []
+        self.failing: Exception | None = None
+        self.model_ids: list[str] = []
+
+    def converse(self, **kwargs) -> dict:
+        self.model_ids.append(kwargs["modelId"])
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.failing is not None:
+            raise self.failing
+        return {"output": {"message": {"content": [{"text": self.name}]}}}
+
+    def invoke_model(self, **kwargs) -> dict:
+        return self.converse(**kwargs)
+
+
+class ManualClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _fresh_router_state(monkeypatch) -> Generator[None, None, None]:
+    monkeypatch.setattr("src.core.client.time.sleep", lambda _delay: None)
+    reset_retry_stats()
+    reset_endpoint_router()
+    reset_bedrock_runtime_clients()
+    yield
+    reset_retry_stats()
+    reset_endpoint_router()
+    reset_bedrock_runtime_clients()
+
+
+@pytest.fixture
+def regions() -> dict[str, FakeRegion]:
+    return {"us-east-1": FakeRegion("us"), "eu-central-1": FakeRegion("global")}
+
+
+@pytest.fixture
+def clock() -> ManualClock:
+    return ManualClock()
+
+
+def _router(regions: dict[str, FakeRegion], clock: ManualClock, **kwargs) -> EndpointRouter:
+    return EndpointRouter(
+        [US, GLOBAL],
+        client_factory=regions.__getitem__,
+        is_failure=is_retryable_error,
+        probe_interval=30.0,
+        clock=clock,
+        rng=random.Random(7),  # noqa: S311 - deterministic test draws
+        **kwargs,
+    )
+
+
+def _states(router: EndpointRouter) -> list[str]:
+    return [health.state for health in router.stats().endpoints]
+
+
+class TestParseEndpoints:
+    def test_region_defaults_and_duplicates_collapse(self):
+        endpoints = parse_endpoints(
+            "us.amazon.nova-2-lite-v1:0, global.amazon.nova-2-lite-v1:0@eu-central-1,"
+            "us.amazon.nova-2-lite-v1:0@us-east-1",
+            "us-east-1",
+        )
+
+        assert endpoints == (US, GLOBAL)
+
+    def test_empty_spec_has_no_endpoints(self):
+        assert parse_endpoints(" , ", "us-east-1") == ()
+
+    def test_entry_without_model_is_rejected(self):
+        with pytest.raises(ValueError, match="missing model id"):
+            parse_endpoints("@us-west-2", "us-east-1")
+
+
+class TestEndpointRouter:
+    def test_invoke_model_keeps_its_model_and_fails_over_regions(self, regions, clock):
+        regions["us-east-1"].failing = _client_error("ThrottlingException")
+        router = _router(regions, clock, failure_threshold=100)
+
+        response = router.invoke_model(modelId="amazon.nova-embed", body="{}")
+
+        assert NovaClient.extract_text(response) == "global"
+        assert regions["eu-central-1"].model_ids == ["amazon.nova-embed"]
+
+    def test_transient_error_fails_over_within_the_call(self, regions, clock):
+        regions["us-east-1"].failing = _client_error("ThrottlingException")
+        router = _router(regions, clock, failure_threshold=100)
+
+        for _ in range(4):
+            response = router.converse(modelId="ignored", messages=MESSAGES)
+            assert NovaClient.extract_text(response) == "global"
+
+        assert set(regions["us-east-1"].model_ids) == {US.model_id}
+        assert set(regions["eu-central-1"].model_ids) == {GLOBAL.model_id}
+        us_health = router.stats().endpoints[0]
+        assert us_health.failures == len(regions["us-east-1"].model_ids) > 0
+
+    def test_request_errors_do_not_fail_over(self, regions, clock):
+        for region in regions.values():
+            region.failing = _client_error("ValidationException")
+        router = _router(regions, clock)
+
+        with pytest.raises(botocore.exceptions.ClientError):
+            router.converse(messages=MESSAGES)
+
+        assert sum(len(region.model_ids) for region in regions.values()) == 1
+        assert all(health.failures == 0 for health in router.stats().endpoints)
+
+    def test_consecutive_failures_eject_the_endpoint(self, regions, clock):
+        regions["us-east-1"].failing = _client_error("ServiceUnavailableException")
+        router = _router(regions, clock, failure_threshold=3)
+
+        for _ in range(1000):
+            assert NovaClient.extract_text(router.converse(messages=MESSAGES)) == "global"
+            if _states(router)[0] == "ejected":
+                break
+        assert len(regions["us-east-1"].model_ids) == 3
+
+        for _ in range(50):
+            router.converse(messages=MESSAGES)
+
+        assert _states(router) == ["ejected", "healthy"]
+        assert len(regions["us-east-1"].model_ids) == 3
+        assert router.stats().endpoints[0].ejections == 1
+
+    def test_successful_probe_restores_the_endpoint(self, regions, clock):
+        regions["us-east-1"].failing = _client_error("ServiceUnavailableException")
+        router = _router(regions, clock, failure_threshold=1)
+        while _states(router)[0] == "healthy":
+            router.converse(messages=MESSAGES)
+        regions["us-east-1"].failing = None
+
+        clock.now += 29
+        router.converse(messages=MESSAGES)
+        assert _states(router)[0] == "ejected"
+
+        clock.now += 1
+        assert _states(router)[0] == "probing"
+        assert NovaClient.extract_text(router.converse(messages=MESSAGES)) == "us"
+        assert _states(router) == ["healthy", "healthy"]
+        assert router.stats().endpoints[0].restorations == 1
+
+    def test_failed_probe_waits_another_interval(self, regions, clock):
+        regions["us-east-1"].failing = _client_error("ServiceUnavailableException")
+        router = _router(regions, clock, failure_threshold=1)
+        while _states(router)[0] == "healthy":
+            router.converse(messages=MESSAGES)
+        probes_before = len(regions["us-east-1"].model_ids)
+
+        clock.now += 30
+        assert NovaClient.extract_text(router.converse(messages=MESSAGES)) == "global"
+        router.converse(messages=MESSAGES)
+
+        assert len(regions["us-east-1"].model_ids) == probes_before + 1
+        assert _states(router)[0] == "ejected"
+
+    def test_all_endpoints_down_still_tries_them(self, regions, clock):
+        for region in regions.values():
+            region.failing = _client_error("ThrottlingException")
+        router = _router(regions, clock, failure_threshold=1)
+        for _ in range(2):
+            with pytest.raises(botocore.exceptions.ClientError):
+                router.converse(messages=MESSAGES)
+        assert _states(router) == ["ejected", "ejected"]
+
+        regions["eu-central-1"].failing = None
+
+        assert NovaClient.extract_text(router.converse(messages=MESSAGES)) == "global"
+        assert _states(router)[1] == "healthy"
+
+    def test_traffic_favours_healthy_and_preferred_endpoints(self, regions, clock):
+        router = _router(regions, clock)
+        for _ in range(300):
+            router.converse(messages=MESSAGES)
+
+        us_calls = len(regions["us-east-1"].model_ids)
+        assert 150 < us_calls < 250
+
+        for health in router.stats().endpoints:
+            assert health.error_rate == 0.0
+            assert health.score == 1.0
+
+
+class TestNovaClientRouting:
+    def test_client_uses_the_configured_router(self, regions, clock):
+        regions["us-east-1"].failing = _client_error("ModelNotReadyException")
+        configure_endpoint_router(_router(regions, clock, failure_threshold=1))
+
+        response = NovaClient(caller="compass").converse(MESSAGES)
+
+        assert NovaClient.extract_text(response) == "global"
+
+    def test_retry_loop_backs_off_after_every_endpoint_failed(self, regions, clock):
+        regions["us-east-1"].errors.append(_client_error("ThrottlingException"))
+        regions["eu-central-1"].errors.append(_client_error("ThrottlingException"))
+        router = _router(regions, clock)
+        configure_endpoint_router(router)
+
+        response = NovaClient(caller="compass").converse(MESSAGES)
+
+        assert NovaClient.extract_text(response) in {"us", "global"}
+        assert sum(health.requests for health in router.stats().endpoints) == 3
+
+    def test_request_errors_keep_their_mapping(self, regions, clock):
+        for region in regions.values():
+            region.failing = _client_error("ValidationException")
+        configure_endpoint_router(_router(regions, clock))
+
+        with pytest.raises(NovaClientError, match="Invalid request"):
+            NovaClient(caller="compass").converse(MESSAGES)
+
+    def test_endpoints_from_settings(self, monkeypatch, regions):
+        monkeypatch.setattr(
+            "src.core.client.BEDROCK_ENDPOINTS", f"{US.model_id},{GLOBAL.model_id}@eu-central-1"
+        )
+        monkeypatch.setattr(
+            "src.core.client.boto3.client",
+            lambda *_a, region_name, **_k: regions[region_name],
+        )
+
+        NovaClient(caller="compass").warm_up()
+        response = NovaClient(caller="compass").converse(MESSAGES)
+
+        assert NovaClient.extract_text(response) in {"us", "global"}
@@ -0,0 +1,210 @@
+"""Unit tests for hedged Bedrock classification calls."""
+
+import threading
+import time
+from collections.abc import Generator
+
+import pytest
+from config.settings import BEDROCK_MAX_POOL_CONNECTIONS
+from src.core.client import NovaClient, _get_hedge_executor, reset_bedrock_runtime_clients
+from src.core.hedging import HedgePolicy, hedge_policy, hedge_stats, reset_hedge_stats
+from src.core.quota import QuotaScheduler, configure_quota_scheduler, reset_quota_scheduler
+from src.core.retry import RetryBudget
+from src.core.usage import process_usage, reset_process_usage
+
+pytestmark = pytest.mark.unit
+
+MESSAGES = [{"role": "user", "content": [{"text": "Wie beantrage ich BAföG?"}]}]
+
+
+class SlowFirstBedrock:
+    """The first request hangs until released; later requests answer at once."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def converse(self, **_kwargs) -> dict:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            self.release.wait(timeout=5)
+        return {
+            "output": {"message": {"content": [{"text": f"FINANCING {call}"}]}},
+            "usage": {"inputTokens": 10, "outputTokens": 2},
+        }
+
+
+@pytest.fixture(autouse=True)
+def _hedging_on(monkeypatch) -> Generator[None, None, None]:
+    monkeypatch.setattr("src.core.client.BEDROCK_HEDGING_ENABLED", True)
+    reset_hedge_stats()
+    reset_process_usage()
+    reset_bedrock_runtime_clients()
+    yield
+    reset_hedge_stats()
+    reset_process_usage()
+    reset_bedrock_runtime_clients()
+
+
+def _install(monkeypatch, bedrock: SlowFirstBedrock) -> None:
+    monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: bedrock)
+
+
+def _warm(caller: str, seconds: float = 0.01) -> None:
+    for _ in range(hedge_policy.min_samples):
+        hedge_policy.record_latency(caller, seconds)
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestHedgePolicy:
+    def test_no_delay_until_enough_samples(self):
+        policy = HedgePolicy(percentile=95, min_samples=3)
+
+        policy.record_latency("router", 0.1)
+        policy.record_latency("router", 0.2)
+        assert policy.hedge_delay("router") is None
+
+        policy.record_latency("router", 0.3)
+        assert policy.hedge_delay("router") == 0.3
+
+    def test_delay_is_the_configured_percentile(self):
+        policy = HedgePolicy(percentile=90, min_samples=1)
+        for index in range(1, 101):
+            policy.record_latency("crisis", index / 1000)
+
+        assert policy.hedge_delay("crisis") == pytest.approx(0.09)
+
+
+class TestHedgedCalls:
+    def test_slow_call_is_hedged_and_first_response_wins(self, monkeypatch):
+        bedrock = SlowFirstBedrock()
+        _install(monkeypatch, bedrock)
+        _warm("router")
+
+        response = NovaClient(caller="router", hedged=True).converse(MESSAGES)
+
+        assert NovaClient.extract_text(response) == "FINANCING 2"
+        site = hedge_stats().by_caller["router"]
+        assert (site.calls, site.hedged, site.hedge_wins) == (1, 1, 1)
+
+        bedrock.release.set()
+        assert _wait_for(lambda: process_usage().by_caller["router"].requests == 2)
+
+    def test_hedge_settles_its_own_quota_grant(self, monkeypatch):
+        bedrock = SlowFirstBedrock()
+        _install(monkeypatch, bedrock)
+        _warm("router")
+        # A frozen clock, so the bucket only changes through charges and settlements.
+        scheduler = QuotaScheduler(
+            requests_per_minute=100, tokens_per_minute=100_000, now=lambda: 1_000.0
+        )
+        configure_quota_scheduler(scheduler)
+        try:
+            NovaClient(caller="router", hedged=True).converse(MESSAGES)
+            bedrock.release.set()
+
+            stats = scheduler.stats()
+            assert stats.available_requests == 98
+            assert stats.available_tokens == 100_000 - 2 * 12
+        finally:
+            reset_quota_scheduler()
+
+    def test_pools_never_outgrow_the_connection_pool(self):
+        for role in ("primary", "hedge"):
+            assert _get_hedge_executor(role)._max_workers <= BEDROCK_MAX_POOL_CONNECTIONS
+
+    def test_calls_are_not_hedged_while_warming_up(self, monkeypatch):
+        bedrock = SlowFirstBedrock()
+        bedrock.release.set()
+        _install(monkeypatch, bedrock)
+
+        NovaClient(caller="crisis", hedged=True).converse(MESSAGES)
+
+        assert bedrock.calls == 1
+        assert hedge_stats().by_caller["crisis"].hedged == 0
+        assert hedge_stats().by_caller["crisis"].hedge_delay_ms is None
+
+    def test_answer_clients_are_never_hedged(self, monkeypatch):
+        bedrock = SlowFirstBedrock()
+        bedrock.release.set()
+        _install(monkeypatch, bedrock)
+        _warm("compass", seconds=0.0)
+
+        NovaClient(caller="compass").converse(MESSAGES)
+
+        assert bedrock.calls == 1
+        assert "compass" not in hedge_stats().by_caller
+
+    def test_primaries_neither_queue_behind_hedges_nor_hedge_while_queued(self, monkeypatch):
+        executors: dict = {}
+        monkeypatch.setattr("src.core.client._HEDGE_POOL_SIZES", {"primary": 1, "hedge": 1})
+        monkeypatch.setattr("src.core.client._hedge_executors", executors)
+        bedrock = SlowFirstBedrock()
+        bedrock.release.set()
+        _install(monkeypatch, bedrock)
+        _warm("router")
+        client = NovaClient(caller="router", hedged=True)
+        busy = threading.Event()
+        try:
+            # A stuck hedge holds the only hedge worker; primaries still run.
+            _get_hedge_executor("hedge").submit(busy.wait, 5)
+            client.converse(MESSAGES)
+
+            # A primary queued past the hedge delay is not hedged once it runs.
+            _get_hedge_executor("primary").submit(time.sleep, 0.2)
+            response = client.converse(MESSAGES)
+        finally:
+            busy.set()
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+
+        assert NovaClient.extract_text(response) == "FINANCING 2"
+        assert bedrock.calls == 2
+        assert hedge_stats().by_caller["router"].hedged == 0
+
+    def test_spent_budget_waits_for_the_primary(self, monkeypatch):
+        monkeypatch.setattr(hedge_policy, "budget", RetryBudget(ratio=0.0, burst=0))
+        bedrock = SlowFirstBedrock()
+        _install(monkeypatch, bedrock)
+        _warm("triage")
+        threading.Timer(0.1, bedrock.release.set).start()
+
+        response = NovaClient(caller="triage", hedged=True).converse(MESSAGES)
+
+        assert NovaClient.extract_text(response) == "FINANCING 1"
+        assert bedrock.calls == 1
+        assert hedge_stats().by_caller["triage"].budget_denied == 1
+
+    def test_hedging_is_off_unless_enabled(self, monkeypatch):
+        monkeypatch.setattr("src.core.client.BEDROCK_HEDGING_ENABLED", False)
+        bedrock = SlowFirstBedrock()
+        bedrock.release.set()
+        _install(monkeypatch, bedrock)
+        _warm("router", seconds=0.0)
+
+        NovaClient(caller="router", hedged=True).converse(MESSAGES)
+
+        assert "router" not in hedge_stats().by_caller
+
+    @pytest.mark.asyncio
+    async def test_async_hedge_wins_without_blocking(self, monkeypatch):
+        bedrock = SlowFirstBedrock()
+        _install(monkeypatch, bedrock)
+        _warm("crisis")
+
+        response = await NovaClient(caller="crisis", hedged=True).aconverse(MESSAGES)
+
+        assert NovaClient.extract_text(response) == "FINANCING 2"
+        assert hedge_stats().by_caller["crisis"].hedge_wins == 1
+        bedrock.release.set()
@@ -0,0 +1,236 @@
+"""Unit tests for token-budgeted history windows."""
+
+import itertools
+
+import pytest
+from src.core.conversation import MAX_SESSION_MESSAGES
+from src.core.history_window import fit_history
+from src.core.provenance import AgentReply, ResponseProvenance
+from src.core.tokens import estimate_message_tokens
+from src.orchestration import ChatService
+
+pytestmark = pytest.mark.unit
+
+PROVENANCE = ResponseProvenance(mode="model", source_registry_used=False, web_grounding_used=False)
+
+
+def _turn(role: str, text: str) -> dict:
+    return {"role": role, "content": [{"text": text}]}
+
+
+def _history(exchanges: int, *, answer_chars: int = 400) -> list[dict]:
+    messages: list[dict] = []
+    for index in range(exchanges):
+        messages.append(_turn("user", f"question {index}"))
+        messages.append(_turn("assistant", f"answer {index} " + "x" * answer_chars))
+    messages.append(_turn("user", "latest question"))
+    return messages
+
+
+class FixedRouter:
+    def route(self, _message: str) -> str:
+        return "FINANCING"
+
+    async def aroute(self, message: str) -> str:
+        return self.route(message)
+
+
+class CalmRadar:
+    def scan(self, _message: str) -> dict:
+        return {"is_crisis": False, "resources": None}
+
+    async def ascan(self, message: str) -> dict:
+        return self.scan(message)
+
+
+class RecordingAgent:
+    name = "student_aid"
+    tool_mode = None
+
+    def __init__(self, history_token_budget: int) -> None:
+        self.history_token_budget = history_token_budget
+        self.seen: list[list[dict]] = []
+
+    def respond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        self.seen.append(messages)
+        return AgentReply(text="answer " + "y" * 400, provenance=PROVENANCE)
+
+
+class TestFitHistory:
+    def test_history_within_budget_is_unchanged(self):
+        messages = _history(2)
+
+        window = fit_history(messages, budget_tokens=10_000)
+
+        assert window.messages is messages
+        assert window.compacted_messages == 0
+
+    def test_zero_budget_disables_the_window(self):
+        messages = _history(20)
+
+        assert fit_history(messages, budget_tokens=0).messages is messages
+
+    def test_older_turns_are_replaced_by_compacted_block(self):
+        messages = _history(10)
+
+        window = fit_history(messages, budget_tokens=400)
+
+        first = window.messages[0]
+        assert first["role"] == "user"
+        block = first["content"][0]["text"]
+        assert "[EARLIER CONVERSATION — COMPACTED]" in block
+        assert "No summary is available yet." not in block
+        assert window.messages[-1] == messages[-1]
+        assert window.compacted_messages == len(messages) - len(window.messages)
+        assert window.estimated_tokens <= 400 < window.original_tokens
+
+    def test_roles_still_alternate_and_input_is_not_mutated(self):
+        messages = _history(10)
+        original = [dict(message) for message in messages]
+
+        window = fit_history(messages, budget_tokens=400)
+
+        roles = [message["role"] for message in window.messages]
+        assert roles[0] == "user"
+        assert all(a != b for a, b in itertools.pairwise(roles))
+        assert messages == original
+
+    def test_window_only_grows_between_recompactions(self):
+        history = _history(30)
+        windows = [
+            fit_history(history[: 2 * turns + 1], budget_tokens=600) for turns in range(4, 31)
+        ]
+
+        recompactions = 0
+        for previous, current in itertools.pairwise(windows):
+            assert current.estimated_tokens <= 600
+            if current.compacted_messages != previous.compacted_messages:
+                recompactions += 1
+                continue
+            # Everything before the newest turn was sent, and cached, last turn.
+            assert current.messages[: len(previous.messages)] == previous.messages
+        assert 0 < recompactions <= 12
+
+    def test_each_recompaction_moves_to_the_next_grid_step(self):
+        history = _history(30)
+        cuts = sorted(
+            {
+                fit_history(history[: 2 * turns + 1], budget_tokens=600).compacted_messages
+                for turns in range(4, 31)
+            }
+            - {0}
+        )
+
+        dropped = [estimate_message_tokens(history[:cut]) for cut in cuts]
+        steps = [tokens // 300 for tokens in dropped]
+        assert steps == sorted(set(steps))
+        assert len(cuts) <= dropped[-1] // 300
+
+    def test_block_is_built_from_the_session_summary(self):
+        window = fit_history(
+            _history(10),
+            budget_tokens=400,
+            conversation_overview=("Asked about BAföG deadlines",),
+            profile_facts=("First in the family to study",),
+        )
+
+        block = window.messages[0]["content"][0]["text"]
+        assert "Conversation so far:\n- Asked about BAföG deadlines" in block
+        assert "What the user shared about themselves:\n- First in the family to study" in block
+        assert "Earlier user requests:" not in block
+
+    def test_anchor_keeps_cut_and_block_until_the_turns_no_longer_fit(self):
+        history = _history(30)
+        first = fit_history(
+            history[:17], budget_tokens=600, conversation_overview=("Asked about BAföG",)
+        )
+        assert first.anchor is not None
+
+        same = fit_history(
+            history[:21],
+            budget_tokens=600,
+            conversation_overview=("Asked about BAföG", "Then about rent"),
+            anchor=first.anchor,
+        )
+        moved = fit_history(
+            history[:23],
+            budget_tokens=600,
+            conversation_overview=("Asked about BAföG", "Then about rent"),
+            anchor=first.anchor,
+        )
+
+        assert same.compacted_messages == first.compacted_messages
+        assert same.messages[: len(first.messages)] == first.messages
+        assert moved.compacted_messages > first.compacted_messages
+        assert "Then about rent" in moved.messages[0]["content"][0]["text"]
+
+    def test_anchor_is_absolute_across_front_trimming(self):
+        history = _history(30)
+        first = fit_history(history[:17], budget_tokens=600)
+        assert first.anchor is not None
+
+        # Four messages were trimmed from the front of the stored history.
+        trimmed = fit_history(history[4:21], budget_tokens=600, first_index=4, anchor=first.anchor)
+
+        assert trimmed.anchor == first.anchor
+        assert trimmed.messages[: len(first.messages)] == first.messages
+
+    def test_without_summary_recent_requests_are_listed(self):
+        window = fit_history(_history(10), budget_tokens=400)
+
+        block = window.messages[0]["content"][0]["text"]
+        assert "Earlier user requests:" in block
+        assert 0 < block.count("- question") <= 5
+        assert "- question 0" not in block
+
+    def test_oversized_latest_turn_is_kept(self):
+        messages = [*_history(2)[:-1], _turn("user", "z" * 8_000)]
+
+        window = fit_history(messages, budget_tokens=100)
+
+        assert len(window.messages) == 1
+        assert window.messages[0]["content"][-1] == messages[-1]["content"][0]
+        assert estimate_message_tokens(window.messages) > 100
+
+
+class TestChatServiceHistoryWindow:
+    def test_long_session_is_compacted_to_the_agents_budget(self):
+        agent = RecordingAgent(history_token_budget=300)
+        service = ChatService(
+            router=FixedRouter(),
+            crisis_radar=CalmRadar(),
+            agents={"COMPASS": agent, "FINANCING": agent},
+        )
+
+        session_id = service.respond("question 0").session_id
+        for index in range(1, 8):
+            service.respond(f"question {index}", session_id=session_id)
+
+        sent = agent.seen[-1]
+        assert len(sent) < 15
+        assert "[EARLIER CONVERSATION — COMPACTED]" in sent[0]["content"][0]["text"]
+        assert sent[-1]["content"][0]["text"] == "question 7"
+        assert estimate_message_tokens(sent) <= 300
+
+    def test_prefix_stays_stable_past_the_message_trim_limit(self):
+        agent = RecordingAgent(history_token_budget=600)
+        service = ChatService(
+            router=FixedRouter(),
+            crisis_radar=CalmRadar(),
+            agents={"COMPASS": agent, "FINANCING": agent},
+        )
+
+        session_id = service.respond("question 0").session_id
+        turns = MAX_SESSION_MESSAGES
+        for index in range(1, turns):
+            service.respond(f"question {index}", session_id=session_id)
+
+        recompactions = 0
+        for previous, current in itertools.pairwise(agent.seen):
+            assert estimate_message_tokens(current) <= 600
+            if current[: len(previous)] != previous:
+                recompactions += 1
+        assert 2 * turns > MAX_SESSION_MESSAGES
+        assert 0 < recompactions <= turns // 3
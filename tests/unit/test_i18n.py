@@ -22,6 +22,7 @@ from src.i18n.strings import (
     STRINGS,
     SUPPORTED_LANGUAGES,
     get_agent_label,
+    quick_action_messages,
     t,
 )
 
@@ -168,6 +169,12 @@ class TestHelperFunctions:
         result = get_agent_label("UNKNOWN_AGENT", "en")
         assert result == "UNKNOWN_AGENT"
 
+    def test_quick_action_messages_cover_every_language(self):
+        messages = quick_action_messages()
+        assert t("quick_bafoeg_msg", "de") in messages
+        assert t("quick_bafoeg_msg", "en") in messages
+        assert len(messages) == len(set(messages))
+
 
 # ── Module-level invariants ───────────────────────────────────────────────────
 
@@ -0,0 +1,192 @@
+"""Unit tests for the local fast-path router."""
+
+import json
+from pathlib import Path
+
+import pytest
+from src.agents.local_router import LocalRouteClassifier, normalize_for_routing
+from src.agents.router import RouterAgent, routing_cache_key
+from src.i18n import quick_action_messages
+
+pytestmark = pytest.mark.unit
+
+SCENARIOS_DIR = Path(__file__).parents[1] / "scenarios"
+
+
+class FakeClient:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.calls = 0
+
+    def converse(self, **_kwargs) -> dict:
+        self.calls += 1
+        return {"text": self.text}
+
+    async def aconverse(self, **kwargs) -> dict:
+        return self.converse(**kwargs)
+
+    def extract_text(self, response: dict) -> str:
+        return response["text"]
+
+
+def _router(text: str = "AGENT: COMPASS", **kwargs) -> tuple[RouterAgent, FakeClient]:
+    router = RouterAgent(**kwargs)
+    client = FakeClient(text)
+    router.client = client  # type: ignore[assignment]
+    return router, client
+
+
+class TestLocalRouteClassifier:
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("Was ist BAföG?", "FINANCING"),
+            ("Kann ich Bafoeg bekommen?", "FINANCING"),
+            ("Welchen NC brauche ich für Medizin?", "STUDY_CHOICE"),
+            ("What does ECTS mean?", "ACADEMIC_BASICS"),
+            ("Ich fühle mich wie ein Impostor.", "ROLE_MODELS"),
+        ],
+    )
+    def test_unambiguous_keywords_are_confident(self, message, expected):
+        decision = LocalRouteClassifier().classify(message)
+
+        assert decision.agent == expected
+        assert decision.confidence >= 0.7
+        assert decision.matched
+
+    def test_general_messages_abstain(self):
+        decision = LocalRouteClassifier().classify("Hello, I don't know where to start")
+
+        assert decision.agent is None
+        assert decision.confidence == 0.0
+
+    def test_conflicting_keywords_lower_confidence(self):
+        decision = LocalRouteClassifier().classify("BAföG oder lieber ein Stipendium und ECTS?")
+
+        assert decision.agent == "FINANCING"
+        assert decision.confidence < 0.7
+
+    def test_normalization_folds_umlauts(self):
+        assert normalize_for_routing("BAföG Gebühren") == "bafoeg gebuehren"
+
+    def test_never_contradicts_a_scenario(self):
+        classifier = LocalRouteClassifier()
+        decided = 0
+        for path in sorted(SCENARIOS_DIR.glob("*.json")):
+            scenario = json.loads(path.read_text(encoding="utf-8"))
+            decision = classifier.classify(scenario["input"])
+            if decision.agent is None or decision.confidence < 0.7:
+                continue
+            decided += 1
+            assert decision.agent == scenario["expected_agent"], scenario["id"]
+
+        assert decided >= 4
+
+
+class TestRouterFastPath:
+    def test_confident_local_route_skips_the_model(self):
+        router, client = _router()
+
+        assert router.route("Was ist BAföG?") == "FINANCING"
+        assert client.calls == 0
+
+    def test_low_confidence_falls_back_to_the_model(self):
+        router, client = _router("AGENT: ROLE_MODELS")
+
+        assert router.route("Ich brauche Motivation") == "ROLE_MODELS"
+        assert client.calls == 1
+
+    def test_disabled_fast_path_always_asks_the_model(self):
+        router, client = _router("AGENT: STUDY_CHOICE", use_local=False)
+
+        assert router.route("Was ist BAföG?") == "STUDY_CHOICE"
+        assert client.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_async_route_uses_the_fast_path(self):
+        router, client = _router()
+
+        assert await router.aroute("What does ECTS mean?") == "ACADEMIC_BASICS"
+        assert client.calls == 0
+
+    def test_routing_stats_report_hit_rate(self):
+        router, _client = _router()
+
+        router.route("Was ist BAföG?")
+        router.route("Stipendium für Erstakademiker?")
+        router.route("Hallo")
+        router.route("Ich weiß nicht weiter")
+
+        stats = router.routing_stats()
+        assert stats.total == 4
+        assert stats.local == 2
+        assert stats.model == 2
+        assert stats.local_hit_rate == 0.5
+        assert stats.local_by_agent == {"FINANCING": 2}
+
+    def test_routing_stats_count_only_actual_model_calls(self):
+        router, client = _router("AGENT: ROLE_MODELS")
+
+        router.route("Ich brauche Motivation")
+        router.route("Ich brauche Motivation")
+        assert router.route_locally("Hallo") is None
+
+        stats = router.routing_stats()
+        assert client.calls == 1
+        assert stats.model == 1
+        assert stats.total == 1
+
+
+class TestRouterCache:
+    def test_model_decisions_are_cached_per_normalized_message(self):
+        router, client = _router("AGENT: ROLE_MODELS")
+
+        assert router.route("Ich brauche Motivation") == "ROLE_MODELS"
+        assert router.route("  ich BRAUCHE   motivation ") == "ROLE_MODELS"
+        assert client.calls == 1
+        stats = router.routing_stats()
+        assert stats.cache is not None
+        assert stats.cache.hits == 1
+        assert stats.cache.misses == 1
+
+    def test_local_decisions_do_not_use_the_cache(self):
+        router, _client = _router()
+
+        router.route("Was ist BAföG?")
+
+        assert router.cache is not None
+        assert router.cache.stats().size == 0
+
+    def test_cache_can_be_disabled(self):
+        router, client = _router("AGENT: ROLE_MODELS", use_cache=False)
+
+        router.route("Ich brauche Motivation")
+        router.route("Ich brauche Motivation")
+
+        assert client.calls == 2
+        assert router.routing_stats().cache is None
+
+    @pytest.mark.asyncio
+    async def test_async_route_shares_the_cache(self):
+        router, client = _router("AGENT: ROLE_MODELS")
+
+        router.route("Ich brauche Motivation")
+        assert await router.aroute("Ich brauche Motivation") == "ROLE_MODELS"
+        assert client.calls == 1
+
+    def test_cache_key_folds_case_umlauts_and_spacing(self):
+        assert routing_cache_key("  Was ist  BAföG? ") == routing_cache_key("was ist bafoeg?")
+
+    def test_prime_cache_routes_quick_actions_once(self):
+        router, client = _router("AGENT: COMPASS")
+        messages = quick_action_messages()
+
+        primed = router.prime_cache(messages)
+
+        assert primed == client.calls
+        assert 0 < primed < len(messages)
+        assert router.prime_cache(messages) == 0
+        for message in messages:
+            router.route(message)
+        assert client.calls == primed
+        assert router.routing_stats().cache.hits == primed  # type: ignore[union-attr]
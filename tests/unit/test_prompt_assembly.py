@@ -0,0 +1,201 @@
+"""Unit tests for precompiled prompt templates and memoized prompt sections."""
+
+from collections.abc import Generator
+
+import pytest
+from src.agents.base import build_ui_language_addendum
+from src.agents.compass import CompassAgent
+from src.agents.onboarding import OnboardingAgent
+from src.core.client import PROMPT_CACHE_POINT
+from src.core.conversation import (
+    Conversation,
+    ConversationStore,
+    build_session_memory_addendum,
+)
+from src.core.prompt_assembly import (
+    PromptTemplate,
+    clear_prompt_memos,
+    identity_addendum,
+    prompt_memo_stats,
+    session_memory_addendum,
+    sourcing_addendum,
+)
+from src.core.provenance import build_sourcing_addendum
+from src.core.safety import build_identity_addendum
+from src.knowledge import SourceSelectionContext, select_trusted_sources
+from src.orchestration import ChatService
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memos() -> Generator[None, None, None]:
+    clear_prompt_memos()
+    yield
+    clear_prompt_memos()
+
+
+def _counts(section: str) -> tuple[int, int]:
+    # Counters are process-lifetime, so tests compare deltas.
+    stats = prompt_memo_stats()[section]
+    return stats.hits, stats.misses
+
+
+def _delta(section: str, before: tuple[int, int]) -> tuple[int, int]:
+    hits, misses = _counts(section)
+    return hits - before[0], misses - before[1]
+
+
+def _sources() -> tuple:
+    selection = select_trusted_sources(
+        SourceSelectionContext(user_language="de", user_message="Wie beantrage ich BAföG?")
+    )
+    assert selection.sources
+    return selection.sources
+
+
+class TestPromptTemplate:
+    def test_renders_precompiled_language_prefix(self):
+        template = PromptTemplate.compile("BASE", lambda language: f"[{language}]")
+
+        assert template.render("de") == "BASE[de]"
+        assert template.render(" EN ") == "BASE[en]"
+
+    def test_unknown_language_falls_back_to_base(self):
+        template = PromptTemplate.compile("BASE", lambda language: f"[{language}]")
+
+        assert template.render("fr") == "BASE"
+        assert template.render(None) == "BASE"
+
+
+class TestMemoizedSections:
+    def test_sourcing_block_is_rendered_once_per_source_ids(self):
+        sources = _sources()
+        before = _counts("sourcing")
+
+        first = sourcing_addendum(sources, tool_mode=None)
+        second = sourcing_addendum(tuple(sources), tool_mode=None)
+        grounded = sourcing_addendum(sources, tool_mode="web_grounding")
+
+        assert first == second == build_sourcing_addendum(sources, tool_mode=None)
+        assert grounded == build_sourcing_addendum(sources, tool_mode="web_grounding")
+        assert _delta("sourcing", before) == (1, 2)
+
+    def test_identity_block_matches_direct_builder(self):
+        context = {"first_gen": True, "language": "de"}
+        before = _counts("identity")
+
+        assert identity_addendum(context) == build_identity_addendum(context)
+        assert identity_addendum(dict(context)) == build_identity_addendum(context)
+        assert _delta("identity", before) == (1, 1)
+
+    def test_session_memory_is_rebuilt_only_when_version_changes(self):
+        conversation = Conversation(session_id="session-1", now=lambda: 100.0)
+        conversation.add_user_message("Wie beantrage ich BAföG?")
+        metadata = conversation.metadata
+        before = _counts("session_memory")
+
+        first = session_memory_addendum(
+            metadata["session_memory"], version=metadata["session_memory_version"]
+        )
+        again = session_memory_addendum(
+            conversation.metadata["session_memory"], version=conversation.memory_version
+        )
+        conversation.add_user_message("Und wie lange dauert das?")
+        changed = conversation.metadata
+
+        updated = session_memory_addendum(
+            changed["session_memory"], version=changed["session_memory_version"]
+        )
+
+        assert first == again == build_session_memory_addendum(metadata["session_memory"])
+        assert updated == build_session_memory_addendum(changed["session_memory"])
+        assert updated != first
+        assert _delta("session_memory", before) == (1, 2)
+
+    def test_unchanged_turn_reuses_the_rendered_section(self):
+        clock = [100.0]
+        store = ConversationStore(now=lambda: clock[0])
+        conversation = store.get_or_create(None, ui_language="de")
+        conversation.add_user_message("Wie beantrage ich BAföG?", ui_language="de")
+        metadata = conversation.metadata
+        first = session_memory_addendum(
+            metadata["session_memory"], version=metadata["session_memory_version"]
+        )
+        before = _counts("session_memory")
+
+        clock[0] = 160.0
+        reopened = store.get_or_create(conversation.session_id, ui_language="de")
+        reopened.set_preference("response_language", "de")
+        again = reopened.metadata
+
+        assert reopened is conversation
+        assert again["session_memory"]["last_activity"] == 160.0
+        assert again["session_memory_version"] == metadata["session_memory_version"]
+        assert (
+            session_memory_addendum(
+                again["session_memory"], version=again["session_memory_version"]
+            )
+            == first
+        )
+        assert _delta("session_memory", before) == (1, 0)
+
+        reopened.set_preference("response_language", "en")
+        assert reopened.memory_version != metadata["session_memory_version"]
+
+    def test_memory_version_is_unique_across_reused_session_ids(self):
+        first = Conversation(session_id="session-1")
+        second = Conversation(session_id="session-1")
+
+        assert first.memory_version != second.memory_version
+
+    def test_missing_version_is_never_memoized(self):
+        memory = Conversation(session_id="session-1").metadata["session_memory"]
+
+        session_memory_addendum(memory, version=None)
+        session_memory_addendum(memory, version=None)
+
+        assert prompt_memo_stats()["session_memory"].size == 0
+
+
+class TestAgentPrompt:
+    def test_memoized_prompt_matches_direct_assembly(self):
+        agent = CompassAgent()
+        sources = _sources()
+        conversation = Conversation(session_id="session-1")
+        conversation.add_user_message("Wie beantrage ich BAföG?")
+        metadata = {
+            **conversation.metadata,
+            "ui_language": "de",
+            "identity_context": {"first_gen": True},
+            "trusted_sources": sources,
+        }
+
+        expected = (
+            agent._base_prompt
+            + build_ui_language_addendum(metadata)
+            + PROMPT_CACHE_POINT
+            + build_identity_addendum(metadata["identity_context"])
+            + build_session_memory_addendum(metadata["session_memory"])
+            + build_sourcing_addendum(sources, tool_mode=agent.tool_mode)
+        )
+
+        assert agent._build_prompt(metadata) == expected
+        assert agent._build_prompt(metadata) == expected
+
+    def test_onboarding_language_block_is_precompiled(self):
+        agent = OnboardingAgent()
+
+        static = agent._static_prompt({"ui_language": "en"})
+
+        assert "App UI language for this turn: en" in static
+        assert "Onboarding language preference" not in agent._static_prompt({})
+
+
+def test_caller_supplied_session_memory_drops_live_version():
+    merged = ChatService._merge_conversation_metadata(
+        {"session_memory": {"session_id": "s"}, "session_memory_version": 7},
+        {"session_memory": {"session_id": "s", "topics": ["bafoeg"]}},
+    )
+
+    assert "session_memory_version" not in merged
@@ -0,0 +1,364 @@
+"""Unit tests for the RPM/TPM quota scheduler."""
+
+import threading
+from collections.abc import Generator
+
+import botocore.exceptions
+import pytest
+from src.core.client import NovaClient, reset_bedrock_runtime_clients
+from src.core.quota import (
+    FileQuotaBackend,
+    QuotaScheduler,
+    build_quota_scheduler,
+    caller_priority,
+    configure_quota_scheduler,
+    estimate_request_tokens,
+    reset_quota_scheduler,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    """Wall clock that only moves when the scheduler sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(clock: FakeClock, **kwargs) -> QuotaScheduler:
+    return QuotaScheduler(now=clock.time, sleep=clock.sleep, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _no_global_scheduler() -> Generator[None, None, None]:
+    reset_quota_scheduler()
+    yield
+    reset_quota_scheduler()
+
+
+class TestQuotaScheduler:
+    def test_requests_wait_once_the_rpm_bucket_is_empty(self):
+        clock = FakeClock()
+        scheduler = _scheduler(clock, requests_per_minute=60, tokens_per_minute=0)
+
+        for _ in range(60):
+            assert scheduler.acquire("crisis", 100).waited_seconds == 0.0
+        grant = scheduler.acquire("crisis", 100)
+
+        assert grant.waited_seconds == pytest.approx(1.0, abs=0.01)
+        assert not grant.forced
+
+    def test_tokens_are_charged_and_settled(self):
+        clock = FakeClock()
+        scheduler = _scheduler(clock, requests_per_minute=0, tokens_per_minute=10_000)
+
+        grant = scheduler.acquire("student_aid", 4_000)
+        assert scheduler.stats().available_tokens == 6_000
+
+        scheduler.settle(grant, actual_tokens=1_500)
+
+        assert scheduler.stats().available_tokens == 8_500
+
+    def test_background_leaves_headroom_for_critical_callers(self):
+        clock = FakeClock()
+        scheduler = _scheduler(
+            clock, requests_per_minute=10, tokens_per_minute=0, max_wait_seconds=0.0
+        )
+        for _ in range(7):
+            scheduler.acquire("router", 0)
+
+        summary = scheduler.acquire("summarizer", 0)
+        crisis = scheduler.acquire("crisis", 0)
+
+        assert summary.forced
+        assert not crisis.forced
+        stats = scheduler.stats().by_priority
+        assert stats["background"].forced == 1
+        assert stats["critical"].granted == 8
+
+    def test_request_is_sent_after_max_wait_and_recorded_as_debt(self):
+        clock = FakeClock()
+        scheduler = _scheduler(
+            clock, requests_per_minute=0, tokens_per_minute=1_000, max_wait_seconds=2.0
+        )
+        scheduler.acquire("compass", 1_000)
+
+        grant = scheduler.acquire("compass", 1_000)
+
+        assert grant.forced
+        assert grant.waited_seconds == pytest.approx(2.0)
+        assert scheduler.stats().available_tokens < 0
+
+    def test_oversized_request_is_clamped_to_the_bucket(self):
+        clock = FakeClock()
+        scheduler = _scheduler(clock, requests_per_minute=0, tokens_per_minute=1_000)
+
+        grant = scheduler.acquire("crisis", 50_000)
+
+        assert grant.tokens == 1_000
+        assert not grant.forced
+
+    def test_oversized_request_fits_the_share_of_its_priority(self):
+        clock = FakeClock()
+        scheduler = _scheduler(clock, requests_per_minute=0, tokens_per_minute=1_000)
+
+        interactive = scheduler.acquire("compass", 50_000)
+        clock.now += 60
+        background = scheduler.acquire("summarizer", 50_000)
+
+        assert (interactive.tokens, background.tokens) == (900, 700)
+        assert not interactive.forced and not background.forced
+        assert interactive.waited_seconds == background.waited_seconds == 0.0
+
+    def test_refund_returns_at_most_the_grant(self):
+        clock = FakeClock()
+        scheduler = _scheduler(clock, requests_per_minute=0, tokens_per_minute=10_000)
+
+        grant = scheduler.acquire("student_aid", 4_000)
+        scheduler.refund(grant, 3_000)
+        assert scheduler.stats().available_tokens == 9_000
+
+        scheduler.refund(grant, 50_000)
+        assert scheduler.stats().available_tokens == 10_000
+
+    @pytest.mark.asyncio
+    async def test_async_acquire_waits_without_blocking(self, monkeypatch):
+        clock = FakeClock()
+        scheduler = _scheduler(clock, requests_per_minute=60, tokens_per_minute=0)
+
+        async def fake_sleep(seconds: float) -> None:
+            clock.now += seconds
+
+        def forbidden_sleep(_seconds: float) -> None:
+            raise AssertionError("blocking sleep on the async path")
+
+        scheduler._sleep = forbidden_sleep
+        monkeypatch.setattr("src.core.quota.asyncio.sleep", fake_sleep)
+        for _ in range(60):
+            await scheduler.aacquire("router", 0)
+
+        grant = await scheduler.aacquire("router", 0)
+
+        assert grant.waited_seconds == pytest.approx(1.0, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_async_file_transactions_run_off_the_event_loop(self, tmp_path):
+        clock = FakeClock()
+        backend = FileQuotaBackend(tmp_path / "quota.json")
+        scheduler = _scheduler(
+            clock, requests_per_minute=10, tokens_per_minute=10_000, backend=backend
+        )
+        loop_thread = threading.get_ident()
+        threads: list[int] = []
+        transact = backend.transact
+
+        def recording_transact(update):
+            threads.append(threading.get_ident())
+            return transact(update)
+
+        backend.transact = recording_transact  # type: ignore[method-assign]
+
+        grant = await scheduler.aacquire("router", 1_000)
+        await scheduler.asettle(grant, 400)
+        assert await scheduler.atry_acquire("router", 0) is not None
+
+        assert len(threads) == 3
+        assert loop_thread not in threads
+        assert scheduler.stats().available_tokens == 10_000 - 400
+
+    def test_file_backend_shares_buckets_between_processes(self, tmp_path):
+        clock = FakeClock()
+        path = tmp_path / "quota.json"
+        worker_a = _scheduler(
+            clock, requests_per_minute=5, tokens_per_minute=0, backend=FileQuotaBackend(path)
+        )
+        worker_b = _scheduler(
+            clock, requests_per_minute=5, tokens_per_minute=0, backend=FileQuotaBackend(path)
+        )
+
+        for _ in range(3):
+            worker_a.acquire("crisis", 0)
+
+        assert worker_b.stats().available_requests == 2
+        worker_b.acquire("crisis", 0)
+        assert worker_a.stats().available_requests == 1
+
+
+class TestQuotaHelpers:
+    def test_caller_priorities(self):
+        assert caller_priority("crisis") == "critical"
+        assert caller_priority("router") == "critical"
+        assert caller_priority("student_aid") == "interactive"
+        assert caller_priority("summarizer") == "background"
+
+    def test_request_estimate_counts_input_and_max_output(self):
+        kwargs = {
+            "system": [{"text": "x" * 400}, {"cachePoint": {"type": "default"}}],
+            "messages": [{"role": "user", "content": [{"text": "y" * 40}]}],
+            "inferenceConfig": {"maxTokens": 1_000},
+        }
+
+        assert estimate_request_tokens(kwargs) == 100 + 10 + 1_000
+
+    def test_scheduler_is_off_without_quotas(self):
+        assert build_quota_scheduler(requests_per_minute=0, tokens_per_minute=0) is None
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError, match="BEDROCK_QUOTA_BACKEND"):
+            build_quota_scheduler(requests_per_minute=10, backend="redis")
+
+
+class StubBedrock:
+    def converse(self, **_kwargs) -> dict:
+        return {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"inputTokens": 30, "outputTokens": 20, "totalTokens": 50},
+        }
+
+
+def test_nova_client_charges_and_settles_through_the_scheduler(monkeypatch):
+    clock = FakeClock()
+    scheduler = _scheduler(clock, requests_per_minute=100, tokens_per_minute=100_000)
+    configure_quota_scheduler(scheduler)
+    monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: StubBedrock())
+    reset_bedrock_runtime_clients()
+
+    NovaClient(caller="summarizer").converse(
+        [{"role": "user", "content": [{"text": "Hi"}]}], max_tokens=2_000
+    )
+
+    stats = scheduler.stats()
+    assert stats.available_requests == 99
+    assert stats.available_tokens == 100_000 - 50
+    assert stats.by_priority["background"].granted == 1
+    reset_bedrock_runtime_clients()
+
+
+class ThrottledOnceBedrock:
+    """Raise ThrottlingException on the first call of either API, then succeed."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failed_input = 0
+
+    def _throttle_first(self, operation: str, kwargs: dict) -> None:
+        self.calls += 1
+        if self.calls == 1:
+            self.failed_input = (
+                estimate_request_tokens(kwargs) - kwargs["inferenceConfig"]["maxTokens"]
+            )
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, operation
+            )
+
+    def converse(self, **kwargs) -> dict:
+        self._throttle_first("Converse", kwargs)
+        return StubBedrock().converse()
+
+    def converse_stream(self, **kwargs) -> dict:
+        self._throttle_first("ConverseStream", kwargs)
+        return StubStreamingBedrock().converse_stream()
+
+
+def test_failed_attempts_return_their_output_reservation(monkeypatch):
+    clock = FakeClock()
+    scheduler = _scheduler(clock, requests_per_minute=100, tokens_per_minute=100_000)
+    configure_quota_scheduler(scheduler)
+    bedrock = ThrottledOnceBedrock()
+    monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: bedrock)
+    monkeypatch.setattr("src.core.client.time.sleep", lambda _delay: None)
+    reset_bedrock_runtime_clients()
+
+    NovaClient(caller="compass").converse(
+        [{"role": "user", "content": [{"text": "Hi"}]}], max_tokens=2_000
+    )
+
+    # The throttled attempt keeps only its input estimate; the retry settles to usage.
+    stats = scheduler.stats()
+    assert stats.available_requests == 98
+    assert bedrock.failed_input > 0
+    assert stats.available_tokens == 100_000 - bedrock.failed_input - 50
+    reset_bedrock_runtime_clients()
+
+
+class StubStreamingBedrock:
+    def converse_stream(self, **_kwargs) -> dict:
+        return {
+            "stream": [
+                {"contentBlockDelta": {"delta": {"text": "ok"}}},
+                {"metadata": {"usage": {"inputTokens": 30, "outputTokens": 20}}},
+            ]
+        }
+
+
+def test_streamed_turns_are_settled_from_the_metadata_event(monkeypatch):
+    clock = FakeClock()
+    scheduler = _scheduler(clock, requests_per_minute=100, tokens_per_minute=100_000)
+    configure_quota_scheduler(scheduler)
+    monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: StubStreamingBedrock())
+    reset_bedrock_runtime_clients()
+
+    chunks = list(
+        NovaClient(caller="student_aid").stream_text(
+            [{"role": "user", "content": [{"text": "Hi"}]}], max_tokens=2_000
+        )
+    )
+
+    assert chunks == ["ok"]
+    assert scheduler.stats().available_tokens == 100_000 - 50
+    reset_bedrock_runtime_clients()
+
+
+@pytest.mark.asyncio
+async def test_async_failed_stream_attempts_return_their_output_reservation(monkeypatch):
+    clock = FakeClock()
+    scheduler = _scheduler(clock, requests_per_minute=100, tokens_per_minute=100_000)
+    configure_quota_scheduler(scheduler)
+    bedrock = ThrottledOnceBedrock()
+    monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: bedrock)
+
+    async def no_sleep(_delay: float) -> None:
+        return None
+
+    monkeypatch.setattr("src.core.client.asyncio.sleep", no_sleep)
+    reset_bedrock_runtime_clients()
+
+    chunks = [
+        chunk
+        async for chunk in NovaClient(caller="student_aid").astream_text(
+            [{"role": "user", "content": [{"text": "Hi"}]}], max_tokens=2_000
+        )
+    ]
+
+    assert chunks == ["ok"]
+    assert scheduler.stats().available_tokens == 100_000 - bedrock.failed_input - 50
+    reset_bedrock_runtime_clients()
+
+
+@pytest.mark.asyncio
+async def test_async_streamed_turns_are_settled_from_the_metadata_event(monkeypatch):
+    clock = FakeClock()
+    scheduler = _scheduler(clock, requests_per_minute=100, tokens_per_minute=100_000)
+    configure_quota_scheduler(scheduler)
+    monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: StubStreamingBedrock())
+    reset_bedrock_runtime_clients()
+
+    chunks = [
+        chunk
+        async for chunk in NovaClient(caller="student_aid").astream_text(
+            [{"role": "user", "content": [{"text": "Hi"}]}], max_tokens=2_000
+        )
+    ]
+
+    assert chunks == ["ok"]
+    assert scheduler.stats().available_tokens == 100_000 - 50
+    reset_bedrock_runtime_clients()
@@ -0,0 +1,271 @@
+"""Unit tests for Bedrock retry backoff, the retry budget and per-site counters."""
+
+from collections.abc import Generator
+
+import botocore.exceptions
+import pytest
+from src.agents.compass import CompassAgent
+from src.core.client import (
+    MAX_RETRIES,
+    NovaClient,
+    NovaClientError,
+    NovaThrottlingError,
+    NovaUnavailableError,
+    StreamInterrupted,
+    reset_bedrock_runtime_clients,
+)
+from src.core.retry import (
+    RETRY_MAX_DELAY,
+    RetryBudget,
+    backoff_delay,
+    reset_retry_stats,
+    retry_stats,
+    retry_tracker,
+)
+
+pytestmark = pytest.mark.unit
+
+MESSAGES = [{"role": "user", "content": [{"text": "Hi"}]}]
+
+
+def _client_error(code: str) -> botocore.exceptions.ClientError:
+    return botocore.exceptions.ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+def _stream_error(code: str) -> botocore.exceptions.EventStreamError:
+    return botocore.exceptions.EventStreamError(
+        {"Error": {"Code": code, "Message": code}}, "ConverseStream"
+    )
+
+
+def _delta(text: str) -> dict:
+    return {"contentBlockDelta": {"delta": {"text": text}}}
+
+
+class ScriptedBedrock:
+    """Raise the scripted errors in order, then answer."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def converse(self, **_kwargs) -> dict:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"output": {"message": {"content": [{"text": "ok"}]}}}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_retry_state(monkeypatch) -> Generator[list[float], None, None]:
+    reset_retry_stats()
+    reset_bedrock_runtime_clients()
+    sleeps: list[float] = []
+    monkeypatch.setattr("src.core.client.time.sleep", sleeps.append)
+    yield sleeps
+    reset_retry_stats()
+    reset_bedrock_runtime_clients()
+
+
+class ScriptedStreamBedrock:
+    """Play one scripted stream per converse_stream call; errors in a script are raised."""
+
+    def __init__(self, *scripts: list | Exception) -> None:
+        self.scripts = list(scripts)
+        self.calls = 0
+
+    def converse_stream(self, **_kwargs) -> dict:
+        self.calls += 1
+        script = self.scripts.pop(0)
+        if isinstance(script, Exception):
+            raise script
+        return {"stream": self._play(script)}
+
+    @staticmethod
+    def _play(script: list) -> Generator[dict, None, None]:
+        for event in script:
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+
+def _install(monkeypatch, bedrock: ScriptedBedrock | ScriptedStreamBedrock) -> None:
+    monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: bedrock)
+
+
+class TestBackoff:
+    def test_delay_is_jittered_below_the_exponential_ceiling(self):
+        delays = [backoff_delay(2) for _ in range(200)]
+
+        assert all(0.0 <= delay <= 4.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_delay_is_capped(self):
+        assert all(backoff_delay(30) <= RETRY_MAX_DELAY for _ in range(50))
+
+
+class TestRetryBudget:
+    def test_burst_is_spent_then_refilled_by_first_attempts(self):
+        budget = RetryBudget(ratio=0.5, burst=2)
+
+        assert budget.try_spend()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+        budget.deposit()
+        budget.deposit()
+
+        assert budget.try_spend()
+
+    def test_balance_never_exceeds_the_burst(self):
+        budget = RetryBudget(ratio=1.0, burst=3)
+
+        for _ in range(10):
+            budget.deposit()
+
+        assert budget.tokens == 3
+
+
+class TestClientRetries:
+    @pytest.mark.parametrize(
+        "error",
+        [
+            _client_error("ThrottlingException"),
+            _client_error("ServiceUnavailableException"),
+            _client_error("ModelNotReadyException"),
+            botocore.exceptions.ConnectionClosedError(endpoint_url="https://bedrock"),
+            ConnectionResetError("reset by peer"),
+        ],
+    )
+    def test_transient_errors_are_retried(self, monkeypatch, _fresh_retry_state, error):
+        bedrock = ScriptedBedrock(error)
+        _install(monkeypatch, bedrock)
+
+        response = NovaClient(caller="router").converse(MESSAGES)
+
+        assert NovaClient.extract_text(response) == "ok"
+        assert bedrock.calls == 2
+        assert len(_fresh_retry_state) == 1
+        site = retry_stats().by_caller["router"]
+        assert (site.calls, site.retries, site.recovered) == (1, 1, 1)
+
+    def test_non_retryable_errors_fail_immediately(self, monkeypatch, _fresh_retry_state):
+        bedrock = ScriptedBedrock(_client_error("ValidationException"))
+        _install(monkeypatch, bedrock)
+
+        with pytest.raises(NovaClientError, match="Invalid request"):
+            NovaClient(caller="crisis").converse(MESSAGES)
+
+        assert bedrock.calls == 1
+        assert _fresh_retry_state == []
+        assert retry_stats().by_caller["crisis"].retries == 0
+
+    def test_unavailable_after_all_retries(self, monkeypatch):
+        errors = [_client_error("ServiceUnavailableException")] * (MAX_RETRIES + 1)
+        bedrock = ScriptedBedrock(*errors)
+        _install(monkeypatch, bedrock)
+
+        with pytest.raises(NovaUnavailableError):
+            NovaClient(caller="compass").converse(MESSAGES)
+
+        assert bedrock.calls == MAX_RETRIES + 1
+        site = retry_stats().by_caller["compass"]
+        assert (site.retries, site.exhausted) == (MAX_RETRIES, 1)
+
+    def test_spent_budget_fails_fast(self, monkeypatch, _fresh_retry_state):
+        monkeypatch.setattr(retry_tracker, "budget", RetryBudget(ratio=0.0, burst=0))
+        bedrock = ScriptedBedrock(_client_error("ThrottlingException"))
+        _install(monkeypatch, bedrock)
+
+        with pytest.raises(NovaThrottlingError):
+            NovaClient(caller="triage").converse(MESSAGES)
+
+        assert bedrock.calls == 1
+        assert _fresh_retry_state == []
+        assert retry_stats().by_caller["triage"].budget_denied == 1
+
+    @pytest.mark.asyncio
+    async def test_async_retries_share_the_budget_and_counters(self, monkeypatch):
+        async def no_sleep(_delay: float) -> None:
+            return None
+
+        monkeypatch.setattr("src.core.client.asyncio.sleep", no_sleep)
+        bedrock = ScriptedBedrock(_client_error("ThrottlingException"))
+        _install(monkeypatch, bedrock)
+        before = retry_stats().budget_tokens
+
+        await NovaClient(caller="student_aid").aconverse(MESSAGES)
+
+        assert retry_stats().by_caller["student_aid"].retries == 1
+        assert retry_stats().budget_tokens < before
+
+
+class TestStreamRetries:
+    def test_failure_before_first_delta_is_retried(self, monkeypatch, _fresh_retry_state):
+        bedrock = ScriptedStreamBedrock(
+            [{"messageStart": {"role": "assistant"}}, _stream_error("throttlingException")],
+            [_delta("Hallo"), _delta(" Welt")],
+        )
+        _install(monkeypatch, bedrock)
+
+        chunks = list(NovaClient(caller="compass").stream_text(MESSAGES))
+
+        assert chunks == ["Hallo", " Welt"]
+        assert bedrock.calls == 2
+        assert len(_fresh_retry_state) == 1
+        assert retry_stats().by_caller["compass"].recovered == 1
+
+    def test_failure_to_open_the_stream_is_retried(self, monkeypatch):
+        bedrock = ScriptedStreamBedrock(
+            _client_error("ServiceUnavailableException"), [_delta("ok")]
+        )
+        _install(monkeypatch, bedrock)
+
+        assert list(NovaClient(caller="compass").stream_text(MESSAGES)) == ["ok"]
+
+    def test_failure_after_text_is_a_typed_event(self, monkeypatch, _fresh_retry_state):
+        bedrock = ScriptedStreamBedrock(
+            [_delta("Teil"), _stream_error("modelStreamErrorException")]
+        )
+        _install(monkeypatch, bedrock)
+
+        chunks = list(NovaClient(caller="compass").stream_text(MESSAGES))
+
+        assert chunks[0] == "Teil"
+        assert isinstance(chunks[-1], StreamInterrupted)
+        assert isinstance(chunks[-1].error, NovaUnavailableError)
+        assert chunks[-1].chunks_delivered == 1
+        assert bedrock.calls == 1
+        assert _fresh_retry_state == []
+
+    def test_stream_errors_share_the_converse_mapping(self, monkeypatch):
+        scripts = [[_stream_error("throttlingException")] for _ in range(MAX_RETRIES + 1)]
+        _install(monkeypatch, ScriptedStreamBedrock(*scripts))
+
+        with pytest.raises(NovaThrottlingError):
+            list(NovaClient(caller="compass").stream_text(MESSAGES))
+
+    @pytest.mark.asyncio
+    async def test_async_stream_retries_before_first_delta(self, monkeypatch):
+        async def no_sleep(_delay: float) -> None:
+            return None
+
+        monkeypatch.setattr("src.core.client.asyncio.sleep", no_sleep)
+        bedrock = ScriptedStreamBedrock([_stream_error("throttlingException")], [_delta("ok")])
+        _install(monkeypatch, bedrock)
+
+        chunks = [chunk async for chunk in NovaClient(caller="compass").astream_text(MESSAGES)]
+
+        assert chunks == ["ok"]
+        assert bedrock.calls == 2
+
+    def test_agent_closes_partial_answer_before_the_event(self, monkeypatch):
+        _install(
+            monkeypatch,
+            ScriptedStreamBedrock([_delta("Du bist "), _stream_error("internalServerException")]),
+        )
+
+        chunks = list(CompassAgent().respond_stream(MESSAGES))
+
+        assert chunks[0] == "Du bist "
+        assert isinstance(chunks[-1], StreamInterrupted)
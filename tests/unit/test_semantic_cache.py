@@ -0,0 +1,339 @@
+"""Unit tests for the semantic response cache and the local hashing embedder."""
+
+import io
+import json
+from collections.abc import Generator
+
+import botocore.exceptions
+import numpy as np
+import pytest
+from src.core.client import NovaAccessDeniedError
+from src.core.embeddings import HashingEmbedder, NovaEmbedder, build_embedder
+from src.core.provenance import AgentReply, ResponseProvenance
+from src.core.usage import process_usage, reset_process_usage
+from src.orchestration import ChatService, SemanticResponseCache
+
+pytestmark = pytest.mark.unit
+
+PROVENANCE = ResponseProvenance(
+    mode="source_registry", source_registry_used=True, web_grounding_used=False
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FailingEmbedder:
+    dimensions = 4
+
+    def embed(self, text: str) -> np.ndarray:
+        raise RuntimeError("embeddings unavailable")
+
+
+class StubRuntime:
+    def __init__(self, vector: list[float] | None = None, error: Exception | None = None):
+        self.vector = vector or [3.0, 4.0]
+        self.error = error
+        self.requests: list[dict] = []
+
+    def invoke_model(self, **kwargs) -> dict:
+        self.requests.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        body = json.dumps({"embeddings": [{"embeddingType": "TEXT", "embedding": self.vector}]})
+        return {
+            "body": io.BytesIO(body.encode("utf-8")),
+            "ResponseMetadata": {"HTTPHeaders": {"x-amzn-bedrock-input-token-count": "7"}},
+        }
+
+
+class FlakyRuntime(StubRuntime):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    def invoke_model(self, **kwargs) -> dict:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+                "InvokeModel",
+            )
+        return super().invoke_model(**kwargs)
+
+
+class FixedRouter:
+    def route(self, _message: str) -> str:
+        return "FINANCING"
+
+    async def aroute(self, message: str) -> str:
+        return self.route(message)
+
+
+class CalmRadar:
+    def scan(self, _message: str) -> dict:
+        return {"is_crisis": False, "resources": None}
+
+    async def ascan(self, message: str) -> dict:
+        return self.scan(message)
+
+
+class CountingAgent:
+    tool_mode = None
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def respond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        self.calls += 1
+        return AgentReply(text=f"answer {self.calls}", provenance=PROVENANCE)
+
+    def respond_stream(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> Generator[str, None, None]:
+        yield self.respond_with_details(messages, metadata).text
+
+
+def _reply(text: str) -> AgentReply:
+    return AgentReply(text=text, provenance=PROVENANCE)
+
+
+def _cache(**kwargs) -> SemanticResponseCache:
+    return SemanticResponseCache(HashingEmbedder(), threshold=0.8, **kwargs)
+
+
+def _remember(cache: SemanticResponseCache, message: str, text: str, **bucket) -> None:
+    bucket = {"agent_key": "FINANCING", "ui_language": "en", **bucket}
+    lookup = cache.lookup(message, **bucket)
+    assert lookup is not None
+    cache.put(lookup, _reply(text))
+
+
+class TestHashingEmbedder:
+    def test_vectors_are_deterministic_and_normalized(self):
+        embedder = HashingEmbedder(dimensions=64)
+
+        first = embedder.embed("Wie beantrage ich BAföG?")
+        second = embedder.embed("Wie beantrage ich BAföG?")
+
+        assert first.shape == (64,)
+        assert np.array_equal(first, second)
+        assert np.linalg.norm(first) == pytest.approx(1.0)
+
+    def test_paraphrases_score_higher_than_unrelated_text(self):
+        embedder = HashingEmbedder()
+        query = embedder.embed("How do I apply for BAföG?")
+
+        paraphrase = float(embedder.embed("how can I apply for Bafoeg") @ query)
+        unrelated = float(embedder.embed("What does ECTS mean?") @ query)
+
+        assert paraphrase > 0.6
+        assert unrelated < paraphrase
+
+    def test_build_embedder_rejects_unknown_kind(self):
+        assert isinstance(build_embedder("hashing"), HashingEmbedder)
+        with pytest.raises(ValueError, match="SEMANTIC_CACHE_EMBEDDER"):
+            build_embedder("word2vec")
+
+
+class TestNovaEmbedder:
+    def test_requests_text_embedding_and_normalizes(self):
+        embedder = NovaEmbedder(model_id="nova-embed", dimensions=256)
+        runtime = StubRuntime([3.0, 4.0])
+        embedder.client._runtime_client = runtime
+
+        vector = embedder.embed("BAföG")
+
+        body = json.loads(runtime.requests[0]["body"])
+        assert runtime.requests[0]["modelId"] == "nova-embed"
+        assert body["singleEmbeddingParams"]["embeddingDimension"] == 256
+        assert body["singleEmbeddingParams"]["text"]["value"] == "BAföG"
+        assert vector.tolist() == pytest.approx([0.6, 0.8])
+
+    def test_maps_bedrock_errors(self):
+        embedder = NovaEmbedder()
+        embedder.client._runtime_client = StubRuntime(
+            error=botocore.exceptions.ClientError(
+                {"Error": {"Code": "AccessDeniedException", "Message": "denied"}},
+                "InvokeModel",
+            )
+        )
+
+        with pytest.raises(NovaAccessDeniedError):
+            embedder.embed("BAföG")
+
+    def test_retries_throttling_and_meters_usage(self, monkeypatch):
+        monkeypatch.setattr("src.core.client.backoff_delay", lambda _attempt: 0.0)
+        reset_process_usage()
+        runtime = FlakyRuntime(failures=1)
+        embedder = NovaEmbedder()
+        embedder.client._runtime_client = runtime
+
+        embedder.embed("BAföG")
+
+        assert runtime.calls == 2
+        usage = process_usage().by_caller["embeddings"]
+        assert usage.requests == 1
+        assert usage.input_tokens == 7
+
+
+class TestSemanticResponseCache:
+    def test_paraphrase_hits_and_keeps_provenance(self):
+        cache = _cache()
+        _remember(cache, "How do I apply for BAföG?", "Apply online.")
+
+        lookup = cache.lookup("how can I apply for Bafoeg", agent_key="FINANCING", ui_language="en")
+
+        assert lookup is not None
+        assert lookup.reply == _reply("Apply online.")
+        assert lookup.similarity >= 0.8
+        assert cache.stats().hits == 1
+
+    def test_unrelated_message_misses(self):
+        cache = _cache()
+        _remember(cache, "How do I apply for BAföG?", "Apply online.")
+
+        lookup = cache.lookup("What does ECTS mean?", agent_key="FINANCING", ui_language="en")
+
+        assert lookup is not None
+        assert lookup.reply is None
+
+    def test_buckets_are_separated_by_agent_and_language(self):
+        cache = _cache()
+        _remember(cache, "How do I apply for BAföG?", "Apply online.")
+
+        other_agent = cache.lookup(
+            "How do I apply for BAföG?", agent_key="COMPASS", ui_language="en"
+        )
+        other_language = cache.lookup(
+            "How do I apply for BAföG?", agent_key="FINANCING", ui_language="de"
+        )
+
+        assert other_agent is not None and other_agent.reply is None
+        assert other_language is not None and other_language.reply is None
+        assert cache.stats().buckets == 1
+
+    def test_expired_entries_are_skipped_and_reused(self):
+        clock = FakeClock()
+        cache = _cache(ttl_seconds=10, now=clock)
+        _remember(cache, "How do I apply for BAföG?", "Apply online.")
+        clock.now = 11
+
+        lookup = cache.lookup("How do I apply for BAföG?", agent_key="FINANCING", ui_language="en")
+        assert lookup is not None and lookup.reply is None
+        assert cache.stats().size == 0
+
+        cache.put(lookup, _reply("Apply online, again."))
+        assert cache.stats().size == 1
+        assert cache.stats().evictions == 0
+
+    def test_full_bucket_evicts_least_recently_used(self):
+        clock = FakeClock()
+        cache = _cache(max_entries=2, now=clock)
+        _remember(cache, "How do I apply for BAföG?", "bafoeg")
+        clock.now = 1
+        _remember(cache, "What does ECTS mean?", "ects")
+        clock.now = 2
+        cache.lookup("How do I apply for BAföG?", agent_key="FINANCING", ui_language="en")
+        clock.now = 3
+
+        _remember(cache, "Which scholarships exist?", "scholarships")
+
+        ects = cache.lookup("What does ECTS mean?", agent_key="FINANCING", ui_language="en")
+        bafoeg = cache.lookup("How do I apply for BAföG?", agent_key="FINANCING", ui_language="en")
+        assert ects is not None and ects.reply is None
+        assert bafoeg is not None and bafoeg.reply == _reply("bafoeg")
+        assert cache.stats().evictions == 1
+
+    def test_embedder_failure_disables_caching_for_the_turn(self):
+        cache = SemanticResponseCache(FailingEmbedder())
+
+        assert cache.lookup("BAföG?", agent_key="FINANCING", ui_language="en") is None
+        assert cache.stats().embed_failures == 1
+
+    def test_personal_messages_are_neither_looked_up_nor_stored(self):
+        cache = _cache()
+
+        for message in (
+            "I am 24 and work part-time, can I still get BAföG?",
+            "Meine Eltern verdienen zu wenig, wie beantrage ich BAföG?",
+            "How do I apply for BAföG? Mail me at anna@example.org",
+            "How do I apply for BAföG? " + "please " * 20,
+        ):
+            assert not cache.eligible(message)
+            assert cache.lookup(message, agent_key="FINANCING", ui_language="en") is None
+
+        assert cache.eligible("How do I apply for BAföG?")
+        assert cache.stats().ineligible == 4
+        assert cache.stats().size == 0
+
+    def test_quick_action_messages_are_always_eligible(self):
+        message = "I am new here, my parents never studied. Where do I start?"
+        cache = _cache(messages=[message])
+
+        assert cache.eligible(message)
+
+    def test_registry_update_starts_from_empty_buckets(self):
+        version = ["v1"]
+        cache = _cache(registry_version=lambda: version[0])
+        _remember(cache, "How do I apply for BAföG?", "Apply online.")
+
+        version[0] = "v2"
+        lookup = cache.lookup("How do I apply for BAföG?", agent_key="FINANCING", ui_language="en")
+        assert lookup is not None and lookup.reply is None
+        cache.put(lookup, _reply("Apply online, new rules."))
+
+        assert cache.stats().buckets == 1
+        assert cache.stats().size == 1
+
+    def test_invalidate_drops_entries(self):
+        cache = _cache()
+        _remember(cache, "How do I apply for BAföG?", "Apply online.")
+
+        cache.invalidate()
+
+        assert cache.stats().size == 0
+
+
+class TestChatServiceSemanticCache:
+    def test_first_turn_paraphrase_reuses_answer(self):
+        agent = CountingAgent()
+        service = ChatService(
+            router=FixedRouter(),
+            crisis_radar=CalmRadar(),
+            agents={"COMPASS": CountingAgent(), "FINANCING": agent},
+            semantic_cache=_cache(),
+        )
+
+        first = service.respond("How do I apply for BAföG?")
+        second = service.respond("how can I apply for Bafoeg")
+        follow_up = service.respond("how can I apply for Bafoeg", session_id=second.session_id)
+
+        assert second.response == first.response == "answer 1"
+        assert second.provenance == PROVENANCE
+        assert follow_up.response == "answer 2"
+        assert service.metrics()["semantic_cache"]["hits"] == 1
+
+    def test_personal_first_turn_is_never_served_to_another_user(self):
+        agent = CountingAgent()
+        service = ChatService(
+            router=FixedRouter(),
+            crisis_radar=CalmRadar(),
+            agents={"COMPASS": CountingAgent(), "FINANCING": agent},
+            semantic_cache=_cache(),
+        )
+
+        first = service.respond("My parents earn 30000 a year, how do I apply for BAföG?")
+        second = service.respond("My parents earn 30000 a year, how do I apply for BAföG?")
+
+        assert first.response == "answer 1"
+        assert second.response == "answer 2"
+        assert service.metrics()["semantic_cache"]["size"] == 0
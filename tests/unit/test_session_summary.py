@@ -1,7 +1,11 @@
 """Unit tests for internal session summarization."""
 
 import pytest
-from src.core.session_summary import NovaSessionSummarizer, SessionSummary
+from src.core.session_summary import (
+    IncrementalSessionSummarizer,
+    NovaSessionSummarizer,
+    SessionSummary,
+)
 
 pytestmark = pytest.mark.unit
 
@@ -150,3 +154,47 @@ def test_nova_session_summarizer_repairs_trailing_commas() -> None:
 
     assert result.profile_facts == ("Erstakademikerin",)
     assert result.conversation_overview == ("Du vergleichst BAföG und Stipendien.",)
+
+
+def test_summarize_delta_sends_only_new_messages_with_previous_summary() -> None:
+    client = StubSummaryClient(
+        text='{"profile_facts": ["Erstakademikerin", "17 Jahre alt"], '
+        '"conversation_overview": ["Du planst dein Studium nach dem Abi."]}'
+    )
+    summarizer = NovaSessionSummarizer(client=client)
+    previous = SessionSummary(
+        profile_facts=("Erstakademikerin",),
+        conversation_overview=("Du suchst nach Orientierung.",),
+    )
+
+    result = summarizer.summarize_delta(
+        [
+            {"role": "user", "content": [{"text": "Ich bin 17 und mache bald Abi."}]},
+            {"role": "assistant", "content": [{"text": "Dann lass uns planen."}]},
+        ],
+        ui_language="de",
+        previous_summary=previous,
+    )
+
+    assert isinstance(summarizer, IncrementalSessionSummarizer)
+    assert result is not None
+    assert result.profile_facts == ("Erstakademikerin", "17 Jahre alt")
+    assert client.last_system_prompt is not None
+    assert "Existing profile_facts:" in client.last_system_prompt
+    assert client.last_messages is not None
+    request = client.last_messages[0]["content"][0]["text"]
+    assert "ONLY the messages added since" in request
+    assert "User: Ich bin 17 und mache bald Abi." in request
+    assert "Assistant: Dann lass uns planen." in request
+
+
+def test_summarize_delta_returns_none_on_failure() -> None:
+    summarizer = NovaSessionSummarizer(client=StubSummaryClient(text="not json at all"))
+
+    result = summarizer.summarize_delta(
+        [{"role": "user", "content": [{"text": "Hallo"}]}],
+        ui_language="de",
+        previous_summary=SessionSummary(profile_facts=("Erstakademikerin",)),
+    )
+
+    assert result is None
@@ -5,6 +5,7 @@ from src.knowledge.source_registry import (
     SourceSelectionContext,
     get_trusted_sources,
     load_trusted_source_manifests,
+    prime_trusted_source_registry,
     select_trusted_sources,
 )
 
@@ -36,6 +37,15 @@ class TestTrustedSourceRegistry:
             assert source.language == "de"
             assert source.country_codes == ("DE",)
 
+    def test_prime_fills_every_category_lookup(self):
+        get_trusted_sources.cache_clear()
+
+        total = prime_trusted_source_registry()
+
+        assert total == len(get_trusted_sources())
+        # Four categories plus the unfiltered view stay cached side by side.
+        assert get_trusted_sources.cache_info().currsize == 5
+
 
 class TestSelectionPolicy:
     def test_german_language_uses_registry(self):
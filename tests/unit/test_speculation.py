@@ -0,0 +1,247 @@
+"""Unit tests for speculative specialist execution."""
+
+import threading
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from src.core.provenance import AgentReply, build_default_provenance
+from src.orchestration import ChatService, ChatTurnResult, SpeculativeRunner
+from src.orchestration.speculation import single_item
+from structlog.testing import capture_logs
+
+pytestmark = pytest.mark.unit
+
+
+class SequenceRouter:
+    """Route each turn to the next key in *keys*."""
+
+    def __init__(self, *keys: str) -> None:
+        self._keys = list(keys)
+
+    def route(self, _message: str) -> str:
+        return self._keys.pop(0)
+
+    async def aroute(self, message: str) -> str:
+        return self.route(message)
+
+
+class CalmRadar:
+    def scan(self, _message: str) -> dict:
+        return {"is_crisis": False, "resources": None}
+
+    async def ascan(self, message: str) -> dict:
+        return self.scan(message)
+
+
+class RecordingAgent:
+    def __init__(self, name: str, *, tool_mode: str | None = None) -> None:
+        self.name = name
+        self.tool_mode = tool_mode
+        self.calls: list[str] = []
+
+    def respond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        self.calls.append("reply")
+        return AgentReply(
+            text=f"{self.name} answer", provenance=build_default_provenance(self.tool_mode)
+        )
+
+    def respond_stream(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> Generator[str, None, None]:
+        self.calls.append("stream")
+        yield f"{self.name} "
+        yield "streamed"
+
+    async def arespond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        return self.respond_with_details(messages, metadata)
+
+    async def arespond_stream(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AsyncGenerator[str, None]:
+        for chunk in self.respond_stream(messages, metadata):
+            yield chunk
+
+
+def _service(*keys: str) -> tuple[ChatService, dict[str, RecordingAgent]]:
+    agents = {
+        "COMPASS": RecordingAgent("compass"),
+        "FINANCING": RecordingAgent("financing"),
+        "ROLE_MODELS": RecordingAgent("role_models"),
+    }
+    service = ChatService(
+        router=SequenceRouter(*keys),
+        crisis_radar=CalmRadar(),
+        agents=agents,
+        speculator=SpeculativeRunner(max_workers=2),
+    )
+    return service, agents
+
+
+def _final(chunks: list) -> ChatTurnResult:
+    result = chunks[-1]
+    assert isinstance(result, ChatTurnResult)
+    return result
+
+
+class TestSpeculativeRunner:
+    def test_commit_replays_buffered_items(self):
+        runner = SpeculativeRunner(max_workers=1)
+        run = runner.start("FINANCING", lambda: iter(["a", "b"]))
+        runner.commit(run)
+
+        assert list(run.items()) == ["a", "b"]
+        stats = runner.stats()
+        assert (stats.started, stats.committed, stats.cancelled) == (1, 1, 0)
+        assert stats.hit_rate == 1.0
+        runner.shutdown()
+
+    def test_cancel_stops_the_producer(self):
+        release = threading.Event()
+        closed = threading.Event()
+
+        def produce() -> Generator[str, None, None]:
+            try:
+                yield "first"
+                release.wait(timeout=5)
+                yield "second"
+                yield "third"
+            finally:
+                closed.set()
+
+        runner = SpeculativeRunner(max_workers=1)
+        run = runner.start("FINANCING", produce)
+        with capture_logs() as logs:
+            runner.cancel(run, routed_to="COMPASS")
+        release.set()
+
+        assert closed.wait(timeout=5)
+        assert run.cancelled is True
+        assert "third" not in list(run.items())
+        assert runner.stats().waste_rate == 1.0
+        assert logs[0]["event"] == "speculation_cancelled"
+        assert logs[0]["routed_to"] == "COMPASS"
+        runner.shutdown()
+
+    def test_producer_errors_surface_on_replay(self):
+        def produce() -> Generator[str, None, None]:
+            yield "partial"
+            raise RuntimeError("stream broke")
+
+        runner = SpeculativeRunner(max_workers=1)
+        run = runner.start("FINANCING", produce)
+
+        with pytest.raises(RuntimeError, match="stream broke"):
+            list(run.items())
+        runner.shutdown()
+
+    def test_empty_stats(self):
+        stats = SpeculativeRunner(max_workers=1).stats()
+
+        assert stats.started == 0
+        assert stats.hit_rate == 0.0
+        assert stats.waste_rate == 0.0
+
+    @pytest.mark.asyncio
+    async def test_async_run_commit_and_cancel(self):
+        async def reply() -> str:
+            return "done"
+
+        runner = SpeculativeRunner(max_workers=1)
+        hit = runner.astart("FINANCING", lambda: single_item(reply))
+        runner.commit(hit)
+        miss = runner.astart("FINANCING", lambda: single_item(reply))
+        runner.cancel(miss, routed_to="COMPASS")
+
+        assert [item async for item in hit.items()] == ["done"]
+        assert miss.cancelled is True
+        assert [item async for item in miss.items()] == []
+        assert runner.stats().committed == 1
+        assert runner.stats().cancelled == 1
+
+
+class TestChatServiceSpeculation:
+    def test_first_turn_does_not_speculate(self):
+        service, _agents = _service("FINANCING")
+
+        result = service.respond("Wie beantrage ich BAfoeG?")
+
+        assert result.response == "financing answer"
+        assert service.metrics()["speculation"]["started"] == 0
+
+    def test_follow_up_commits_speculation_for_the_same_agent(self):
+        service, agents = _service("FINANCING", "FINANCING")
+        first = service.respond("Wie beantrage ich BAfoeG?")
+
+        result = service.respond("Und wie lange dauert das?", session_id=first.session_id)
+
+        assert result.agent == "FINANCING"
+        assert result.response == "financing answer"
+        assert agents["FINANCING"].calls == ["reply", "reply"]
+        stats = service.metrics()["speculation"]
+        assert stats["committed"] == 1
+        assert stats["hit_rate"] == 1.0
+
+    def test_follow_up_cancels_when_routing_changes(self):
+        service, agents = _service("FINANCING", "ROLE_MODELS")
+        first = service.respond("Wie beantrage ich BAfoeG?")
+
+        result = service.respond(
+            "Ich fuehle mich wie ein Hochstapler.", session_id=first.session_id
+        )
+
+        assert result.agent == "ROLE_MODELS"
+        assert result.response == "role_models answer"
+        assert agents["ROLE_MODELS"].calls == ["reply"]
+        stats = service.metrics()["speculation"]
+        assert stats["cancelled"] == 1
+        assert stats["waste_rate"] == 1.0
+
+    def test_stream_replays_speculative_chunks(self):
+        service, agents = _service("FINANCING", "FINANCING")
+        first = _final(list(service.respond_stream("Wie beantrage ich BAfoeG?")))
+
+        chunks = list(service.respond_stream("Und danach?", session_id=first.session_id))
+
+        assert chunks[:-1] == ["financing ", "streamed"]
+        assert _final(chunks).response == "financing streamed"
+        assert agents["FINANCING"].calls == ["stream", "stream"]
+        assert service.metrics()["speculation"]["committed"] == 1
+
+    def test_stream_uses_single_reply_for_tool_mode_agents(self):
+        service, agents = _service("FINANCING", "FINANCING")
+        agents["FINANCING"].tool_mode = "web_grounding"
+        first = _final(list(service.respond_stream("Wie beantrage ich BAfoeG?")))
+
+        chunks = list(service.respond_stream("Und danach?", session_id=first.session_id))
+
+        assert chunks[:-1] == ["financing answer"]
+        assert _final(chunks).provenance.web_grounding_used is True
+
+    def test_disabled_without_speculator(self):
+        service, _agents = _service("FINANCING", "FINANCING")
+        service.speculator = None
+        first = service.respond("Wie beantrage ich BAfoeG?")
+        service.respond("Und danach?", session_id=first.session_id)
+
+        assert service.metrics()["speculation"] is None
+
+    @pytest.mark.asyncio
+    async def test_async_follow_up_commits_and_cancels(self):
+        service, _agents = _service("FINANCING", "FINANCING", "COMPASS")
+        first = await service.arespond("Wie beantrage ich BAfoeG?")
+
+        hit = [
+            chunk
+            async for chunk in service.arespond_stream("Und danach?", session_id=first.session_id)
+        ]
+        miss = await service.arespond("Was soll ich studieren?", session_id=first.session_id)
+
+        assert _final(hit).response == "financing streamed"
+        assert miss.agent == "COMPASS"
+        assert miss.response == "compass answer"
+        stats = service.metrics()["speculation"]
+        assert (stats["started"], stats["committed"], stats["cancelled"]) == (2, 1, 1)
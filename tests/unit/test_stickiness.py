@@ -0,0 +1,226 @@
+"""Unit tests for session-sticky routing of short follow-ups."""
+
+import pytest
+from src.core.conversation import Conversation, detect_topics
+from src.core.provenance import AgentReply, build_default_provenance
+from src.orchestration import ChatService
+from src.orchestration.stickiness import StickyRoutingPolicy
+from structlog.testing import capture_logs
+
+pytestmark = pytest.mark.unit
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingRouter:
+    def __init__(self, agent_key: str) -> None:
+        self.agent_key = agent_key
+        self.calls = 0
+
+    def route(self, _message: str) -> str:
+        self.calls += 1
+        return self.agent_key
+
+    async def aroute(self, message: str) -> str:
+        return self.route(message)
+
+
+class StubCrisisRadar:
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+
+    def scan(self, _message: str) -> dict:
+        return self.payload
+
+    async def ascan(self, message: str) -> dict:
+        return self.scan(message)
+
+
+class StubAgent:
+    tool_mode = None
+
+    def respond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        return AgentReply(text="Antwort", provenance=build_default_provenance())
+
+    async def arespond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        return self.respond_with_details(messages, metadata)
+
+
+def _session(agent: str | None = "FINANCING", clock: Clock | None = None) -> Conversation:
+    session = Conversation(now=clock or Clock())
+    session.add_user_message("Wie beantrage ich BAföG?")
+    if agent is not None:
+        session.add_assistant_message("So geht's.", agent_key=agent)
+    return session
+
+
+class TestStickyRoutingPolicy:
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "und wie beantrage ich das?",
+            "and how much is that?",
+            "Wie lange dauert das?",
+            "Und was mache ich, wenn meine Eltern die Unterlagen dafür nicht rausgeben wollen?",
+        ],
+    )
+    def test_keeps_the_current_agent_for_follow_ups(self, message: str):
+        clock = Clock()
+        policy = StickyRoutingPolicy(now=clock)
+
+        decision = policy.decide(_session(clock=clock), message)
+
+        assert decision.agent == "FINANCING"
+        assert decision.reason == "follow_up"
+
+    def test_reroutes_on_a_topic_switch(self):
+        clock = Clock()
+        policy = StickyRoutingPolicy(now=clock)
+
+        decision = policy.decide(_session(clock=clock), "und wie viele ECTS brauche ich?")
+
+        assert decision.agent is None
+        assert decision.reason == "topic_switch"
+
+    def test_reroutes_when_the_local_lexicon_points_elsewhere(self):
+        clock = Clock()
+        policy = StickyRoutingPolicy(now=clock)
+
+        decision = policy.decide(_session(clock=clock), "Und was ist mit dem NC?")
+
+        assert decision.reason == "topic_switch"
+
+    def test_same_agent_topics_stay_sticky(self):
+        clock = Clock()
+        policy = StickyRoutingPolicy(now=clock)
+
+        decision = policy.decide(_session(clock=clock), "und ein Stipendium?")
+
+        assert decision.agent == "FINANCING"
+
+    def test_reroutes_long_new_questions(self):
+        clock = Clock()
+        policy = StickyRoutingPolicy(now=clock, max_words=4)
+
+        decision = policy.decide(
+            _session(clock=clock), "Ich überlege gerade ganz grundsätzlich, wie es weitergehen soll"
+        )
+
+        assert decision.reason == "not_follow_up"
+
+    def test_window_expires(self):
+        clock = Clock()
+        session = _session(clock=clock)
+        policy = StickyRoutingPolicy(now=clock, window_seconds=60)
+        clock.now += 61
+
+        assert policy.decide(session, "und dann?").reason == "expired"
+
+    def test_needs_a_current_agent(self):
+        policy = StickyRoutingPolicy()
+
+        assert policy.decide(_session(agent=None), "und dann?").reason == "no_current_agent"
+
+    def test_stats_count_every_reason(self):
+        clock = Clock()
+        policy = StickyRoutingPolicy(now=clock)
+        session = _session(clock=clock)
+        policy.decide(session, "und dann?")
+        policy.decide(session, "und wie viele ECTS brauche ich?")
+
+        stats = policy.stats()
+
+        assert (stats.total, stats.kept, stats.rerouted) == (2, 1, 1)
+        assert stats.sticky_rate == 0.5
+        assert stats.by_reason["topic_switch"] == 1
+        assert stats.by_reason["expired"] == 0
+
+
+def test_detect_topics_uses_the_session_topic_table():
+    assert detect_topics("Brauche ich für BAföG ECTS-Nachweise?") == ("BAfoeG", "ECTS")
+    assert detect_topics("Hallo") == ()
+
+
+class TestChatServiceStickyRouting:
+    def _service(self, router: CountingRouter) -> ChatService:
+        return ChatService(
+            router=router,
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(), "FINANCING": StubAgent(), "ROLE_MODELS": StubAgent()},
+            sticky_routing=StickyRoutingPolicy(),
+        )
+
+    def test_follow_up_skips_the_router(self):
+        router = CountingRouter("FINANCING")
+        service = self._service(router)
+        first = service.respond("Wie beantrage ich BAföG?")
+        router.agent_key = "COMPASS"
+
+        with capture_logs() as logs:
+            result = service.respond("und wie lange dauert das?", session_id=first.session_id)
+
+        assert router.calls == 1
+        assert result.agent == "FINANCING"
+        triage_log = next(log for log in logs if log["event"] == "triage_completed")
+        assert triage_log["sticky"] is True
+        assert service.metrics()["sticky_routing"]["kept"] == 1
+
+    def test_topic_switch_asks_the_router(self):
+        router = CountingRouter("FINANCING")
+        service = self._service(router)
+        first = service.respond("Wie beantrage ich BAföG?")
+        router.agent_key = "ROLE_MODELS"
+
+        result = service.respond("Ich fühle mich wie ein Impostor.", session_id=first.session_id)
+
+        assert router.calls == 2
+        assert result.agent == "ROLE_MODELS"
+
+    def test_crisis_scan_still_runs_on_sticky_turns(self):
+        router = CountingRouter("FINANCING")
+        service = ChatService(
+            router=router,
+            crisis_radar=StubCrisisRadar({"is_crisis": True, "resources": {"emergency": "112"}}),
+            agents={"COMPASS": StubAgent(), "FINANCING": StubAgent()},
+            sticky_routing=StickyRoutingPolicy(),
+        )
+        first = service.respond("Wie beantrage ich BAföG?")
+
+        result = service.respond("und dann?", session_id=first.session_id)
+
+        assert router.calls == 1
+        assert result.crisis is True
+
+    @pytest.mark.asyncio
+    async def test_async_follow_up_skips_the_router(self):
+        router = CountingRouter("FINANCING")
+        service = self._service(router)
+        first = await service.arespond("Wie beantrage ich BAföG?")
+
+        result = await service.arespond("and how much is that?", session_id=first.session_id)
+
+        assert router.calls == 1
+        assert result.agent == "FINANCING"
+
+    def test_disabled_by_default(self):
+        router = CountingRouter("FINANCING")
+        service = ChatService(
+            router=router,
+            crisis_radar=StubCrisisRadar({"is_crisis": False, "resources": None}),
+            agents={"COMPASS": StubAgent(), "FINANCING": StubAgent()},
+        )
+        first = service.respond("Wie beantrage ich BAföG?")
+        service.respond("und dann?", session_id=first.session_id)
+
+        assert router.calls == 2
+        assert service.metrics()["sticky_routing"] is None
@@ -0,0 +1,133 @@
+"""Unit tests for summary cadence policies and session summary progress."""
+
+import pytest
+from src.core.conversation import Conversation
+from src.core.session_summary import SessionSummary
+from src.core.summary_cadence import (
+    AnyOf,
+    EveryNTurns,
+    EveryTurn,
+    ProfileSignalChange,
+    SummaryProgress,
+    TokenGrowth,
+    build_summary_cadence,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _progress(
+    *,
+    new_messages: int = 2,
+    new_tokens: int = 20,
+    signals_changed: bool = False,
+    has_summary: bool = True,
+) -> SummaryProgress:
+    return SummaryProgress(
+        new_messages=new_messages,
+        new_tokens=new_tokens,
+        signals_changed=signals_changed,
+        has_summary=has_summary,
+    )
+
+
+class TestPolicies:
+    def test_every_turn_only_needs_new_messages(self):
+        assert EveryTurn().should_summarize(_progress()) is True
+        assert EveryTurn().should_summarize(_progress(new_messages=0)) is False
+
+    def test_every_n_turns_counts_exchanges(self):
+        policy = EveryNTurns(3)
+        assert policy.should_summarize(_progress(new_messages=4)) is False
+        assert policy.should_summarize(_progress(new_messages=6)) is True
+
+    def test_token_growth_threshold(self):
+        policy = TokenGrowth(500)
+        assert policy.should_summarize(_progress(new_tokens=499)) is False
+        assert policy.should_summarize(_progress(new_tokens=500)) is True
+
+    def test_signal_change_and_first_summary(self):
+        policy = ProfileSignalChange()
+        assert policy.should_summarize(_progress()) is False
+        assert policy.should_summarize(_progress(signals_changed=True)) is True
+        assert policy.should_summarize(_progress(has_summary=False)) is True
+        assert policy.should_summarize(_progress(new_messages=0, has_summary=False)) is False
+
+    def test_any_of_combines_policies(self):
+        policy = AnyOf((EveryNTurns(4), TokenGrowth(1000)))
+        assert policy.should_summarize(_progress(new_tokens=1200)) is True
+        assert policy.should_summarize(_progress()) is False
+
+    def test_unknown_mode_is_rejected(self):
+        assert isinstance(build_summary_cadence("every_turn"), EveryTurn)
+        with pytest.raises(ValueError, match="SUMMARY_CADENCE_MODE"):
+            build_summary_cadence("sometimes")
+
+
+class TestConversationSummaryProgress:
+    def test_new_identity_signal_marks_change(self):
+        conversation = Conversation()
+        conversation.add_user_message("Hallo", ui_language="de")
+        conversation.add_assistant_message("Hi!", agent_key="COMPASS")
+        conversation.update_summary(SessionSummary(conversation_overview=("Begruessung",)))
+
+        conversation.add_user_message("Danke dir!", ui_language="de")
+        conversation.add_assistant_message("Gern.", agent_key="COMPASS")
+        unchanged = conversation.summary_progress()
+
+        conversation.add_user_message("Ich bin Erstakademikerin.", ui_language="de")
+        changed = conversation.summary_progress()
+
+        assert unchanged.new_messages == 2
+        assert unchanged.new_tokens > 0
+        assert unchanged.has_summary is True
+        assert unchanged.signals_changed is False
+        assert changed.signals_changed is True
+
+    def test_repeated_small_talk_does_not_change_signals(self):
+        conversation = Conversation()
+        conversation.add_user_message("Was ist BAfoeG?", ui_language="de")
+        conversation.add_assistant_message("Eine Foerderung.", agent_key="FINANCING")
+        conversation.update_summary(SessionSummary(profile_facts=("Fragt nach BAfoeG",)))
+
+        conversation.add_user_message("Danke, und wie lange dauert BAfoeG?", ui_language="de")
+        conversation.add_assistant_message("Ein paar Wochen.", agent_key="FINANCING")
+
+        assert conversation.summary_progress().signals_changed is False
+
+    def test_mark_survives_message_trimming(self):
+        conversation = Conversation()
+        for index in range(20):
+            conversation.add_user_message(f"Frage {index}", ui_language="de")
+            conversation.add_assistant_message(f"Antwort {index}", agent_key="COMPASS")
+
+        assert conversation.summary_progress().new_messages == 40
+        conversation.update_summary(SessionSummary(conversation_overview=("Viele Fragen",)))
+        assert conversation.summary_progress().new_messages == 0
+
+    def test_summary_covers_only_transcript_it_read(self):
+        conversation = Conversation()
+        conversation.add_user_message("Erste Frage", ui_language="de")
+        covered_through = conversation.summary_input().covered_through
+        conversation.add_assistant_message("Antwort", agent_key="COMPASS")
+
+        conversation.update_summary(
+            SessionSummary(conversation_overview=("Erste Frage",)),
+            covered_through=covered_through,
+        )
+
+        assert conversation.summary_progress().new_messages == 1
+
+    def test_stale_summary_does_not_overwrite_newer_one(self):
+        conversation = Conversation()
+        conversation.add_user_message("Erste Frage", ui_language="de")
+        stale_mark = conversation.summary_input().covered_through
+        conversation.add_assistant_message("Antwort", agent_key="COMPASS")
+        conversation.update_summary(SessionSummary(conversation_overview=("Neu",)))
+
+        conversation.update_summary(
+            SessionSummary(conversation_overview=("Alt",)),
+            covered_through=stale_mark,
+        )
+
+        assert conversation.conversation_overview == ["Neu"]
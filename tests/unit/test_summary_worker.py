@@ -0,0 +1,251 @@
+"""Unit tests for the background session summarization worker."""
+
+import threading
+
+import pytest
+from src.core.conversation import Conversation
+from src.core.session_summary import NovaSessionSummarizer, SessionSummary
+from src.orchestration.summaries import SummaryWorker, refresh_session_summary
+
+pytestmark = pytest.mark.unit
+
+
+class RecordingSummarizer:
+    """Records the transcript length it saw; optionally blocks until released."""
+
+    def __init__(self, *, gate: threading.Event | None = None) -> None:
+        self.gate = gate
+        self.started = threading.Event()
+        self.seen_lengths: list[int] = []
+
+    def summarize(
+        self,
+        messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary | None = None,
+    ) -> SessionSummary:
+        self.started.set()
+        if self.gate is not None:
+            assert self.gate.wait(timeout=2)
+        self.seen_lengths.append(len(messages))
+        return SessionSummary(
+            profile_facts=(f"{len(messages)} messages",),
+            conversation_overview=(f"Summary in {ui_language}",),
+        )
+
+
+class FailingSummarizer:
+    def summarize(self, messages, *, ui_language, previous_summary=None) -> SessionSummary:
+        raise RuntimeError("boom")
+
+
+def _conversation_with_turns(turns: int) -> Conversation:
+    conversation = Conversation()
+    for index in range(turns):
+        conversation.add_user_message(f"Frage {index}", ui_language="de")
+        conversation.add_assistant_message(f"Antwort {index}", agent_key="COMPASS")
+    return conversation
+
+
+def test_worker_applies_summary_to_session() -> None:
+    worker = SummaryWorker(RecordingSummarizer())
+    session = _conversation_with_turns(1)
+
+    assert worker.submit(session, ui_language="de") is True
+    assert worker.flush(timeout=2) is True
+
+    assert session.profile_facts == ["2 messages"]
+    assert session.conversation_overview == ["Summary in de"]
+    stats = worker.stats()
+    assert stats.completed == 1
+    assert stats.queue_depth == 0
+    assert stats.in_flight == 0
+    worker.shutdown()
+
+
+def test_jobs_for_same_session_coalesce_to_latest_transcript() -> None:
+    gate = threading.Event()
+    summarizer = RecordingSummarizer(gate=gate)
+    worker = SummaryWorker(summarizer, max_workers=1)
+    busy = _conversation_with_turns(1)
+    session = _conversation_with_turns(1)
+
+    worker.submit(busy, ui_language="de")
+    assert summarizer.started.wait(timeout=2)
+    worker.submit(session, ui_language="de")
+    session.add_user_message("Noch eine Frage", ui_language="de")
+    worker.submit(session, ui_language="de")
+    session.add_assistant_message("Noch eine Antwort", agent_key="COMPASS")
+    worker.submit(session, ui_language="de")
+
+    stats = worker.stats()
+    assert stats.queue_depth == 1
+    assert stats.in_flight == 1
+    assert stats.coalesced == 2
+
+    gate.set()
+    assert worker.flush(timeout=2) is True
+    assert summarizer.seen_lengths == [2, 4]
+    assert session.profile_facts == ["4 messages"]
+    worker.shutdown()
+
+
+def test_turn_during_running_summary_is_rescheduled() -> None:
+    gate = threading.Event()
+    summarizer = RecordingSummarizer(gate=gate)
+    worker = SummaryWorker(summarizer)
+    session = _conversation_with_turns(1)
+
+    worker.submit(session, ui_language="en")
+    assert summarizer.started.wait(timeout=2)
+    session.add_user_message("Follow-up", ui_language="en")
+    worker.submit(session, ui_language="en")
+    assert worker.stats().in_flight == 1
+
+    gate.set()
+    assert worker.flush(timeout=2) is True
+    assert summarizer.seen_lengths == [2, 3]
+    assert worker.stats().completed == 2
+    worker.shutdown()
+
+
+def test_queue_is_bounded_by_session_count() -> None:
+    gate = threading.Event()
+    summarizer = RecordingSummarizer(gate=gate)
+    worker = SummaryWorker(summarizer, max_workers=1, max_queue_depth=2)
+
+    assert worker.submit(_conversation_with_turns(1), ui_language="de") is True
+    assert worker.submit(_conversation_with_turns(1), ui_language="de") is True
+    assert worker.submit(_conversation_with_turns(1), ui_language="de") is False
+
+    assert worker.stats().dropped == 1
+    gate.set()
+    assert worker.flush(timeout=2) is True
+    worker.shutdown()
+
+
+def test_failed_summary_keeps_previous_memory_and_counts_failure() -> None:
+    worker = SummaryWorker(FailingSummarizer())
+    session = _conversation_with_turns(1)
+    session.update_summary(SessionSummary(profile_facts=("Erstakademikerin",)))
+
+    worker.submit(session, ui_language="de")
+    assert worker.flush(timeout=2) is True
+
+    assert session.profile_facts == ["Erstakademikerin"]
+    assert worker.stats().failed == 1
+    worker.shutdown()
+
+
+def test_submit_after_shutdown_is_dropped() -> None:
+    worker = SummaryWorker(RecordingSummarizer())
+    worker.shutdown()
+
+    assert worker.submit(_conversation_with_turns(1), ui_language="de") is False
+    assert worker.stats().dropped == 1
+
+
+class DeltaSummarizer(RecordingSummarizer):
+    """Incremental summarizer that records which messages each delta contained."""
+
+    def __init__(self, *, fail: bool = False) -> None:
+        super().__init__()
+        self.fail = fail
+        self.deltas: list[list[str]] = []
+
+    def summarize_delta(
+        self,
+        new_messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary,
+    ) -> SessionSummary | None:
+        self.deltas.append([message["content"][0]["text"] for message in new_messages])
+        if self.fail:
+            return None
+        return SessionSummary(
+            profile_facts=previous_summary.profile_facts,
+            conversation_overview=(*previous_summary.conversation_overview, "delta"),
+        )
+
+
+def test_incremental_refresh_sends_only_messages_since_high_water_mark() -> None:
+    summarizer = DeltaSummarizer()
+    session = _conversation_with_turns(2)
+
+    refresh_session_summary(summarizer, session, ui_language="de", incremental=True)
+    session.add_user_message("Neue Frage", ui_language="de")
+    session.add_assistant_message("Neue Antwort", agent_key="COMPASS")
+    refresh_session_summary(summarizer, session, ui_language="de", incremental=True)
+
+    assert summarizer.seen_lengths == [4]
+    assert summarizer.deltas == [["Neue Frage", "Neue Antwort"]]
+    assert session.conversation_overview == ["Summary in de", "delta"]
+    assert session.summary_progress().new_messages == 0
+
+
+def test_failed_delta_keeps_high_water_mark_for_retry() -> None:
+    summarizer = DeltaSummarizer(fail=True)
+    session = _conversation_with_turns(1)
+    session.update_summary(SessionSummary(profile_facts=("Erstakademikerin",)))
+    session.add_user_message("Neue Frage", ui_language="de")
+
+    refresh_session_summary(summarizer, session, ui_language="de", incremental=True)
+    session.add_assistant_message("Neue Antwort", agent_key="COMPASS")
+    refresh_session_summary(summarizer, session, ui_language="de", incremental=True)
+
+    assert summarizer.deltas == [["Neue Frage"], ["Neue Frage", "Neue Antwort"]]
+    assert session.summary_progress().new_messages == 2
+
+
+def test_full_refresh_when_incremental_disabled() -> None:
+    summarizer = DeltaSummarizer()
+    session = _conversation_with_turns(1)
+    session.update_summary(SessionSummary(profile_facts=("Erstakademikerin",)))
+    session.add_user_message("Neue Frage", ui_language="de")
+
+    refresh_session_summary(summarizer, session, ui_language="de", incremental=False)
+
+    assert summarizer.deltas == []
+    assert summarizer.seen_lengths == [3]
+
+
+class TextSummaryClient:
+    """Summary client that answers every request with *text*."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.calls: list[list[dict]] = []
+
+    def converse(self, messages: list[dict], **_kwargs) -> dict:
+        self.calls.append(messages)
+        return {}
+
+    def extract_text(self, _response: dict) -> str:
+        return self.text
+
+
+def test_failed_full_summary_keeps_high_water_mark_for_retry() -> None:
+    client = TextSummaryClient("not json at all")
+    session = _conversation_with_turns(2)
+
+    for incremental in (True, False):
+        refresh_session_summary(
+            NovaSessionSummarizer(client=client),
+            session,
+            ui_language="de",
+            incremental=incremental,
+        )
+
+    assert len(client.calls) == 2
+    assert session.profile_facts == []
+    assert session.summary_progress().new_messages == 4
+
+    client.text = '{"profile_facts": ["Erstakademikerin"], "conversation_overview": ["BAföG"]}'
+    refresh_session_summary(
+        NovaSessionSummarizer(client=client), session, ui_language="de", incremental=True
+    )
+
+    assert session.profile_facts == ["Erstakademikerin"]
+    assert session.summary_progress().new_messages == 0
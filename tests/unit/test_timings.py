@@ -0,0 +1,71 @@
+"""Unit tests for per-turn latency timing helpers."""
+
+import pytest
+from src.core.timings import TURN_TIMER_KEY, TurnTimer, timed_stage
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_stages_accumulate_and_total_covers_turn() -> None:
+    clock = FakeClock()
+    timer = TurnTimer(now=clock)
+
+    with timer.stage("context"):
+        clock.advance(0.010)
+    with timer.stage("prompt_build"):
+        clock.advance(0.002)
+    with timer.stage("prompt_build"):
+        clock.advance(0.003)
+    timer.record("route", 120.0)
+    timer.record("crisis", None)
+    clock.advance(0.100)
+
+    timings = timer.finish()
+
+    assert timings.context_ms == 10.0
+    assert timings.prompt_build_ms == 5.0
+    assert timings.route_ms == 120.0
+    assert timings.crisis_ms is None
+    assert timings.total_ms == 115.0
+
+
+def test_first_chunk_is_recorded_once() -> None:
+    clock = FakeClock()
+    timer = TurnTimer(now=clock)
+
+    clock.advance(0.250)
+    timer.mark_first_chunk()
+    clock.advance(1.0)
+    timer.mark_first_chunk()
+
+    assert timer.finish().first_chunk_ms == 250.0
+
+
+def test_unknown_stage_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown turn stage"):
+        TurnTimer().record("dessert", 1.0)
+
+
+def test_timed_stage_uses_timer_from_metadata_and_ignores_missing_timer() -> None:
+    clock = FakeClock()
+    timer = TurnTimer(now=clock)
+
+    with timed_stage({TURN_TIMER_KEY: timer}, "prompt_build"):
+        clock.advance(0.004)
+    with timed_stage(None, "prompt_build"):
+        clock.advance(1.0)
+    with timed_stage({"ui_language": "de"}, "prompt_build"):
+        clock.advance(1.0)
+
+    assert timer.finish().prompt_build_ms == 4.0
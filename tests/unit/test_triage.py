@@ -0,0 +1,379 @@
+"""Unit tests for the concurrent routing + crisis triage stage."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from src.agents.crisis import CRISIS_RESOURCES, CrisisRadar
+from src.agents.router import RouterAgent
+from src.agents.triage import TriageAgent, parse_triage_reply
+from src.core.client import NovaThrottlingError
+from src.orchestration.triage import CombinedTriage, ParallelTriage, build_triage
+
+pytestmark = pytest.mark.unit
+
+
+class SlowRouter:
+    def __init__(self, agent_key: str = "FINANCING", *, delay: float = 0.0) -> None:
+        self.agent_key = agent_key
+        self.delay = delay
+        self.messages: list[str] = []
+
+    def route(self, message: str) -> str:
+        self.messages.append(message)
+        time.sleep(self.delay)
+        return self.agent_key
+
+
+class SlowCrisisRadar:
+    def __init__(self, *, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.error = error
+
+    def scan(self, _message: str) -> dict:
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"is_crisis": False, "assessment": "CRISIS: NO", "resources": None}
+
+
+class BarrierRouter:
+    """Only returns when the crisis scan is running at the same time."""
+
+    def __init__(self, barrier: threading.Barrier) -> None:
+        self.barrier = barrier
+
+    def route(self, _message: str) -> str:
+        self.barrier.wait(timeout=1)
+        return "ROLE_MODELS"
+
+
+class BarrierCrisisRadar:
+    def __init__(self, barrier: threading.Barrier) -> None:
+        self.barrier = barrier
+
+    def scan(self, _message: str) -> dict:
+        self.barrier.wait(timeout=1)
+        return {"is_crisis": False, "assessment": "CRISIS: NO", "resources": None}
+
+
+def test_router_and_crisis_scan_run_concurrently() -> None:
+    barrier = threading.Barrier(2)
+    triage = ParallelTriage(BarrierRouter(barrier), BarrierCrisisRadar(barrier))
+
+    result = triage.run("I feel like I don't belong here.")
+
+    assert result.agent_key == "ROLE_MODELS"
+    assert result.route_fallback is False
+    assert result.crisis_failed is False
+    assert result.route_ms is not None
+    assert result.crisis_ms is not None
+
+
+def test_route_message_is_passed_to_router_only() -> None:
+    router = SlowRouter()
+    triage = ParallelTriage(router, SlowCrisisRadar())
+
+    triage.run(
+        "Bitte erklaere das.", route_message="Bitte erklaere das.\n\nAttached documents: a.pdf"
+    )
+
+    assert router.messages == ["Bitte erklaere das.\n\nAttached documents: a.pdf"]
+
+
+def test_sticky_agent_skips_the_router_but_not_the_crisis_scan() -> None:
+    router = SlowRouter()
+    triage = ParallelTriage(router, SlowCrisisRadar())
+
+    result = triage.run("und wie lange dauert das?", sticky_agent="ROLE_MODELS")
+
+    assert router.messages == []
+    assert result.agent_key == "ROLE_MODELS"
+    assert result.sticky is True
+    assert result.route_ms is None
+    assert result.crisis_ms is not None
+
+
+def test_router_timeout_falls_back_to_compass() -> None:
+    triage = ParallelTriage(
+        SlowRouter(delay=0.5),
+        SlowCrisisRadar(),
+        deadline_seconds=0.05,
+    )
+
+    started = time.monotonic()
+    result = triage.run("What is ECTS?")
+
+    assert time.monotonic() - started < 0.4
+    assert result.agent_key == "COMPASS"
+    assert result.route_fallback is True
+    assert result.route_ms is None
+    assert result.crisis["is_crisis"] is False
+
+
+def test_router_error_falls_back_to_compass() -> None:
+    class FailingRouter:
+        def route(self, _message: str) -> str:
+            raise NovaThrottlingError("throttled")
+
+    result = ParallelTriage(FailingRouter(), SlowCrisisRadar()).run("Hallo")
+
+    assert result.agent_key == "COMPASS"
+    assert result.route_fallback is True
+
+
+def test_crisis_failure_uses_explicit_failure_assessment() -> None:
+    triage = ParallelTriage(
+        SlowRouter(),
+        SlowCrisisRadar(error=NovaThrottlingError("throttled")),
+    )
+
+    result = triage.run("Wie beantrage ich BAföG?")
+
+    assert result.crisis_failed is True
+    assert result.crisis["is_crisis"] is False
+    assert result.crisis["scan_failed"] is True
+    assert "CRISIS: UNKNOWN" in result.crisis["assessment"]
+    assert result.agent_key == "FINANCING"
+
+
+def test_crisis_timeout_still_surfaces_resources_for_strong_signals() -> None:
+    triage = ParallelTriage(
+        SlowRouter(agent_key="COMPASS"),
+        SlowCrisisRadar(delay=0.5),
+        deadline_seconds=0.05,
+    )
+
+    result = triage.run("Ich kann nicht mehr und will einfach verschwinden.")
+
+    assert result.crisis_failed is True
+    assert result.crisis["is_crisis"] is True
+    assert result.crisis["resources"] == CRISIS_RESOURCES
+    assert "SCAN_TIMEOUT" in result.crisis["assessment"]
+
+
+class AsyncRouter:
+    def __init__(self, agent_key: str = "FINANCING", *, delay: float = 0.0) -> None:
+        self.agent_key = agent_key
+        self.delay = delay
+
+    def route(self, _message: str) -> str:
+        raise AssertionError("sync route must not run on the async path")
+
+    async def aroute(self, _message: str) -> str:
+        await asyncio.sleep(self.delay)
+        return self.agent_key
+
+
+class AsyncCrisisRadar:
+    def __init__(self, *, delay: float = 0.0) -> None:
+        self.delay = delay
+
+    def scan(self, _message: str) -> dict:
+        raise AssertionError("sync scan must not run on the async path")
+
+    async def ascan(self, _message: str) -> dict:
+        await asyncio.sleep(self.delay)
+        return {"is_crisis": False, "assessment": "CRISIS: NO", "resources": None}
+
+
+@pytest.mark.asyncio
+async def test_arun_awaits_router_and_crisis_concurrently() -> None:
+    triage = ParallelTriage(AsyncRouter(delay=0.1), AsyncCrisisRadar(delay=0.1))
+
+    started = time.monotonic()
+    result = await triage.arun("Wie beantrage ich BAföG?")
+
+    assert time.monotonic() - started < 0.19
+    assert result.agent_key == "FINANCING"
+    assert result.crisis_failed is False
+
+
+@pytest.mark.asyncio
+async def test_arun_deadline_uses_same_fallbacks() -> None:
+    triage = ParallelTriage(
+        AsyncRouter(delay=0.5),
+        AsyncCrisisRadar(delay=0.5),
+        deadline_seconds=0.05,
+    )
+
+    result = await triage.arun("Ich kann nicht mehr und will einfach verschwinden.")
+
+    assert result.agent_key == "COMPASS"
+    assert result.route_fallback is True
+    assert result.crisis_failed is True
+    assert result.crisis["is_crisis"] is True
+
+
+class FakeTriageClient:
+    def __init__(self, text: str, *, delay: float = 0.0) -> None:
+        self.text = text
+        self.delay = delay
+        self.calls: list[dict] = []
+
+    def converse(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        time.sleep(self.delay)
+        return {"text": self.text}
+
+    async def aconverse(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        return {"text": self.text}
+
+    def extract_text(self, response: dict) -> str:
+        return response["text"]
+
+
+def _combined(
+    text: str, *, delay: float = 0.0, deadline_seconds: float = 1.0
+) -> tuple[CombinedTriage, FakeTriageClient]:
+    client = FakeTriageClient(text, delay=delay)
+    router = RouterAgent()
+    crisis_radar = CrisisRadar(client=FakeTriageClient("CRISIS: NO"))
+    triage = CombinedTriage(
+        TriageAgent(client=client),
+        router=router,
+        crisis_radar=crisis_radar,
+        deadline_seconds=deadline_seconds,
+    )
+    return triage, client
+
+
+def test_parse_triage_reply_reads_agent_and_crisis_lines() -> None:
+    decision = parse_triage_reply(
+        "Ich weiß nicht, wie ich die Miete zahlen soll.",
+        "AGENT: COMPASS\nCRISIS: YES\nTYPE: FINANCIAL",
+    )
+
+    assert decision.agent_key == "COMPASS"
+    assert decision.crisis["is_crisis"] is True
+    assert decision.crisis["resources"] == CRISIS_RESOURCES
+
+
+def test_parse_triage_reply_applies_the_dropout_override() -> None:
+    decision = parse_triage_reply(
+        "Ich will erstmal wissen, ob ich überhaupt studieren will.",
+        "AGENT: STUDY_CHOICE\nCRISIS: YES\nTYPE: DROPOUT",
+    )
+
+    assert decision.agent_key == "STUDY_CHOICE"
+    assert decision.crisis["is_crisis"] is False
+
+
+def test_combined_triage_makes_one_request_for_open_questions() -> None:
+    triage, client = _combined("AGENT: ROLE_MODELS\nCRISIS: YES\nTYPE: MENTAL")
+
+    result = triage.run("Ich fühle mich so einsam und weiß nicht weiter.")
+
+    assert len(client.calls) == 1
+    assert result.agent_key == "ROLE_MODELS"
+    assert result.crisis["is_crisis"] is True
+    assert result.route_ms is not None
+    assert result.route_ms == result.crisis_ms
+    assert result.route_fallback is False
+    assert result.crisis_failed is False
+
+
+def test_combined_triage_skips_the_request_when_both_answers_are_local() -> None:
+    triage, client = _combined("AGENT: COMPASS\nCRISIS: NO\nTYPE: NONE")
+
+    result = triage.run("Ich kann nicht mehr, das BAföG reicht nicht.")
+
+    assert client.calls == []
+    assert result.agent_key == "FINANCING"
+    assert result.crisis["is_crisis"] is True
+
+
+def test_combined_triage_prefers_local_answers_over_the_model() -> None:
+    triage, client = _combined("AGENT: COMPASS\nCRISIS: NO\nTYPE: NONE")
+
+    result = triage.run("Ich habe Schulden wegen dem BAföG.")
+
+    assert len(client.calls) == 1
+    assert result.agent_key == "FINANCING"
+    assert result.crisis["is_crisis"] is False
+
+
+def test_combined_triage_reuses_cached_crisis_assessments() -> None:
+    triage, client = _combined("AGENT: COMPASS\nCRISIS: NO\nTYPE: NONE")
+    assert triage.crisis_radar is not None
+    message = "Ich habe Schulden wegen dem BAföG."
+    triage.crisis_radar.scan(message)
+
+    result = triage.run(message)
+
+    assert client.calls == []
+    assert result.agent_key == "FINANCING"
+    assert result.crisis["is_crisis"] is False
+
+
+def test_combined_triage_keeps_document_names_out_of_the_crisis_question() -> None:
+    triage, client = _combined("AGENT: FINANCING\nCRISIS: NO\nTYPE: NONE")
+    message = "Ich fühle mich so einsam und weiß nicht weiter."
+
+    triage.run(message, route_message=f"{message}\n\nAttached documents: bescheid.pdf")
+
+    content = client.calls[0]["messages"][0]["content"]
+    assert content[0] == {"text": message}
+    assert content[1]["text"].startswith("ROUTING CONTEXT:")
+    assert "bescheid.pdf" in content[1]["text"]
+
+
+def test_combined_triage_counts_each_turn_once_in_routing_stats() -> None:
+    triage, _client = _combined("AGENT: ROLE_MODELS\nCRISIS: NO\nTYPE: NONE")
+    assert triage.router is not None
+
+    triage.run("Was ist BAföG?")
+    triage.run("Ich brauche Motivation.")
+
+    stats = triage.router.routing_stats()
+    assert stats.total == 2
+    assert stats.local == 1
+    assert stats.model == 1
+
+
+def test_combined_triage_timeout_uses_the_same_fallbacks() -> None:
+    triage, _client = _combined("AGENT: FINANCING", delay=0.5, deadline_seconds=0.05)
+
+    result = triage.run("Mir geht es richtig schlecht.")
+
+    assert result.agent_key == "COMPASS"
+    assert result.route_fallback is True
+    assert result.crisis_failed is True
+    assert "SCAN_TIMEOUT" in result.crisis["assessment"]
+
+
+@pytest.mark.asyncio
+async def test_combined_triage_async_path() -> None:
+    triage, client = _combined("AGENT: STUDY_CHOICE\nCRISIS: NO\nTYPE: NONE")
+
+    result = await triage.arun("Ich bin total überfordert mit der Bewerbung.")
+
+    assert len(client.calls) == 1
+    assert result.agent_key == "STUDY_CHOICE"
+    assert result.crisis_failed is False
+
+
+def test_combined_triage_sticky_agent_overrides_the_model_route() -> None:
+    triage, client = _combined("AGENT: COMPASS\nCRISIS: YES\nTYPE: MENTAL")
+
+    result = triage.run(
+        "Und ich fühle mich so einsam und weiß nicht weiter.", sticky_agent="FINANCING"
+    )
+
+    assert len(client.calls) == 1
+    assert result.agent_key == "FINANCING"
+    assert result.sticky is True
+    assert result.crisis["is_crisis"] is True
+
+
+def test_build_triage_selects_mode() -> None:
+    router = RouterAgent()
+    crisis_radar = CrisisRadar(client=FakeTriageClient("CRISIS: NO"))
+
+    assert isinstance(build_triage(router, crisis_radar, "parallel"), ParallelTriage)
+    assert isinstance(build_triage(router, crisis_radar, "combined"), CombinedTriage)
+    with pytest.raises(ValueError, match="Unknown triage mode"):
+        build_triage(router, crisis_radar, "sequential")
@@ -0,0 +1,70 @@
+"""Unit tests for the bounded TTL cache."""
+
+import pytest
+from src.core.ttl_cache import TTLCache
+
+pytestmark = pytest.mark.unit
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_hit_and_miss_are_counted(self):
+        cache: TTLCache[str] = TTLCache(max_entries=4, ttl_seconds=60)
+        cache.put("was ist bafoeg?", "FINANCING")
+
+        assert cache.get("was ist bafoeg?") == "FINANCING"
+        assert cache.get("hallo") is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_entries_expire_after_ttl(self):
+        clock = Clock()
+        cache: TTLCache[str] = TTLCache(max_entries=4, ttl_seconds=10, now=clock)
+        cache.put("a", "x")
+
+        clock.now = 9.9
+        assert cache.get("a") == "x"
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert "a" not in cache
+        assert cache.stats().size == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache: TTLCache[int] = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats().evictions == 1
+
+    def test_membership_does_not_touch_counters(self):
+        cache: TTLCache[int] = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", 1)
+
+        assert "a" in cache
+        assert cache.stats().hits == 0
+        assert cache.stats().misses == 0
+
+    def test_clear_keeps_counters(self):
+        cache: TTLCache[int] = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert cache.stats().hits == 1
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError, match="max_entries"):
+            TTLCache(max_entries=0, ttl_seconds=1)
@@ -0,0 +1,221 @@
+"""Unit tests for Bedrock token usage and cost accounting."""
+
+from collections.abc import Generator
+
+import pytest
+from config.settings import BEDROCK_PRICE_INPUT_PER_MTOK, BEDROCK_PRICE_OUTPUT_PER_MTOK
+from src.core.client import NovaClient, reset_bedrock_runtime_clients
+from src.core.provenance import AgentReply, ResponseProvenance
+from src.core.session_summary import SessionSummary
+from src.core.usage import (
+    UsageMeter,
+    current_meter,
+    metered,
+    process_usage,
+    record_usage,
+    reset_process_usage,
+)
+from src.orchestration import ChatService
+
+pytestmark = pytest.mark.unit
+
+PROVENANCE = ResponseProvenance(mode="model", source_registry_used=False, web_grounding_used=False)
+
+
+def _usage(input_tokens: int, output_tokens: int) -> dict:
+    return {"inputTokens": input_tokens, "outputTokens": output_tokens}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_usage() -> Generator[None, None, None]:
+    reset_process_usage()
+    yield
+    reset_process_usage()
+
+
+class MeteredRouter:
+    """Records usage like a model-backed router would."""
+
+    def route(self, _message: str) -> str:
+        record_usage(_usage(50, 2), caller="router")
+        return "FINANCING"
+
+    async def aroute(self, message: str) -> str:
+        return self.route(message)
+
+
+class CalmRadar:
+    def scan(self, _message: str) -> dict:
+        record_usage(_usage(40, 3), caller="crisis")
+        return {"is_crisis": False, "resources": None}
+
+    async def ascan(self, message: str) -> dict:
+        return self.scan(message)
+
+
+class MeteredAgent:
+    name = "student_aid"
+    tool_mode = None
+
+    def respond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        record_usage(_usage(300, 120), caller=self.name, metrics={"latencyMs": 850})
+        return AgentReply(text="answer", provenance=PROVENANCE)
+
+    async def arespond_with_details(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> AgentReply:
+        return self.respond_with_details(messages, metadata)
+
+    def respond_stream(
+        self, messages: list[dict], metadata: dict | None = None
+    ) -> Generator[str, None, None]:
+        yield "ans"
+        record_usage(_usage(300, 120), caller=self.name)
+        yield "wer"
+
+
+class MeteredSummarizer:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def summarize(
+        self,
+        messages: list[dict],
+        *,
+        ui_language: str,
+        previous_summary: SessionSummary | None = None,
+    ) -> SessionSummary:
+        self.calls += 1
+        record_usage(_usage(200, 60), caller="summarizer")
+        return SessionSummary(conversation_overview=("BAföG",))
+
+
+class StubBedrock:
+    def converse(self, **kwargs) -> dict:
+        return {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": _usage(10, 4),
+            "metrics": {"latencyMs": 120},
+        }
+
+
+def _service(**kwargs) -> ChatService:
+    agent = MeteredAgent()
+    return ChatService(
+        router=MeteredRouter(),
+        crisis_radar=CalmRadar(),
+        agents={"COMPASS": agent, "FINANCING": agent},
+        **kwargs,
+    )
+
+
+class TestUsageMeter:
+    def test_record_usage_is_labeled_and_priced(self):
+        record_usage(_usage(1_000_000, 0), caller="router", metrics={"latencyMs": 12})
+        record_usage(_usage(0, 1_000_000), caller="compass")
+
+        report = process_usage()
+
+        assert report.by_caller["router"].input_tokens == 1_000_000
+        assert report.by_caller["router"].latency_ms == 12
+        assert report.total.requests == 2
+        assert report.total.total_tokens == 2_000_000
+        assert report.total.estimated_cost_usd == pytest.approx(
+            BEDROCK_PRICE_INPUT_PER_MTOK + BEDROCK_PRICE_OUTPUT_PER_MTOK
+        )
+
+    def test_metered_binds_and_restores_the_meter(self):
+        outer, inner = UsageMeter(), UsageMeter()
+
+        with metered(outer):
+            with metered(inner):
+                record_usage(_usage(10, 1), caller="crisis")
+            assert current_meter() is outer
+        assert current_meter() is None
+
+        assert inner.total_tokens() == 11
+        assert outer.total_tokens() == 0
+        assert process_usage().total.total_tokens == 11
+
+    def test_empty_usage_is_ignored(self):
+        record_usage(None)
+        record_usage({})
+
+        assert process_usage().total.requests == 0
+
+    def test_nova_client_labels_converse_usage(self, monkeypatch):
+        monkeypatch.setattr("src.core.client.boto3.client", lambda *_a, **_k: StubBedrock())
+        reset_bedrock_runtime_clients()
+
+        NovaClient(caller="router").converse([{"role": "user", "content": [{"text": "Hi"}]}])
+        list(
+            NovaClient.iter_stream_text(
+                {"stream": [{"metadata": {"usage": _usage(7, 2), "metrics": {"latencyMs": 9}}}]},
+                caller="compass",
+            )
+        )
+
+        report = process_usage()
+        assert report.by_caller["router"].latency_ms == 120
+        assert report.by_caller["compass"].input_tokens == 7
+        reset_bedrock_runtime_clients()
+
+
+class TestChatServiceUsage:
+    def test_turn_usage_covers_triage_threads_and_generation(self):
+        service = _service(include_usage=True)
+
+        first = service.respond("Wie beantrage ich BAföG?")
+        second = service.respond("Und danach?", session_id=first.session_id)
+
+        assert first.usage is not None and second.usage is not None
+        assert set(first.usage.turn.by_caller) == {"router", "crisis", "student_aid"}
+        assert first.usage.turn.total.total_tokens == 515
+        assert second.usage.session.total_tokens == 1030
+        assert service.metrics()["usage"]["by_caller"]["student_aid"]["requests"] == 2
+
+    def test_usage_is_omitted_unless_enabled(self):
+        assert _service().respond("Hallo").usage is None
+
+    def test_streamed_turn_is_metered(self):
+        service = _service(include_usage=True)
+
+        *_chunks, result = service.respond_stream("Wie beantrage ich BAföG?")
+
+        assert result.usage is not None
+        assert result.usage.turn.by_caller["student_aid"].output_tokens == 120
+
+    @pytest.mark.asyncio
+    async def test_async_turn_is_metered(self):
+        service = _service(include_usage=True)
+
+        result = await service.arespond("Wie beantrage ich BAföG?")
+
+        assert result.usage is not None
+        assert result.usage.turn.total.requests == 3
+
+    def test_summaries_count_toward_the_session(self):
+        summarizer = MeteredSummarizer()
+        service = _service(include_usage=True, summarizer=summarizer)
+
+        first = service.respond("Wie beantrage ich BAföG?")
+        second = service.respond("Und danach?", session_id=first.session_id)
+
+        assert second.usage is not None
+        assert second.usage.session.total_tokens == 2 * (515 + 260)
+        assert "summarizer" not in second.usage.turn.by_caller
+
+    def test_session_over_budget_skips_summaries_but_still_answers(self):
+        summarizer = MeteredSummarizer()
+        service = _service(include_usage=True, summarizer=summarizer, session_token_budget=600)
+
+        first = service.respond("Wie beantrage ich BAföG?")
+        second = service.respond("Und danach?", session_id=first.session_id)
+        third = service.respond("Und dann?", session_id=first.session_id)
+
+        assert summarizer.calls == 1
+        assert second.usage is not None and second.usage.over_budget
+        assert third.response == "answer"
+        assert service.metrics()["summary_cadence"]["over_budget"] == 2